@@ -0,0 +1,89 @@
+"""Token authentication for the REST API.
+
+A request authenticated with a token looks up the token and its user,
+and each permission check made while handling the request looks up the
+user's permission set again to find the user's compiled policies.
+``CachedTokenAuthentication`` caches the user of a token together with
+the ID of the user's permission set, so repeated requests with the same
+token need neither lookup. tutelary already keeps the compiled
+permission tree of each permission set in memory, and ``core.backends``
+uses the cached ID to find it.
+
+Entries are removed when the token is deleted or saved, which covers
+logging out and replacing a token, when the user is saved and when the
+user's policies change. The entries are kept in the cache configured in
+``CACHES``, which is shared by all processes, so a deleted token stops
+authenticating in every process at once.
+
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+# Entries are invalidated explicitly; the timeout only limits how long a
+# change made outside of the signal handlers can go unnoticed.
+CACHE_TIMEOUT = 60
+TOKEN_CACHE_KEY = 'auth:token:{}'
+USER_CACHE_KEY = 'auth:user:{}'
+
+
+def _token_cache_key(key):
+    # Token keys are credentials, so they are not used as cache keys
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+    return TOKEN_CACHE_KEY.format(digest)
+
+
+def _user_cache_key(user_id):
+    return USER_CACHE_KEY.format(user_id)
+
+
+def get_token_user(key):
+    """Returns the cached user of the token ``key``, or ``None``."""
+    entry = cache.get(_token_cache_key(key))
+    if entry is None:
+        return None
+    user, permission_set_id = entry
+    user._permission_set_id = permission_set_id
+    return user
+
+
+def remember_token(key, user):
+    """Caches ``user`` and the ID of its permission set for the token
+    ``key``."""
+    permission_set_id = user.permissionset.values_list(
+        'pk', flat=True).first()
+    token_key = _token_cache_key(key)
+    cache.set_many({token_key: (user, permission_set_id),
+                    _user_cache_key(user.pk): token_key},
+                   CACHE_TIMEOUT)
+    user._permission_set_id = permission_set_id
+
+
+def invalidate_token(key):
+    """Removes the cached user of the token ``key``."""
+    cache.delete(_token_cache_key(key))
+
+
+def invalidate_user_token(user_id):
+    """Removes the cached token of the user with the ID ``user_id``."""
+    user_key = _user_cache_key(user_id)
+    token_key = cache.get(user_key)
+    if token_key is not None:
+        cache.delete_many([token_key, user_key])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication that caches the user of each token and the
+    user's permission set."""
+
+    def authenticate_credentials(self, key):
+        user = get_token_user(key)
+        if user is not None:
+            return (user, Token(key=key, user=user))
+
+        user, token = super().authenticate_credentials(key)
+        remember_token(key, user)
+        return (user, token)
@@ -0,0 +1,74 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIRequestFactory
+
+from accounts.models import User
+from organization.models import Organization
+from organization.views.api import OrganizationList
+from ...authentication import CachedTokenAuthentication, invalidate_token
+
+
+class Command(BaseCommand):
+    help = """Compares the number of queries and requests per second of the
+    organization list API when requests are authenticated with DRF's
+    TokenAuthentication and with CachedTokenAuthentication. The list checks
+    the user's permissions for every organization. Nothing is kept in the
+    database."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            dest='requests',
+            default=200,
+            help='Number of requests with each authentication class'
+        )
+        parser.add_argument(
+            '--organizations',
+            type=int,
+            dest='organizations',
+            default=20,
+            help='Number of organizations in the list'
+        )
+
+    def timed(self, view, count, credentials):
+        factory = APIRequestFactory()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for _ in range(count):
+                request = factory.get('/organizations/',
+                                      HTTP_AUTHORIZATION=credentials)
+                response = view(request)
+                assert response.status_code == 200, response.status_code
+            elapsed = time.perf_counter() - start
+        return len(queries) / count, count / elapsed
+
+    def handle(self, *args, **options):
+        count = options['requests']
+
+        with transaction.atomic():
+            for i in range(options['organizations']):
+                Organization.objects.create(name='Benchmark {}'.format(i))
+            user = User.objects.create_user(
+                username='benchmark-token',
+                email='benchmark-token@example.com',
+                password='benchmark-password')
+            token = Token.objects.create(user=user)
+            credentials = 'Token ' + token.key
+
+            self.stdout.write('{:<28} {:>10} {:>12}'.format(
+                '', 'queries', 'requests'))
+            for auth in (TokenAuthentication, CachedTokenAuthentication):
+                view = OrganizationList.as_view(
+                    authentication_classes=(auth,))
+                queries, rate = self.timed(view, count, credentials)
+                self.stdout.write('{:<28} {:>10.1f} {:>10.1f}/s'.format(
+                    auth.__name__, queries, rate))
+
+            invalidate_token(token.key)
+            transaction.set_rollback(True)
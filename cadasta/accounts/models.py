@@ -5,10 +5,12 @@ from django.dispatch import receiver
 from django.utils.translation import ugettext as _
 import django.contrib.auth.models as auth
 import django.contrib.auth.base_user as auth_base
-from tutelary.models import Policy
+from rest_framework.authtoken.models import Token
+from tutelary.models import PermissionSet, Policy
 from tutelary.decorators import permissioned_model
 
-from simple_history.models import HistoricalRecords
+from core.history import HistoricalRecords
+from .authentication import invalidate_token, invalidate_user_token
 from .manager import UserManager
 
 
@@ -80,3 +82,30 @@ def assign_default_policy(sender, instance, **kwargs):
     if policy not in assigned_policies:
         assigned_policies.insert(0, policy)
     instance.assign_policies(*assigned_policies)
+
+
+@receiver(models.signals.post_save, sender=Token)
+@receiver(models.signals.post_delete, sender=Token)
+def invalidate_token_cache(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(models.signals.post_save, sender=User)
+def invalidate_user_token_cache(sender, instance, **kwargs):
+    invalidate_user_token(instance.pk)
+
+
+@receiver(models.signals.m2m_changed, sender=PermissionSet.users.through)
+def invalidate_token_policies(sender, instance, action, reverse, pk_set,
+                              **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if reverse:
+        invalidate_user_token(instance.pk)
+    elif action == 'pre_clear':
+        for user_id in instance.users.values_list('pk', flat=True):
+            invalidate_user_token(user_id)
+    else:
+        for user_id in pk_set:
+            invalidate_user_token(user_id)
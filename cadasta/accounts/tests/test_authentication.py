@@ -0,0 +1,97 @@
+import pytest
+from django.core.cache import cache
+from django.test import TestCase
+from djoser.views import LogoutView
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from tutelary.models import Policy, Role
+
+from core.tests.utils.cases import UserTestCase
+from .. import authentication
+from ..authentication import CachedTokenAuthentication
+from .factories import UserFactory
+
+
+class CachedTokenAuthenticationTest(UserTestCase, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory.create()
+        self.token = Token.objects.create(user=self.user)
+        self.auth = CachedTokenAuthentication()
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def request(self, key=None):
+        return APIRequestFactory().get(
+            '/', HTTP_AUTHORIZATION='Token ' + (key or self.token.key))
+
+    def authenticate(self, key=None):
+        return self.auth.authenticate(self.request(key))
+
+    def is_cached(self, key=None):
+        return authentication.get_token_user(
+            key or self.token.key) is not None
+
+    def test_token_user_is_cached(self):
+        user, token = self.authenticate()
+        assert user == self.user
+        assert token.key == self.token.key
+        assert self.is_cached()
+        # Builds the permission tree, which tutelary keeps in memory
+        assert user.has_perm('org.list') is True
+
+        with self.assertNumQueries(0):
+            user, token = self.authenticate()
+            assert user == self.user
+            assert token.key == self.token.key
+            assert user.has_perm('org.list') is True
+            assert user.has_perm('org.archive') is False
+
+    def test_invalid_token(self):
+        with pytest.raises(AuthenticationFailed):
+            self.authenticate('0' * 40)
+        assert not self.is_cached('0' * 40)
+
+    def test_logout_invalidates_token(self):
+        self.authenticate()
+        request = self.request()
+        response = LogoutView.as_view(
+            authentication_classes=(CachedTokenAuthentication,))(request)
+        assert response.status_code == 200
+        assert not self.is_cached()
+        with pytest.raises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_token_rotation(self):
+        self.authenticate()
+        self.token.delete()
+        new_token = Token.objects.create(user=self.user)
+        assert not self.is_cached()
+        with pytest.raises(AuthenticationFailed):
+            self.authenticate()
+        user, _ = self.authenticate(new_token.key)
+        assert user == self.user
+
+    def test_user_save_invalidates_token(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        assert not self.is_cached()
+        with pytest.raises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_policy_change_invalidates_token(self):
+        user, _ = self.authenticate()
+        assert user.has_perm('org.archive') is False
+
+        self.user.assign_policies(Policy.objects.get(name='default'),
+                                  Role.objects.get(name='superuser'))
+        assert not self.is_cached()
+        user, _ = self.authenticate()
+        assert user.has_perm('org.archive') is True
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate()
+            assert user.has_perm('org.archive') is True
@@ -87,7 +87,7 @@ MIDDLEWARE_CLASSES = (
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'accounts.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
@@ -97,6 +97,8 @@ REST_FRAMEWORK = {
     'DEFAULT_VERSIONING_CLASS':
     'rest_framework.versioning.NamespaceVersioning',
     'DEFAULT_VERSION': 'v1',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': 100,
     'EXCEPTION_HANDLER': 'core.views.api.exception_handler'
 }
 
@@ -217,6 +219,18 @@ LEAFLET_CONFIG = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/1.9/topics/cache/
+# Cached roles, tokens and form lists are invalidated when they change,
+# so the cache must be shared by all uWSGI processes and the worker.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': os.environ.get('MEMCACHED_LOCATION', '127.0.0.1:11211'),
+    }
+}
+
 # Invalid names for Cadasta organizations, projects, and usernames
 CADASTA_INVALID_ENTITY_NAMES = ['add', 'new']
 
@@ -309,6 +323,15 @@ ATTRIBUTE_GROUPS = {
 ICON_URL = ('https://s3-us-west-2.amazonaws.com/cadasta-platformprod'
             '-bucket/icons/{}.png')
 
+# Sizes of the thumbnails made of image resources by ThumbnailJob
+THUMBNAIL_SIZES = ((128, 128), (512, 512))
+
+# GPX layers with more points than this are simplified by
+# SpatialResourceJob, to within the tolerance (in degrees, about 1m).
+# Set GPX_SIMPLIFY_POINTS to None to keep every point.
+GPX_SIMPLIFY_POINTS = 10000
+GPX_SIMPLIFY_TOLERANCE = 0.00001
+
 MIME_LOOKUPS = {
     'application/pdf': 'pdf',
     'audio/mpeg3': 'mp3',
@@ -339,3 +362,6 @@ MIME_LOOKUPS = {
 FILE_UPLOAD_HANDLERS = [
     'django.core.files.uploadhandler.TemporaryFileUploadHandler',
 ]
+
+# Number of rows written per bulk insert when importing data
+IMPORT_BATCH_SIZE = 1000
@@ -1,3 +1,11 @@
 from .dev import *  # NOQA
 
 MEDIA_ROOT = os.path.join(os.path.dirname(BASE_DIR), 'core/media/test')
+
+# Tests run in a single process and must not share cached entries with
+# other test runs.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
@@ -31,3 +31,11 @@ LEAFLET_CONFIG['TILES'][0] = (
     'http://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png',
     LEAFLET_CONFIG['TILES'][0][2]
 )
+
+# Tests run in a single process and must not share cached entries with
+# other test runs.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
@@ -1,6 +1,13 @@
 from tutelary.backends import Backend as TutelaryBackend
+from tutelary.models import PermissionSet
 from django.contrib.auth.backends import ModelBackend
 
 
 class Auth(TutelaryBackend, ModelBackend):
-    pass
+    def _get_pset(self, user):
+        # Users authenticated with a cached token already know their
+        # permission set, see accounts.authentication
+        pset_id = getattr(user, '_permission_set_id', None)
+        if pset_id is None:
+            return super()._get_pset(user)
+        return PermissionSet(pk=pset_id).tree()
@@ -0,0 +1,241 @@
+"""Filtering of list APIs by the values of JSON attributes.
+
+Parties, locations and relationships store the answers to the
+questionnaire of their project in the JSONB ``attributes`` column. The
+list APIs filter on them with query parameters of the form
+``attributes.<name>[__<lookup>]=<value>``:
+
+``attributes.land_use=residential``
+    the attribute equals the value
+``attributes.land_use__in=residential,commercial``
+    the attribute equals one of the comma-separated values
+``attributes.area__gte=100`` (also ``gt``, ``lt`` and ``lte``)
+    range filters on integer, decimal, date and date-time attributes
+``attributes.crops__contains=maize``
+    a ``select_multiple`` attribute includes the value
+
+Equality, ``in`` and ``contains`` are translated to JSONB containment
+(``@>``), which uses the GIN index of each ``attributes`` column. Range
+filters compare the attribute extracted with ``->>`` (and converted to a
+number, for numeric attributes); they use the partial expression indexes
+that ``create_attribute_indexes`` creates from the attribute schema of a
+project.
+
+"""
+
+import hashlib
+from decimal import Decimal, InvalidOperation
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.db.models import DecimalField, F, Func, Q, TextField
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.translation import ugettext as _
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from questionnaires.cache import get_schema
+
+PARAM_PREFIX = 'attributes.'
+RANGE_LOOKUPS = ('gt', 'gte', 'lt', 'lte')
+LOOKUPS = RANGE_LOOKUPS + ('in', 'contains')
+
+NUMERIC_TYPES = ('integer', 'decimal')
+DATE_TYPES = ('date', 'dateTime')
+
+# The value of an attribute as text, and as a number if it looks like
+# one. Both are immutable, so that they can be indexed; the expressions
+# used in queries have to match those of the indexes exactly.
+TEXT_SQL = '({column} ->> {name})'
+NUMERIC_SQL = ("(CASE WHEN ({column} ->> {name}) "
+               "~ '^[-+]?[0-9]+(\\.[0-9]+)?$' "
+               "THEN ({column} ->> {name})::numeric END)")
+
+INDEX_PREFIX = 'attr_'
+
+
+class AttributeValue(Func):
+    """The value of the attribute ``name``, as text or as a number."""
+
+    def __init__(self, name, numeric=False):
+        self.name = name
+        self.numeric = numeric
+        output_field = DecimalField() if numeric else TextField()
+        super().__init__(F('attributes'), output_field=output_field)
+
+    def as_sql(self, compiler, connection):
+        column, params = compiler.compile(self.source_expressions[0])
+        template = NUMERIC_SQL if self.numeric else TEXT_SQL
+        sql = template.format(column=column, name='%s')
+        return sql, params + [self.name] * sql.count('%s')
+
+
+def parse_params(params):
+    """Returns ``(param, name, lookup, value)`` for each attribute filter
+    in the query parameters ``params``."""
+    filters = []
+    for param, value in params.items():
+        if not param.startswith(PARAM_PREFIX):
+            continue
+        name = param[len(PARAM_PREFIX):]
+        lookup = 'exact'
+        if '__' in name:
+            prefix, suffix = name.rsplit('__', 1)
+            if suffix in LOOKUPS:
+                name, lookup = prefix, suffix
+        filters.append((param, name, lookup, value))
+    return filters
+
+
+def json_values(attr, value, param):
+    """Returns the JSON values that an attribute equal to the query
+    parameter ``value`` can be stored as. Submitted and imported answers
+    are stored as strings, answers given through the API with their JSON
+    type."""
+    if attr.type == 'integer':
+        try:
+            return [value, int(value)]
+        except ValueError:
+            raise ValidationError({param: _("Expected an integer.")})
+    if attr.type == 'decimal':
+        try:
+            return [value, float(Decimal(value))]
+        except InvalidOperation:
+            raise ValidationError({param: _("Expected a number.")})
+    if attr.type == 'boolean' and value.lower() in ('true', 'false'):
+        return [value, value.lower() == 'true']
+    if attr.type == 'select_multiple':
+        return [[value], value]
+    return [value]
+
+
+def range_value(attr, value, param):
+    if attr.type in NUMERIC_TYPES:
+        try:
+            return AttributeValue(attr.name, numeric=True), Decimal(value)
+        except InvalidOperation:
+            raise ValidationError({param: _("Expected a number.")})
+    if attr.type in DATE_TYPES:
+        if parse_date(value) is None and parse_datetime(value) is None:
+            raise ValidationError({param: _("Expected a date.")})
+        return AttributeValue(attr.name), value
+    raise ValidationError({param: _(
+        "Range filters only apply to numbers and dates.")})
+
+
+def filter_attributes(queryset, project, params):
+    """Filters ``queryset``, a queryset of objects of ``project``, by the
+    attribute filters in the query parameters ``params``. The attributes
+    are looked up in the attribute schema of the project."""
+    filters = parse_params(params)
+    if not filters:
+        return queryset
+
+    opts = queryset.model._meta
+    attrs = get_schema(project).get(
+        '{}.{}'.format(opts.app_label, opts.model_name))
+    for i, (param, name, lookup, value) in enumerate(filters):
+        attr = attrs.get(name)
+        if attr is None:
+            raise ValidationError({param: _("Unknown attribute.")})
+
+        if lookup in RANGE_LOOKUPS:
+            expression, value = range_value(attr, value, param)
+            alias = 'attribute_filter_{}'.format(i)
+            queryset = queryset.annotate(**{alias: expression}).filter(
+                **{'{}__{}'.format(alias, lookup): value})
+            continue
+
+        if lookup == 'contains' and attr.type != 'select_multiple':
+            raise ValidationError({param: _(
+                "Only select_multiple attributes contain values.")})
+        values = value.split(',') if lookup == 'in' else [value]
+        condition = Q()
+        for v in values:
+            for json_value in json_values(attr, v, param):
+                condition |= Q(attributes__contains={name: json_value})
+        queryset = queryset.filter(condition)
+    return queryset
+
+
+class AttributeFilter(BaseFilterBackend):
+    """Filters the objects of a project by the ``attributes.<name>``
+    query parameters."""
+
+    def filter_queryset(self, request, queryset, view):
+        return filter_attributes(
+            queryset, view.get_project(), request.query_params)
+
+
+def index_prefix(project):
+    """Returns the prefix of the names of the attribute indexes of
+    ``project``. Postgres limits names to 63 characters, so names are
+    made of hashes."""
+    return '{}{}_'.format(
+        INDEX_PREFIX,
+        hashlib.md5(project.id.encode('utf-8')).hexdigest()[:8])
+
+
+def index_name(project, table, name, numeric):
+    attr_hash = hashlib.md5('{}|{}|{}'.format(
+        table, name, numeric).encode('utf-8')).hexdigest()
+    return index_prefix(project) + attr_hash[:16]
+
+
+def get_attribute_tables():
+    tables = []
+    for group in settings.ATTRIBUTE_GROUPS.values():
+        model = apps.get_model(group['app_label'], group['model'])
+        key = '{}.{}'.format(group['app_label'], group['model'])
+        tables.append((key, model._meta.db_table))
+    return tables
+
+
+def get_attribute_indexes(project):
+    """Returns the name, SQL and parameters of the expression indexes
+    that range filters on the attributes of ``project`` need."""
+    schema = get_schema(project)
+    indexes = []
+    for key, table in get_attribute_tables():
+        for attr in schema.get(key).values():
+            if attr.type not in NUMERIC_TYPES + DATE_TYPES:
+                continue
+            numeric = attr.type in NUMERIC_TYPES
+            template = NUMERIC_SQL if numeric else TEXT_SQL
+            expression = template.format(column='attributes', name='%s')
+            name = index_name(project, table, attr.name, numeric)
+            sql = 'CREATE INDEX {} ON {} ({}) WHERE project_id = %s'.format(
+                connection.ops.quote_name(name),
+                connection.ops.quote_name(table), expression)
+            params = [attr.name] * expression.count('%s') + [project.id]
+            indexes.append((name, sql, params))
+    return indexes
+
+
+def create_attribute_indexes(project, drop=True):
+    """Creates the missing expression indexes for range filters on the
+    attributes of ``project`` and returns their names. With ``drop``,
+    the indexes of attributes that are not in the schema of the project
+    any more are dropped."""
+    indexes = get_attribute_indexes(project)
+    tables = tuple(table for key, table in get_attribute_tables())
+    prefix = index_prefix(project)
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT indexname FROM pg_indexes "
+                       "WHERE tablename IN %s", [tables])
+        existing = {row[0] for row in cursor.fetchall()
+                    if row[0].startswith(prefix)}
+
+        created = []
+        for name, sql, params in indexes:
+            if name not in existing:
+                cursor.execute(sql, params)
+                created.append(name)
+        if drop:
+            wanted = {name for name, sql, params in indexes}
+            for name in existing - wanted:
+                cursor.execute('DROP INDEX {}'.format(
+                    connection.ops.quote_name(name)))
+    return created
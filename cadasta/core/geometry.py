@@ -0,0 +1,108 @@
+import math
+
+from django.contrib.gis.geos import (GeometryCollection, LinearRing, Point,
+                                     Polygon)
+
+# Largest number of vertices of the parts made by ``subdivide``
+SUBDIVIDE_MAX_VERTICES = 256
+
+
+def longitude_offset(geometry):
+    """Returns the multiple of 360 degrees that moves a geometry lying
+    entirely east of 180 or west of -180 degrees longitude back into the
+    -180..180 range, or 0 if the geometry is within or crosses that
+    range."""
+    if geometry is None or geometry.empty:
+        return 0
+    xmin, _, xmax, _ = geometry.extent
+    if xmin > 180:
+        return -360 * math.ceil((xmin - 180) / 360)
+    if xmax < -180:
+        return 360 * math.ceil((-180 - xmax) / 360)
+    return 0
+
+
+def _shift_coords(coords, offset):
+    return [(c[0] + offset,) + tuple(c[1:]) for c in coords]
+
+
+def shift_longitudes(geometry, offset):
+    """Returns a copy of the geometry with ``offset`` added to the
+    longitude of every coordinate, keeping all parts and holes of
+    multi-part geometries and polygons."""
+    srid = geometry.srid
+    if isinstance(geometry, GeometryCollection):
+        parts = [shift_longitudes(part, offset) for part in geometry]
+        return type(geometry)(*parts, srid=srid)
+    if isinstance(geometry, Polygon):
+        rings = [LinearRing(_shift_coords(ring.coords, offset))
+                 for ring in geometry]
+        return Polygon(*rings, srid=srid)
+    if isinstance(geometry, Point):
+        return Point(_shift_coords([geometry.coords], offset)[0], srid=srid)
+    return type(geometry)(_shift_coords(geometry.coords, offset), srid=srid)
+
+
+def normalize_longitudes(geometry):
+    """Moves a geometry that lies entirely outside of the -180..180
+    longitude range (e.g. drawn on a map that was panned across the
+    antimeridian) back into it. Returns the geometry unchanged if it is
+    already in range."""
+    offset = longitude_offset(geometry)
+    if offset == 0:
+        return geometry
+    return shift_longitudes(geometry, offset)
+
+
+def normalize_longitudes_sql(column):
+    """Returns an SQL expression for the set-based equivalent of
+    ``normalize_longitudes`` applied to the PostGIS geometry ``column``,
+    and a condition that selects the rows it changes."""
+    expression = (
+        'ST_Translate({c}, CASE WHEN ST_XMin({c}) > 180 '
+        'THEN -360 * ceil((ST_XMin({c}) - 180) / 360) '
+        'ELSE 360 * ceil((-180 - ST_XMax({c})) / 360) END, 0)'
+    ).format(c=column)
+    condition = '(ST_XMin({c}) > 180 OR ST_XMax({c}) < -180)'.format(
+        c=column)
+    return expression, condition
+
+
+def _polygons(geometry):
+    if isinstance(geometry, Polygon):
+        return [] if geometry.empty else [geometry]
+    if isinstance(geometry, GeometryCollection):
+        return [p for part in geometry for p in _polygons(part)]
+    return []
+
+
+def subdivide(geometry, max_vertices=SUBDIVIDE_MAX_VERTICES):
+    """Splits the polygons of ``geometry`` into polygons with at most
+    ``max_vertices`` vertices each, which together cover the same area.
+    Polygons that are too large are cut in half across their longer side
+    until the parts are small enough, which is what PostGIS 2.2's
+    ``ST_Subdivide`` does. Small parts have small bounding boxes, so a
+    spatial index finds the parts near a point much more precisely than
+    the polygons they were cut from, and testing a point against a part
+    is cheap."""
+    parts = []
+    pending = _polygons(geometry)
+    while pending:
+        polygon = pending.pop()
+        if polygon.num_coords <= max_vertices:
+            polygon.srid = geometry.srid
+            parts.append(polygon)
+            continue
+
+        xmin, ymin, xmax, ymax = polygon.extent
+        if xmax - xmin >= ymax - ymin:
+            middle = (xmin + xmax) / 2
+            halves = ((xmin, ymin, middle, ymax), (middle, ymin, xmax, ymax))
+        else:
+            middle = (ymin + ymax) / 2
+            halves = ((xmin, ymin, xmax, middle), (xmin, middle, xmax, ymax))
+        for bbox in halves:
+            half = Polygon.from_bbox(bbox)
+            half.srid = polygon.srid
+            pending.extend(_polygons(polygon.intersection(half)))
+    return parts
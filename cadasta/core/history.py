@@ -0,0 +1,164 @@
+"""Helpers for writing django-simple-history records.
+
+Objects saved without going through ``Model.save`` (e.g. with
+``bulk_create``) never trigger the ``post_save`` handler installed by
+``HistoricalRecords``; ``bulk_create_history`` writes their records in
+bulk instead.
+
+Objects that are saved one by one write a historical record with a
+second INSERT for every save. ``buffered_history`` collects the records
+of all saves, deletes and ``bulk_create_history`` calls made inside it
+and writes them with one bulk INSERT per historical model when the block
+ends, in the same transaction. Models must use the ``HistoricalRecords``
+defined here for their saves to be buffered.
+
+"""
+
+import logging
+import math
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.utils.timezone import now
+from simple_history import models as history_models
+
+logger = logging.getLogger('core.history')
+
+# Number of buffered records after which they are written even though
+# the block has not ended, to bound the memory used by large imports
+MAX_BUFFERED_RECORDS = 5000
+# Number of records written per INSERT statement
+BATCH_SIZE = 1000
+
+_state = threading.local()
+
+
+def get_history_model(model):
+    """Return the historical model generated for ``model``."""
+    manager_name = model._meta.simple_history_manager_attribute
+    return getattr(model, manager_name).model
+
+
+def get_history_user(instance):
+    """Mirrors ``HistoricalRecords.get_history_user``: the modifying user
+    is taken from the instance or from the request exposed by
+    ``HistoryRequestMiddleware``."""
+    try:
+        return instance._history_user
+    except AttributeError:
+        try:
+            if HistoricalRecords.thread.request.user.is_authenticated():
+                return HistoricalRecords.thread.request.user
+            return None
+        except AttributeError:
+            return None
+
+
+def make_historical_record(history_model, instance, history_type,
+                           history_date=None):
+    attrs = {}
+    for field in instance._meta.fields:
+        attrs[field.attname] = getattr(instance, field.attname)
+    return history_model(
+        history_date=getattr(instance, '_history_date', history_date or now()),
+        history_type=history_type,
+        history_user=get_history_user(instance),
+        **attrs
+    )
+
+
+class HistoryBuffer:
+    """Historical records waiting to be written, and counts of the
+    records and INSERT statements written so far."""
+
+    def __init__(self, max_records=MAX_BUFFERED_RECORDS):
+        self.max_records = max_records
+        self.records = 0
+        self.inserts = 0
+        self._pending = OrderedDict()
+        self._num_pending = 0
+
+    @property
+    def inserts_per_record(self):
+        """The number of INSERT statements written per historical record.
+        Without buffering, every save writes its record with its own
+        INSERT, so this is 1."""
+        if self.records == 0:
+            return 0
+        return self.inserts / self.records
+
+    def add(self, history_model, records):
+        self._pending.setdefault(history_model, []).extend(records)
+        self._num_pending += len(records)
+        if self._num_pending >= self.max_records:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered records."""
+        for history_model, records in self._pending.items():
+            history_model.objects.bulk_create(records, batch_size=BATCH_SIZE)
+            self.records += len(records)
+            self.inserts += math.ceil(len(records) / BATCH_SIZE)
+        self._pending.clear()
+        self._num_pending = 0
+
+
+def get_history_buffer():
+    """Returns the buffer of the innermost ``buffered_history`` block of
+    the current thread, or ``None``."""
+    return getattr(_state, 'buffer', None)
+
+
+@contextmanager
+def buffered_history(max_records=MAX_BUFFERED_RECORDS):
+    """Runs the block in a transaction and writes the historical records
+    of the objects saved or deleted in it in bulk when it ends. Records
+    are not written if the block raises an exception. Yields the
+    ``HistoryBuffer``, whose counts can be read after the block."""
+    previous = get_history_buffer()
+    buffer = HistoryBuffer(max_records)
+    with transaction.atomic():
+        _state.buffer = buffer
+        try:
+            yield buffer
+            buffer.flush()
+        finally:
+            _state.buffer = previous
+    logger.info('Wrote %d historical records with %d inserts',
+                buffer.records, buffer.inserts)
+
+
+class HistoricalRecords(history_models.HistoricalRecords):
+    """``HistoricalRecords`` that adds the record of a save or delete to
+    the active ``buffered_history`` block instead of writing it."""
+
+    def create_historical_record(self, instance, history_type):
+        buffer = get_history_buffer()
+        if buffer is None:
+            return super().create_historical_record(instance, history_type)
+        history_model = getattr(instance, self.manager_name).model
+        buffer.add(history_model, [
+            make_historical_record(history_model, instance, history_type)])
+
+
+def bulk_create_history(instances, history_type='+', batch_size=None):
+    """Creates the historical records for ``instances`` using a single
+    ``bulk_create`` call, or adds them to the active ``buffered_history``
+    block. All instances must be of the same model."""
+    if not instances:
+        return []
+
+    history_model = get_history_model(type(instances[0]))
+    history_date = now()
+    records = [
+        make_historical_record(history_model, instance, history_type,
+                               history_date=history_date)
+        for instance in instances
+    ]
+    buffer = get_history_buffer()
+    if buffer is not None:
+        buffer.add(history_model, records)
+        return records
+    return history_model.objects.bulk_create(records, batch_size=batch_size)
@@ -0,0 +1,131 @@
+import random
+import time
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from jsonattrs.models import (Attribute, AttributeType, Schema,
+                              create_attribute_types)
+
+from organization.models import Organization, Project
+from spatial.models import SpatialUnit
+from ...filters import create_attribute_indexes, filter_attributes
+from ...util import random_id
+
+LAND_USES = ['residential', 'commercial', 'agricultural', 'forest',
+             'industrial', 'public']
+CROPS = ['maize', 'beans', 'cassava', 'rice', 'coffee', 'tea']
+
+FILTERS = [
+    {'attributes.land_use': 'forest'},
+    {'attributes.land_use__in': 'industrial,public'},
+    {'attributes.crops__contains': 'coffee'},
+    {'attributes.area__gte': '9900'},
+    {'attributes.area__gte': '5000', 'attributes.area__lt': '5100'},
+]
+
+
+def make_schema(project):
+    create_attribute_types()
+    schema = Schema.objects.create(
+        content_type=ContentType.objects.get_for_model(SpatialUnit),
+        selectors=(project.organization.id, project.id))
+    types = {t.name: t for t in AttributeType.objects.all()}
+    Attribute.objects.create(
+        schema=schema, name='land_use', long_name='Land use', index=0,
+        attr_type=types['select_one'], choices=LAND_USES)
+    Attribute.objects.create(
+        schema=schema, name='crops', long_name='Crops', index=1,
+        attr_type=types['select_multiple'], choices=CROPS)
+    Attribute.objects.create(
+        schema=schema, name='area', long_name='Area', index=2,
+        attr_type=types['integer'])
+
+
+def make_locations(project, count):
+    """Writes ``count`` point locations with random attributes to
+    ``project``. Like submitted answers, the area is a string."""
+    rnd = random.Random(0)
+    batch_size = settings.IMPORT_BATCH_SIZE
+    for start in range(0, count, batch_size):
+        SpatialUnit.objects.bulk_create([
+            SpatialUnit(id=random_id(), project=project, type='PA',
+                        attributes={
+                            'land_use': rnd.choice(LAND_USES),
+                            'crops': rnd.sample(CROPS, rnd.randint(0, 3)),
+                            'area': str(rnd.randint(1, 10000)),
+                        },
+                        geometry=Point(rnd.uniform(-170, 170),
+                                       rnd.uniform(-60, 60), srid=4326))
+            for _ in range(min(batch_size, count - start))
+        ])
+
+
+class Command(BaseCommand):
+    help = """Times filtering a large location list by attributes with the
+    attribute filters of the API, compared to loading all locations, and
+    shows the query plans, which use the GIN and expression indexes of the
+    attributes. Nothing is kept in the database."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            dest='count',
+            default=80000,
+            help='Number of locations in the project'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            dest='repeat',
+            default=5,
+            help='Number of times each filter is run'
+        )
+
+    def timed(self, func, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = func()
+        return (time.perf_counter() - start) / repeat, result
+
+    def explain(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN ' + sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def handle(self, *args, **options):
+        count = options['count']
+        repeat = options['repeat']
+
+        with transaction.atomic():
+            org = Organization.objects.create(name='Benchmark')
+            project = Project.objects.create(name='Benchmark',
+                                             organization=org)
+            make_schema(project)
+            make_locations(project, count)
+            create_attribute_indexes(project)
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE {}'.format(SpatialUnit._meta.db_table))
+            queryset = project.spatial_units.all()
+
+            loading, loaded = self.timed(
+                lambda: len(list(queryset.values_list('id', 'attributes'))),
+                repeat)
+            self.stdout.write('{} locations, loaded in {:.2f}ms'.format(
+                loaded, loading * 1000))
+
+            for params in FILTERS:
+                filtered = filter_attributes(queryset, project, params)
+                database, found = self.timed(
+                    lambda: len(list(filtered.values_list('id'))), repeat)
+                self.stdout.write('\n{}: {} location(s) in {:.2f}ms'.format(
+                    ', '.join('{}={}'.format(*p) for p in params.items()),
+                    found, database * 1000))
+                for line in self.explain(filtered.values_list('id')):
+                    self.stdout.write('    ' + line)
+
+            transaction.set_rollback(True)
@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from organization.models import Organization, Project
+from party.models import Party
+from ...history import buffered_history
+
+
+class Command(BaseCommand):
+    help = """Compares creating parties one by one with their historical
+    records written on every save and buffered by buffered_history, and
+    reports the number of statements written per party. Nothing is kept in
+    the database."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--saves',
+            type=int,
+            dest='saves',
+            default=2000,
+            help='Number of parties to create'
+        )
+
+    def timed(self, func, count):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        inserts = sum(1 for q in queries if q['sql'].startswith('INSERT'))
+        return elapsed / count * 1e6, inserts / count
+
+    def write(self, label, microseconds, inserts):
+        self.stdout.write('{:<12} {:10.2f}us {:10.2f}'.format(
+            label, microseconds, inserts))
+
+    def handle(self, *args, **options):
+        saves = options['saves']
+
+        with transaction.atomic():
+            org = Organization.objects.create(name='Benchmark')
+            project = Project.objects.create(name='Benchmark',
+                                             organization=org)
+
+            def create():
+                for i in range(saves):
+                    Party.objects.create(project=project,
+                                         name='Party {}'.format(i),
+                                         type='IN', attributes={})
+
+            buffers = []
+
+            def create_buffered():
+                with buffered_history() as buffer:
+                    create()
+                buffers.append(buffer)
+
+            self.stdout.write('{} parties'.format(saves))
+            self.stdout.write('{:<12} {:>12} {:>10}'.format(
+                '', 'per party', 'inserts'))
+            self.write('unbuffered', *self.timed(create, saves))
+            self.write('buffered', *self.timed(create_buffered, saves))
+            self.stdout.write('history inserts per record: {:.4f}'.format(
+                buffers[0].inserts_per_record))
+
+            transaction.set_rollback(True)
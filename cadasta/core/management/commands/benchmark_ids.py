@@ -0,0 +1,84 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from organization.models import Organization, Project
+from spatial.models import SpatialUnit
+from ...util import ID_FIELD_LENGTH, byte_to_base32_chr, random_id, random_ids
+
+
+def randint_id():
+    """Generates an ID the way it was before ``IDAllocator``, with one
+    call to ``random.randint`` per character."""
+    rand_id = [random.randint(0, 0xFF) for i in range(ID_FIELD_LENGTH)]
+    return ''.join(map(byte_to_base32_chr, rand_id))
+
+
+class Command(BaseCommand):
+    help = """Compares generating IDs character by character to taking them
+    from the batches of the ID allocator, and creating locations with and
+    without looking up each new ID first. Nothing is kept in the
+    database."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            dest='count',
+            default=100000,
+            help='Number of IDs to generate'
+        )
+        parser.add_argument(
+            '--saves',
+            type=int,
+            dest='saves',
+            default=1000,
+            help='Number of locations to create'
+        )
+
+    def timed(self, func, count):
+        start = time.perf_counter()
+        func()
+        return (time.perf_counter() - start) / count * 1e6
+
+    def write(self, label, microseconds):
+        self.stdout.write('{:<36} {:10.2f}us'.format(label, microseconds))
+
+    def handle(self, *args, **options):
+        count = options['count']
+        saves = options['saves']
+
+        self.stdout.write('{} IDs'.format(count))
+        self.write('random.randint per character', self.timed(
+            lambda: [randint_id() for _ in range(count)], count))
+        self.write('random_id()', self.timed(
+            lambda: [random_id() for _ in range(count)], count))
+        self.write('random_ids({})'.format(count), self.timed(
+            lambda: random_ids(count), count))
+
+        with transaction.atomic():
+            org = Organization.objects.create(name='Benchmark')
+            project = Project.objects.create(name='Benchmark',
+                                             organization=org)
+
+            def lookup_and_save():
+                for _ in range(saves):
+                    unit = SpatialUnit(project=project, type='PA',
+                                       attributes={})
+                    unit.id = randint_id()
+                    SpatialUnit.objects.filter(pk=unit.id).exists()
+                    unit.save(force_insert=True)
+
+            def save():
+                for _ in range(saves):
+                    SpatialUnit(project=project, type='PA',
+                                attributes={}).save()
+
+            self.stdout.write('\n{} locations'.format(saves))
+            self.write('lookup, then insert', self.timed(
+                lookup_and_save, saves))
+            self.write('insert', self.timed(save, saves))
+
+            transaction.set_rollback(True)
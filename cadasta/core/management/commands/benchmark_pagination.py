@@ -0,0 +1,121 @@
+import random
+import time
+
+from django.conf import settings
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from organization.models import Organization, Project
+from spatial.choices import TYPE_CHOICES
+from spatial.models import SpatialUnit
+from ...pagination import KeysetPagination
+from ...util import random_id
+
+
+def make_locations(project, count):
+    """Writes ``count`` point locations of random types to ``project``."""
+    rnd = random.Random(0)
+    types = [t for t, _ in TYPE_CHOICES]
+    batch_size = settings.IMPORT_BATCH_SIZE
+    for start in range(0, count, batch_size):
+        SpatialUnit.objects.bulk_create([
+            SpatialUnit(id=random_id(), project=project,
+                        type=rnd.choice(types), attributes={},
+                        geometry=Point(rnd.uniform(-170, 170),
+                                       rnd.uniform(-60, 60), srid=4326))
+            for _ in range(min(batch_size, count - start))
+        ])
+
+
+class Command(BaseCommand):
+    help = """Compares fetching pages of a large location list with the
+    keyset pagination of the API to fetching them with OFFSET, at several
+    depths of the list. Nothing is kept in the database."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            dest='count',
+            default=100000,
+            help='Number of locations in the project'
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            dest='page_size',
+            default=100,
+            help='Number of locations on each page'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            dest='repeat',
+            default=5,
+            help='Number of times each page is fetched'
+        )
+
+    def timed(self, func, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) / repeat
+
+    def keyset_page(self, queryset, page_size, after):
+        """Returns a function fetching the page that follows ``after``
+        with ``KeysetPagination``."""
+        paginator = KeysetPagination()
+        paginator.page_size = page_size
+        paginator.base_url = '/'
+        paginator.keys = paginator.get_keys(None, queryset, None)
+        url = '/'
+        if after is not None:
+            url = paginator.encode_cursor(
+                paginator.get_position(after), reverse=False)
+        request = Request(APIRequestFactory().get(url))
+
+        def fetch():
+            paginator.paginate_queryset(queryset, request)
+        return fetch
+
+    def offset_page(self, queryset, page_size, offset):
+        queryset = queryset.order_by('type', 'id')
+
+        def fetch():
+            list(queryset[offset:offset + page_size])
+        return fetch
+
+    def handle(self, *args, **options):
+        count = options['count']
+        page_size = options['page_size']
+        repeat = options['repeat']
+
+        with transaction.atomic():
+            org = Organization.objects.create(name='Benchmark')
+            project = Project.objects.create(name='Benchmark',
+                                             organization=org)
+            make_locations(project, count)
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE {}'.format(SpatialUnit._meta.db_table))
+            queryset = project.spatial_units.all()
+            self.stdout.write('{} locations, {} per page'.format(
+                count, page_size))
+
+            self.stdout.write('{:>10} {:>10} {:>10}'.format(
+                'offset', 'keyset', 'OFFSET'))
+            for depth in (0, 0.1, 0.5, 0.9, 1):
+                offset = max(min(int(count * depth), count - page_size), 0)
+                after = None
+                if offset > 0:
+                    after = queryset.order_by('type', 'id')[offset - 1]
+                keyset = self.timed(
+                    self.keyset_page(queryset, page_size, after), repeat)
+                plain = self.timed(
+                    self.offset_page(queryset, page_size, offset), repeat)
+                self.stdout.write('{:>10} {:9.2f}ms {:9.2f}ms'.format(
+                    offset, keyset * 1000, plain * 1000))
+
+            transaction.set_rollback(True)
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from organization.models import Project
+from ...filters import create_attribute_indexes
+
+
+class Command(BaseCommand):
+    help = """Creates the indexes for range filters on the numeric and
+    date attributes of a project, or of all projects, and drops the
+    indexes of attributes that are not in their questionnaires any
+    more."""
+
+    def add_arguments(self, parser):
+        parser.add_argument('organization', nargs='?',
+                            help='Organization slug')
+        parser.add_argument('project', nargs='?', help='Project slug')
+
+    def handle(self, *args, **options):
+        projects = Project.objects.select_related('organization')
+        if options['organization']:
+            projects = projects.filter(
+                organization__slug=options['organization'])
+            if options['project']:
+                projects = projects.filter(slug=options['project'])
+            if not projects.exists():
+                raise CommandError('Project not found.')
+
+        for project in projects:
+            created = create_attribute_indexes(project)
+            self.stdout.write('{}/{}: created {} index(es).'.format(
+                project.organization.slug, project.slug, len(created)))
@@ -0,0 +1,55 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.models import BackgroundJob
+
+
+def get_job_models():
+    return [model for model in apps.get_models()
+            if issubclass(model, BackgroundJob)]
+
+
+def process_next_job():
+    """Claims and executes one queued job of any job model. Returns the
+    executed job or ``None`` if all queues are empty."""
+    for model in get_job_models():
+        job = model.claim_next()
+        if job is not None:
+            job.execute()
+            return job
+    return None
+
+
+class Command(BaseCommand):
+    help = "Process queued background jobs (e.g. project exports)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            dest='once',
+            default=False,
+            help='Process all queued jobs and exit'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            dest='interval',
+            default=2.0,
+            help='Seconds to wait before polling an empty queue again'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            job = process_next_job()
+            if job is not None:
+                self.stdout.write('{} {}: {}'.format(
+                    type(job).__name__, job.id, job.get_status_display()))
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
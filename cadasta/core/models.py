@@ -1,7 +1,12 @@
 import itertools
 import math
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
 from core.util import slugify
-from django.db import models
+from django.db import IntegrityError, models, router, transaction
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
 
 from .util import random_id, ID_FIELD_LENGTH
 
@@ -13,19 +18,28 @@ class RandomIDModel(models.Model):
         abstract = True
 
     def save(self, *args, **kwargs):
-        if not self.id:
-            kwargs['force_insert'] = True
+        if self.id:
+            return super(RandomIDModel, self).save(*args, **kwargs)
 
-            ok = False
-            while not ok:
-                self.id = random_id()
-
-                if not type(self).objects.filter(pk=self.id).exists():
-                    ok = True
-                    super(RandomIDModel, self).save(*args, **kwargs)
-
-        else:
-            super(RandomIDModel, self).save(*args, **kwargs)
+        # New IDs are not looked up before they are inserted: a collision
+        # of two random IDs is unlikely enough that the primary key
+        # constraint can catch it. Outside of a transaction, the insert
+        # is retried with another ID. Within one, retrying would need a
+        # savepoint around every insert, which costs more than the lookup
+        # it replaces, so the IntegrityError is raised.
+        kwargs['force_insert'] = True
+        using = kwargs.get('using') or router.db_for_write(
+            type(self), instance=self)
+        while True:
+            self.id = random_id()
+            try:
+                return super(RandomIDModel, self).save(*args, **kwargs)
+            except IntegrityError:
+                if (transaction.get_connection(using).in_atomic_block or
+                        not type(self).objects.using(using).filter(
+                            pk=self.id).exists()):
+                    self.id = None
+                    raise
 
 
 class SlugModel:
@@ -53,3 +67,147 @@ class SlugModel:
         self.__original_slug = self.slug
 
         return super().save(*args, **kwargs)
+
+
+_loading = threading.local()
+
+
+@contextmanager
+def known_project(project):
+    """Objects of ``project`` loaded from the database inside the block
+    get ``project`` as their project instead of looking it up."""
+    previous = getattr(_loading, 'project', None)
+    _loading.project = project
+    try:
+        yield project
+    finally:
+        _loading.project = previous
+
+
+class ProjectObjectModel:
+    """Lets a ``known_project`` block hand its project to the objects it
+    loads.
+
+    jsonattrs sets up the attributes of an object on ``post_init``, from
+    schemas selected by its project and organization. ``select_related``
+    attaches related objects only after ``post_init``, so every object
+    would otherwise look its project and organization up on its own.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        project = getattr(_loading, 'project', None)
+        if project is None or 'project_id' not in field_names:
+            return super().from_db(db, field_names, values)
+        kwargs = dict(zip(field_names, values))
+        if kwargs['project_id'] != project.pk:
+            return super().from_db(db, field_names, values)
+        del kwargs['project_id']
+        new = cls(project=project, **kwargs)
+        new._state.adding = False
+        new._state.db = db
+        return new
+
+
+class BackgroundJob(RandomIDModel):
+    """Base class for jobs that are queued in the database and processed
+    outside of the request by the ``runworker`` management command.
+    Subclasses implement ``run``, which may report its progress through
+    ``set_progress``.
+
+    Claiming a job and reporting its progress update its heartbeat. A
+    running job whose heartbeat is older than ``HEARTBEAT_TIMEOUT`` is
+    assumed to have been interrupted, e.g. because its worker was killed,
+    and is queued again, unless it has been started ``MAX_ATTEMPTS`` times
+    already, in which case it fails. Jobs should report their progress
+    more often than ``HEARTBEAT_TIMEOUT``.
+
+    """
+
+    HEARTBEAT_TIMEOUT = timedelta(minutes=30)
+    MAX_ATTEMPTS = 3
+
+    QUEUED = 'Q'
+    RUNNING = 'R'
+    DONE = 'D'
+    FAILED = 'F'
+    STATUS_CHOICES = ((QUEUED, _('Queued')),
+                      (RUNNING, _('Running')),
+                      (DONE, _('Done')),
+                      (FAILED, _('Failed')))
+
+    status = models.CharField(max_length=1, choices=STATUS_CHOICES,
+                              default=QUEUED, db_index=True)
+    progress = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    created_date = models.DateTimeField(auto_now_add=True)
+    started_date = models.DateTimeField(null=True, blank=True)
+    finished_date = models.DateTimeField(null=True, blank=True)
+    heartbeat_date = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+        ordering = ('created_date',)
+
+    @property
+    def is_finished(self):
+        return self.status in (self.DONE, self.FAILED)
+
+    @classmethod
+    def requeue_stale(cls):
+        """Queues the running jobs whose heartbeat is older than
+        ``HEARTBEAT_TIMEOUT`` again and returns their number. Those that
+        have been started ``MAX_ATTEMPTS`` times fail instead."""
+        now = timezone.now()
+        stale = cls.objects.filter(
+            status=cls.RUNNING,
+            heartbeat_date__lt=now - cls.HEARTBEAT_TIMEOUT)
+        stale.filter(attempts__gte=cls.MAX_ATTEMPTS).update(
+            status=cls.FAILED, finished_date=now,
+            error='Interrupted {} times.'.format(cls.MAX_ATTEMPTS))
+        return stale.filter(attempts__lt=cls.MAX_ATTEMPTS).update(
+            status=cls.QUEUED, started_date=None, heartbeat_date=None,
+            progress=0)
+
+    @classmethod
+    def claim_next(cls):
+        """Returns the oldest queued job after marking it as running, or
+        ``None`` if the queue is empty. A job is only claimed if its status
+        is still queued when it is updated, so several workers can share
+        one queue. Stale jobs are queued again first."""
+        cls.requeue_stale()
+        queued = cls.objects.filter(status=cls.QUEUED).order_by(
+            'created_date').values_list('id', flat=True)
+        for job_id in queued[:10]:
+            now = timezone.now()
+            claimed = cls.objects.filter(id=job_id, status=cls.QUEUED).update(
+                status=cls.RUNNING, started_date=now, heartbeat_date=now,
+                attempts=models.F('attempts') + 1)
+            if claimed:
+                return cls.objects.get(id=job_id)
+        return None
+
+    def set_progress(self, progress):
+        self.progress = progress
+        self.heartbeat_date = timezone.now()
+        type(self).objects.filter(id=self.id).update(
+            progress=progress, heartbeat_date=self.heartbeat_date)
+
+    def run(self):
+        raise NotImplementedError(
+            "Your %s class has not defined a run() method."
+            % self.__class__.__name__
+        )
+
+    def execute(self):
+        try:
+            self.run()
+        except Exception as e:
+            self.status = self.FAILED
+            self.error = str(e)
+        else:
+            self.status = self.DONE
+            self.progress = 100
+        self.finished_date = timezone.now()
+        self.save()
@@ -0,0 +1,249 @@
+"""Keyset pagination for the API list endpoints.
+
+DRF's ``CursorPagination`` orders by a single field and falls back to an
+``OFFSET`` to step over rows that share a value, and it requires an
+ordering on every view. ``KeysetPagination`` orders by the requested (or
+default) ordering followed by the primary key, so that every row has a
+unique position. The cursor stores the position of the first or last row
+of a page and the following page is selected by comparing against that
+position, which costs the same on the thousandth page as on the first.
+
+"""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# Fields whose values can be compared in the database and round-trip
+# through the cursor as strings. Geometries and JSON attributes cannot be
+# used as keys; orderings on them are ignored.
+KEY_FIELD_TYPES = {
+    'AutoField', 'BigIntegerField', 'BooleanField', 'CharField',
+    'DateField', 'DateTimeField', 'DecimalField', 'FloatField',
+    'ForeignKey', 'IntegerField', 'PositiveIntegerField',
+    'PositiveSmallIntegerField', 'SlugField', 'SmallIntegerField',
+    'TextField', 'UUIDField',
+}
+
+
+class Key:
+    """One column of the ordering. Descending keys, like PostgreSQL,
+    return ``NULL`` values first."""
+
+    def __init__(self, field, descending=False):
+        self.field = field
+        self.name = field.attname
+        self.descending = descending
+
+    def reversed(self):
+        return Key(self.field, not self.descending)
+
+    def order_by(self):
+        return ('-' if self.descending else '') + self.name
+
+    def to_python(self, value):
+        if value is None:
+            return None
+        return self.field.to_python(value)
+
+    def equal(self, value):
+        if value is None:
+            return Q(**{self.name + '__isnull': True})
+        return Q(**{self.name: value})
+
+    def after(self, value):
+        """Returns a ``Q`` object matching the rows that follow ``value``
+        in the direction of this key, or ``None`` if no row can follow."""
+        if self.descending:
+            if value is None:
+                return Q(**{self.name + '__isnull': False})
+            return Q(**{self.name + '__lt': value})
+
+        if value is None:
+            return None
+        after = Q(**{self.name + '__gt': value})
+        if self.field.null:
+            after |= Q(**{self.name + '__isnull': True})
+        return after
+
+    def bound(self, value):
+        """Returns a ``Q`` object that is implied by ``after`` but only
+        compares against ``value``, so that the database can use it as the
+        start of an index range scan."""
+        if value is None:
+            return Q() if self.descending else self.equal(value)
+        if self.descending:
+            return Q(**{self.name + '__lte': value})
+        bound = Q(**{self.name + '__gte': value})
+        if self.field.null:
+            bound |= Q(**{self.name + '__isnull': True})
+        return bound
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination keyed on the ordering of the list plus the
+    primary key.
+
+    The ordering is taken from the view's ``OrderingFilter``, the view's
+    ``ordering`` or the model's default ordering. ``page_size`` sets the
+    number of results per page, up to ``max_page_size``.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    ordering = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.keys = self.get_keys(request, queryset, view)
+        self.reverse, position = self.decode_cursor(request)
+
+        keys = self.keys
+        if self.reverse:
+            keys = [key.reversed() for key in keys]
+        queryset = queryset.order_by(*[key.order_by() for key in keys])
+        if position is not None:
+            queryset = queryset.filter(
+                keys[0].bound(position[0]),
+                self.filter_after(keys, position))
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+
+        if self.reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.position = position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def filter_after(self, keys, position):
+        """Returns a ``Q`` object matching the rows that follow
+        ``position``: ``(a > x) OR (a = x AND b > y) OR ...``."""
+        after = None
+        equal = Q()
+        for key, value in zip(keys, position):
+            key_after = key.after(value)
+            if key_after is not None:
+                key_after = equal & key_after
+                after = key_after if after is None else after | key_after
+            equal &= key.equal(value)
+        return after
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_keys(self, request, queryset, view):
+        """Returns the ordering of the list as a list of keys, ending
+        with the primary key."""
+        ordering = None
+        for backend in getattr(view, 'filter_backends', ()):
+            if hasattr(backend, 'get_ordering'):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        if not ordering:
+            ordering = (self.ordering or queryset.query.order_by or
+                        queryset.model._meta.ordering)
+
+        opts = queryset.model._meta
+        keys = []
+        for name in ordering:
+            descending = name.startswith('-')
+            name = name.lstrip('-')
+            try:
+                field = opts.pk if name == 'pk' else opts.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if (not field.concrete or
+                    field.get_internal_type() not in KEY_FIELD_TYPES or
+                    any(key.name == field.attname for key in keys)):
+                continue
+            keys.append(Key(field, descending))
+            if field.primary_key:
+                return keys
+
+        keys.append(Key(opts.pk))
+        return keys
+
+    def decode_cursor(self, request):
+        """Returns whether the cursor points backwards, and the position
+        it points at."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return False, None
+
+        try:
+            cursor = json.loads(
+                urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            position = cursor['p']
+            if len(position) != len(self.keys):
+                raise ValueError
+            position = [key.to_python(value)
+                        for key, value in zip(self.keys, position)]
+            return bool(cursor.get('r')), position
+        except (KeyError, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position, reverse):
+        cursor = {'p': [None if value is None else str(value)
+                        for value in position]}
+        if reverse:
+            cursor['r'] = 1
+        encoded = urlsafe_b64encode(
+            json.dumps(cursor).encode('utf-8')).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded)
+
+    def get_position(self, obj):
+        return [getattr(obj, key.name) for key in self.keys]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        # The page is only empty if its rows were removed in the meantime
+        position = (self.get_position(self.page[-1]) if self.page
+                    else self.position)
+        return self.encode_cursor(position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = (self.get_position(self.page[0]) if self.page
+                    else self.position)
+        return self.encode_cursor(position, reverse=True)
+
+
+class GeoJsonKeysetPagination(KeysetPagination):
+    """Keeps paginated GeoJSON lists valid feature collections by
+    adding the links next to the features."""
+
+    def get_paginated_response(self, data):
+        return Response({
+            'type': 'FeatureCollection',
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'features': data['features'],
+        })
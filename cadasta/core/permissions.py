@@ -0,0 +1,139 @@
+"""Per-user cache of the roles the views check on every page render.
+
+Whether a user is a superuser, administers an organization or manages a
+project is needed to render almost every organization and project page.
+Looking it up means querying the superuser ``Role``, the user's assigned
+policies and the organization and project roles. The answers are cached
+per user and the cache entry is removed whenever the user's roles or
+policies change. Removing it is only seen by other processes because the
+cache configured in ``CACHES`` is shared by all of them.
+
+"""
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from tutelary.models import PermissionSet, Role
+
+# Roles are invalidated explicitly; the timeout only limits how long a
+# change made outside of the signal handlers below can go unnoticed.
+CACHE_TIMEOUT = 60 * 15
+CACHE_KEY = 'permissions:user:{}'
+
+
+def _cache_key(user_id):
+    return CACHE_KEY.format(user_id)
+
+
+def _load_user_roles(user):
+    OrganizationRole = apps.get_model('organization', 'OrganizationRole')
+    ProjectRole = apps.get_model('organization', 'ProjectRole')
+
+    su_role = Role.objects.filter(name='superuser').first()
+    org_roles = OrganizationRole.objects.filter(
+        user=user).values_list('organization_id', 'admin')
+    project_roles = ProjectRole.objects.filter(
+        user=user).values_list('project_id', 'role')
+
+    return {
+        'superuser': (su_role is not None and
+                      su_role in user.assigned_policies()),
+        'organizations': {org: admin for org, admin in org_roles},
+        'projects': dict(project_roles),
+    }
+
+
+def get_user_roles(user):
+    """Returns a dict describing the roles of ``user``:
+
+    - ``superuser``: whether the superuser role is assigned to the user,
+    - ``organizations``: maps the IDs of the user's organizations to
+      whether the user is an administrator of the organization,
+    - ``projects``: maps the IDs of the user's projects to the user's
+      role in the project.
+
+    Anonymous users have no roles.
+    """
+    if not user.is_authenticated():
+        return {'superuser': False, 'organizations': {}, 'projects': {}}
+
+    key = _cache_key(user.pk)
+    roles = cache.get(key)
+    if roles is None:
+        roles = _load_user_roles(user)
+        cache.set(key, roles, CACHE_TIMEOUT)
+    return roles
+
+
+def invalidate_user_roles(user_id):
+    """Removes the cached roles of the user with the ID ``user_id``."""
+    cache.delete(_cache_key(user_id))
+
+
+def is_superuser(user):
+    return get_user_roles(user)['superuser']
+
+
+def is_org_admin(user, organization):
+    """Returns whether ``user`` is a superuser or an administrator of
+    ``organization``."""
+    roles = get_user_roles(user)
+    return (roles['superuser'] or
+            roles['organizations'].get(organization.pk, False))
+
+
+def is_project_admin(user, project):
+    """Returns whether ``user`` is a superuser, an administrator of the
+    project's organization or a manager of ``project``."""
+    roles = get_user_roles(user)
+    return (roles['superuser'] or
+            roles['organizations'].get(project.organization_id, False) or
+            roles['projects'].get(project.pk) == 'PM')
+
+
+def visible_projects(user, archived=True):
+    """Returns a queryset of the projects listed for ``user``: all
+    projects for superusers, and otherwise the public projects and the
+    projects of the user's organizations that are not archived. With
+    ``archived``, the archived projects of the organizations the user
+    administers are included too. Memberships are looked up in the same
+    query rather than in the cached roles, so the list never includes
+    projects of an organization the user has just left."""
+    Project = apps.get_model('organization', 'Project')
+    OrganizationRole = apps.get_model('organization', 'OrganizationRole')
+
+    visible = Q(access='public', archived=False)
+    if not user.is_authenticated():
+        return Project.objects.filter(visible)
+    if is_superuser(user):
+        return Project.objects.all()
+
+    memberships = OrganizationRole.objects.filter(user=user)
+    visible |= Q(organization__in=memberships.values('organization_id'),
+                 archived=False)
+    if archived:
+        visible |= Q(organization__in=memberships.filter(
+            admin=True).values('organization_id'))
+    return Project.objects.filter(visible)
+
+
+@receiver(m2m_changed, sender=PermissionSet.users.through)
+def invalidate_assigned_policies(sender, instance, action, reverse, pk_set,
+                                 **kwargs):
+    """tutelary assigns policies to a user by moving the user to another
+    permission set, so this covers all changes of a user's policies,
+    including the superuser role."""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if reverse:
+        invalidate_user_roles(instance.pk)
+    elif action == 'pre_clear':
+        for user_id in instance.users.values_list('pk', flat=True):
+            invalidate_user_roles(user_id)
+    else:
+        for user_id in pk_set:
+            invalidate_user_roles(user_id)
@@ -44,6 +44,26 @@ function add_map_controls(map) {
   return map
 }
 
+function removeFeature(layerGroup, layer) {
+  layerGroup.removeLayer(layer);
+  if (layer.marker) {
+    layerGroup.removeLayer(layer.marker);
+  }
+  // Stop L.Deflate from adding the layer back when the map is zoomed.
+  layer.zoomThreshold = Infinity;
+}
+
+/*
+ * spatialUnits describes where to load the project's spatial units from:
+ *   url:     the spatial unit GeoJSON API endpoint
+ *   extent:  [west, south, east, north] of all spatial units, or null
+ *   exclude: ID of a spatial unit that should not be shown
+ *
+ * Features are requested for the visible part of the map every time it is
+ * moved, simplified for the current zoom level. Features that are already
+ * shown are only replaced when the map has been zoomed in since they were
+ * loaded.
+ */
 function renderFeatures(map, projectExtent, spatialUnits, trans, fitBounds) {
   var projectBounds;
 
@@ -66,23 +86,30 @@ function renderFeatures(map, projectExtent, spatialUnits, trans, fitBounds) {
     if (fitBounds === 'project') {map.fitBounds(projectBounds);}
   }
 
+  var loaded = {};
+  var loadingZoom;
+
   var geoJson = L.geoJson(null, {
     style: { weight: 2 },
+    filter: function(feature) {
+      return feature.id !== spatialUnits.exclude;
+    },
     onEachFeature: function(feature, layer) {
       layer.bindPopup("<div class=\"text-wrap\">" +
                       "<h2><span>Location</span>" +
                       feature.properties.type + "</h2></div>" +
                       "<div class=\"btn-wrap\"><a href='" + feature.properties.url + "' class=\"btn btn-primary btn-sm btn-block\">" + trans['open'] + "</a>"  +
                       "</div>");
+      loaded[feature.id] = {layer: layer, zoom: loadingZoom};
     }
   });
 
   L.Deflate(map, {minSize: 20, layerGroup: geoJson});
-  geoJson.addData(spatialUnits);
 
   if (fitBounds === 'locations') {
-    if (spatialUnits.features.length) {
-      map.fitBounds(L.geoJson(spatialUnits).getBounds());
+    var extent = spatialUnits.extent;
+    if (extent) {
+      map.fitBounds([[extent[1], extent[0]], [extent[3], extent[2]]]);
     } else if (projectBounds) {
       map.fitBounds(projectBounds);
     }
@@ -92,6 +119,34 @@ function renderFeatures(map, projectExtent, spatialUnits, trans, fitBounds) {
   markerGroup.addTo(map);
   markerGroup.checkIn(geoJson);
   geoJson.addTo(map);
+
+  var request = null;
+  function loadFeatures() {
+    if (request) {
+      request.abort();
+    }
+    var zoom = map.getZoom();
+    request = $.getJSON(spatialUnits.url, {
+      bbox: map.getBounds().toBBoxString(),
+      zoom: zoom
+    }).done(function(data) {
+      var features = $.grep(data.features, function(feature) {
+        var current = loaded[feature.id];
+        if (current) {
+          if (current.zoom >= zoom) {
+            return false;
+          }
+          removeFeature(geoJson, current.layer);
+        }
+        return true;
+      });
+      loadingZoom = zoom;
+      geoJson.addData(features);
+    });
+  }
+
+  map.on('moveend', loadFeatures);
+  loadFeatures();
 }
 
 function switch_layer_controls(map, options){
@@ -118,9 +173,10 @@ function switch_layer_controls(map, options){
 
 function add_spatial_resources(map, url){
   $.ajax(url).done(function(data){
-    if (data.length == 0) return;
+    if (data.next) add_spatial_resources(map, data.next);
+    if (data.results.length == 0) return;
     var spatialResources = {};
-    $.each(data, function(idx, resource){
+    $.each(data.results, function(idx, resource){
       var name = resource.name;
       var layers = {};
       var group = new L.LayerGroup();
@@ -0,0 +1,130 @@
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase
+from jsonattrs.models import Attribute, AttributeType, Schema
+from jsonattrs.management.commands import loadattrtypes
+from rest_framework.exceptions import ValidationError
+
+from organization.tests.factories import ProjectFactory
+from spatial.models import SpatialUnit
+from spatial.tests.factories import SpatialUnitFactory
+from ..filters import (create_attribute_indexes, filter_attributes,
+                       get_attribute_indexes, parse_params)
+
+
+def create_schema(project):
+    schema = Schema.objects.create(
+        content_type=ContentType.objects.get_for_model(SpatialUnit),
+        selectors=(project.organization.id, project.id))
+    types = {t.name: t for t in AttributeType.objects.all()}
+    for index, (name, attr_type, choices) in enumerate((
+            ('land_use', 'select_one', ['forest', 'farm', 'town']),
+            ('crops', 'select_multiple', ['maize', 'beans', 'rice']),
+            ('area', 'integer', None),
+            ('surveyed', 'date', None))):
+        Attribute.objects.create(
+            schema=schema, name=name, long_name=name, index=index,
+            attr_type=types[attr_type], choices=choices)
+
+
+class AttributeFilterTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        loadattrtypes.Command().handle(force=True)
+        self.project = ProjectFactory.create()
+        create_schema(self.project)
+        self.forest = SpatialUnitFactory.create(
+            project=self.project, attributes={
+                'land_use': 'forest', 'crops': [], 'area': '1200',
+                'surveyed': '2016-03-01'})
+        self.farm = SpatialUnitFactory.create(
+            project=self.project, attributes={
+                'land_use': 'farm', 'crops': ['maize', 'beans'],
+                'area': 80, 'surveyed': '2016-07-15'})
+        self.town = SpatialUnitFactory.create(
+            project=self.project, attributes={
+                'land_use': 'town', 'crops': ['rice'], 'area': '15',
+                'surveyed': '2016-10-01'})
+        self.queryset = SpatialUnit.objects.filter(project=self.project)
+
+    def filter(self, **params):
+        params = {'attributes.' + k: v for k, v in params.items()}
+        return set(filter_attributes(self.queryset, self.project, params))
+
+    def test_parse_params(self):
+        filters = sorted(parse_params({
+            'type': 'PA',
+            'attributes.land_use': 'forest',
+            'attributes.area__gte': '10',
+            'attributes.long__name': 'x',
+        }))
+        assert filters == [
+            ('attributes.area__gte', 'area', 'gte', '10'),
+            ('attributes.land_use', 'land_use', 'exact', 'forest'),
+            ('attributes.long__name', 'long__name', 'exact', 'x'),
+        ]
+
+    def test_no_filters(self):
+        assert filter_attributes(
+            self.queryset, self.project, {'type': 'PA'}) is self.queryset
+
+    def test_equal(self):
+        assert self.filter(land_use='farm') == {self.farm}
+        # Numbers match whether they were stored as strings or numbers
+        assert self.filter(area='1200') == {self.forest}
+        assert self.filter(area='80') == {self.farm}
+
+    def test_in(self):
+        assert self.filter(land_use__in='farm,town') == {self.farm, self.town}
+        assert self.filter(area__in='15,80') == {self.farm, self.town}
+
+    def test_contains(self):
+        assert self.filter(crops__contains='maize') == {self.farm}
+        assert self.filter(crops='rice') == {self.town}
+        assert self.filter(crops__contains='tea') == set()
+
+    def test_range(self):
+        assert self.filter(area__gte='80') == {self.forest, self.farm}
+        assert self.filter(area__gt='15', area__lt='1200') == {self.farm}
+        assert self.filter(surveyed__lt='2016-08-01') == {self.forest,
+                                                          self.farm}
+
+    def test_combined(self):
+        assert self.filter(land_use__in='forest,farm',
+                           area__lte='100') == {self.farm}
+
+    def test_invalid_filters(self):
+        for params in ({'colour': 'red'},
+                       {'land_use__gte': 'farm'},
+                       {'land_use__contains': 'farm'},
+                       {'area': 'large'},
+                       {'area__gte': 'large'},
+                       {'surveyed__gte': 'spring'}):
+            param = 'attributes.' + list(params)[0]
+            with pytest.raises(ValidationError) as e:
+                self.filter(**params)
+            assert param in e.value.detail
+
+    def get_indexes(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexname FROM pg_indexes WHERE tablename = %s",
+                [SpatialUnit._meta.db_table])
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_create_attribute_indexes(self):
+        indexes = get_attribute_indexes(self.project)
+        assert len(indexes) == 2
+
+        created = create_attribute_indexes(self.project)
+        assert set(created) == {name for name, _, _ in indexes}
+        assert set(created) <= self.get_indexes()
+        assert create_attribute_indexes(self.project) == []
+
+        Attribute.objects.get(name='surveyed').delete()
+        assert create_attribute_indexes(self.project) == []
+        assert len(set(created) & self.get_indexes()) == 1
+
+        # Filters still work, and match the remaining index
+        assert self.filter(area__gte='80') == {self.forest, self.farm}
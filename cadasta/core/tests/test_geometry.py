@@ -0,0 +1,115 @@
+from django.contrib.gis.geos import GEOSGeometry, MultiPolygon
+from django.test import TestCase
+
+from ..geometry import (longitude_offset, normalize_longitudes,
+                        normalize_longitudes_sql, shift_longitudes,
+                        subdivide)
+
+
+class LongitudeOffsetTest(TestCase):
+    def test_in_range(self):
+        assert longitude_offset(GEOSGeometry('POINT(10 10)')) == 0
+        assert longitude_offset(GEOSGeometry('POINT(180 10)')) == 0
+        assert longitude_offset(GEOSGeometry('POINT(-180 10)')) == 0
+
+    def test_crossing_antimeridian(self):
+        geom = GEOSGeometry('LINESTRING(170 10, 190 10)')
+        assert longitude_offset(geom) == 0
+
+    def test_east_of_antimeridian(self):
+        assert longitude_offset(GEOSGeometry('POINT(200 10)')) == -360
+        assert longitude_offset(GEOSGeometry('POINT(900 10)')) == -720
+
+    def test_west_of_antimeridian(self):
+        assert longitude_offset(GEOSGeometry('POINT(-200 10)')) == 360
+        assert longitude_offset(GEOSGeometry('POINT(-540 10)')) == 360
+
+    def test_empty_geometry(self):
+        assert longitude_offset(None) == 0
+        assert longitude_offset(GEOSGeometry('LINESTRING EMPTY')) == 0
+
+
+class ShiftLongitudesTest(TestCase):
+    def test_point(self):
+        geom = shift_longitudes(GEOSGeometry('SRID=4326;POINT(200 10)'),
+                                -360)
+        assert geom.coords == (-160, 10)
+        assert geom.srid == 4326
+
+    def test_linestring(self):
+        geom = shift_longitudes(
+            GEOSGeometry('LINESTRING(200 10, 210 20)'), -360)
+        assert geom.geom_type == 'LineString'
+        assert geom.coords == ((-160, 10), (-150, 20))
+
+    def test_polygon_with_hole(self):
+        geom = shift_longitudes(GEOSGeometry(
+            'POLYGON((200 0, 210 0, 210 10, 200 10, 200 0), '
+            '(202 2, 204 2, 204 4, 202 2))'), -360)
+        assert geom.geom_type == 'Polygon'
+        assert geom.coords == (
+            ((-160, 0), (-150, 0), (-150, 10), (-160, 10), (-160, 0)),
+            ((-158, 2), (-156, 2), (-156, 4), (-158, 2)))
+
+    def test_multi_part_geometries(self):
+        geom = shift_longitudes(GEOSGeometry(
+            'MULTIPOLYGON(((200 0, 210 0, 210 10, 200 0)), '
+            '((220 0, 230 0, 230 10, 220 0)))'), -360)
+        assert geom.geom_type == 'MultiPolygon'
+        assert geom.coords == (
+            (((-160, 0), (-150, 0), (-150, 10), (-160, 0)),),
+            (((-140, 0), (-130, 0), (-130, 10), (-140, 0)),))
+
+        geom = shift_longitudes(GEOSGeometry(
+            'GEOMETRYCOLLECTION(POINT(-200 0), LINESTRING(-210 0, -220 5))'),
+            360)
+        assert geom.geom_type == 'GeometryCollection'
+        assert geom.coords == ((160, 0), ((150, 0), (140, 5)))
+
+
+class NormalizeLongitudesTest(TestCase):
+    def test_unchanged(self):
+        geom = GEOSGeometry('POINT(10 10)')
+        assert normalize_longitudes(geom) is geom
+
+    def test_normalize(self):
+        geom = normalize_longitudes(GEOSGeometry('POINT(-200 10)'))
+        assert geom.coords == (160, 10)
+
+    def test_normalize_sql(self):
+        expression, condition = normalize_longitudes_sql('geom')
+        assert expression.startswith('ST_Translate(geom, ')
+        assert 'ST_XMin(geom) > 180' in condition
+        assert 'ST_XMax(geom) < -180' in condition
+
+
+class SubdivideTest(TestCase):
+    def circle(self, vertices, x=0):
+        return GEOSGeometry('SRID=4326;POINT({} 0)'.format(x)).buffer(
+            10, quadsegs=vertices // 4)
+
+    def test_small_polygon(self):
+        geom = GEOSGeometry(
+            'SRID=4326;POLYGON((0 0, 1 0, 1 1, 0 1, 0 0))')
+        parts = subdivide(geom)
+        assert len(parts) == 1
+        assert parts[0].equals(geom)
+
+    def test_large_polygon(self):
+        geom = self.circle(1000)
+        parts = subdivide(geom, max_vertices=64)
+        assert len(parts) > 1
+        assert all(p.geom_type == 'Polygon' for p in parts)
+        assert all(p.num_coords <= 64 for p in parts)
+        assert all(p.srid == 4326 for p in parts)
+        assert abs(sum(p.area for p in parts) - geom.area) < 1e-6
+
+    def test_multipolygon(self):
+        geom = MultiPolygon(self.circle(400), self.circle(16, x=50),
+                            srid=4326)
+        parts = subdivide(geom, max_vertices=64)
+        assert all(p.num_coords <= 64 for p in parts)
+        assert abs(sum(p.area for p in parts) - geom.area) < 1e-6
+
+    def test_not_polygonal(self):
+        assert subdivide(GEOSGeometry('SRID=4326;POINT(0 0)')) == []
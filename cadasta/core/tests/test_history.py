@@ -0,0 +1,97 @@
+import pytest
+from django.test import TestCase
+from accounts.tests.factories import UserFactory
+from organization.models import Organization
+
+from ..history import (buffered_history, bulk_create_history,
+                       get_history_buffer, get_history_model)
+
+
+class BulkCreateHistoryTest(TestCase):
+    def test_get_history_model(self):
+        assert get_history_model(Organization) is Organization.history.model
+
+    def test_bulk_create_history(self):
+        orgs = [Organization(id='org{}'.format(i),
+                             name='Org {}'.format(i),
+                             slug='org-{}'.format(i))
+                for i in range(3)]
+        Organization.objects.bulk_create(orgs)
+        user = UserFactory.create()
+        orgs[0]._history_user = user
+
+        records = bulk_create_history(orgs)
+        assert len(records) == 3
+        assert Organization.history.filter(history_type='+').count() == 3
+        record = Organization.history.get(id='org0')
+        assert record.name == 'Org 0'
+        assert record.history_user == user
+        assert Organization.history.get(id='org1').history_user is None
+
+    def test_bulk_create_history_without_instances(self):
+        assert bulk_create_history([]) == []
+        assert Organization.history.count() == 0
+
+
+class BufferedHistoryTest(TestCase):
+    def create_orgs(self, count):
+        return [Organization.objects.create(name='Org {}'.format(i))
+                for i in range(count)]
+
+    def test_saves_are_buffered(self):
+        with buffered_history() as buffer:
+            orgs = self.create_orgs(3)
+            orgs[0].description = 'Changed'
+            orgs[0].save()
+            orgs[2].delete()
+            assert Organization.history.count() == 0
+
+        assert buffer.records == 5
+        assert buffer.inserts == 1
+        assert buffer.inserts_per_record == 0.2
+        assert list(Organization.history.filter(
+            id=orgs[0].id).values_list('history_type', 'description')) == [
+            ('~', 'Changed'), ('+', None)]
+        assert Organization.history.filter(history_type='-').count() == 1
+        assert get_history_buffer() is None
+
+    def test_bulk_create_history(self):
+        orgs = [Organization(id='bulk{}'.format(i),
+                             name='Bulk {}'.format(i),
+                             slug='bulk-{}'.format(i))
+                for i in range(3)]
+        with buffered_history() as buffer:
+            Organization.objects.bulk_create(orgs)
+            bulk_create_history(orgs)
+            self.create_orgs(2)
+            assert Organization.history.count() == 0
+        assert buffer.records == 5
+        assert buffer.inserts == 1
+        assert Organization.history.count() == 5
+
+    def test_buffer_is_flushed_when_full(self):
+        with buffered_history(max_records=2) as buffer:
+            self.create_orgs(3)
+            assert Organization.history.count() == 2
+        assert buffer.records == 3
+        assert buffer.inserts == 2
+
+    def test_exception_discards_records(self):
+        with pytest.raises(ValueError):
+            with buffered_history():
+                self.create_orgs(2)
+                raise ValueError
+        assert Organization.objects.count() == 0
+        assert Organization.history.count() == 0
+        assert get_history_buffer() is None
+
+    def test_nested_blocks(self):
+        with buffered_history() as outer:
+            self.create_orgs(1)
+            with buffered_history() as inner:
+                Organization.objects.create(name='Inner')
+            assert inner.records == 1
+            assert Organization.history.count() == 1
+            assert get_history_buffer() is outer
+        assert outer.records == 1
+        assert Organization.history.count() == 2
@@ -1,3 +1,8 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import TestCase
 from django.contrib.sites.models import Site
 
@@ -7,9 +12,13 @@ from tutelary.models import Policy
 from accounts.models import User
 from organization.models import Organization, Project
 from spatial.models import SpatialUnit, SpatialRelationship
-from core.management.commands import loadsite
+from core.management.commands import loadsite, runworker
+from core.models import BackgroundJob
 from jsonattrs.models import create_attribute_types
 from party.models import load_tenure_relationship_types
+from organization.tests.factories import ProjectFactory
+from .test_filters import create_schema
+from .test_models import MyBackgroundJob
 
 
 class FixturesTest(TestCase):
@@ -54,3 +63,46 @@ class LoadSiteTest(TestCase):
         assert Site.objects.filter(name='Cadasta').exists()
         loadsite.Command().handle()
         assert len(Site.objects.all()) == 1
+
+
+class RunWorkerTest(TestCase):
+    def test_get_job_models(self):
+        assert MyBackgroundJob in runworker.get_job_models()
+
+    def test_process_next_job(self):
+        job = MyBackgroundJob.objects.create()
+        assert runworker.process_next_job() == job
+        job.refresh_from_db()
+        assert job.status == BackgroundJob.DONE
+        assert runworker.process_next_job() is None
+
+    def test_run_once(self):
+        MyBackgroundJob.objects.create()
+        MyBackgroundJob.objects.create(fail=True)
+        runworker.Command().handle(once=True, interval=0)
+        assert not MyBackgroundJob.objects.filter(
+            status=BackgroundJob.QUEUED).exists()
+        assert MyBackgroundJob.objects.filter(
+            status=BackgroundJob.FAILED).count() == 1
+
+
+class CreateAttributeIndexesTest(TestCase):
+    def test_create_indexes(self):
+        create_attribute_types()
+        project = ProjectFactory.create()
+        create_schema(project)
+        ProjectFactory.create()
+
+        out = StringIO()
+        call_command('createattributeindexes', stdout=out)
+        assert 'created 2 index(es)' in out.getvalue()
+        assert 'created 0 index(es)' in out.getvalue()
+
+        out = StringIO()
+        call_command('createattributeindexes', project.organization.slug,
+                     project.slug, stdout=out)
+        assert out.getvalue() == '{}/{}: created 0 index(es).\n'.format(
+            project.organization.slug, project.slug)
+
+        with pytest.raises(CommandError):
+            call_command('createattributeindexes', 'some-org', 'some-prj')
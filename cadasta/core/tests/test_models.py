@@ -1,7 +1,11 @@
-import random
-from django.db.models import SlugField, CharField, Model
-from django.test import TestCase
-from ..models import RandomIDModel, SlugModel
+import pytest
+from datetime import timedelta
+from django.db import IntegrityError, transaction
+from django.db.models import BooleanField, SlugField, CharField, Model
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from ..models import BackgroundJob, RandomIDModel, SlugModel
+from ..util import id_allocator, random_id
 
 
 class MyRandomIdModel(RandomIDModel):
@@ -17,14 +21,32 @@ class RandomIDModelTest(TestCase):
         instance.save()
         assert instance.id is not None
 
+    def test_save_without_lookup(self):
+        instance = MyRandomIdModel()
+        with self.assertNumQueries(1):
+            instance.save()
+
+    def test_duplicate_id_in_transaction(self):
+        instance1 = MyRandomIdModel.objects.create()
+        random_id()
+        id_allocator._ids.append(instance1.id)
+        instance2 = MyRandomIdModel()
+        with pytest.raises(IntegrityError):
+            with transaction.atomic():
+                instance2.save()
+        assert instance2.id is None
+
+
+class RandomIDModelRetryTest(TransactionTestCase):
     def test_duplicate_ids(self):
-        random.seed(a=10)
-        instance1 = MyRandomIdModel()
-        instance1.save()
-        random.seed(a=10)
+        instance1 = MyRandomIdModel.objects.create()
+        # The next ID that is handed out collides with the first one
+        random_id()
+        id_allocator._ids.append(instance1.id)
         instance2 = MyRandomIdModel()
         instance2.save()
         assert instance1.id != instance2.id
+        assert MyRandomIdModel.objects.count() == 2
 
 
 class MySlugModel(SlugModel, Model):
@@ -154,3 +176,101 @@ class SlugModelTest(TestCase):
 
         assert MySlugModel.objects.count() == 101
         assert instance.slug[-4:] == '-100'
+
+
+class MyBackgroundJob(BackgroundJob):
+    fail = BooleanField(default=False)
+
+    class Meta:
+        app_label = 'core'
+
+    def run(self):
+        if self.fail:
+            raise ValueError('Something went wrong')
+        self.set_progress(50)
+
+
+class BackgroundJobTest(TestCase):
+    def test_claim_next(self):
+        first = MyBackgroundJob.objects.create()
+        second = MyBackgroundJob.objects.create()
+
+        job = MyBackgroundJob.claim_next()
+        assert job == first
+        assert job.status == BackgroundJob.RUNNING
+        assert job.started_date is not None
+        assert job.heartbeat_date == job.started_date
+        assert job.attempts == 1
+
+        assert MyBackgroundJob.claim_next() == second
+        assert MyBackgroundJob.claim_next() is None
+
+    def test_claim_next_skips_claimed_jobs(self):
+        job = MyBackgroundJob.objects.create()
+        MyBackgroundJob.objects.filter(id=job.id).update(
+            status=BackgroundJob.RUNNING)
+        assert MyBackgroundJob.claim_next() is None
+
+    def test_claim_next_requeues_stale_jobs(self):
+        stale = MyBackgroundJob.objects.create()
+        running = MyBackgroundJob.objects.create()
+        MyBackgroundJob.objects.filter(id=stale.id).update(
+            status=BackgroundJob.RUNNING, progress=40, attempts=1,
+            started_date=timezone.now() - timedelta(hours=2),
+            heartbeat_date=timezone.now() - timedelta(hours=1))
+        MyBackgroundJob.objects.filter(id=running.id).update(
+            status=BackgroundJob.RUNNING, attempts=1,
+            started_date=timezone.now() - timedelta(hours=2),
+            heartbeat_date=timezone.now())
+
+        job = MyBackgroundJob.claim_next()
+        assert job == stale
+        assert job.status == BackgroundJob.RUNNING
+        assert job.progress == 0
+        assert job.attempts == 2
+        assert job.started_date > timezone.now() - timedelta(minutes=1)
+        assert job.heartbeat_date == job.started_date
+        assert MyBackgroundJob.claim_next() is None
+
+    def test_claim_next_fails_jobs_after_max_attempts(self):
+        job = MyBackgroundJob.objects.create()
+        MyBackgroundJob.objects.filter(id=job.id).update(
+            status=BackgroundJob.RUNNING,
+            attempts=BackgroundJob.MAX_ATTEMPTS,
+            started_date=timezone.now() - timedelta(hours=1),
+            heartbeat_date=timezone.now() - timedelta(hours=1))
+
+        assert MyBackgroundJob.claim_next() is None
+        job.refresh_from_db()
+        assert job.status == BackgroundJob.FAILED
+        assert job.error == 'Interrupted 3 times.'
+        assert job.finished_date is not None
+
+    def test_set_progress(self):
+        job = MyBackgroundJob.objects.create()
+        job.set_progress(20)
+        job.refresh_from_db()
+        assert job.progress == 20
+        assert job.heartbeat_date > timezone.now() - timedelta(minutes=1)
+
+    def test_execute(self):
+        job = MyBackgroundJob.objects.create()
+        job.execute()
+        job.refresh_from_db()
+        assert job.status == BackgroundJob.DONE
+        assert job.progress == 100
+        assert job.finished_date is not None
+        assert job.is_finished is True
+
+    def test_execute_failing_job(self):
+        job = MyBackgroundJob.objects.create(fail=True)
+        job.execute()
+        job.refresh_from_db()
+        assert job.status == BackgroundJob.FAILED
+        assert job.error == 'Something went wrong'
+        assert job.progress == 0
+        assert job.is_finished is True
+
+    def test_run_not_implemented(self):
+        with pytest.raises(NotImplementedError):
+            BackgroundJob().run()
@@ -0,0 +1,100 @@
+import pytest
+from django.test import TestCase
+from rest_framework import filters
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from organization.tests.factories import ProjectFactory
+from party.models import Party
+from party.tests.factories import PartyFactory
+from ..pagination import KeysetPagination
+
+
+class PartyListView:
+    filter_backends = (filters.OrderingFilter,)
+    ordering_fields = ('name', 'type')
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        self.project = ProjectFactory.create()
+        for name in ('b', 'a', 'c', 'a', 'b', 'a', 'd'):
+            PartyFactory.create(project=self.project, name=name)
+        self.queryset = Party.objects.filter(project=self.project)
+
+    def paginate(self, url='/', **params):
+        request = Request(APIRequestFactory().get(url, params))
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(
+            self.queryset, request, view=PartyListView())
+        return paginator, page
+
+    def walk(self, url='/', **params):
+        pages = []
+        paginator, page = self.paginate(url, **params)
+        pages.append(page)
+        while paginator.get_next_link():
+            paginator, page = self.paginate(paginator.get_next_link())
+            pages.append(page)
+        return paginator, pages
+
+    def test_pages_follow_default_ordering(self):
+        _, pages = self.walk(page_size=2)
+        assert [len(page) for page in pages] == [2, 2, 2, 1]
+
+        ids = [party.id for page in pages for party in page]
+        expected = list(self.queryset.order_by('name', 'id')
+                                     .values_list('id', flat=True))
+        assert ids == expected
+
+    def test_pages_follow_requested_ordering(self):
+        _, pages = self.walk(page_size=3, ordering='-name')
+        ids = [party.id for page in pages for party in page]
+        expected = list(self.queryset.order_by('-name', 'id')
+                                     .values_list('id', flat=True))
+        assert ids == expected
+
+    def test_previous_pages(self):
+        paginator, pages = self.walk(page_size=2)
+        assert paginator.get_previous_link() is not None
+
+        previous = []
+        while paginator.get_previous_link():
+            paginator, page = self.paginate(paginator.get_previous_link())
+            previous.insert(0, page)
+        assert previous == pages[:-1]
+
+    def test_first_and_last_page(self):
+        paginator, page = self.paginate()
+        assert len(page) == 7
+        assert paginator.get_next_link() is None
+        assert paginator.get_previous_link() is None
+
+    def test_page_size(self):
+        _, page = self.paginate(page_size=5)
+        assert len(page) == 5
+        _, page = self.paginate(page_size='all')
+        assert len(page) == 7
+
+        paginator = KeysetPagination()
+        paginator.max_page_size = 3
+        request = Request(APIRequestFactory().get('/', {'page_size': 5}))
+        page = paginator.paginate_queryset(self.queryset, request)
+        assert len(page) == 3
+
+    def test_deep_pages_do_not_use_offset(self):
+        paginator, _ = self.walk(page_size=2)
+        request = Request(
+            APIRequestFactory().get(paginator.get_previous_link()))
+        paginator = KeysetPagination()
+        paginator.page_size = 2
+        with self.assertNumQueries(1) as queries:
+            paginator.paginate_queryset(self.queryset, request,
+                                        view=PartyListView())
+        sql = queries.captured_queries[0]['sql']
+        assert 'OFFSET' not in sql
+
+    def test_invalid_cursor(self):
+        with pytest.raises(NotFound):
+            self.paginate(cursor='invalid')
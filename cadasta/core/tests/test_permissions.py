@@ -0,0 +1,146 @@
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase
+
+from tutelary.models import Role
+
+from accounts.tests.factories import UserFactory
+from organization.models import OrganizationRole, Project, ProjectRole
+from organization.tests.factories import OrganizationFactory, ProjectFactory
+from .utils.cases import UserTestCase
+from ..permissions import (get_user_roles, is_org_admin, is_project_admin,
+                           is_superuser, visible_projects)
+
+
+class UserRolesTest(UserTestCase, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory.create()
+        self.org = OrganizationFactory.create()
+        self.prj = ProjectFactory.create(organization=self.org)
+
+    def test_anonymous_user(self):
+        user = AnonymousUser()
+        assert get_user_roles(user) == {
+            'superuser': False, 'organizations': {}, 'projects': {}
+        }
+        assert is_superuser(user) is False
+        assert is_org_admin(user, self.org) is False
+        assert is_project_admin(user, self.prj) is False
+
+    def test_roles_are_cached(self):
+        OrganizationRole.objects.create(
+            organization=self.org, user=self.user, admin=True)
+        ProjectRole.objects.create(project=self.prj, user=self.user)
+        roles = get_user_roles(self.user)
+        assert roles == {
+            'superuser': False,
+            'organizations': {self.org.id: True},
+            'projects': {self.prj.id: 'PU'},
+        }
+
+        with self.assertNumQueries(0):
+            assert get_user_roles(self.user) == roles
+            assert is_org_admin(self.user, self.org) is True
+            assert is_project_admin(self.user, self.prj) is True
+
+    def test_superuser(self):
+        assert is_superuser(self.user) is False
+        self.user.assign_policies(Role.objects.get(name='superuser'))
+        assert is_superuser(self.user) is True
+        assert is_org_admin(self.user, self.org) is True
+        assert is_project_admin(self.user, self.prj) is True
+
+    def test_org_role_changes_invalidate_cache(self):
+        assert is_org_admin(self.user, self.org) is False
+
+        role = OrganizationRole.objects.create(
+            organization=self.org, user=self.user)
+        assert get_user_roles(self.user)['organizations'] == {
+            self.org.id: False}
+        assert is_org_admin(self.user, self.org) is False
+
+        role.admin = True
+        role.save()
+        assert is_org_admin(self.user, self.org) is True
+        assert is_project_admin(self.user, self.prj) is True
+
+        role.delete()
+        assert get_user_roles(self.user)['organizations'] == {}
+        assert is_org_admin(self.user, self.org) is False
+
+    def test_project_role_changes_invalidate_cache(self):
+        OrganizationRole.objects.create(organization=self.org, user=self.user)
+        assert is_project_admin(self.user, self.prj) is False
+
+        role = ProjectRole.objects.create(project=self.prj, user=self.user)
+        assert get_user_roles(self.user)['projects'] == {self.prj.id: 'PU'}
+        assert is_project_admin(self.user, self.prj) is False
+
+        role.role = 'PM'
+        role.save()
+        assert is_project_admin(self.user, self.prj) is True
+
+        role.delete()
+        assert get_user_roles(self.user)['projects'] == {}
+        assert is_project_admin(self.user, self.prj) is False
+
+
+class VisibleProjectsTest(UserTestCase, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory.create()
+        self.org = OrganizationFactory.create()
+        self.other_org = OrganizationFactory.create()
+        self.public = ProjectFactory.create(organization=self.org)
+        self.private = ProjectFactory.create(organization=self.org,
+                                             access='private')
+        self.archived = ProjectFactory.create(organization=self.org,
+                                              archived=True)
+        self.other_public = ProjectFactory.create(organization=self.other_org)
+        self.other_private = ProjectFactory.create(
+            organization=self.other_org, access='private')
+
+    def visible(self, user, **kwargs):
+        return set(visible_projects(user, **kwargs))
+
+    def test_anonymous_user(self):
+        assert self.visible(AnonymousUser()) == {self.public,
+                                                 self.other_public}
+
+    def test_user_without_roles(self):
+        assert self.visible(self.user) == {self.public, self.other_public}
+
+    def test_org_member(self):
+        OrganizationRole.objects.create(organization=self.org, user=self.user)
+        assert self.visible(self.user) == {self.public, self.private,
+                                           self.other_public}
+
+    def test_org_admin(self):
+        OrganizationRole.objects.create(organization=self.org, user=self.user,
+                                        admin=True)
+        assert self.visible(self.user) == {self.public, self.private,
+                                           self.archived, self.other_public}
+        assert self.visible(self.user, archived=False) == {
+            self.public, self.private, self.other_public}
+
+    def test_memberships_are_not_cached(self):
+        role = OrganizationRole.objects.create(
+            organization=self.org, user=self.user, admin=True)
+        get_user_roles(self.user)
+        # Changes that bypass the signal handlers are seen as well
+        OrganizationRole.objects.filter(pk=role.pk).update(admin=False)
+        assert self.visible(self.user) == {self.public, self.private,
+                                           self.other_public}
+        OrganizationRole.objects.filter(pk=role.pk).delete()
+        assert self.visible(self.user) == {self.public, self.other_public}
+
+    def test_superuser(self):
+        self.user.assign_policies(Role.objects.get(name='superuser'))
+        assert self.visible(self.user) == set(Project.objects.all())
+
+    def test_single_query(self):
+        OrganizationRole.objects.create(organization=self.org, user=self.user,
+                                        admin=True)
+        get_user_roles(self.user)
+        with self.assertNumQueries(1):
+            assert len(self.visible(self.user)) == 4
@@ -0,0 +1,57 @@
+import os
+
+from django.test import TestCase
+
+from ..util import (ID_FIELD_LENGTH, IDAllocator, alphabet,
+                    queryset_iterator, random_ids)
+from .test_models import MyRandomIdModel
+
+
+class QuerysetIteratorTest(TestCase):
+    def test_iterate_in_chunks(self):
+        instances = [MyRandomIdModel.objects.create() for i in range(5)]
+        expected = sorted(i.pk for i in instances)
+
+        with self.assertNumQueries(3):
+            items = list(queryset_iterator(MyRandomIdModel.objects.all(),
+                                           chunk_size=2))
+        assert [i.pk for i in items] == expected
+
+    def test_iterate_full_last_chunk(self):
+        for i in range(4):
+            MyRandomIdModel.objects.create()
+
+        with self.assertNumQueries(3):
+            items = list(queryset_iterator(MyRandomIdModel.objects.all(),
+                                           chunk_size=2))
+        assert len(items) == 4
+
+    def test_iterate_empty_queryset(self):
+        assert list(queryset_iterator(MyRandomIdModel.objects.all())) == []
+
+
+class IDAllocatorTest(TestCase):
+    def test_allocate(self):
+        allocator = IDAllocator(batch_size=10)
+        ids = allocator.allocate(4)
+        assert len(ids) == 4
+        assert len(allocator._ids) == 6
+        assert all(len(id) == ID_FIELD_LENGTH and set(id) <= set(alphabet)
+                   for id in ids)
+
+        ids += allocator.allocate(25)
+        assert len(ids) == 29
+        assert len(set(ids)) == 29
+        assert allocator.allocate(0) == []
+
+    def test_ids_are_not_shared_after_fork(self):
+        allocator = IDAllocator(batch_size=10)
+        allocator.allocate(1)
+        buffered = list(allocator._ids)
+        allocator._pid = os.getpid() + 1
+        assert allocator.allocate(1)[0] not in buffered
+        assert not set(allocator._ids) & set(buffered)
+
+    def test_random_ids(self):
+        ids = random_ids(1000)
+        assert len(set(ids)) == 1000
@@ -1,5 +1,6 @@
-import random
+import os
 import string
+import threading
 import django.utils.text as base_utils
 
 
@@ -11,13 +12,66 @@ for loser in 'l1o0':
     alphabet = alphabet[:i] + alphabet[i + 1:]
 
 
+# Maps every byte to one of the 32 characters of the alphabet, so that
+# each byte of entropy makes one character of an ID
+ID_CHARACTERS = bytes.maketrans(
+    bytes(range(256)), bytes(ord(alphabet[b & 31]) for b in range(256)))
+ID_BATCH_SIZE = 256
+
+
 def byte_to_base32_chr(byte):
     return alphabet[byte & 31]
 
 
+class IDAllocator:
+    """Hands out random IDs, generating them ``batch_size`` at a time from
+    a single read of the operating system's entropy source.
+
+    IDs have 120 random bits, so they are not checked for uniqueness
+    here; ``RandomIDModel`` relies on the primary key constraint instead.
+    """
+
+    def __init__(self, batch_size=ID_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._ids = []
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def generate(self, count):
+        chars = os.urandom(count * ID_FIELD_LENGTH).translate(
+            ID_CHARACTERS).decode('ascii')
+        return [chars[i:i + ID_FIELD_LENGTH]
+                for i in range(0, len(chars), ID_FIELD_LENGTH)]
+
+    def allocate(self, count):
+        """Returns a list of ``count`` new IDs."""
+        if count <= 0:
+            return []
+        with self._lock:
+            if self._pid != os.getpid():
+                # IDs generated before a fork would be handed out by both
+                # processes
+                self._ids = []
+                self._pid = os.getpid()
+            if len(self._ids) < count:
+                self._ids.extend(self.generate(
+                    max(count - len(self._ids), self.batch_size)))
+            ids = self._ids[-count:]
+            del self._ids[-count:]
+        return ids
+
+
+id_allocator = IDAllocator()
+
+
 def random_id():
-    rand_id = [random.randint(0, 0xFF) for i in range(ID_FIELD_LENGTH)]
-    return ''.join(map(byte_to_base32_chr, rand_id))
+    return id_allocator.allocate(1)[0]
+
+
+def random_ids(count):
+    """Returns ``count`` new IDs, for objects written with
+    ``bulk_create``."""
+    return id_allocator.allocate(count)
 
 
 def slugify(text, max_length=None, allow_unicode=False):
@@ -25,3 +79,22 @@ def slugify(text, max_length=None, allow_unicode=False):
     if max_length is not None:
         slug = slug[:max_length]
     return slug
+
+
+def queryset_iterator(queryset, chunk_size=1000):
+    """Iterates over a queryset in primary key order, fetching at most
+    ``chunk_size`` rows per query. Unlike ``QuerySet.iterator()`` this
+    keeps memory use bounded on PostgreSQL, where psycopg2 loads the
+    complete result of a query into memory."""
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        chunk = queryset
+        if last_pk is not None:
+            chunk = chunk.filter(pk__gt=last_pk)
+        items = list(chunk[:chunk_size])
+        for item in items:
+            yield item
+        if len(items) < chunk_size:
+            break
+        last_pk = items[-1].pk
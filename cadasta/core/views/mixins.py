@@ -1,6 +1,6 @@
 from django.shortcuts import redirect
 
-from tutelary.models import Role
+from ..permissions import is_superuser
 
 
 class ArchiveMixin:
@@ -24,12 +24,7 @@ class SuperUserCheckMixin:
     @property
     def is_superuser(self):
         if self.is_su is None:
-            role = Role.objects.filter(name='superuser')
-            self.is_su = False
-            if len(role) > 0:
-                if hasattr(self.request.user, 'assigned_policies'):
-                    if role[0] in self.request.user.assigned_policies():
-                        self.is_su = True
+            self.is_su = is_superuser(self.request.user)
         return self.is_su
 
     def get_context_data(self, *args, **kwargs):
@@ -1,6 +1,8 @@
 import os
 from django.contrib.gis.utils import LayerMapping
-from .models import WorldBorder
+from django.db import transaction
+from core.geometry import subdivide
+from .models import WorldBorder, WorldBorderPart
 
 
 world_mapping = {
@@ -15,14 +17,39 @@ world_mapping = {
     'mpoly': 'MULTIPOLYGON',
 }
 
+# Country borders are large, so they are inserted a few at a time
+BORDER_BATCH_SIZE = 20
+PART_BATCH_SIZE = 1000
+
 world_shp = os.path.abspath(os.path.join(
     os.path.dirname(__file__), 'data', 'ne_10m_admin_0_countries.shp'
 ))
 
 
+def create_parts(borders):
+    """Creates the subdivided parts of ``borders``, which must have been
+    saved."""
+    parts = [WorldBorderPart(border_id=border.id, geom=part)
+             for border in borders
+             for part in subdivide(border.mpoly)]
+    WorldBorderPart.objects.bulk_create(parts, batch_size=PART_BATCH_SIZE)
+
+
 def run(verbose=False):
-    WorldBorder.objects.all().delete()
+    # LayerMapping.save would insert the countries one at a time; its
+    # field mapping and checks are used here, and the rows inserted in
+    # bulk.
     lm = LayerMapping(WorldBorder, world_shp, world_mapping,
                       transform=False, encoding='iso-8859-1')
+    borders = [WorldBorder(**lm.feature_kwargs(feature))
+               for feature in lm.layer]
+
+    with transaction.atomic():
+        WorldBorder.objects.all().delete()
+        WorldBorder.objects.bulk_create(borders,
+                                        batch_size=BORDER_BATCH_SIZE)
+        # bulk_create does not set the IDs of the new rows
+        create_parts(WorldBorder.objects.only('id', 'mpoly').iterator())
 
-    lm.save(strict=True, verbose=verbose)
+    if verbose:
+        print('Loaded {} countries'.format(len(borders)))
@@ -0,0 +1,48 @@
+import random
+import time
+
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import WorldBorder, WorldBorderPart, find_country
+
+
+class Command(BaseCommand):
+    help = """Compares finding the countries of random points with the
+    country borders, as projects did before, and with the subdivided
+    border parts. The countries must have been loaded with loadcountries."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--points',
+            type=int,
+            dest='points',
+            default=1000,
+            help='Number of points to look up'
+        )
+
+    def timed(self, lookup, points):
+        start = time.perf_counter()
+        found = sum(1 for point in points if lookup(point) is not None)
+        return (time.perf_counter() - start) / len(points) * 1000, found
+
+    def handle(self, *args, **options):
+        if not WorldBorderPart.objects.exists():
+            raise CommandError('No countries loaded, run loadcountries')
+
+        # Between 60 degrees south and 75 degrees north, where most land is
+        rand = random.Random(0)
+        points = [Point(rand.uniform(-180, 180), rand.uniform(-60, 75),
+                        srid=4326)
+                  for _ in range(options['points'])]
+
+        def borders(point):
+            return WorldBorder.objects.filter(
+                mpoly__contains=point
+            ).values_list('iso2', flat=True).first()
+
+        self.stdout.write('{} points'.format(len(points)))
+        for label, lookup in (('borders', borders), ('parts', find_country)):
+            ms, found = self.timed(lookup, points)
+            self.stdout.write('{:<10} {:8.2f}ms per point, {} in a '
+                              'country'.format(label, ms, found))
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.6 on 2016-10-18 16:12
+from __future__ import unicode_literals
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+from core.geometry import subdivide
+
+
+def create_parts(apps, schema_editor):
+    WorldBorder = apps.get_model('geography', 'WorldBorder')
+    WorldBorderPart = apps.get_model('geography', 'WorldBorderPart')
+    for border in WorldBorder.objects.only('id', 'mpoly').iterator():
+        WorldBorderPart.objects.bulk_create(
+            WorldBorderPart(border_id=border.id, geom=part)
+            for part in subdivide(border.mpoly))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geography', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorldBorderPart',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('geom', django.contrib.gis.db.models.fields.PolygonField(srid=4326)),
+                ('border', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parts', to='geography.WorldBorder')),
+            ],
+        ),
+        migrations.RunPython(create_parts, migrations.RunPython.noop),
+    ]
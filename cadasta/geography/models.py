@@ -14,3 +14,20 @@ class WorldBorder(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class WorldBorderPart(models.Model):
+    """A small piece of a country's border, made by
+    ``core.geometry.subdivide``. Country borders have up to hundreds of
+    thousands of vertices, so finding the country of a point is much
+    faster with the spatial index of the parts than with the borders."""
+    border = models.ForeignKey(WorldBorder, related_name='parts')
+    geom = models.PolygonField()
+
+
+def find_country(point):
+    """Returns the two-letter ISO code of the country at ``point``, or
+    ``None`` if the point is not in any country."""
+    return WorldBorderPart.objects.filter(
+        geom__intersects=point
+    ).order_by('border_id').values_list('border__iso2', flat=True).first()
@@ -1,6 +1,8 @@
+from django.contrib.gis.geos import GEOSGeometry, MultiPolygon
 from django.test import TestCase
 
-from geography.models import WorldBorder
+from geography.load import create_parts
+from geography.models import WorldBorder, WorldBorderPart, find_country
 
 
 class WorldBorderTest(TestCase):
@@ -10,3 +12,33 @@ class WorldBorderTest(TestCase):
             mpoly='MULTIPOLYGON(((10 10, 10 20, 20 20, 20 15, 10 10)))'
         )
         assert str(border) == 'Narnia'
+
+
+class FindCountryTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        circle = GEOSGeometry('SRID=4326;POINT(0 0)').buffer(10, quadsegs=200)
+        self.narnia = WorldBorder.objects.create(
+            name='Narnia', iso2='NA', pop_est=1, un=1,
+            mpoly=MultiPolygon(circle, srid=4326))
+        self.archenland = WorldBorder.objects.create(
+            name='Archenland', iso2='AR', pop_est=1, un=2,
+            mpoly='SRID=4326;MULTIPOLYGON(((20 -5, 30 -5, 30 5, 20 5, 20 -5)))'
+        )
+        create_parts([self.narnia, self.archenland])
+
+    def test_parts(self):
+        assert self.narnia.parts.count() > 1
+        assert self.archenland.parts.count() == 1
+
+    def test_find_country(self):
+        assert find_country(GEOSGeometry('SRID=4326;POINT(1 1)')) == 'NA'
+        # On a line along which Narnia was cut in half
+        assert find_country(GEOSGeometry('SRID=4326;POINT(0 5)')) == 'NA'
+        assert find_country(GEOSGeometry('SRID=4326;POINT(25 0)')) == 'AR'
+        assert find_country(GEOSGeometry('SRID=4326;POINT(15 0)')) is None
+
+    def test_parts_are_deleted_with_border(self):
+        self.archenland.delete()
+        assert not WorldBorderPart.objects.filter(
+            border_id=self.archenland.id).exists()
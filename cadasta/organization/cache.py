@@ -0,0 +1,80 @@
+"""Cache of the GeoJSON features of the projects on the dashboard map.
+
+The dashboard map shows the extents of all projects the user can see.
+Serialising every extent on every page view is the most expensive part
+of rendering the dashboard, so the feature of each project is
+serialised once, with its extent simplified to what is visible on the
+map, and kept in Django's cache under a key of its own. A page view
+finds out which projects the user can see, with one query, reads their
+features with one cache request and only serialises the features
+missing from the cache.
+
+The feature of a project is removed from the cache whenever the project
+or its organization is saved or deleted, because features include the
+organization's name and slug. The features are kept in the cache shared
+by all processes, so removing them takes effect in every process at
+once.
+
+"""
+
+from collections import OrderedDict
+
+from django.core.cache import cache
+
+from spatial.functions import SimplifyPreserveTopology, zoom_tolerance
+
+# Features are invalidated explicitly; the timeout only limits how long a
+# change made outside of the signal handlers can go unnoticed.
+CACHE_TIMEOUT = 60 * 60
+CACHE_KEY = 'dashboard:project-feature:{}'
+# Extents are simplified by the size of a pixel at this map zoom level
+SIMPLIFY_ZOOM = 12
+
+
+def _load_project_features(ids):
+    from .models import Project
+    from .serializers import ProjectGeometrySerializer
+
+    projects = list(Project.objects.filter(
+        id__in=ids, extent__isnull=False
+    ).select_related('organization').annotate(
+        simplified_extent=SimplifyPreserveTopology(
+            'extent', zoom_tolerance(SIMPLIFY_ZOOM))
+    ))
+    for project in projects:
+        project.extent = project.simplified_extent
+    features = ProjectGeometrySerializer(projects, many=True).data['features']
+    return {project.id: feature
+            for project, feature in zip(projects, features)}
+
+
+def get_project_features(ids):
+    """Returns a dict mapping those of the project IDs ``ids`` whose
+    projects have an extent to their GeoJSON features. Features missing
+    from the cache are loaded and cached."""
+    keys = {CACHE_KEY.format(pk): pk for pk in ids}
+    features = {keys[key]: feature
+                for key, feature in cache.get_many(keys).items()}
+    missing = [pk for pk in ids if pk not in features]
+    if missing:
+        loaded = _load_project_features(missing)
+        cache.set_many({CACHE_KEY.format(pk): feature
+                        for pk, feature in loaded.items()}, CACHE_TIMEOUT)
+        features.update(loaded)
+    return features
+
+
+def get_projects_geojson(projects):
+    """Returns a GeoJSON feature collection of the extents of
+    ``projects``, a queryset, in the order of the queryset."""
+    ids = list(projects.filter(
+        extent__isnull=False).values_list('id', flat=True))
+    features = get_project_features(ids)
+    return OrderedDict((
+        ('type', 'FeatureCollection'),
+        ('features', [features[pk] for pk in ids if pk in features]),
+    ))
+
+
+def invalidate_project_features(ids):
+    cache.delete_many([CACHE_KEY.format(pk) for pk in ids])
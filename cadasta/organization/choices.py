@@ -10,3 +10,8 @@ ROLE_CHOICES = (('PU', _('Project User')),
 
 ACCESS_CHOICES = [("public", _("Public")),
                   ("private", _("Private"))]
+
+EXPORT_TYPE_CHOICES = (('all', _('All data')),
+                       ('xls', _('XLS')),
+                       ('shp', _('SHP')),
+                       ('res', _('Resources')))
@@ -0,0 +1,50 @@
+import os
+
+from django.conf import settings
+
+from .resources import ResourceExporter, MIME_TYPE
+from .shape import ShapeExporter
+from .xls import XLSExporter
+from .zipstream import ZipStream
+
+
+def export_project(project, type, file_name, progress=None):
+    """Writes a project export of the given type (``xls``, ``shp``,
+    ``res`` or ``all``) and returns the path and MIME type of the file.
+    ``progress`` is called with a percentage after each completed step."""
+    def report(percent):
+        if progress is not None:
+            progress(percent)
+
+    if type == 'shp':
+        e = ShapeExporter(project)
+        path, mime = e.make_download(file_name + '-shp')
+    elif type == 'xls':
+        e = XLSExporter(project)
+        path, mime = e.make_download(file_name + '-xls')
+    elif type == 'res':
+        e = ResourceExporter(project)
+        path, mime = e.make_download(file_name + '-res')
+    elif type == 'all':
+        res_exporter = ResourceExporter(project)
+        xls_exporter = XLSExporter(project)
+        shp_exporter = ShapeExporter(project)
+        path = os.path.join(settings.MEDIA_ROOT,
+                            'temp/{}.zip'.format(file_name))
+        mime = MIME_TYPE
+
+        # All parts go into one archive as they are made. The workbook
+        # and the shapefile archive are compressed already and are
+        # stored as they are.
+        with open(path, 'wb') as f, ZipStream(f) as myzip:
+            res_exporter.write_resources(myzip, file_name + '-res')
+            report(40)
+            data_path, _ = xls_exporter.make_download(file_name + '-xls')
+            myzip.write(data_path, arcname='data.xlsx')
+            report(60)
+            shp_path, _ = shp_exporter.make_download(file_name + '-shp')
+            myzip.write(shp_path, arcname='data-shp.zip')
+            report(80)
+
+    report(100)
+    return path, mime
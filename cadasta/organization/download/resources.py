@@ -1,12 +1,23 @@
 import os
+from collections import defaultdict
 from openpyxl import Workbook
-from zipfile import ZipFile
 from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg
 
 from resources.models import Resource, ContentObject
+from resources.utils.io import iter_file
+from .zipstream import ZipStream
 
 MIME_TYPE = 'application/zip'
 
+# Columns of the resource worksheet that list linked objects, by the model
+# of the linked objects
+LINK_COLUMNS = {
+    'spatialunit': 'locations',
+    'party': 'parties',
+    'tenurerelationship': 'rels',
+}
+
 
 class ResourceExporter():
     def __init__(self, project):
@@ -28,37 +39,44 @@ class ResourceExporter():
 
         return path
 
-    def pack_resource_data(self, res):
-        locations = []
-        parties = []
-        rels = []
-        links = ContentObject.objects.filter(resource=res).values_list(
-            'object_id', 'content_type__model')
-        for l in links:
-            if l[1] == 'spatialunit':
-                locations.append(l[0])
-            elif l[1] == 'party':
-                parties.append(l[0])
-            elif l[1] == 'tenurerelationship':
-                rels.append(l[0])
-
+    def get_links(self):
+        """Returns the IDs of the objects linked to each resource of the
+        project, grouped by column, with a single query."""
+        links = defaultdict(lambda: defaultdict(list))
+        rows = ContentObject.objects.filter(
+            resource__project=self.project,
+            content_type__model__in=LINK_COLUMNS
+        ).values('resource_id', 'content_type__model').annotate(
+            ids=ArrayAgg('object_id'))
+        for row in rows:
+            column = LINK_COLUMNS[row['content_type__model']]
+            links[row['resource_id']][column] = sorted(row['ids'])
+        return links
+
+    def pack_resource_data(self, res, links):
         return [res.id, res.name, res.description, res.original_file,
-                ', '.join(locations), ', '.join(parties), ', '.join(rels)]
-
-    def make_download(self, f_name):
-        path = os.path.join(settings.MEDIA_ROOT,
-                            'temp/{}.zip'.format(f_name))
+                ', '.join(links['locations']), ', '.join(links['parties']),
+                ', '.join(links['rels'])]
 
+    def write_resources(self, zipstream, f_name):
+        """Adds the files of all resources and the resource worksheet to
+        ``zipstream``."""
+        links = self.get_links()
         resources = Resource.objects.filter(project=self.project)
         res_data = []
 
-        with ZipFile(path, 'a') as myzip:
-            for r in resources:
-                res_data.append(self.pack_resource_data(r))
-                myzip.write(r.file.open().name, arcname=r.original_file)
+        for r in resources.iterator():
+            res_data.append(self.pack_resource_data(r, links[r.id]))
+            zipstream.write_chunks(r.original_file, iter_file(r.file))
+
+        resources_xls = self.make_resource_worksheet(f_name, res_data)
+        zipstream.write(resources_xls, arcname='resources.xlsx')
+
+    def make_download(self, f_name):
+        path = os.path.join(settings.MEDIA_ROOT,
+                            'temp/{}.zip'.format(f_name))
 
-            resources_xls = self.make_resource_worksheet(f_name, res_data)
-            myzip.write(resources_xls, arcname='resources.xlsx')
-            myzip.close()
+        with open(path, 'wb') as f, ZipStream(f) as myzip:
+            self.write_resources(myzip, f_name)
 
         return path, MIME_TYPE
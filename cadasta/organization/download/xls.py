@@ -1,5 +1,6 @@
 import os
 from openpyxl import Workbook
+from core.util import queryset_iterator
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 
@@ -10,6 +11,11 @@ MIME_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
 
 
 class XLSExporter(Exporter):
+    chunk_size = 1000
+
+    def iterate(self, queryset):
+        return queryset_iterator(queryset, chunk_size=self.chunk_size)
+
     def write_items(self, worksheet, queryset, content_type, model_attrs):
         schema_attrs = self.get_schema_attrs(content_type)
 
@@ -23,7 +29,7 @@ class XLSExporter(Exporter):
 
     def write_locations(self):
         worksheet = self.workbook.create_sheet(title='locations')
-        locations = self.project.spatial_units.all()
+        locations = self.iterate(self.project.spatial_units.all())
         content_type = ContentType.objects.get(app_label='spatial',
                                                model='spatialunit')
         self.write_items(worksheet, locations, content_type,
@@ -31,7 +37,7 @@ class XLSExporter(Exporter):
 
     def write_parties(self):
         worksheet = self.workbook.create_sheet(title='parties')
-        parties = self.project.parties.all()
+        parties = self.iterate(self.project.parties.all())
         content_type = ContentType.objects.get(app_label='party',
                                                model='party')
         self.write_items(worksheet, parties, content_type,
@@ -39,7 +45,8 @@ class XLSExporter(Exporter):
 
     def write_relationships(self):
         worksheet = self.workbook.create_sheet(title='relationships')
-        relationships = self.project.tenure_relationships.all()
+        relationships = self.iterate(
+            self.project.tenure_relationships.select_related('tenure_type'))
         content_type = ContentType.objects.get(app_label='party',
                                                model='tenurerelationship')
         self.write_items(worksheet, relationships, content_type,
@@ -47,8 +54,9 @@ class XLSExporter(Exporter):
 
     def make_download(self, f_name):
         path = os.path.join(settings.MEDIA_ROOT, 'temp/{}.xlsx'.format(f_name))
-        self.workbook = Workbook()
-        self.workbook.remove_sheet(self.workbook['Sheet'])
+        # Rows of a write-only workbook are written to a temporary file as
+        # they are appended, so memory use does not grow with the project.
+        self.workbook = Workbook(write_only=True)
 
         self.write_locations()
         self.write_parties()
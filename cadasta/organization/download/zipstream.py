@@ -0,0 +1,209 @@
+"""A zip writer that only ever appends to its output.
+
+``zipfile.ZipFile`` needs to seek back to a member's header once the
+member has been written, so it can only write to local files (or to a
+buffer holding the whole archive), and the content of a member has to be
+available as a local file or as a single ``bytes`` object. ``ZipStream``
+writes the CRC and sizes of each member in a data descriptor after its
+content instead, which lets it write to any object with a ``write``
+method (an open file, a storage upload or an HTTP response) and take the
+content of each member as a sequence of chunks.
+
+"""
+
+import os
+import struct
+import time
+import zlib
+from zipfile import LargeZipFile
+
+# Files in these formats are compressed already; deflating them again
+# costs time and does not make them any smaller.
+COMPRESSED_EXTENSIONS = {
+    '.7z', '.aac', '.avi', '.docx', '.gif', '.gz', '.jpeg', '.jpg', '.m4a',
+    '.mkv', '.mov', '.mp3', '.mp4', '.mpeg', '.mpg', '.odp', '.ods', '.odt',
+    '.oga', '.ogg', '.ogv', '.pdf', '.png', '.pptx', '.rar', '.webm',
+    '.webp', '.xlsx', '.zip',
+}
+
+CHUNK_SIZE = 64 * 1024
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+ZIP32_LIMIT = 0xFFFFFFFF
+ZIP32_MAX_ENTRIES = 0xFFFF
+
+# Bit 3: sizes and CRC follow the content; bit 11: the name is UTF-8
+FLAGS = 0x08 | 0x800
+VERSION = 20
+VERSION_ZIP64 = 45
+# Created on Unix, so that the permissions below are used when extracting
+CREATE_SYSTEM = 3
+EXTERNAL_ATTR = 0o100644 << 16
+
+LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+DATA_DESCRIPTOR = struct.Struct('<IIII')
+DATA_DESCRIPTOR_ZIP64 = struct.Struct('<IIQQ')
+CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+END_RECORD = struct.Struct('<IHHHHIIH')
+END_RECORD_ZIP64 = struct.Struct('<IQHHIIQQQQ')
+END_LOCATOR_ZIP64 = struct.Struct('<IIQI')
+
+
+def should_compress(name):
+    """Returns whether a member called ``name`` is worth deflating."""
+    ext = os.path.splitext(name)[1].lower()
+    return ext not in COMPRESSED_EXTENSIONS
+
+
+def dos_date_time(timestamp=None):
+    t = time.localtime(timestamp)
+    return (((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday,
+            (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2))
+
+
+def read_chunks(file, chunk_size=CHUNK_SIZE):
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+class ZipStream:
+    """Writes a zip archive to ``output`` member by member.
+
+    ``write_chunks`` adds a member from an iterable of ``bytes``;
+    ``write`` and ``writestr`` add a local file and a string. Each member
+    is deflated unless its name shows that it is compressed already.
+    Members that are larger than 4GB must be announced by passing their
+    ``size``. ``close`` writes the central directory and must be called
+    once all members have been added; the output itself is not closed.
+    """
+
+    def __init__(self, output):
+        self.output = output
+        self.offset = 0
+        self.members = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+    def _write(self, data):
+        self.output.write(data)
+        self.offset += len(data)
+
+    def write_chunks(self, arcname, chunks, compress=None, size=None,
+                     timestamp=None):
+        if compress is None:
+            compress = should_compress(arcname)
+        method = ZIP_DEFLATED if compress else ZIP_STORED
+        zip64 = size is not None and size >= ZIP32_LIMIT
+        name = arcname.encode('utf-8')
+        date, time_ = dos_date_time(timestamp)
+        header_offset = self.offset
+
+        extra = b''
+        if zip64:
+            # The sizes follow in the zip64 data descriptor
+            extra = struct.pack('<HHQQ', 1, 16, 0, 0)
+        self._write(LOCAL_HEADER.pack(
+            0x04034b50, VERSION_ZIP64 if zip64 else VERSION, FLAGS, method,
+            time_, date, 0, ZIP32_LIMIT if zip64 else 0,
+            ZIP32_LIMIT if zip64 else 0, len(name), len(extra)))
+        self._write(name)
+        self._write(extra)
+
+        crc = 0
+        file_size = 0
+        compress_size = 0
+        compressor = (zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION,
+                                       zlib.DEFLATED, -15)
+                      if compress else None)
+        for chunk in chunks:
+            crc = zlib.crc32(chunk, crc)
+            file_size += len(chunk)
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            compress_size += len(chunk)
+            if chunk:
+                self._write(chunk)
+        if compressor is not None:
+            chunk = compressor.flush()
+            compress_size += len(chunk)
+            self._write(chunk)
+
+        if not zip64 and max(file_size, compress_size) >= ZIP32_LIMIT:
+            raise LargeZipFile(
+                "{} is larger than 4GB but its size was not given".format(
+                    arcname))
+        descriptor = DATA_DESCRIPTOR_ZIP64 if zip64 else DATA_DESCRIPTOR
+        self._write(descriptor.pack(0x08074b50, crc & 0xFFFFFFFF,
+                                    compress_size, file_size))
+
+        self.members.append((name, method, date, time_, crc & 0xFFFFFFFF,
+                             compress_size, file_size, header_offset))
+
+    def write(self, path, arcname=None, compress=None):
+        """Adds the local file at ``path``."""
+        if arcname is None:
+            arcname = os.path.basename(path)
+        with open(path, 'rb') as f:
+            self.write_chunks(arcname, read_chunks(f), compress=compress,
+                              size=os.fstat(f.fileno()).st_size,
+                              timestamp=os.path.getmtime(path))
+
+    def writestr(self, arcname, data, compress=None):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.write_chunks(arcname, [data], compress=compress, size=len(data))
+
+    def close(self):
+        start = self.offset
+        zip64_archive = len(self.members) >= ZIP32_MAX_ENTRIES
+        for (name, method, date, time_, crc, compress_size, file_size,
+             header_offset) in self.members:
+            # Values that do not fit are moved to the zip64 extra field,
+            # in this order
+            values = []
+            if file_size >= ZIP32_LIMIT:
+                values.append(file_size)
+            if compress_size >= ZIP32_LIMIT:
+                values.append(compress_size)
+            if header_offset >= ZIP32_LIMIT:
+                values.append(header_offset)
+            extra = b''
+            if values:
+                zip64_archive = True
+                extra = struct.pack('<HH' + 'Q' * len(values),
+                                    1, 8 * len(values), *values)
+            version = VERSION_ZIP64 if values else VERSION
+            self._write(CENTRAL_HEADER.pack(
+                0x02014b50, (CREATE_SYSTEM << 8) | version, version, FLAGS,
+                method, time_, date, crc,
+                min(compress_size, ZIP32_LIMIT), min(file_size, ZIP32_LIMIT),
+                len(name), len(extra), 0, 0, 0, EXTERNAL_ATTR,
+                min(header_offset, ZIP32_LIMIT)))
+            self._write(name)
+            self._write(extra)
+
+        count = len(self.members)
+        size = self.offset - start
+        if start >= ZIP32_LIMIT or size >= ZIP32_LIMIT:
+            zip64_archive = True
+        if zip64_archive:
+            end_offset = self.offset
+            self._write(END_RECORD_ZIP64.pack(
+                0x06064b50, END_RECORD_ZIP64.size - 12,
+                (CREATE_SYSTEM << 8) | VERSION_ZIP64, VERSION_ZIP64,
+                0, 0, count, count, size, start))
+            self._write(END_LOCATOR_ZIP64.pack(0x07064b50, 0, end_offset, 1))
+        self._write(END_RECORD.pack(
+            0x06054b50, 0, 0,
+            min(count, ZIP32_MAX_ENTRIES), min(count, ZIP32_MAX_ENTRIES),
+            min(size, ZIP32_LIMIT), min(start, ZIP32_LIMIT), 0))
@@ -1,5 +1,4 @@
 import time
-from zipfile import ZipFile
 
 import magic
 from accounts.models import User
@@ -20,12 +19,11 @@ from questionnaires.models import Questionnaire
 from spatial.choices import TYPE_CHOICES as LOCATION_TYPE_CHOICES
 from tutelary.models import check_perms
 
-from .choices import ADMIN_CHOICES, ROLE_CHOICES
-from .download.resources import ResourceExporter
-from .download.shape import ShapeExporter
-from .download.xls import XLSExporter
+from .choices import ADMIN_CHOICES, EXPORT_TYPE_CHOICES, ROLE_CHOICES
+from .download.export import export_project
 from .fields import ContactsField, ProjectRoleField, PublicPrivateField
-from .models import Organization, OrganizationRole, Project, ProjectRole
+from .models import (ExportJob, Organization, OrganizationRole, Project,
+                     ProjectRole)
 
 FORM_CHOICES = (('Pb', _('Public User')),) + ROLE_CHOICES
 QUESTIONNAIRE_TYPES = [
@@ -441,8 +439,7 @@ class ProjectEditPermissions(PermissionsForm, forms.Form):
 
 
 class DownloadForm(forms.Form):
-    CHOICES = (('all', 'All data'), ('xls', 'XLS'), ('shp', 'SHP'),
-               ('res', 'Resources'))
+    CHOICES = EXPORT_TYPE_CHOICES
     type = forms.ChoiceField(choices=CHOICES, initial='xls')
 
     def __init__(self, project, user, *args, **kwargs):
@@ -454,31 +451,12 @@ class DownloadForm(forms.Form):
         t = round(time.time() * 1000)
 
         file_name = '{}-{}-{}'.format(self.project.id, self.user.id, t)
-        type = self.cleaned_data['type']
-
-        if type == 'shp':
-            e = ShapeExporter(self.project)
-            path, mime = e.make_download(file_name + '-shp')
-        elif type == 'xls':
-            e = XLSExporter(self.project)
-            path, mime = e.make_download(file_name + '-xls')
-        elif type == 'res':
-            e = ResourceExporter(self.project)
-            path, mime = e.make_download(file_name + '-res')
-        elif type == 'all':
-            res_exporter = ResourceExporter(self.project)
-            xls_exporter = XLSExporter(self.project)
-            shp_exporter = ShapeExporter(self.project)
-            path, mime = res_exporter.make_download(file_name + '-res')
-            data_path, _ = xls_exporter.make_download(file_name + '-xls')
-            shp_path, _ = shp_exporter.make_download(file_name + '-shp')
-
-            with ZipFile(path, 'a') as myzip:
-                myzip.write(data_path, arcname='data.xlsx')
-                myzip.write(shp_path, arcname='data-shp.zip')
-                myzip.close()
-
-        return path, mime
+        return export_project(
+            self.project, self.cleaned_data['type'], file_name)
+
+    def get_job(self):
+        return ExportJob.objects.get_or_enqueue(
+            self.project, self.user, self.cleaned_data['type'])
 
 
 class SelectImportForm(forms.Form):
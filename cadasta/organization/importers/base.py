@@ -1,6 +1,5 @@
 from django.conf import settings
-from django.contrib.contenttypes.models import ContentType
-from jsonattrs.models import Schema
+from questionnaires.cache import get_schema
 
 ATTRIBUTE_GROUPS = settings.ATTRIBUTE_GROUPS
 
@@ -25,32 +24,19 @@ class Importer():
             content_type_keys.append(content_type_key)
         return content_type_keys
 
-    def get_schema_attrs(self):
-        for attribute_group in ATTRIBUTE_GROUPS:
-            app_label = ATTRIBUTE_GROUPS[attribute_group]['app_label']
-            model = ATTRIBUTE_GROUPS[attribute_group]['model']
-            content_type_key = '{}.{}'.format(app_label, model)
-            content_type = ContentType.objects.get(
-                app_label=app_label, model=model)
-
-            if content_type_key not in self._schema_attrs.keys():
-                selectors = [
-                    self.project.organization.id,
-                    self.project.id,
-                    self.project.current_questionnaire
-                ]
-                schemas = Schema.objects.lookup(
-                    content_type=content_type, selectors=selectors
-                )
-                attrs = []
-                if schemas:
-                    attrs = [
-                        a for s in schemas
-                        for a in s.attributes.all() if not a.omit
-                    ]
-                self._schema_attrs[content_type_key] = attrs
-
-        return self._schema_attrs
+    def get_schema_attrs(self, party_type=None):
+        """Returns the attributes of each content type. Party attributes
+        are those of ``party_type``, or of all party types if it is not
+        given."""
+        if party_type not in self._schema_attrs:
+            schema = get_schema(self.project)
+            self._schema_attrs[party_type] = {
+                key: list(schema.get(
+                    key, party_type if key == 'party.party' else None
+                ).values())
+                for key in self.get_content_type_keys()
+            }
+        return self._schema_attrs[party_type]
 
     def import_data(self, config_dict, **kwargs):
         raise NotImplementedError(
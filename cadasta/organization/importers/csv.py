@@ -1,12 +1,16 @@
 import csv
 from collections import OrderedDict
 
-from django.db import transaction
+from core.history import buffered_history, bulk_create_history
+from core.util import random_id
+from django.conf import settings
+from django.db import models, router
 from django.utils.translation import ugettext as _
 from party.models import Party, TenureRelationship, TenureRelationshipType
 from spatial.models import SpatialUnit
-from xforms.utils import odk_geom_to_wkt
+from xforms.utils import odk_geom_to_ewkb
 
+from ..models import count_project_objects
 from . import base, exceptions
 
 CONTENT_TYPES = {
@@ -23,11 +27,13 @@ TENURE_TYPE = 'tenure_type'
 class CSVImporter(base.Importer):
 
     def __init__(self, project=None, path=None,
-                 delimiter=None, quotechar=None):
+                 delimiter=None, quotechar=None, batch_size=None):
         super(CSVImporter, self).__init__(project=project)
         self.path = path
         self.delimiter = ',' if not delimiter else delimiter
         self.quotechar = '|' if not quotechar else quotechar
+        self.batch_size = (settings.IMPORT_BATCH_SIZE
+                           if not batch_size else batch_size)
 
     def get_headers(self):
         headers = []
@@ -42,12 +48,12 @@ class CSVImporter(base.Importer):
         ]
         return headers
 
-    def get_attribute_map(self):
+    def get_attribute_map(self, party_type=None):
         headers = sorted([h.lower() for h in self.get_headers()])
         attribute_map = OrderedDict({})
         extra_attrs = []
         extra_headers = []
-        schema_attrs = self.get_schema_attrs()
+        schema_attrs = self.get_schema_attrs(party_type)
         found_attrs = {}
         for content_type in schema_attrs:
             attributes = schema_attrs[content_type]
@@ -71,17 +77,20 @@ class CSVImporter(base.Importer):
     def import_data(self, config_dict, **kwargs):
         content_types = dict(
             (key, {}) for key in self.get_content_type_keys())
+        party_type = config_dict['party_type']
         (attr_map,
-            extra_attrs, extra_headers) = self.get_attribute_map()
+            extra_attrs, extra_headers) = self.get_attribute_map(party_type)
         attributes = config_dict['attributes']
         party_name_field = config_dict['party_name_field']
-        party_type = config_dict['party_type']
         location_type = config_dict['location_type']
         geometry_type_field = config_dict['geometry_type_field']
         geometry_field = config_dict['geometry_field']
         path = config_dict['file']
+        tenure_types = dict(
+            (tt.id, tt) for tt in TenureRelationshipType.objects.all())
+        batch = ([], [], [])
         try:
-            with transaction.atomic():
+            with buffered_history():
                 with open(path, 'r', newline='') as csvfile:
                     reader = csv.reader(
                         csvfile, delimiter=self.delimiter,
@@ -102,7 +111,7 @@ class CSVImporter(base.Importer):
                             raise ValueError(
                                 _("Invalid geometry type")
                             )
-                        geometry = odk_geom_to_wkt(coords)
+                        geometry = odk_geom_to_ewkb(coords)
                         try:
                             tenure_type = row[
                                 csv_headers.index(TENURE_TYPE)]
@@ -110,6 +119,11 @@ class CSVImporter(base.Importer):
                             raise ValueError(
                                 _("No 'tenure_type' column found")
                             )
+                        tt = tenure_types.get(tenure_type)
+                        if tt is None:
+                            raise ValueError(
+                                _("Invalid tenure type: %s") % tenure_type
+                            )
                         content_types['party.party'] = {
                             'project': self.project,
                             'name': party_name,
@@ -123,7 +137,11 @@ class CSVImporter(base.Importer):
                             'attributes': {}
                         }
                         for attr in attributes:
-                            attribute, content_type, name = attr_map.get(attr)
+                            mapped = attr_map.get(attr)
+                            if mapped is None:
+                                # An attribute of another party type
+                                continue
+                            attribute, content_type, name = mapped
                             if (attribute is not None):
                                 val = row[csv_headers.index(attr)]
                                 if (not attribute.required and val == ""):
@@ -131,17 +149,44 @@ class CSVImporter(base.Importer):
                                 content_types[content_type][
                                     'attributes'][
                                         attribute.name] = val
-                        party = Party.objects.create(
-                            **content_types['party.party']
+                        party = Party(
+                            id=random_id(), **content_types['party.party']
                         )
-                        su = SpatialUnit.objects.create(
+                        su = SpatialUnit(
+                            id=random_id(),
                             **content_types['spatial.spatialunit']
                         )
-                        tt = TenureRelationshipType.objects.get(id=tenure_type)
-                        TenureRelationship.objects.create(
-                            project=self.project, party=party,
-                            spatial_unit=su, tenure_type=tt
+                        tenure = TenureRelationship(
+                            id=random_id(), project=self.project,
+                            party=party, spatial_unit=su, tenure_type=tt
                         )
+                        for objs, obj in zip(batch, (party, su, tenure)):
+                            objs.append(obj)
+                        if len(batch[0]) >= self.batch_size:
+                            self._bulk_insert(*batch)
+                            batch = ([], [], [])
+                    self._bulk_insert(*batch)
         except Exception as e:
             raise exceptions.DataImportError(
                 line_num=reader.line_num, error=e)
+
+    def _bulk_insert(self, parties, spatial_units, relationships):
+        """Writes one chunk of imported rows. ``bulk_create`` neither
+        calls ``save`` nor sends model signals, so the ``pre_save``
+        handlers (attribute schema checks, extent normalisation) are
+        dispatched here, and the historical records and project statistics
+        are updated in bulk.
+        """
+        for model, objs in ((Party, parties),
+                            (SpatialUnit, spatial_units),
+                            (TenureRelationship, relationships)):
+            if not objs:
+                continue
+            for obj in objs:
+                models.signals.pre_save.send(
+                    sender=model, instance=obj, raw=False,
+                    using=router.db_for_write(model), update_fields=None
+                )
+            model.objects.bulk_create(objs)
+            bulk_create_history(objs)
+            count_project_objects(model, self.project.id, len(objs))
@@ -0,0 +1,68 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+
+from ...models import PROJECT_STATISTICS, Project, ProjectStatistics
+
+
+def count_objects(projects):
+    """Counts the objects of the given projects with one grouped query per
+    counted model and returns a dict that maps project IDs to the field
+    values of their statistics."""
+    counts = {p: {f: 0 for f in PROJECT_STATISTICS.values()}
+              for p in projects.values_list('id', flat=True)}
+    for label, field in PROJECT_STATISTICS.items():
+        objects = apps.get_model(label).objects.filter(project__in=projects)
+        if field == 'num_resources':
+            objects = objects.filter(archived=False)
+        for project_id, number in objects.values_list(
+                'project_id').annotate(number=Count('pk')).order_by():
+            counts[project_id][field] = number
+    return counts
+
+
+class Command(BaseCommand):
+    help = """Counts the locations, parties, relationships and resources of
+    all projects, or of the projects of one organization, and corrects the
+    stored project statistics where they differ."""
+
+    def add_arguments(self, parser):
+        parser.add_argument('organization', nargs='?',
+                            help='Organization slug')
+        parser.add_argument('project', nargs='?', help='Project slug')
+
+    def handle(self, *args, **options):
+        projects = Project.objects.all()
+        if options['organization']:
+            projects = projects.filter(
+                organization__slug=options['organization'])
+        if options['project']:
+            projects = projects.filter(slug=options['project'])
+            if not projects.exists():
+                raise CommandError('Project not found.')
+
+        with transaction.atomic():
+            # Lock the statistics before counting, so that objects added
+            # in the meantime are counted by the signal handlers
+            stored = {s.project_id: s for s in ProjectStatistics.objects
+                      .select_for_update().filter(project__in=projects)}
+            counts = count_objects(projects)
+
+            missing = []
+            fixed = 0
+            for project_id, values in counts.items():
+                statistics = stored.get(project_id)
+                if statistics is None:
+                    missing.append(
+                        ProjectStatistics(project_id=project_id, **values))
+                elif any(getattr(statistics, f) != v
+                         for f, v in values.items()):
+                    ProjectStatistics.objects.filter(
+                        project_id=project_id).update(**values)
+                    fixed += 1
+            ProjectStatistics.objects.bulk_create(missing)
+
+        self.stdout.write(
+            'Counted {} project(s): corrected {}, added {}.'.format(
+                len(counts), fixed, len(missing)))
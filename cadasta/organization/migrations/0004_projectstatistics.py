@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.6 on 2016-10-18 14:37
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0003_exportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectStatistics',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='statistics', serialize=False, to='organization.Project')),
+                ('num_locations', models.IntegerField(default=0)),
+                ('num_parties', models.IntegerField(default=0)),
+                ('num_relationships', models.IntegerField(default=0)),
+                ('num_resources', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
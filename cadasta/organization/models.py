@@ -1,3 +1,6 @@
+import os
+
+from django.apps import apps
 from django.core.urlresolvers import reverse
 from django.conf import settings
 from django.db import models
@@ -6,19 +9,20 @@ from django.contrib.postgres.fields import JSONField, ArrayField
 from django.dispatch import receiver
 from django.utils.translation import ugettext as _
 import django.contrib.gis.db.models as gismodels
-from simple_history.models import HistoricalRecords
-from shapely.geometry import Polygon
-from shapely.wkt import dumps
 
 from tutelary.decorators import permissioned_model
 from tutelary.models import Policy
 
-from core.models import RandomIDModel, SlugModel
-from geography.models import WorldBorder
+from core.geometry import normalize_longitudes
+from core.history import HistoricalRecords
+from core.permissions import invalidate_user_roles
+from core.models import BackgroundJob, RandomIDModel, SlugModel
+from geography.models import find_country
 from resources.mixins import ResourceModelMixin
 from .validators import validate_contact
-from .choices import ROLE_CHOICES, ACCESS_CHOICES
+from .choices import ROLE_CHOICES, ACCESS_CHOICES, EXPORT_TYPE_CHOICES
 from . import messages
+from .cache import invalidate_project_features
 
 
 PERMISSIONS_DIR = settings.BASE_DIR + '/permissions/'
@@ -153,6 +157,15 @@ def remove_project_membership(sender, instance, **kwargs):
     reassign_user_policies(instance, False)
 
 
+@receiver(models.signals.post_save, sender=OrganizationRole)
+@receiver(models.signals.pre_delete, sender=OrganizationRole)
+@receiver(models.signals.post_delete, sender=OrganizationRole)
+def invalidate_org_role_cache(sender, instance, **kwargs):
+    # post_delete as well, so that roles cached by another request while
+    # the role was being deleted do not outlive it.
+    invalidate_user_roles(instance.user_id)
+
+
 @permissioned_model
 class Project(ResourceModelMixin, SlugModel, RandomIDModel):
     name = models.CharField(max_length=100)
@@ -252,40 +265,32 @@ class Project(ResourceModelMixin, SlugModel, RandomIDModel):
     def save(self, *args, **kwargs):
         if ((self.country is None or self.country == '') and
            self.extent is not None):
-            try:
-                self.country = WorldBorder.objects.get(
-                    mpoly__contains=self.extent.centroid
-                ).iso2
-            except:
-                pass
+            country = find_country(
+                normalize_longitudes(self.extent).centroid)
+            if country is not None:
+                self.country = country
         super().save(*args, **kwargs)
 
     def public(self):
         return self.access == 'public'
 
 
-def reassign_project_extent(instance):
-    coords = [list(x) for x in list(instance.extent.boundary.coords)]
-    for point in coords:
-        if point[0] >= -180 and point[0] <= 180:
-            return
-    while coords[0][0] < -180:
-        for point in coords:
-            point[0] += 360
-    while coords[0][0] > 180:
-        for point in coords:
-            point[0] -= 360
-    extent = []
-    for point in coords:
-        latlng = [point[0], point[1]]
-        extent.append(tuple(latlng))
-    instance.extent = dumps(Polygon(extent))
+@receiver(models.signals.post_save, sender=Organization)
+def invalidate_organization_project_features(sender, instance, **kwargs):
+    invalidate_project_features(
+        instance.projects.values_list('id', flat=True))
+
+
+@receiver(models.signals.post_save, sender=Project)
+@receiver(models.signals.post_delete, sender=Project)
+def invalidate_project_feature_cache(sender, instance, **kwargs):
+    invalidate_project_features([instance.id])
 
 
 @receiver(models.signals.pre_save, sender=Project)
 def check_extent(sender, instance, **kwargs):
     if instance.extent:
-        reassign_project_extent(instance)
+        instance.extent = normalize_longitudes(instance.extent)
 
 
 class ProjectRole(RandomIDModel):
@@ -341,3 +346,172 @@ def assign_project_permissions(sender, instance, **kwargs):
         assigned_policies.append(project_manager)
 
     instance.user.assign_policies(*assigned_policies)
+
+
+@receiver(models.signals.post_save, sender=ProjectRole)
+@receiver(models.signals.pre_delete, sender=ProjectRole)
+@receiver(models.signals.post_delete, sender=ProjectRole)
+def invalidate_project_role_cache(sender, instance, **kwargs):
+    invalidate_user_roles(instance.user_id)
+
+
+# Models whose history is checked to find out whether a project's data has
+# changed since an export was created, with the lookup to the project.
+EXPORTED_MODELS = (
+    ('spatial.SpatialUnit', 'project'),
+    ('party.Party', 'project'),
+    ('party.TenureRelationship', 'project'),
+    ('resources.Resource', 'project'),
+    ('resources.ContentObject', 'resource__project'),
+)
+
+
+def get_project_data_version(project):
+    """Returns the time of the latest change to any data that is included
+    in the project's exports. Deletions are taken into account because
+    they are recorded in the models' history."""
+    version = project.last_updated
+    for label, lookup in EXPORTED_MODELS:
+        model = apps.get_model(label)
+        latest = model.history.filter(**{lookup: project}).aggregate(
+            latest=models.Max('history_date'))['latest']
+        if latest is not None and (version is None or latest > version):
+            version = latest
+    return version
+
+
+class ExportJobManager(models.Manager):
+
+    def get_or_enqueue(self, project, user, type):
+        """Returns a queued, running or finished export of the project's
+        current data, or queues a new export job if there is none. Jobs
+        whose worker stopped reporting are queued again first."""
+        ExportJob.requeue_stale()
+        version = get_project_data_version(project)
+        jobs = self.filter(
+            project=project, type=type, data_version=version
+        ).exclude(status=ExportJob.FAILED).order_by('-created_date')
+
+        for job in jobs:
+            if job.status != ExportJob.DONE or job.file_exists:
+                return job
+
+        return self.create(project=project, user=user, type=type,
+                           data_version=version)
+
+
+class ExportJob(BackgroundJob):
+    project = models.ForeignKey(Project, related_name='export_jobs')
+    user = models.ForeignKey('accounts.User', related_name='export_jobs')
+    type = models.CharField(max_length=3, choices=EXPORT_TYPE_CHOICES)
+    data_version = models.DateTimeField(null=True, blank=True)
+    file = models.CharField(max_length=255, blank=True, default='')
+    mime_type = models.CharField(max_length=100, blank=True, default='')
+
+    objects = ExportJobManager()
+
+    def __str__(self):
+        return "<ExportJob: {project} ({type})>".format(
+            project=self.project.name, type=self.type)
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def file_exists(self):
+        return bool(self.file) and os.path.exists(self.file)
+
+    def run(self):
+        from .download.export import export_project
+
+        file_name = '{}-{}-{}'.format(self.project.id, self.user.id, self.id)
+        self.file, self.mime_type = export_project(
+            self.project, self.type, file_name, progress=self.set_progress)
+
+
+# Models counted in the project statistics, with the field of
+# ProjectStatistics that holds their number. Archived objects are not
+# counted.
+PROJECT_STATISTICS = {
+    'spatial.SpatialUnit': 'num_locations',
+    'party.Party': 'num_parties',
+    'party.TenureRelationship': 'num_relationships',
+    'resources.Resource': 'num_resources',
+}
+
+
+class ProjectStatisticsManager(models.Manager):
+
+    def recount(self, project):
+        """Counts the objects of the project from scratch and stores the
+        result."""
+        counts = {}
+        for label, field in PROJECT_STATISTICS.items():
+            objects = apps.get_model(label).objects.filter(project=project)
+            if field == 'num_resources':
+                objects = objects.filter(archived=False)
+            counts[field] = objects.count()
+        statistics, _ = self.update_or_create(project_id=project.pk,
+                                              defaults=counts)
+        return statistics
+
+    def get_for_project(self, project):
+        """Returns the statistics of the project, counting its objects if
+        they have not been counted before."""
+        try:
+            return project.statistics
+        except ProjectStatistics.DoesNotExist:
+            return self.recount(project)
+
+    def add(self, project_id, **deltas):
+        """Adds the given numbers to the counters of the project with a
+        single ``UPDATE``. Nothing is changed if the project has not been
+        counted yet; its objects are counted when the statistics are
+        first read."""
+        self.filter(project_id=project_id).update(
+            **{f: models.F(f) + d for f, d in deltas.items()})
+
+
+class ProjectStatistics(models.Model):
+    project = models.OneToOneField(Project, primary_key=True,
+                                   related_name='statistics')
+    num_locations = models.IntegerField(default=0)
+    num_parties = models.IntegerField(default=0)
+    num_relationships = models.IntegerField(default=0)
+    num_resources = models.IntegerField(default=0)
+
+    objects = ProjectStatisticsManager()
+
+    def __str__(self):
+        return "<ProjectStatistics: {}>".format(self.project.name)
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def has_content(self):
+        return (self.num_locations > 0 or self.num_parties > 0 or
+                self.num_resources > 0)
+
+
+def count_project_objects(model, project_id, number):
+    """Updates the statistics of the project after ``number`` objects of
+    ``model`` were added to it (or removed from it, if ``number`` is
+    negative)."""
+    field = PROJECT_STATISTICS[model._meta.label]
+    ProjectStatistics.objects.add(project_id, **{field: number})
+
+
+def count_created_object(sender, instance, created, **kwargs):
+    if created and not getattr(instance, 'archived', False):
+        count_project_objects(sender, instance.project_id, 1)
+
+
+def count_deleted_object(sender, instance, **kwargs):
+    if not getattr(instance, 'archived', False):
+        count_project_objects(sender, instance.project_id, -1)
+
+
+for label in PROJECT_STATISTICS:
+    models.signals.post_save.connect(count_created_object, sender=label)
+    models.signals.post_delete.connect(count_deleted_object, sender=label)
@@ -13,7 +13,8 @@ from django_countries.serializer_fields import CountryField
 from core.serializers import DetailSerializer, FieldSelectorSerializer
 from accounts.models import User
 from accounts.serializers import UserSerializer
-from .models import Organization, Project, OrganizationRole, ProjectRole
+from .models import (ExportJob, Organization, Project, OrganizationRole,
+                     ProjectRole, ProjectStatistics)
 
 
 class OrganizationSerializer(DetailSerializer, FieldSelectorSerializer,
@@ -56,10 +57,22 @@ class OrganizationSerializer(DetailSerializer, FieldSelectorSerializer,
         return org
 
 
+class ProjectStatisticsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProjectStatistics
+        fields = ('num_locations', 'num_parties', 'num_relationships',
+                  'num_resources')
+
+
 class ProjectSerializer(DetailSerializer, serializers.ModelSerializer):
     users = UserSerializer(many=True, read_only=True)
     organization = OrganizationSerializer(hide_detail=True, read_only=True)
     country = CountryField(required=False)
+    statistics = serializers.SerializerMethodField()
+
+    def get_statistics(self, project):
+        statistics = ProjectStatistics.objects.get_for_project(project)
+        return ProjectStatisticsSerializer(statistics).data
 
     def validate_name(self, value):
 
@@ -94,9 +107,10 @@ class ProjectSerializer(DetailSerializer, serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = ('id', 'organization', 'country', 'name', 'description',
-                  'archived', 'urls', 'contacts', 'users', 'access', 'slug')
+                  'archived', 'urls', 'contacts', 'users', 'access', 'slug',
+                  'statistics')
         read_only_fields = ('id', 'country', 'slug')
-        detail_only_fields = ('users',)
+        detail_only_fields = ('users', 'statistics')
 
         # Suppress automatic model-derived UniqueTogetherValidator because
         # organization is a read-only field in the serializer.
@@ -312,3 +326,23 @@ class UserAdminSerializer(UserSerializer):
         model = User
         fields = ('username', 'full_name', 'email',
                   'organizations', 'last_login', 'is_active')
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = ('id', 'type', 'status', 'progress', 'error',
+                  'created_date', 'finished_date', 'download_url')
+        read_only_fields = ('id', 'status', 'progress', 'error',
+                            'created_date', 'finished_date')
+
+    def get_download_url(self, job):
+        if job.status != ExportJob.DONE:
+            return None
+        return reverse(
+            'organization:project-download-file',
+            kwargs={'organization': job.project.organization.slug,
+                    'project': job.project.slug,
+                    'job': job.id})
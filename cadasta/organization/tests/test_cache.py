@@ -0,0 +1,90 @@
+from django.contrib.gis.geos import GEOSGeometry
+from django.core.cache import cache
+from django.test import TestCase
+
+from ..cache import CACHE_KEY, get_project_features, get_projects_geojson
+from ..models import Project
+from .factories import OrganizationFactory, ProjectFactory
+
+EXTENT = ('SRID=4326;POLYGON((-5.1 8.1, -5.0 7.6, -4.6 7.8, -4.8 8.2, '
+          '-5.1 8.1))')
+
+
+class ProjectFeaturesTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.org = OrganizationFactory.create(name='Org', slug='org')
+        self.project = ProjectFactory.create(
+            name='Project', slug='project', organization=self.org,
+            extent=EXTENT)
+        ProjectFactory.create(organization=self.org)
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def test_features(self):
+        features = get_project_features([self.project.id])
+        assert list(features) == [self.project.id]
+        feature = features[self.project.id]
+        assert feature['properties']['name'] == 'Project'
+        assert feature['properties']['org'] == 'Org'
+        assert feature['properties']['url'] == (
+            '/organizations/org/projects/project/')
+        assert cache.get(CACHE_KEY.format(self.project.id)) == feature
+
+        with self.assertNumQueries(0):
+            assert get_project_features([self.project.id]) == features
+
+    def test_only_missing_features_are_loaded(self):
+        other = ProjectFactory.create(organization=self.org, name='Another',
+                                      extent=EXTENT)
+        get_project_features([self.project.id])
+        cache.set(CACHE_KEY.format(self.project.id), 'cached')
+
+        features = get_project_features([self.project.id, other.id])
+        assert features[self.project.id] == 'cached'
+        assert features[other.id]['properties']['name'] == 'Another'
+
+    def test_extent_is_simplified(self):
+        # A dent of a few metres, which is not visible on the map
+        extent = GEOSGeometry(
+            'SRID=4326;POLYGON((0 0, 0.5 0.00001, 1 0, 1 1, 0 1, 0 0))')
+        ProjectFactory.create(organization=self.org, name='Detail',
+                              extent=extent)
+        project = Project.objects.get(name='Detail')
+        coords = get_project_features([project.id])[project.id][
+            'geometry']['coordinates']
+        assert len(coords[0]) == 5
+
+    def test_geojson(self):
+        other = ProjectFactory.create(organization=self.org, name='Another',
+                                      extent=EXTENT)
+        get_project_features([self.project.id, other.id])
+
+        with self.assertNumQueries(1):
+            geojson = get_projects_geojson(Project.objects.all())
+        assert geojson['type'] == 'FeatureCollection'
+        assert [f['properties']['name'] for f in geojson['features']] == [
+            'Another', 'Project']
+
+        geojson = get_projects_geojson(Project.objects.filter(pk=other.pk))
+        assert [f['properties']['name'] for f in geojson['features']] == [
+            'Another']
+
+    def test_saves_invalidate_features(self):
+        get_project_features([self.project.id])
+        self.project.name = 'Renamed'
+        self.project.save()
+        assert get_project_features([self.project.id])[self.project.id][
+            'properties']['name'] == 'Renamed'
+
+        self.org.name = 'Renamed org'
+        self.org.save()
+        assert get_project_features([self.project.id])[self.project.id][
+            'properties']['org'] == 'Renamed org'
+
+        project_id = self.project.id
+        self.project.delete()
+        assert cache.get(CACHE_KEY.format(project_id)) is None
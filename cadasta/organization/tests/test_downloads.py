@@ -3,11 +3,14 @@ import time
 import os
 import csv
 from openpyxl import load_workbook, Workbook
-from zipfile import ZipFile
+from io import BytesIO
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
 
 from django.test import TestCase
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from jsonattrs.models import Attribute, AttributeType, Schema
 
@@ -26,6 +29,7 @@ from ..download.base import Exporter
 from ..download.xls import XLSExporter
 from ..download.resources import ResourceExporter
 from ..download.shape import ShapeExporter
+from ..download.zipstream import ZipStream, should_compress
 
 
 class BaseExporterTest(UserTestCase, TestCase):
@@ -434,6 +438,49 @@ class XLSTest(UserTestCase, TestCase):
         assert (mime == 'application/vnd.openxmlformats-officedocument.'
                         'spreadsheetml.sheet')
 
+    def test_make_download_with_data(self):
+        ensure_dirs()
+        project = ProjectFactory.create()
+        tenure_type = TenureRelationshipType.objects.get(id='FH')
+        relationships = TenureRelationshipFactory.create_batch(
+            3, project=project, tenure_type=tenure_type)
+
+        exporter = XLSExporter(project)
+        exporter.chunk_size = 2
+        path, mime = exporter.make_download('file')
+
+        wb = load_workbook(filename=path, read_only=True)
+        assert wb.get_sheet_names() == [
+            'locations', 'parties', 'relationships']
+
+        rows = list(wb['parties'].rows)
+        assert len(rows) == 4
+        assert (sorted(row[0].value for row in rows[1:]) ==
+                sorted(r.party.id for r in relationships))
+
+        rows = list(wb['relationships'].rows)
+        assert len(rows) == 4
+        assert [c.value for c in rows[0]] == [
+            'party_id', 'spatial_unit_id', 'tenure_type.label']
+        assert all(row[2].value == tenure_type.label for row in rows[1:])
+
+    def test_write_relationships_fetches_tenure_types(self):
+        project = ProjectFactory.create()
+
+        def count_queries():
+            exporter = XLSExporter(project)
+            exporter.workbook = Workbook()
+            with CaptureQueriesContext(connection) as context:
+                exporter.write_relationships()
+            return len(context.captured_queries)
+
+        TenureRelationshipFactory.create_batch(2, project=project)
+        count_queries()  # warm up the schema cache
+        num_queries = count_queries()
+
+        TenureRelationshipFactory.create_batch(5, project=project)
+        assert count_queries() == num_queries
+
 
 @pytest.mark.usefixtures('clear_temp')
 @pytest.mark.usefixtures('make_dirs')
@@ -466,11 +513,12 @@ class ResourcesTest(UserTestCase, TestCase):
             assert sheet[chr(i + 97) + '2'].value == data[0][i]
             assert sheet[chr(i + 97) + '3'].value == data[1][i]
 
-    def test_pack_resource_data(self):
+    def test_get_links(self):
         project = ProjectFactory.create()
         exporter = ResourceExporter(project)
 
         res = ResourceFactory.create(project=project)
+        res2 = ResourceFactory.create(project=project)
         loc = SpatialUnitFactory.create(project=project)
         loc2 = SpatialUnitFactory.create(project=project)
         par = PartyFactory.create(project=project)
@@ -480,16 +528,25 @@ class ResourcesTest(UserTestCase, TestCase):
         ContentObject.objects.create(resource=res, content_object=loc2)
         ContentObject.objects.create(resource=res, content_object=par)
         ContentObject.objects.create(resource=res, content_object=rel)
+        ContentObject.objects.create(resource=res2, content_object=loc)
+
+        with self.assertNumQueries(1):
+            links = exporter.get_links()
+        assert links[res.id]['locations'] == sorted([loc.id, loc2.id])
+        assert links[res.id]['parties'] == [par.id]
+        assert links[res.id]['rels'] == [rel.id]
+        assert links[res2.id]['locations'] == [loc.id]
+        assert links[res2.id]['parties'] == []
+
+    def test_pack_resource_data(self):
+        project = ProjectFactory.create()
+        exporter = ResourceExporter(project)
+        res = ResourceFactory.create(project=project)
+        links = {'locations': ['l1', 'l2'], 'parties': ['p1'], 'rels': []}
 
-        packed = exporter.pack_resource_data(res)
-        assert packed[0] == res.id
-        assert packed[1] == res.name
-        assert packed[2] == res.description
-        assert packed[3] == res.original_file
-        assert loc.id in packed[4]
-        assert loc2.id in packed[4]
-        assert par.id in packed[5]
-        assert rel.id in packed[6]
+        packed = exporter.pack_resource_data(res, links)
+        assert packed == [res.id, res.name, res.description,
+                          res.original_file, 'l1, l2', 'p1', '']
 
     def test_make_download(self):
         ensure_dirs()
@@ -507,3 +564,41 @@ class ResourcesTest(UserTestCase, TestCase):
             assert len(testzip.namelist()) == 2
             assert res.original_file in testzip.namelist()
             assert 'resources.xlsx' in testzip.namelist()
+            assert testzip.testzip() is None
+            assert (testzip.getinfo('resources.xlsx').compress_type ==
+                    ZIP_STORED)
+
+
+class ZipStreamTest(TestCase):
+    def test_should_compress(self):
+        assert should_compress('locations.csv') is True
+        assert should_compress('README') is True
+        assert should_compress('photo.JPG') is False
+        assert should_compress('data-shp.zip') is False
+
+    def test_write_to_unseekable_output(self):
+        class Output:
+            def __init__(self):
+                self.chunks = []
+
+            def write(self, data):
+                self.chunks.append(data)
+
+        output = Output()
+        with ZipStream(output) as myzip:
+            myzip.writestr('README.txt', 'Read me ' * 100)
+            myzip.write_chunks('photo.jpg', [b'\xff\xd8', b'\x00' * 100])
+            myzip.write_chunks('empty.csv', [])
+
+        with ZipFile(BytesIO(b''.join(output.chunks)), 'r') as testzip:
+            assert testzip.namelist() == ['README.txt', 'photo.jpg',
+                                          'empty.csv']
+            assert testzip.testzip() is None
+            assert testzip.read('README.txt') == b'Read me ' * 100
+            assert testzip.read('photo.jpg') == b'\xff\xd8' + b'\x00' * 100
+            assert testzip.read('empty.csv') == b''
+
+            readme = testzip.getinfo('README.txt')
+            assert readme.compress_type == ZIP_DEFLATED
+            assert readme.compress_size < readme.file_size
+            assert testzip.getinfo('photo.jpg').compress_type == ZIP_STORED
@@ -1,6 +1,6 @@
 import os
 import random
-from zipfile import ZipFile
+from zipfile import ZipFile, ZIP_STORED
 
 from django.conf import settings
 from django.forms.utils import ErrorDict
@@ -1011,6 +1011,8 @@ class DownloadFormTest(UserTestCase, TestCase):
             assert 'resources.xlsx' in testzip.namelist()
             assert 'data.xlsx' in testzip.namelist()
             assert 'data-shp.zip' in testzip.namelist()
+            assert (testzip.getinfo('data-shp.zip').compress_type ==
+                    ZIP_STORED)
 
 
 class SelectImportFormTest(UserTestCase, TestCase):
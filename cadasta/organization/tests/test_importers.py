@@ -5,9 +5,11 @@ import pytest
 from buckets.test.storage import FakeS3Storage
 from core.tests.utils.cases import UserTestCase
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.contrib.gis.geos import LineString, Point, Polygon
-from jsonattrs.models import Attribute, Schema
+from jsonattrs.models import Attribute, AttributeType, Schema
 from party.models import Party, TenureRelationship
+from questionnaires.cache import CompiledAttribute
 from questionnaires.models import Questionnaire
 from resources.tests.utils import clear_temp  # noqa
 from spatial.models import SpatialUnit
@@ -56,6 +58,8 @@ class CSVImportTest(UserTestCase, TestCase):
         self.invalid_geom_type = (
             '/organization/tests/files/invalid_geom_type.csv')
         self.no_tenure_type = '/organization/tests/files/no_tenure_type.csv'
+        self.invalid_tenure_type = (
+            '/organization/tests/files/invalid_tenure_type.csv')
 
         self.project = ProjectFactory.create(name='Test CSV Import')
         storage = FakeS3Storage()
@@ -101,7 +105,7 @@ class CSVImportTest(UserTestCase, TestCase):
         assert len(extra_headers) == 10
         assert attr_map['class_hh'][1] == 'party.party'
         assert isinstance(attr_map[
-            'others_conflict'][0], Attribute)
+            'others_conflict'][0], CompiledAttribute)
 
     def test_import_data(self):
         importer = csv.CSVImporter(
@@ -129,6 +133,74 @@ class CSVImportTest(UserTestCase, TestCase):
         assert 'how_aquire_landwh' not in su.attributes.keys()
         assert 'how_aquire_landw' in su.attributes.keys()
 
+    def test_import_data_with_conditional_party_attributes(self):
+        questionnaire = Questionnaire.objects.get(project=self.project)
+        content_type = ContentType.objects.get(
+            app_label='party', model='party')
+        selectors = (self.project.organization.id, self.project.id,
+                     questionnaire.id)
+        text = AttributeType.objects.get(name='text')
+        Attribute.objects.create(
+            schema=Schema.objects.create(content_type=content_type,
+                                         selectors=selectors + ('IN',)),
+            name='present_add', long_name='Present address',
+            attr_type=text, index=0)
+        Attribute.objects.create(
+            schema=Schema.objects.create(content_type=content_type,
+                                         selectors=selectors + ('GR',)),
+            name='conflicts_resoulation', long_name='Conflict resolution',
+            attr_type=text, index=0, required=True)
+
+        importer = csv.CSVImporter(
+            project=self.project, path=self.path + self.valid_csv)
+        attr_map = importer.get_attribute_map(party_type='IN')[0]
+        assert 'present_add' in attr_map
+        assert 'conflicts_resoulation' not in attr_map
+
+        config_dict = {
+            'file': self.path + self.valid_csv,
+            'party_name_field': 'name_of_hh',
+            'party_type': 'IN',
+            'location_type': 'PA',
+            'geometry_type_field': 'geo_type',
+            'geometry_field': 'location_geometry',
+            'attributes': self.attributes + ['present_add',
+                                             'conflicts_resoulation'],
+            'project': self.project
+        }
+        importer.import_data(config_dict)
+        assert Party.objects.count() == 10
+        assert Party.objects.filter(
+            attributes__has_key='present_add').exists()
+        assert not Party.objects.filter(
+            attributes__has_key='conflicts_resoulation').exists()
+
+    def test_import_data_in_batches(self):
+        importer = csv.CSVImporter(
+            project=self.project, path=self.path + self.valid_csv,
+            batch_size=3)
+        config_dict = {
+            'file': self.path + self.valid_csv,
+            'party_name_field': 'name_of_hh',
+            'party_type': 'IN',
+            'location_type': 'PA',
+            'geometry_type_field': 'geo_type',
+            'geometry_field': 'location_geometry',
+            'attributes': self.attributes,
+            'project': self.project
+        }
+        importer.import_data(config_dict)
+        assert Party.objects.all().count() == 10
+        assert SpatialUnit.objects.all().count() == 10
+        assert TenureRelationship.objects.all().count() == 10
+        assert Party.history.filter(history_type='+').count() == 10
+        assert SpatialUnit.history.filter(history_type='+').count() == 10
+        assert TenureRelationship.history.filter(
+            history_type='+').count() == 10
+        for tenure in TenureRelationship.objects.all():
+            assert tenure.party.project == self.project
+            assert tenure.spatial_unit.project == self.project
+
     def test_import_with_geoshape(self):
         importer = csv.CSVImporter(
             project=self.project, path=self.path + self.geoshape_csv)
@@ -255,3 +327,24 @@ class CSVImportTest(UserTestCase, TestCase):
         assert Party.objects.all().count() == 0
         assert SpatialUnit.objects.all().count() == 0
         assert TenureRelationship.objects.all().count() == 0
+
+    def test_import_with_invalid_tenure_type(self):
+        importer = csv.CSVImporter(
+            project=self.project, path=self.path + self.invalid_tenure_type)
+        config_dict = {
+            'file': self.path + self.invalid_tenure_type,
+            'party_name_field': 'name_of_hh',
+            'party_type': 'IN',
+            'location_type': 'PA',
+            'geometry_type_field': 'geo_type',
+            'geometry_field': 'location_geometry',
+            'attributes': self.attributes,
+            'project': self.project
+        }
+        with pytest.raises(exceptions.DataImportError) as e:
+            importer.import_data(config_dict)
+        assert str(e.value) == ("Error importing file at line 3: "
+                                "Invalid tenure type: XX")
+        assert Party.objects.all().count() == 0
+        assert SpatialUnit.objects.all().count() == 0
+        assert TenureRelationship.objects.all().count() == 0
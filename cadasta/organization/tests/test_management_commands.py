@@ -0,0 +1,57 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from party.tests.factories import PartyFactory
+from spatial.tests.factories import SpatialUnitFactory
+from .factories import ProjectFactory
+from ..models import ProjectStatistics
+
+
+class ReconcileStatisticsTest(TestCase):
+    def setUp(self):
+        self.project = ProjectFactory.create()
+        self.other = ProjectFactory.create()
+        self.empty = ProjectFactory.create()
+        ProjectStatistics.objects.get_for_project(self.project)
+        ProjectStatistics.objects.get_for_project(self.empty)
+        SpatialUnitFactory.create_batch(2, project=self.project)
+        PartyFactory.create(project=self.project)
+        SpatialUnitFactory.create(project=self.other)
+        # Queryset updates skip the signal handlers
+        ProjectStatistics.objects.filter(project=self.project).update(
+            num_locations=10)
+
+    def call(self, *args):
+        out = StringIO()
+        call_command('reconcilestatistics', *args, stdout=out)
+        return out.getvalue()
+
+    def test_reconcile_all_projects(self):
+        out = self.call()
+        assert 'Counted 3 project(s): corrected 1, added 1.' in out
+
+        statistics = ProjectStatistics.objects.get(project=self.project)
+        assert statistics.num_locations == 2
+        assert statistics.num_parties == 1
+        statistics = ProjectStatistics.objects.get(project=self.other)
+        assert statistics.num_locations == 1
+        statistics = ProjectStatistics.objects.get(project=self.empty)
+        assert statistics.num_locations == 0
+
+        out = self.call()
+        assert 'Counted 3 project(s): corrected 0, added 0.' in out
+
+    def test_reconcile_project(self):
+        out = self.call(self.project.organization.slug, self.project.slug)
+        assert 'Counted 1 project(s): corrected 1, added 0.' in out
+        assert ProjectStatistics.objects.get(
+            project=self.project).num_locations == 2
+        assert ProjectStatistics.objects.filter(
+            project=self.other).exists() is False
+
+    def test_project_not_found(self):
+        with pytest.raises(CommandError):
+            self.call(self.project.organization.slug, 'unknown')
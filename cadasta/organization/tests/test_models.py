@@ -1,13 +1,27 @@
+import os
+from datetime import timedelta
+
+import pytest
 from django.conf import settings
 from django.test import TestCase
+from django.utils import timezone
 
 from tutelary.models import Policy
 
 from core.tests.utils.cases import UserTestCase
+from core.tests.utils.files import make_dirs  # noqa
 from accounts.tests.factories import UserFactory
 from geography import load as load_countries
+from resources.tests.utils import clear_temp  # noqa
+from resources.utils.io import ensure_dirs
+from party.tests.factories import PartyFactory, TenureRelationshipFactory
+from resources.tests.factories import ResourceFactory
+from spatial.models import SpatialUnit
+from spatial.tests.factories import SpatialUnitFactory
 from .factories import OrganizationFactory, ProjectFactory
-from ..models import OrganizationRole, ProjectRole
+from ..models import (ExportJob, OrganizationRole, Project, ProjectRole,
+                      ProjectStatistics, count_project_objects,
+                      get_project_data_version)
 
 PERMISSIONS_DIR = settings.BASE_DIR + '/permissions/'
 
@@ -127,6 +141,16 @@ class ProjectTest(TestCase):
             (-148.63333, 47.25), (-148.58333, 47.25), (-148.58333, 47.28333),
             (-148.63333, 47.28333), (-148.63333, 47.25))
 
+    def test_reassign_extent_with_hole(self):
+        project = ProjectFactory.create(
+            extent='SRID=4326;POLYGON(('
+            '-200 0, -190 0, -190 10, -200 10, -200 0), '
+            '(-198 2, -196 2, -196 4, -198 2))'
+        )
+        assert project.extent.coords == (
+            ((160, 0), (170, 0), (170, 10), (160, 10), (160, 0)),
+            ((162, 2), (164, 2), (164, 4), (162, 2)))
+
     def test_defaults_to_public(self):
         project = ProjectFactory.create()
         assert project.public()
@@ -209,3 +233,172 @@ class ProjectRoleTest(UserTestCase, TestCase):
 
     def test_remove_collector_role(self):
         self._change_role('resource.add', 'DC', True, 'PU', False)
+
+
+@pytest.mark.usefixtures('make_dirs')
+@pytest.mark.usefixtures('clear_temp')
+class ExportJobTest(UserTestCase, TestCase):
+    def setUp(self):
+        super().setUp()
+        ensure_dirs()
+        self.project = ProjectFactory.create()
+        self.user = UserFactory.create()
+
+    def test_str(self):
+        job = ExportJob(project=self.project, user=self.user, type='xls')
+        assert str(job) == '<ExportJob: {} (xls)>'.format(self.project.name)
+        assert repr(job) == str(job)
+
+    def test_data_version_changes_with_project_data(self):
+        version = get_project_data_version(self.project)
+        assert version == self.project.last_updated
+
+        su = SpatialUnitFactory.create(project=self.project)
+        created_version = get_project_data_version(self.project)
+        assert created_version > version
+
+        su.delete()
+        assert get_project_data_version(self.project) > created_version
+
+    def test_run(self):
+        job = ExportJob.objects.create(
+            project=self.project, user=self.user, type='xls')
+        job.execute()
+        job.refresh_from_db()
+        assert job.status == ExportJob.DONE
+        assert job.progress == 100
+        assert job.file_exists is True
+        assert job.mime_type == ('application/vnd.openxmlformats-'
+                                 'officedocument.spreadsheetml.sheet')
+
+    def test_get_or_enqueue(self):
+        job = ExportJob.objects.get_or_enqueue(self.project, self.user, 'shp')
+        assert job.status == ExportJob.QUEUED
+        assert job.data_version == get_project_data_version(self.project)
+
+        # a pending job for the same data is reused ...
+        assert ExportJob.objects.get_or_enqueue(
+            self.project, UserFactory.create(), 'shp') == job
+
+        # ... but not for another export type
+        assert ExportJob.objects.get_or_enqueue(
+            self.project, self.user, 'xls') != job
+
+    def test_get_or_enqueue_reuses_finished_export(self):
+        job = ExportJob.objects.get_or_enqueue(self.project, self.user, 'xls')
+        job.execute()
+        assert ExportJob.objects.get_or_enqueue(
+            self.project, self.user, 'xls') == job
+
+    def test_get_or_enqueue_after_data_changed(self):
+        job = ExportJob.objects.get_or_enqueue(self.project, self.user, 'xls')
+        job.execute()
+        SpatialUnitFactory.create(project=self.project)
+        new_job = ExportJob.objects.get_or_enqueue(
+            self.project, self.user, 'xls')
+        assert new_job != job
+        assert new_job.status == ExportJob.QUEUED
+
+    def test_get_or_enqueue_after_file_removed(self):
+        job = ExportJob.objects.get_or_enqueue(self.project, self.user, 'xls')
+        job.execute()
+        os.remove(job.file)
+        assert ExportJob.objects.get_or_enqueue(
+            self.project, self.user, 'xls') != job
+
+    def test_get_or_enqueue_after_failed_export(self):
+        job = ExportJob.objects.get_or_enqueue(self.project, self.user, 'xls')
+        job.status = ExportJob.FAILED
+        job.save()
+        assert ExportJob.objects.get_or_enqueue(
+            self.project, self.user, 'xls') != job
+
+    def test_get_or_enqueue_requeues_stale_export(self):
+        job = ExportJob.objects.get_or_enqueue(self.project, self.user, 'xls')
+        ExportJob.objects.filter(id=job.id).update(
+            status=ExportJob.RUNNING, attempts=1,
+            started_date=timezone.now() - timedelta(hours=2),
+            heartbeat_date=timezone.now() - timedelta(hours=1))
+        assert ExportJob.objects.get_or_enqueue(
+            self.project, self.user, 'xls') == job
+        job.refresh_from_db()
+        assert job.status == ExportJob.QUEUED
+        assert job.started_date is None
+
+
+@pytest.mark.usefixtures('make_dirs')
+@pytest.mark.usefixtures('clear_temp')
+class ProjectStatisticsTest(UserTestCase, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.project = ProjectFactory.create()
+
+    def get_statistics(self):
+        return ProjectStatistics.objects.get(project=self.project)
+
+    def test_str(self):
+        statistics = ProjectStatistics(project=self.project)
+        assert str(statistics) == '<ProjectStatistics: {}>'.format(
+            self.project.name)
+        assert repr(statistics) == str(statistics)
+
+    def test_get_for_project_counts_objects(self):
+        SpatialUnitFactory.create_batch(2, project=self.project)
+        ResourceFactory.create(project=self.project, archived=True)
+        assert ProjectStatistics.objects.exists() is False
+
+        statistics = ProjectStatistics.objects.get_for_project(self.project)
+        assert statistics.num_locations == 2
+        assert statistics.num_parties == 0
+        assert statistics.num_resources == 0
+        assert statistics.has_content is True
+
+        project = Project.objects.select_related('statistics').get(
+            pk=self.project.pk)
+        with self.assertNumQueries(0):
+            assert ProjectStatistics.objects.get_for_project(
+                project) == statistics
+
+    def test_objects_are_counted(self):
+        ProjectStatistics.objects.get_for_project(self.project)
+
+        su = SpatialUnitFactory.create(project=self.project)
+        party = PartyFactory.create(project=self.project)
+        TenureRelationshipFactory.create(
+            project=self.project, party=party, spatial_unit=su)
+        ResourceFactory.create(project=self.project)
+        SpatialUnitFactory.create()
+        statistics = self.get_statistics()
+        assert statistics.num_locations == 1
+        assert statistics.num_parties == 1
+        assert statistics.num_relationships == 1
+        assert statistics.num_resources == 1
+
+        # deleting the party deletes its relationship as well
+        party.delete()
+        statistics = self.get_statistics()
+        assert statistics.num_locations == 1
+        assert statistics.num_parties == 0
+        assert statistics.num_relationships == 0
+
+    def test_archived_resources_are_not_counted(self):
+        ProjectStatistics.objects.get_for_project(self.project)
+
+        resource = ResourceFactory.create(project=self.project)
+        assert self.get_statistics().num_resources == 1
+
+        resource.archived = True
+        resource.save()
+        assert self.get_statistics().num_resources == 0
+
+        resource.save()
+        assert self.get_statistics().num_resources == 0
+
+        resource.archived = False
+        resource.save()
+        assert self.get_statistics().num_resources == 1
+
+    def test_count_project_objects(self):
+        ProjectStatistics.objects.get_for_project(self.project)
+        count_project_objects(SpatialUnit, self.project.id, 10)
+        assert self.get_statistics().num_locations == 10
@@ -132,3 +132,34 @@ class ProjectUrlTest(TestCase):
         assert resolved.kwargs['organization'] == 'habitat'
         assert resolved.kwargs['project'] == '123abc'
         assert resolved.kwargs['username'] == 'barbara-@+.'
+
+    def test_project_exports(self):
+        actual = reverse(
+            version_ns('organization:project_exports'),
+            kwargs={'organization': 'habitat', 'project': '123abc'}
+        )
+        expected = version_url(
+            '/organizations/habitat/projects/123abc/exports/')
+        assert actual == expected
+
+        resolved = resolve(expected)
+        assert resolved.func.__name__ == api.ProjectExportJobList.__name__
+        assert resolved.kwargs['organization'] == 'habitat'
+        assert resolved.kwargs['project'] == '123abc'
+
+    def test_project_exports_detail(self):
+        actual = reverse(
+            version_ns('organization:project_exports_detail'),
+            kwargs={'organization': 'habitat',
+                    'project': '123abc',
+                    'job': 'job123'}
+        )
+        expected = version_url(
+            '/organizations/habitat/projects/123abc/exports/job123/')
+        assert actual == expected
+
+        resolved = resolve(expected)
+        assert resolved.func.__name__ == api.ProjectExportJobDetail.__name__
+        assert resolved.kwargs['organization'] == 'habitat'
+        assert resolved.kwargs['project'] == '123abc'
+        assert resolved.kwargs['job'] == 'job123'
@@ -187,6 +187,35 @@ class ProjectUrlsTest(TestCase):
         assert resolved.kwargs['organization'] == 'org-slug'
         assert resolved.kwargs['project'] == 'prj'
 
+    def test_project_download_job(self):
+        url = reverse('organization:project-download-job',
+                      kwargs={'organization': 'org-slug', 'project': 'prj',
+                              'job': 'abc123'})
+        assert (url == '/organizations/org-slug/projects/prj/download/abc123/')
+
+        resolved = resolve(
+            '/organizations/org-slug/projects/prj/download/abc123/')
+        assert (resolved.func.__name__ ==
+                default.ProjectDataDownloadJob.__name__)
+        assert resolved.kwargs['organization'] == 'org-slug'
+        assert resolved.kwargs['project'] == 'prj'
+        assert resolved.kwargs['job'] == 'abc123'
+
+    def test_project_download_file(self):
+        url = reverse('organization:project-download-file',
+                      kwargs={'organization': 'org-slug', 'project': 'prj',
+                              'job': 'abc123'})
+        assert (url ==
+                '/organizations/org-slug/projects/prj/download/abc123/file/')
+
+        resolved = resolve(
+            '/organizations/org-slug/projects/prj/download/abc123/file/')
+        assert (resolved.func.__name__ ==
+                default.ProjectDataDownloadFile.__name__)
+        assert resolved.kwargs['organization'] == 'org-slug'
+        assert resolved.kwargs['project'] == 'prj'
+        assert resolved.kwargs['job'] == 'abc123'
+
 
 class OrganizationMembersUrlsTest(TestCase):
     def test_member_list(self):
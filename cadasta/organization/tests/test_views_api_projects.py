@@ -7,9 +7,10 @@ from skivvy import APITestCase
 
 from core.tests.utils.cases import UserTestCase
 from accounts.tests.factories import UserFactory
+from spatial.tests.factories import SpatialUnitFactory
 from accounts.models import User
 from .factories import OrganizationFactory, ProjectFactory, clause
-from ..models import Project, ProjectRole, OrganizationRole
+from ..models import ExportJob, Project, ProjectRole, OrganizationRole
 from ..views import api
 
 from tutelary.models import Role
@@ -65,9 +66,9 @@ class ProjectUsersAPITest(APITestCase, UserTestCase, TestCase):
         self.project = ProjectFactory.create(add_users=prj_users)
         response = self.request(user=self.user)
         assert response.status_code == 200
-        assert len(response.content) == 2
+        assert len(response.content['results']) == 2
         assert (other_user.username not in
-                [u['username'] for u in response.content])
+                [u['username'] for u in response.content['results']])
 
     def test_full_list_with_unauthorized_user(self):
         self.project = ProjectFactory.create()
@@ -261,9 +262,9 @@ class OrganizationProjectListAPITest(APITestCase, UserTestCase, TestCase):
         ProjectFactory.create_batch(2)
         response = self.request(user=self.user)
         assert response.status_code == 200
-        assert len(response.content) == 2
+        assert len(response.content['results']) == 2
         assert all([proj.get('organization').get('id') == self.organization.id
-                    for proj in response.content])
+                    for proj in response.content['results']])
 
     def test_full_list_with_unauthorized_user(self):
         """
@@ -273,9 +274,9 @@ class OrganizationProjectListAPITest(APITestCase, UserTestCase, TestCase):
         ProjectFactory.create_batch(2)
         response = self.request()
         assert response.status_code == 200
-        assert len(response.content) == 2
+        assert len(response.content['results']) == 2
         assert all([proj.get('organization').get('id') == self.organization.id
-                    for proj in response.content])
+                    for proj in response.content['results']])
 
     def test_filter_archived_without_authorization(self):
         """
@@ -285,7 +286,7 @@ class OrganizationProjectListAPITest(APITestCase, UserTestCase, TestCase):
         ProjectFactory.create(organization=self.organization, archived=False)
         response = self.request(user=self.user, get_data={'archived': True})
         assert response.status_code == 200
-        assert len(response.content) == 0
+        assert len(response.content['results']) == 0
 
     def test_fitler_archived_with_org_admin(self):
         """
@@ -298,7 +299,7 @@ class OrganizationProjectListAPITest(APITestCase, UserTestCase, TestCase):
         ProjectFactory.create(organization=self.organization, archived=False)
         response = self.request(user=user, get_data={'archived': True})
         assert response.status_code == 200
-        assert len(response.content) == 1
+        assert len(response.content['results']) == 1
 
     def test_search_filter(self):
         """
@@ -308,8 +309,9 @@ class OrganizationProjectListAPITest(APITestCase, UserTestCase, TestCase):
         ProjectFactory.create(organization=self.organization, name='aaaa',)
         response = self.request(user=self.user, get_data={'search': 'opdp'})
         assert response.status_code == 200
-        assert len(response.content) == 1
-        assert all([proj['name'] == 'opdp' for proj in response.content])
+        assert len(response.content['results']) == 1
+        assert all([proj['name'] == 'opdp'
+                    for proj in response.content['results']])
 
     def test_ordering(self):
         ProjectFactory.create_from_kwargs([
@@ -319,8 +321,8 @@ class OrganizationProjectListAPITest(APITestCase, UserTestCase, TestCase):
         ])
         response = self.request(user=self.user, get_data={'ordering': 'name'})
         assert response.status_code == 200
-        assert len(response.content) == 3
-        names = [proj['name'] for proj in response.content]
+        assert len(response.content['results']) == 3
+        names = [proj['name'] for proj in response.content['results']]
         assert names == sorted(names)
 
     def test_reverse_ordering(self):
@@ -331,8 +333,8 @@ class OrganizationProjectListAPITest(APITestCase, UserTestCase, TestCase):
         ])
         response = self.request(user=self.user, get_data={'ordering': '-name'})
         assert response.status_code == 200
-        assert len(response.content) == 3
-        names = [proj['name'] for proj in response.content]
+        assert len(response.content['results']) == 3
+        names = [proj['name'] for proj in response.content['results']]
         assert names == sorted(names, reverse=True)
 
     def test_permission_filter(self):
@@ -356,8 +358,8 @@ class OrganizationProjectListAPITest(APITestCase, UserTestCase, TestCase):
         response = self.request(user=self.user,
                                 get_data={'permissions': 'party.create'})
         assert response.status_code == 200
-        assert len(response.content) == 1
-        assert response.content[0]['slug'] != 'unauthorized'
+        assert len(response.content['results']) == 1
+        assert response.content['results'][0]['slug'] != 'unauthorized'
 
 
 class ProjectListAPITest(APITestCase, UserTestCase, TestCase):
@@ -376,7 +378,7 @@ class ProjectListAPITest(APITestCase, UserTestCase, TestCase):
         ProjectFactory.create_batch(2)
         response = self.request(user=self.user)
         assert response.status_code == 200
-        assert len(response.content) == 4
+        assert len(response.content['results']) == 4
 
     def test_full_list_with_superuser(self):
         """
@@ -390,7 +392,7 @@ class ProjectListAPITest(APITestCase, UserTestCase, TestCase):
         ProjectFactory.create_batch(2)
         response = self.request(user=self.user)
         assert response.status_code == 200
-        assert len(response.content) == 4
+        assert len(response.content['results']) == 4
 
     def test_full_list_with_unauthorized_user(self):
         """
@@ -400,9 +402,9 @@ class ProjectListAPITest(APITestCase, UserTestCase, TestCase):
         ProjectFactory.create_batch(2)
         response = self.request()
         assert response.status_code == 200
-        assert len(response.content) == 4
+        assert len(response.content['results']) == 4
         assert all(['users' not in proj['organization']
-                    for proj in response.content])
+                    for proj in response.content['results']])
 
     def test_empty_list_with_unauthorized_user(self):
         """
@@ -410,7 +412,7 @@ class ProjectListAPITest(APITestCase, UserTestCase, TestCase):
         """
         response = self.request()
         assert response.status_code == 200
-        assert len(response.content) == 0
+        assert len(response.content['results']) == 0
 
     def test_filter_active(self):
         """
@@ -420,7 +422,7 @@ class ProjectListAPITest(APITestCase, UserTestCase, TestCase):
         ProjectFactory.create(archived=False)
         response = self.request(user=self.user, get_data={'archived': False})
         assert response.status_code == 200
-        assert len(response.content) == 1
+        assert len(response.content['results']) == 1
 
     def test_search_filter(self):
         """
@@ -430,8 +432,9 @@ class ProjectListAPITest(APITestCase, UserTestCase, TestCase):
         ProjectFactory.create_batch(2)
         response = self.request(user=self.user, get_data={'search': 'opdp'})
         assert response.status_code == 200
-        assert len(response.content) == 1
-        assert all([proj['name'] == 'opdp' for proj in response.content])
+        assert len(response.content['results']) == 1
+        assert all([proj['name'] == 'opdp'
+                    for proj in response.content['results']])
 
     def test_ordering(self):
         ProjectFactory.create_from_kwargs([
@@ -439,8 +442,8 @@ class ProjectListAPITest(APITestCase, UserTestCase, TestCase):
         ])
         response = self.request(user=self.user, get_data={'ordering': 'name'})
         assert response.status_code == 200
-        assert len(response.content) == 3
-        names = [proj['name'] for proj in response.content]
+        assert len(response.content['results']) == 3
+        names = [proj['name'] for proj in response.content['results']]
         assert names == sorted(names)
 
     def test_reverse_ordering(self):
@@ -449,8 +452,8 @@ class ProjectListAPITest(APITestCase, UserTestCase, TestCase):
         ])
         response = self.request(user=self.user, get_data={'ordering': '-name'})
         assert response.status_code == 200
-        assert len(response.content) == 3
-        names = [proj['name'] for proj in response.content]
+        assert len(response.content['results']) == 3
+        names = [proj['name'] for proj in response.content['results']]
         assert names == sorted(names, reverse=True)
 
     def test_permission_filter(self):
@@ -474,8 +477,8 @@ class ProjectListAPITest(APITestCase, UserTestCase, TestCase):
         response = self.request(user=self.user,
                                 get_data={'permissions': 'party.create'})
         assert response.status_code == 200
-        assert len(response.content) == 1
-        assert response.content[0]['slug'] != 'unauthorized'
+        assert len(response.content['results']) == 1
+        assert response.content['results'][0]['slug'] != 'unauthorized'
 
     # CONDITIONS:
     #
@@ -515,7 +518,7 @@ class ProjectListAPITest(APITestCase, UserTestCase, TestCase):
         response = self.request(user=user)
         assert response.status_code == 200
         expected_names = [prjs[i].name for i in idxs]
-        pnames = [p['name'] for p in response.content]
+        pnames = [p['name'] for p in response.content['results']]
         assert(sorted(expected_names) == sorted(pnames))
 
     def test_visibility_filtering(self):
@@ -642,6 +645,17 @@ class ProjectDetailAPITest(APITestCase, UserTestCase, TestCase):
         assert response.content['id'] == self.project.id
         assert 'users' in response.content
 
+    def test_get_project_statistics(self):
+        SpatialUnitFactory.create_batch(2, project=self.project)
+        response = self.request(user=self.user)
+        assert response.status_code == 200
+        assert response.content['statistics'] == {
+            'num_locations': 2,
+            'num_parties': 0,
+            'num_relationships': 0,
+            'num_resources': 0,
+        }
+
     def test_get_public_project_that_does_not_exist(self):
         response = self.request(url_kwargs={'project': 'some-project'})
         assert response.status_code == 404
@@ -847,3 +861,96 @@ class ProjectDetailAPITest(APITestCase, UserTestCase, TestCase):
         assert response.status_code == 400
         self.project.refresh_from_db()
         assert self.project.access == 'public'
+
+
+class ProjectExportJobListAPITest(APITestCase, UserTestCase, TestCase):
+    view_class = api.ProjectExportJobList
+    post_data = {'type': 'xls'}
+
+    def setup_models(self):
+        self.user = UserFactory.create()
+        assign_policies(self.user)
+        self.project = ProjectFactory.create()
+
+    def setup_url_kwargs(self):
+        return {
+            'organization': self.project.organization.slug,
+            'project': self.project.slug
+        }
+
+    def test_list_jobs(self):
+        ExportJob.objects.create(
+            project=self.project, user=self.user, type='xls')
+        ExportJob.objects.create(
+            project=ProjectFactory.create(), user=self.user, type='xls')
+        response = self.request(user=self.user)
+        assert response.status_code == 200
+        assert len(response.content['results']) == 1
+
+    def test_list_jobs_with_unauthorized_user(self):
+        response = self.request()
+        assert response.status_code == 403
+
+    def test_create_job(self):
+        response = self.request(method='POST', user=self.user)
+        assert response.status_code == 202
+        job = ExportJob.objects.get(project=self.project)
+        assert response.content['id'] == job.id
+        assert response.content['status'] == ExportJob.QUEUED
+        assert response.content['download_url'] is None
+
+    def test_create_job_reuses_finished_export(self):
+        job = ExportJob.objects.get_or_enqueue(self.project, self.user, 'xls')
+        job.execute()
+        response = self.request(method='POST', user=self.user)
+        assert response.status_code == 200
+        assert response.content['id'] == job.id
+        assert response.content['status'] == ExportJob.DONE
+        assert job.id in response.content['download_url']
+        assert ExportJob.objects.count() == 1
+
+    def test_create_job_with_invalid_type(self):
+        response = self.request(method='POST', user=self.user,
+                                post_data={'type': 'pdf'})
+        assert response.status_code == 400
+        assert ExportJob.objects.count() == 0
+
+    def test_create_job_with_unauthorized_user(self):
+        response = self.request(method='POST')
+        assert response.status_code == 403
+        assert ExportJob.objects.count() == 0
+
+
+class ProjectExportJobDetailAPITest(APITestCase, UserTestCase, TestCase):
+    view_class = api.ProjectExportJobDetail
+
+    def setup_models(self):
+        self.user = UserFactory.create()
+        assign_policies(self.user)
+        self.project = ProjectFactory.create()
+        self.job = ExportJob.objects.create(
+            project=self.project, user=self.user, type='shp', progress=40,
+            status=ExportJob.RUNNING)
+
+    def setup_url_kwargs(self):
+        return {
+            'organization': self.project.organization.slug,
+            'project': self.project.slug,
+            'job': self.job.id
+        }
+
+    def test_get_job(self):
+        response = self.request(user=self.user)
+        assert response.status_code == 200
+        assert response.content['id'] == self.job.id
+        assert response.content['type'] == 'shp'
+        assert response.content['status'] == ExportJob.RUNNING
+        assert response.content['progress'] == 40
+
+    def test_get_job_that_does_not_exist(self):
+        response = self.request(user=self.user, url_kwargs={'job': 'abc'})
+        assert response.status_code == 404
+
+    def test_get_job_with_unauthorized_user(self):
+        response = self.request()
+        assert response.status_code == 403
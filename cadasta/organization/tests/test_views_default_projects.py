@@ -18,7 +18,8 @@ from django.http import Http404, HttpRequest
 from django.template.loader import render_to_string
 from django.test import TestCase
 from jsonattrs.models import Attribute, Schema
-from organization.models import OrganizationRole, Project, ProjectRole
+from organization.models import (ExportJob, OrganizationRole, Project,
+                                 ProjectRole, get_project_data_version)
 from party.models import Party, TenureRelationship
 from party.tests.factories import PartyFactory
 from questionnaires.models import Questionnaire
@@ -30,7 +31,6 @@ from resources.tests.utils import clear_temp  # noqa
 from resources.utils.io import ensure_dirs
 from skivvy import ViewTestCase
 from spatial.models import SpatialUnit
-from spatial.serializers import SpatialUnitGeoJsonSerializer
 from spatial.tests.factories import SpatialUnitFactory
 from tutelary.models import Policy, Role, assign_user_policies
 
@@ -104,14 +104,15 @@ class ProjectListTest(ViewTestCase, UserTestCase, TestCase):
         assigned_policies.append(self.policy)
         self.user.assign_policies(*assigned_policies)
 
-    @property
-    def sort_key(self):
-        return lambda p: p.organization.slug + ':' + p.slug
+    def ordered(self, projs):
+        return list(Project.objects.filter(
+            pk__in=[p.pk for p in projs]
+        ).order_by('organization__slug', 'slug'))
 
     def setup_template_context(self):
         projs = self.projs + self.unauth_projs
         return {
-            'object_list': sorted(projs, key=self.sort_key),
+            'object_list': self.ordered(projs),
             'add_allowed': False,
             'is_superuser': False,
             'any_archived': False,
@@ -146,7 +147,7 @@ class ProjectListTest(ViewTestCase, UserTestCase, TestCase):
 
         assert response.status_code == 200
         assert response.content == self.render_content(
-            object_list=sorted(projs, key=self.sort_key))
+            object_list=self.ordered(projs))
 
     def test_get_with_org_memberships(self):
         OrganizationRole.objects.create(organization=self.ok_org1,
@@ -159,7 +160,7 @@ class ProjectListTest(ViewTestCase, UserTestCase, TestCase):
 
         assert response.status_code == 200
         assert response.content == self.render_content(
-            object_list=sorted(projs, key=self.sort_key))
+            object_list=self.ordered(projs))
 
     def test_get_with_org_admin(self):
         OrganizationRole.objects.create(organization=self.ok_org2,
@@ -171,7 +172,7 @@ class ProjectListTest(ViewTestCase, UserTestCase, TestCase):
 
         assert response.status_code == 200
         assert response.content == self.render_content(
-            object_list=sorted(projs, key=self.sort_key),
+            object_list=self.ordered(projs),
             add_allowed=True,
             any_archived=True)
 
@@ -183,7 +184,7 @@ class ProjectListTest(ViewTestCase, UserTestCase, TestCase):
         response = self.request(user=superuser)
         assert response.status_code == 200
         assert response.content == self.render_content(
-            object_list=sorted(Project.objects.all(), key=self.sort_key),
+            object_list=self.ordered(Project.objects.all()),
             add_allowed=True,
             is_superuser=True,
             any_archived=True,
@@ -217,7 +218,7 @@ class ProjectDashboardTest(ViewTestCase, UserTestCase, TestCase):
         return {
             'object': self.project,
             'project': self.project,
-            'geojson': '{"type": "FeatureCollection", "features": []}',
+            'locations_extent': 'null',
             'is_superuser': False,
             'is_administrator': False,
             'has_content': False,
@@ -394,19 +395,19 @@ class ProjectDashboardTest(ViewTestCase, UserTestCase, TestCase):
         assert response.content == expected
 
     def test_get_with_overview_stats(self):
-        su = SpatialUnitFactory.create(project=self.project)
+        SpatialUnitFactory.create(project=self.project,
+                                  geometry='SRID=4326;POINT(11 2)')
         PartyFactory.create(project=self.project)
         ResourceFactory.create(project=self.project)
         ResourceFactory.create(project=self.project, archived=True)
-        geojson = json.dumps(
-            SpatialUnitGeoJsonSerializer([su], many=True).data)
         response = self.request(user=self.user)
         assert response.status_code == 200
-        assert response.content == self.render_content(geojson=geojson,
-                                                       has_content=True,
-                                                       num_locations=1,
-                                                       num_parties=1,
-                                                       num_resources=1)
+        assert response.content == self.render_content(
+            locations_extent='[11.0, 2.0, 11.0, 2.0]',
+            has_content=True,
+            num_locations=1,
+            num_parties=1,
+            num_resources=1)
         assert "<div class=\"num\">1</div> location" in response.content
         assert "<div class=\"num\">1</div> party" in response.content
         assert "<div class=\"num\">1</div> resource" in response.content
@@ -1297,6 +1298,122 @@ class ProjectDataDownloadTest(ViewTestCase, UserTestCase, TestCase):
     def test_post_with_authorized_user(self):
         assign_policies(self.user)
         response = self.request(user=self.user, method='POST')
+        job = ExportJob.objects.get(project=self.project)
+        assert job.type == 'xls'
+        assert job.user == self.user
+        assert job.status == ExportJob.QUEUED
+        assert response.status_code == 302
+        assert response.location == reverse(
+            'organization:project-download-job',
+            kwargs={'organization': self.project.organization.slug,
+                    'project': self.project.slug,
+                    'job': job.id})
+
+    def test_post_reuses_pending_export(self):
+        assign_policies(self.user)
+        job = ExportJob.objects.create(
+            project=self.project, user=self.user, type='xls',
+            data_version=get_project_data_version(self.project))
+        response = self.request(user=self.user, method='POST')
+        assert response.status_code == 302
+        assert job.id in response.location
+        assert ExportJob.objects.count() == 1
+
+    def test_post_with_unauthorized_user(self):
+        response = self.request(user=self.user, method='POST')
+        assert response.status_code == 302
+        assert ("You don't have permission to download data from this project"
+                in response.messages)
+        assert ExportJob.objects.count() == 0
+
+    def test_post_with_unauthenticated_user(self):
+        response = self.request(method='POST')
+        assert response.status_code == 302
+        assert '/account/login/' in response.location
+
+
+@pytest.mark.usefixtures('make_dirs')
+@pytest.mark.usefixtures('clear_temp')
+class ProjectDataDownloadJobTest(ViewTestCase, UserTestCase, TestCase):
+    view_class = default.ProjectDataDownloadJob
+    template = 'organization/project_download_job.html'
+
+    def setup_models(self):
+        ensure_dirs()
+        self.project = ProjectFactory.create()
+        self.user = UserFactory.create()
+        self.job = ExportJob.objects.create(
+            project=self.project, user=self.user, type='xls')
+
+    def setup_url_kwargs(self):
+        return {
+            'organization': self.project.organization.slug,
+            'project': self.project.slug,
+            'job': self.job.id
+        }
+
+    def setup_template_context(self):
+        return {'project': self.project,
+                'object': self.project,
+                'job': self.job}
+
+    def test_get_with_authorized_user(self):
+        assign_policies(self.user)
+        response = self.request(user=self.user)
+        assert response.status_code == 200
+        assert response.content == self.expected_content
+
+    def test_get_finished_job(self):
+        assign_policies(self.user)
+        self.job.execute()
+        response = self.request(user=self.user)
+        assert response.status_code == 200
+        assert response.content == self.expected_content
+        assert 'Your download is ready' in response.content
+
+    def test_get_job_of_other_project(self):
+        assign_policies(self.user)
+        other_job = ExportJob.objects.create(
+            project=ProjectFactory.create(), user=self.user, type='xls')
+        with pytest.raises(Http404):
+            self.request(user=self.user,
+                         url_kwargs={'job': other_job.id})
+
+    def test_get_with_unauthorized_user(self):
+        response = self.request(user=self.user)
+        assert response.status_code == 302
+        assert ("You don't have permission to download data from this project"
+                in response.messages)
+
+    def test_get_with_unauthenticated_user(self):
+        response = self.request()
+        assert response.status_code == 302
+        assert '/account/login/' in response.location
+
+
+@pytest.mark.usefixtures('make_dirs')
+@pytest.mark.usefixtures('clear_temp')
+class ProjectDataDownloadFileTest(ViewTestCase, UserTestCase, TestCase):
+    view_class = default.ProjectDataDownloadFile
+
+    def setup_models(self):
+        ensure_dirs()
+        self.project = ProjectFactory.create()
+        self.user = UserFactory.create()
+        self.job = ExportJob.objects.create(
+            project=self.project, user=self.user, type='xls')
+
+    def setup_url_kwargs(self):
+        return {
+            'organization': self.project.organization.slug,
+            'project': self.project.slug,
+            'job': self.job.id
+        }
+
+    def test_get_with_authorized_user(self):
+        assign_policies(self.user)
+        self.job.execute()
+        response = self.request(user=self.user)
         assert response.status_code == 200
         assert (response.headers['content-disposition'][1] ==
                 'attachment; filename={}.xlsx'.format(self.project.slug))
@@ -1304,14 +1421,20 @@ class ProjectDataDownloadTest(ViewTestCase, UserTestCase, TestCase):
                 'application/vnd.openxmlformats-officedocument.'
                 'spreadsheetml.sheet')
 
-    def test_post_with_unauthorized_user(self):
-        response = self.request(user=self.user, method='POST')
+    def test_get_unfinished_export(self):
+        assign_policies(self.user)
+        with pytest.raises(Http404):
+            self.request(user=self.user)
+
+    def test_get_with_unauthorized_user(self):
+        self.job.execute()
+        response = self.request(user=self.user)
         assert response.status_code == 302
         assert ("You don't have permission to download data from this project"
                 in response.messages)
 
-    def test_post_with_unauthenticated_user(self):
-        response = self.request(method='POST')
+    def test_get_with_unauthenticated_user(self):
+        response = self.request()
         assert response.status_code == 302
         assert '/account/login/' in response.location
 
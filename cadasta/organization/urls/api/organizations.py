@@ -36,4 +36,13 @@ urlpatterns = [
         '(?P<project>[-\w]+)/users/(?P<username>[-@+.\w]+)/$',
         api.ProjectUsersDetail.as_view(),
         name='project_users_detail'),
+    url(
+        r'^(?P<organization>[-\w]+)/projects/(?P<project>[-\w]+)/exports/$',
+        api.ProjectExportJobList.as_view(),
+        name='project_exports'),
+    url(
+        r'^(?P<organization>[-\w]+)/projects/'
+        '(?P<project>[-\w]+)/exports/(?P<job>[-\w]+)/$',
+        api.ProjectExportJobDetail.as_view(),
+        name='project_exports_detail'),
 ]
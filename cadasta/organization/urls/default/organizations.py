@@ -65,6 +65,16 @@ urlpatterns = [
         r'^(?P<organization>[-\w]+)/projects/(?P<project>[-\w]+)/download/$',
         default.ProjectDataDownload.as_view(),
         name='project-download'),
+    url(
+        r'^(?P<organization>[-\w]+)/projects/(?P<project>[-\w]+)/download/'
+        '(?P<job>[-\w]+)/$',
+        default.ProjectDataDownloadJob.as_view(),
+        name='project-download-job'),
+    url(
+        r'^(?P<organization>[-\w]+)/projects/(?P<project>[-\w]+)/download/'
+        '(?P<job>[-\w]+)/file/$',
+        default.ProjectDataDownloadFile.as_view(),
+        name='project-download-file'),
     url(
         r'^(?P<organization>[-\w]+)/projects/(?P<project>[-\w]+)/import/$',
         default.ProjectDataImportWizard.as_view(),
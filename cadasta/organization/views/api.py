@@ -8,7 +8,7 @@ from core.mixins import update_permissions
 
 from accounts.models import User
 
-from ..models import Organization, OrganizationRole, ProjectRole
+from ..models import ExportJob, Organization, OrganizationRole, ProjectRole
 from .. import serializers
 from . import mixins
 
@@ -228,7 +228,7 @@ class ProjectDetail(APIPermissionRequiredMixin,
 
     def get_queryset(self):
         return self.get_organization(
-            lookup_kwarg='organization').projects.all()
+            lookup_kwarg='organization').projects.select_related('statistics')
 
 
 class ProjectUsers(APIPermissionRequiredMixin,
@@ -259,3 +259,35 @@ class ProjectUsersDetail(APIPermissionRequiredMixin,
         ).delete()
 
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProjectExportJobList(APIPermissionRequiredMixin,
+                           mixins.ExportJobMixin,
+                           generics.ListCreateAPIView):
+    serializer_class = serializers.ExportJobSerializer
+    permission_required = 'project.download'
+
+    def get_queryset(self):
+        return self.get_project().export_jobs.all()
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = ExportJob.objects.get_or_enqueue(
+            self.get_project(), request.user,
+            serializer.validated_data['type'])
+
+        return Response(
+            self.get_serializer(job).data,
+            status=(status.HTTP_200_OK if job.status == ExportJob.DONE
+                    else status.HTTP_202_ACCEPTED))
+
+
+class ProjectExportJobDetail(APIPermissionRequiredMixin,
+                             mixins.ExportJobMixin,
+                             generics.RetrieveAPIView):
+    serializer_class = serializers.ExportJobSerializer
+    permission_required = 'project.download'
+
+    def get_object(self):
+        return self.get_job()
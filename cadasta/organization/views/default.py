@@ -9,16 +9,17 @@ import formtools.wizard.views as wizard
 from accounts.models import User
 from core.mixins import (LoginPermissionRequiredMixin, PermissionRequiredMixin,
                          update_permissions)
+from core.permissions import visible_projects
 from core.views.mixins import ArchiveMixin, SuperUserCheckMixin
 from django.conf import settings
+from django.contrib.gis.db.models import Extent
 from django.core.files.storage import DefaultStorage, FileSystemStorage
 from django.core.urlresolvers import reverse
 from django.db import transaction
-from django.http import HttpResponse
+from django.http import FileResponse, Http404
 from django.shortcuts import get_object_or_404, redirect
 from questionnaires.exceptions import InvalidXLSForm
 from questionnaires.models import Questionnaire
-from spatial.serializers import SpatialUnitGeoJsonSerializer
 
 from resources.models import ContentObject, Resource
 
@@ -27,7 +28,8 @@ from .. import messages as error_messages
 from .. import forms
 from ..importers import csv
 from ..importers.exceptions import DataImportError
-from ..models import Organization, OrganizationRole, Project, ProjectRole
+from ..models import (ExportJob, Organization, OrganizationRole, Project,
+                      ProjectRole, ProjectStatistics)
 
 
 class OrganizationList(PermissionRequiredMixin, generic.ListView):
@@ -324,53 +326,29 @@ class UserActivation(LoginPermissionRequiredMixin, base_generic.View):
 
 
 class ProjectList(PermissionRequiredMixin,
-                  mixins.ProjectQuerySetMixin,
                   mixins.ProjectCreateCheckMixin,
                   generic.ListView):
-    def permission_filter(self, view, p):
-        if p.archived is True:
-            return ('project.view_archived',)
-        elif p.access == 'private':
-            return ('project.view_private',)
-        else:
-            return ('project.view',)
-
     model = Project
     template_name = 'organization/project_list.html'
     permission_required = 'project.list'
-    permission_filter_queryset = permission_filter
+    # Anyone can list projects. Which projects are listed is decided by
+    # visible_projects from the user's memberships, so the permissions of
+    # the individual projects are not checked.
+    permission_filter_queryset = True
     project_create_check_multiple = True
 
+    def get_perms_objects(self):
+        return [None]
+
+    def get_queryset(self):
+        return visible_projects(self.request.user).select_related(
+            'organization').order_by('organization__slug', 'slug')
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['any_archived'] = self.get_queryset().filter(
-                                                        archived=True).exists()
+        context['any_archived'] = any(p.archived for p in self.object_list)
         return context
 
-    def get(self, request, *args, **kwargs):
-        user = self.request.user
-        if (hasattr(user, 'assigned_policies') and
-           self.is_superuser):
-                projects = Project.objects.all()
-        else:
-            projects = []
-            projects.extend(Project.objects.filter(access='public',
-                                                   archived=False))
-            if hasattr(user, 'organizations'):
-                for org in Organization.objects.all():
-                    if org in user.organizations.all():
-                        projects.extend(org.projects.filter(access='private',
-                                                            archived=False))
-                        if OrganizationRole.objects.get(organization=org,
-                                                        user=user
-                                                        ).admin is True:
-                            projects.extend(
-                                org.projects.filter(archived=True))
-        self.object_list = sorted(
-            projects, key=lambda p: p.organization.slug + ':' + p.slug)
-        context = self.get_context_data()
-        return super(generic.ListView, self).render_to_response(context)
-
 
 class ProjectDashboard(PermissionRequiredMixin,
                        mixins.ProjectAdminCheckMixin,
@@ -391,18 +369,14 @@ class ProjectDashboard(PermissionRequiredMixin,
 
     def get_context_data(self, **kwargs):
         context = super(ProjectDashboard, self).get_context_data(**kwargs)
-        num_locations = self.object.spatial_units.count()
-        num_parties = self.object.parties.count()
-        num_resources = self.object.resource_set.filter(archived=False).count()
-        context['has_content'] = (
-            num_locations > 0 or num_parties > 0 or num_resources > 0)
-        context['num_locations'] = num_locations
-        context['num_parties'] = num_parties
-        context['num_resources'] = num_resources
-        context['geojson'] = json.dumps(
-            SpatialUnitGeoJsonSerializer(
-                self.object.spatial_units.all(), many=True).data
-        )
+        statistics = ProjectStatistics.objects.get_for_project(self.object)
+        context['has_content'] = statistics.has_content
+        context['num_locations'] = statistics.num_locations
+        context['num_parties'] = statistics.num_parties
+        context['num_resources'] = statistics.num_resources
+        extent = self.object.spatial_units.aggregate(
+            extent=Extent('geometry'))['extent']
+        context['locations_extent'] = json.dumps(extent)
 
         return context
 
@@ -697,12 +671,47 @@ class ProjectDataDownload(mixins.ProjectMixin,
         self.object = self.get_object()
         form = self.get_form()
         if form.is_valid():
-            path, mime_type = form.get_file()
-            filename, ext = os.path.splitext(path)
-            response = HttpResponse(open(path, 'rb'), content_type=mime_type)
-            response['Content-Disposition'] = ('attachment; filename=' +
-                                               self.object.slug + ext)
-            return response
+            job = form.get_job()
+            return redirect('organization:project-download-job',
+                            organization=self.object.organization.slug,
+                            project=self.object.slug,
+                            job=job.id)
+
+
+class ProjectDataDownloadJob(mixins.ExportJobMixin,
+                             LoginPermissionRequiredMixin,
+                             mixins.ProjectAdminCheckMixin,
+                             generic.DetailView):
+    template_name = 'organization/project_download_job.html'
+    permission_required = 'project.download'
+    permission_denied_message = error_messages.PROJ_DOWNLOAD
+
+    def get_object(self):
+        return self.get_project()
+
+    def get_context_data(self, *args, **kwargs):
+        context = super().get_context_data(*args, **kwargs)
+        context['job'] = self.get_job()
+        return context
+
+
+class ProjectDataDownloadFile(mixins.ExportJobMixin,
+                              LoginPermissionRequiredMixin,
+                              base_generic.View):
+    permission_required = 'project.download'
+    permission_denied_message = error_messages.PROJ_DOWNLOAD
+
+    def get(self, request, *args, **kwargs):
+        job = self.get_job()
+        if job.status != ExportJob.DONE or not job.file_exists:
+            raise Http404()
+
+        filename, ext = os.path.splitext(job.file)
+        response = FileResponse(open(job.file, 'rb'),
+                                content_type=job.mime_type)
+        response['Content-Disposition'] = ('attachment; filename=' +
+                                           self.get_project().slug + ext)
+        return response
 
 
 DATA_IMPORT_FORMS = [('select_file', forms.SelectImportForm),
@@ -1,12 +1,13 @@
 from django.conf import settings
-from django.contrib.auth.models import AnonymousUser
 from django.contrib.sites.shortcuts import get_current_site
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
 
-from tutelary.models import Role, check_perms
+from tutelary.models import check_perms
 
-from ..models import Organization, Project, OrganizationRole, ProjectRole
+from core.permissions import (get_user_roles, is_org_admin, is_project_admin,
+                              is_superuser)
+from ..models import ExportJob, Organization, Project
 
 
 class OrganizationMixin:
@@ -54,6 +55,20 @@ class ProjectMixin:
         return self.get_project().organization
 
 
+class ExportJobMixin(ProjectMixin):
+    def get_job(self):
+        if not hasattr(self, 'job'):
+            self.job = get_object_or_404(
+                ExportJob,
+                project=self.get_project(),
+                id=self.kwargs['job']
+            )
+        return self.job
+
+    def get_perms_objects(self):
+        return [self.get_project()]
+
+
 class ProjectRoles(ProjectMixin):
     lookup_field = 'username'
 
@@ -74,20 +89,15 @@ class ProjectRoles(ProjectMixin):
 
 class ProjectQuerySetMixin:
     def get_queryset(self):
-        if not hasattr(self, 'su_role'):
-            self.su_role = Role.objects.get(name='superuser')
-
-        if (not isinstance(self.request.user, AnonymousUser) and
-            any([isinstance(pol, Role) and pol == self.su_role
-                 for pol in self.request.user.assigned_policies()])):
+        user = self.request.user
+        if is_superuser(user):
             return Project.objects.all()
 
-        if hasattr(self.request.user, 'organizations'):
-            orgs = self.request.user.organizations.all()
-            if len(orgs) > 0:
-                return Project.objects.filter(
-                    Q(access='public') | Q(organization__in=orgs)
-                )
+        orgs = get_user_roles(user)['organizations']
+        if orgs:
+            return Project.objects.filter(
+                Q(access='public') | Q(organization_id__in=orgs)
+            )
 
         return Project.objects.filter(access='public')
 
@@ -100,28 +110,8 @@ class ProjectAdminCheckMixin:
     @property
     def is_administrator(self):
         if self.is_admin is None:
-            su_role = Role.objects.filter(name='superuser')
-            org_admins = [
-                role.user for role in OrganizationRole.objects.filter(
-                    organization=self.get_project().organization,
-                    admin=True
-                )
-            ]
-            proj_managers = [
-                role.user for role in ProjectRole.objects.filter(
-                    project=self.get_project(),
-                    role='PM'
-                )
-
-            ]
-            self.is_admin = False
-            if len(su_role) > 0:
-                if hasattr(self.request.user, 'assigned_policies'):
-                    if su_role[0] in self.request.user.assigned_policies():
-                        self.is_admin = True
-            if (self.request.user in org_admins or
-               self.request.user in proj_managers):
-                self.is_admin = True
+            self.is_admin = is_project_admin(self.request.user,
+                                             self.get_project())
         return self.is_admin
 
     def get_context_data(self, *args, **kwargs):
@@ -180,24 +170,11 @@ class OrgAdminCheckMixin:
     @property
     def is_administrator(self):
         if self.is_admin is None:
-            su_role = Role.objects.filter(name='superuser')
             if hasattr(self, 'get_organization'):
                 org = self.get_organization()
             else:
                 org = self.get_object()
-            org_admins = [
-                role.user for role in OrganizationRole.objects.filter(
-                    organization=org,
-                    admin=True
-                )
-            ]
-            self.is_admin = False
-            if len(su_role) > 0:
-                if hasattr(self.request.user, 'assigned_policies'):
-                    if su_role[0] in self.request.user.assigned_policies():
-                        self.is_admin = True
-            if self.request.user in org_admins:
-                self.is_admin = True
+            self.is_admin = is_org_admin(self.request.user, org)
         return self.is_admin
 
     def get_context_data(self, *args, **kwargs):
@@ -0,0 +1,74 @@
+"""Traversal of the relationship graph of a project.
+
+Parties and locations are the nodes of the graph; tenure, party and
+spatial relationships are its edges. The edges are followed in both
+directions, whichever of the two related objects is the first one.
+
+"""
+
+from django.db import connection
+
+from spatial.models import SpatialRelationship
+from .models import PartyRelationship, TenureRelationship
+
+NEIGHBOURHOOD_SQL = """
+WITH RECURSIVE edges (rel_class, rel_id, source_kind, source,
+                      target_kind, target) AS (
+    SELECT 'tenure'::text, id, 'party'::text, party_id,
+           'spatial'::text, spatial_unit_id
+      FROM {tenure} WHERE project_id = %(project)s
+    UNION ALL
+    SELECT 'tenure'::text, id, 'spatial'::text, spatial_unit_id,
+           'party'::text, party_id
+      FROM {tenure} WHERE project_id = %(project)s
+    UNION ALL
+    SELECT 'party'::text, id, 'party'::text, party1_id,
+           'party'::text, party2_id
+      FROM {party} WHERE project_id = %(project)s
+    UNION ALL
+    SELECT 'party'::text, id, 'party'::text, party2_id,
+           'party'::text, party1_id
+      FROM {party} WHERE project_id = %(project)s
+    UNION ALL
+    SELECT 'spatial'::text, id, 'spatial'::text, su1_id,
+           'spatial'::text, su2_id
+      FROM {spatial} WHERE project_id = %(project)s
+    UNION ALL
+    SELECT 'spatial'::text, id, 'spatial'::text, su2_id,
+           'spatial'::text, su1_id
+      FROM {spatial} WHERE project_id = %(project)s
+), walk (rel_class, rel_id, kind, node, depth) AS (
+    SELECT rel_class, rel_id, target_kind, target, 1
+      FROM edges
+     WHERE source_kind = %(kind)s AND source = %(node)s
+    UNION
+    SELECT e.rel_class, e.rel_id, e.target_kind, e.target, w.depth + 1
+      FROM walk w
+      JOIN edges e ON e.source_kind = w.kind AND e.source = w.node
+     WHERE w.depth < %(depth)s
+)
+SELECT rel_class, rel_id, MIN(depth)
+  FROM walk
+ GROUP BY rel_class, rel_id
+"""
+
+
+def relationship_neighbourhood(project, kind, node, depth):
+    """Returns the relationships that can be reached from a party or a
+    location of ``project`` by following at most ``depth`` relationships.
+
+    ``kind`` is ``'party'`` or ``'spatial'`` and ``node`` is the ID of the
+    party or location. The result maps ``(rel_class, id)`` of each
+    relationship to the number of relationships that had to be followed
+    to reach it, with ``rel_class`` being ``'tenure'``, ``'party'`` or
+    ``'spatial'``.
+    """
+    sql = NEIGHBOURHOOD_SQL.format(
+        tenure=TenureRelationship._meta.db_table,
+        party=PartyRelationship._meta.db_table,
+        spatial=SpatialRelationship._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {'project': project.id, 'kind': kind,
+                             'node': node, 'depth': depth})
+        return {(rel_class, rel_id): hops
+                for rel_class, rel_id, hops in cursor.fetchall()}
@@ -14,9 +14,8 @@ class BaseRelationshipManager(models.Manager):
 
     def check_project_constraints(self, project=None, left=None, right=None):
         """Related entities must be in the same project."""
-        if (project.id != left.project.id or
-                project.id != right.project.id or
-                left.project.id != right.project.id):
+        if (project.id != left.project_id or
+                project.id != right.project_id):
             raise exceptions.ProjectRelationshipError(
                 'Related entities are not in the same project.')
 
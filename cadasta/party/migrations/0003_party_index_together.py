@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.6 on 2016-10-18 15:02
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('party', '0002_remove_all_types_from_tenure_relationship_type'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='party',
+            index_together=set([('project', 'name', 'id')]),
+        ),
+    ]
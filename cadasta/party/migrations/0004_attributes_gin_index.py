@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.6 on 2016-10-20 09:12
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+GIN_INDEX = ("CREATE INDEX {table}_attributes_gin "
+             "ON {table} USING GIN (attributes jsonb_path_ops)")
+DROP_INDEX = "DROP INDEX {table}_attributes_gin"
+TABLES = ('party_party', 'party_partyrelationship',
+          'party_tenurerelationship')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('party', '0003_party_index_together'),
+    ]
+
+    # Used by the attribute filters of the list APIs (core.filters), which
+    # look up attributes with JSONB containment.
+    operations = [
+        migrations.RunSQL(GIN_INDEX.format(table=table),
+                          DROP_INDEX.format(table=table))
+        for table in TABLES
+    ]
@@ -1,6 +1,6 @@
 """Party models."""
 
-from core.models import RandomIDModel
+from core.models import ProjectObjectModel, RandomIDModel
 from django.core.urlresolvers import reverse
 from django.conf import settings
 from django.contrib.gis.db import models
@@ -12,7 +12,7 @@ from jsonattrs.decorators import fix_model_for_attributes
 from jsonattrs.fields import JSONAttributeField
 from organization.models import Project
 from organization.validators import validate_contact
-from simple_history.models import HistoricalRecords
+from core.history import HistoricalRecords
 
 from resources.mixins import ResourceModelMixin, detach_object_resources
 from spatial.models import SpatialUnit
@@ -25,7 +25,7 @@ PERMISSIONS_DIR = settings.BASE_DIR + '/permissions/'
 
 @fix_model_for_attributes
 @permissioned_model
-class Party(ResourceModelMixin, RandomIDModel):
+class Party(ProjectObjectModel, ResourceModelMixin, RandomIDModel):
     """
     Party model.
 
@@ -84,6 +84,8 @@ class Party(ResourceModelMixin, RandomIDModel):
 
     class Meta:
         ordering = ('name',)
+        # Serves the keyset-paginated party lists of a project
+        index_together = (('project', 'name', 'id'),)
 
     class TutelaryMeta:
         perm_type = 'party'
@@ -138,7 +140,7 @@ models.signals.pre_delete.connect(detach_object_resources, sender=Party)
 
 @fix_model_for_attributes
 @permissioned_model
-class PartyRelationship(RandomIDModel):
+class PartyRelationship(ProjectObjectModel, RandomIDModel):
     """
     PartyRelationship model.
 
@@ -210,7 +212,8 @@ class PartyRelationship(RandomIDModel):
 
 @fix_model_for_attributes
 @permissioned_model
-class TenureRelationship(ResourceModelMixin, RandomIDModel):
+class TenureRelationship(ProjectObjectModel, ResourceModelMixin,
+                         RandomIDModel):
     """TenureRelationship model.
 
     Governs relationships between Party and SpatialUnit.
@@ -57,7 +57,7 @@ class PartyRelationshipWriteSerializer(serializers.ModelSerializer):
         if party1.id == party2.id:
             raise serializers.ValidationError(
                 _("The parties must be different"))
-        elif party1.project.slug != party2.project.slug:
+        elif party1.project_id != party2.project_id:
             err_msg = _(
                 "'party1' project ({}) should be equal to"
                 " 'party2' project ({})")
@@ -102,7 +102,7 @@ class TenureRelationshipWriteSerializer(serializers.ModelSerializer):
         else:
             party = data['party']
             spatial_unit = data['spatial_unit']
-        if party.project.slug != spatial_unit.project.slug:
+        if party.project_id != spatial_unit.project_id:
             err_msg = _(
                 "'party' project ({}) should be equal to"
                 " 'spatial_unit' project ({})")
@@ -70,6 +70,24 @@ class PartyUrlTest(TestCase):
         assert resolved.kwargs['project'] == '123abc'
         assert resolved.kwargs['party'] == '123456123456123456123456'
 
+    def test_project_party_relationship_graph(self):
+        actual = reverse(
+            version_ns('party:rel_graph'),
+            kwargs={
+                'organization': 'habitat',
+                'project': '123abc',
+                'party': '123456123456123456123456',
+            }
+        )
+        expected = version_url(
+            '/organizations/habitat/projects/123abc/'
+            'parties/123456123456123456123456/relationships/graph/')
+        assert actual == expected
+
+        resolved = resolve(expected)
+        assert resolved.func.__name__ == api.RelationshipGraph.__name__
+        assert resolved.kwargs['party'] == '123456123456123456123456'
+
 
 class RelationshipUrlTest(TestCase):
 
@@ -2,7 +2,9 @@
 
 import json
 
+from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
+from jsonattrs.models import Attribute, AttributeType, Schema
 from rest_framework.exceptions import PermissionDenied
 from tutelary.models import Policy, assign_user_policies
 from skivvy import APITestCase
@@ -10,6 +12,7 @@ from skivvy import APITestCase
 from core.tests.utils.cases import UserTestCase
 from organization.tests.factories import OrganizationFactory, ProjectFactory
 from accounts.tests.factories import UserFactory
+from ..models import Party
 from ..tests.factories import PartyFactory
 
 from ..views import api
@@ -64,8 +67,8 @@ class PartyListAPITest(APITestCase, UserTestCase, TestCase):
         PartyFactory.create_batch(2, project=self.prj)
         response = self.request(user=self.user)
         assert response.status_code == 200
-        assert len(response.content) == 2
-        assert 'users' not in response.content[0]
+        assert len(response.content['results']) == 2
+        assert 'users' not in response.content['results'][0]
 
     def test_full_list_with_unauthorized_user(self):
         PartyFactory.create(project=self.prj)
@@ -82,7 +85,7 @@ class PartyListAPITest(APITestCase, UserTestCase, TestCase):
         response = self.request(user=self.user,
                                 get_data={'name': 'Test Party One'})
         assert response.status_code == 200
-        assert len(response.content) == 1
+        assert len(response.content['results']) == 1
 
     def test_type_filter(self):
         PartyFactory.create_from_kwargs([
@@ -92,7 +95,30 @@ class PartyListAPITest(APITestCase, UserTestCase, TestCase):
         ])
         response = self.request(user=self.user, get_data={'type': 'GR'})
         assert response.status_code == 200
-        assert len(response.content) == 1
+        assert len(response.content['results']) == 1
+
+    def test_attribute_filter(self):
+        schema = Schema.objects.create(
+            content_type=ContentType.objects.get_for_model(Party),
+            selectors=(self.org.id, self.prj.id))
+        Attribute.objects.create(
+            schema=schema, name='occupation', long_name='Occupation',
+            attr_type=AttributeType.objects.get(name='text'), index=0)
+        PartyFactory.create_from_kwargs([
+            {'name': 'Farmer', 'project': self.prj,
+             'attributes': {'occupation': 'farmer'}},
+            {'name': 'Teacher', 'project': self.prj,
+             'attributes': {'occupation': 'teacher'}},
+        ])
+        response = self.request(
+            user=self.user, get_data={'attributes.occupation': 'farmer'})
+        assert response.status_code == 200
+        assert [p['name'] for p in response.content['results']] == ['Farmer']
+
+        response = self.request(
+            user=self.user, get_data={'attributes.age__gte': '18'})
+        assert response.status_code == 400
+        assert 'attributes.age__gte' in response.content
 
     def test_ordering(self):
         PartyFactory.create_from_kwargs([
@@ -102,8 +128,8 @@ class PartyListAPITest(APITestCase, UserTestCase, TestCase):
         ])
         response = self.request(user=self.user, get_data={'ordering': 'name'})
         assert response.status_code == 200
-        assert len(response.content) == 3
-        names = [party['name'] for party in response.content]
+        assert len(response.content['results']) == 3
+        names = [party['name'] for party in response.content['results']]
         assert names == sorted(names)
 
     def test_reverse_ordering(self):
@@ -114,8 +140,8 @@ class PartyListAPITest(APITestCase, UserTestCase, TestCase):
         ])
         response = self.request(user=self.user, get_data={'ordering': '-name'})
         assert response.status_code == 200
-        assert len(response.content) == 3
-        names = [party['name'] for party in response.content]
+        assert len(response.content['results']) == 3
+        names = [party['name'] for party in response.content['results']]
         assert names == sorted(names, reverse=True)
 
     def test_get_full_list_organization_does_not_exist(self):
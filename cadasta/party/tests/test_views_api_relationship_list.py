@@ -1,6 +1,10 @@
 import json
 
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from jsonattrs.models import Attribute, AttributeType, Schema
 from tutelary.models import Policy
 from skivvy import APITestCase
 
@@ -8,39 +12,44 @@ from accounts.tests.factories import UserFactory
 from core.tests.utils.cases import UserTestCase
 from organization.tests.factories import ProjectFactory
 from spatial.tests import factories as spatial_factories
+from party.models import TenureRelationship
 from party.tests import factories as party_factories
-from party.views.api import RelationshipList
+from party.views.api import RelationshipGraph, RelationshipList
+
+
+def assign_policies(user):
+    clauses = {
+        'clause': [
+            {
+                'effect': 'allow',
+                'object': ['project/*/*',
+                           'spatial/*/*/*',
+                           'spatial_rel/*/*/*',
+                           'party/*/*/*',
+                           'party_rel/*/*/*',
+                           'tenure_rel/*/*/*'],
+                'action': ['project.*',
+                           'project.*.*',
+                           'spatial.*',
+                           'spatial_rel.*',
+                           'party.*',
+                           'party_rel.*',
+                           'tenure_rel.*']
+            }
+        ]
+    }
+    policy = Policy.objects.create(
+        name='basic-test',
+        body=json.dumps(clauses))
+    user.assign_policies(policy)
 
 
 class SpatialUnitsRelationshipListAPITest(APITestCase, UserTestCase, TestCase):
     view_class = RelationshipList
 
     def setup_models(self):
-        clauses = {
-            'clause': [
-                {
-                    'effect': 'allow',
-                    'object': ['project/*/*',
-                               'spatial/*/*/*',
-                               'spatial_rel/*/*/*',
-                               'party/*/*/*',
-                               'party_rel/*/*/*',
-                               'tenure_rel/*/*/*'],
-                    'action': ['project.*',
-                               'project.*.*',
-                               'spatial.*',
-                               'spatial_rel.*',
-                               'party.*',
-                               'party_rel.*',
-                               'tenure_rel.*']
-                }
-            ]
-        }
-        policy = Policy.objects.create(
-            name='basic-test',
-            body=json.dumps(clauses))
         self.user = UserFactory.create()
-        self.user.assign_policies(policy)
+        assign_policies(self.user)
 
         self.prj = ProjectFactory.create(slug='test-project', access='public')
         self.SR = spatial_factories.SpatialRelationshipFactory
@@ -98,3 +107,147 @@ class SpatialUnitsRelationshipListAPITest(APITestCase, UserTestCase, TestCase):
 
         assert response.status_code == 400
         assert response.content['detail'] == "Relationship class is unknown"
+
+    def test_attribute_filter(self):
+        schema = Schema.objects.create(
+            content_type=ContentType.objects.get_for_model(
+                TenureRelationship),
+            selectors=(self.prj.organization.id, self.prj.id))
+        Attribute.objects.create(
+            schema=schema, name='acquired', long_name='Acquired',
+            attr_type=AttributeType.objects.get(name='date'), index=0)
+        party = party_factories.PartyFactory.create(project=self.prj)
+        tr1 = self.TR.create(project=self.prj, party=party,
+                             attributes={'acquired': '2001-05-01'})
+        self.TR.create(project=self.prj, party=party,
+                       attributes={'acquired': '1998-02-01'})
+        self.PR.create(project=self.prj, party1=party)
+
+        response = self.request(
+            user=self.user, url_kwargs={'party_id': party.id},
+            get_data={'class': 'tenure',
+                      'attributes.acquired__gte': '2000-01-01'})
+        assert response.status_code == 200
+        assert [rel['id'] for rel in response.content] == [tr1.id]
+
+        # Each class of relationships has its own attributes
+        response = self.request(user=self.user,
+                                url_kwargs={'party_id': party.id},
+                                get_data={'attributes.acquired': '2001'})
+        assert response.status_code == 400
+
+    def count_queries(self, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.request(user=self.user, **kwargs)
+        assert response.status_code == 200
+        return len(queries)
+
+    def test_party_relationships_are_fetched_with_fixed_queries(self):
+        party = party_factories.PartyFactory.create(project=self.prj)
+        self.PR.create(project=self.prj, party1=party)
+        self.TR.create(project=self.prj, party=party)
+        queries = self.count_queries(url_kwargs={'party_id': party.id})
+
+        self.PR.create_batch(3, project=self.prj, party2=party)
+        self.TR.create_batch(3, project=self.prj, party=party)
+        with self.assertNumQueries(queries):
+            response = self.request(user=self.user,
+                                    url_kwargs={'party_id': party.id})
+        assert response.status_code == 200
+        assert len(response.content) == 8
+
+    def test_spatial_relationships_are_fetched_with_fixed_queries(self):
+        su = spatial_factories.SpatialUnitFactory.create(project=self.prj)
+        self.SR.create(project=self.prj, su1=su)
+        self.TR.create(project=self.prj, spatial_unit=su)
+        queries = self.count_queries(url_kwargs={'spatial_id': su.id})
+
+        self.SR.create_batch(3, project=self.prj, su2=su)
+        self.TR.create_batch(3, project=self.prj, spatial_unit=su)
+        with self.assertNumQueries(queries):
+            response = self.request(user=self.user,
+                                    url_kwargs={'spatial_id': su.id})
+        assert response.status_code == 200
+        assert len(response.content) == 8
+
+
+class RelationshipGraphAPITest(APITestCase, UserTestCase, TestCase):
+    view_class = RelationshipGraph
+
+    def setup_models(self):
+        self.user = UserFactory.create()
+        assign_policies(self.user)
+        self.prj = ProjectFactory.create(slug='test-project', access='public')
+
+        # party1 -tenure- su1 -spatial- su2 -tenure- party2 -party- party3
+        self.party1, self.party2, self.party3 = (
+            party_factories.PartyFactory.create_batch(3, project=self.prj))
+        self.su1, self.su2 = (
+            spatial_factories.SpatialUnitFactory.create_batch(
+                2, project=self.prj))
+        self.tr1 = party_factories.TenureRelationshipFactory.create(
+            project=self.prj, party=self.party1, spatial_unit=self.su1)
+        self.sr = spatial_factories.SpatialRelationshipFactory.create(
+            project=self.prj, su1=self.su2, su2=self.su1)
+        self.tr2 = party_factories.TenureRelationshipFactory.create(
+            project=self.prj, party=self.party2, spatial_unit=self.su2)
+        self.pr = party_factories.PartyRelationshipFactory.create(
+            project=self.prj, party1=self.party3, party2=self.party2)
+        party_factories.TenureRelationshipFactory.create()
+
+    def setup_url_kwargs(self):
+        return {
+            'organization': self.prj.organization.slug,
+            'project': self.prj.slug,
+            'party': self.party1.id,
+        }
+
+    def test_default_depth(self):
+        response = self.request(user=self.user)
+        assert response.status_code == 200
+        assert [(rel['rel_class'], rel['id'], rel['depth'])
+                for rel in response.content] == [
+            ('tenure', self.tr1.id, 1),
+            ('spatial', self.sr.id, 2),
+        ]
+
+    def test_full_neighbourhood(self):
+        response = self.request(user=self.user, get_data={'depth': 5})
+        assert response.status_code == 200
+        depths = {rel['id']: rel['depth'] for rel in response.content}
+        assert depths == {self.tr1.id: 1, self.sr.id: 2, self.tr2.id: 3,
+                          self.pr.id: 4}
+
+    def test_neighbourhood_of_spatial_unit(self):
+        response = self.request(user=self.user,
+                                url_kwargs={'party': None,
+                                            'spatial_id': self.su2.id},
+                                get_data={'depth': 1})
+        assert response.status_code == 200
+        assert sorted(rel['id'] for rel in response.content) == sorted([
+            self.sr.id, self.tr2.id])
+
+    def test_invalid_depth(self):
+        response = self.request(user=self.user, get_data={'depth': 10})
+        assert response.status_code == 400
+        assert 'depth' in response.content
+
+        response = self.request(user=self.user, get_data={'depth': 'all'})
+        assert response.status_code == 400
+
+    def test_relationships_are_fetched_with_fixed_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.request(user=self.user, get_data={'depth': 5})
+        assert response.status_code == 200
+        assert len(response.content) == 4
+
+        party_factories.TenureRelationshipFactory.create_batch(
+            3, project=self.prj, party=self.party1)
+        spatial_factories.SpatialRelationshipFactory.create_batch(
+            3, project=self.prj, su1=self.su1)
+        party_factories.PartyRelationshipFactory.create_batch(
+            3, project=self.prj, party1=self.party2)
+        with self.assertNumQueries(len(queries)):
+            response = self.request(user=self.user, get_data={'depth': 5})
+        assert response.status_code == 200
+        assert len(response.content) == 13
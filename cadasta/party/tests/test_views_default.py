@@ -826,7 +826,6 @@ class PartyRelationshipDetailTest(ViewTestCase, UserTestCase, TestCase):
         return {'object': self.project,
                 'relationship': self.relationship,
                 'location': self.relationship.spatial_unit,
-                'geojson': '{"type": "FeatureCollection", "features": []}',
                 'attributes': (('Test field', 'test', ),
                                ('Test field 2', 'Choice 2', ),
                                ('Test field 3', 'Choice 1, Choice 3', ))}
@@ -901,8 +900,7 @@ class PartyRelationshipEditTest(ViewTestCase, UserTestCase, TestCase):
         return {'object': self.project,
                 'relationship': self.relationship,
                 'location': self.relationship.spatial_unit,
-                'form': form,
-                'geojson': '{"type": "FeatureCollection", "features": []}'}
+                'form': form}
 
     def setup_url_kwargs(self):
         return {
@@ -1015,8 +1013,7 @@ class PartyRelationshipDeleteTest(ViewTestCase, UserTestCase, TestCase):
     def setup_template_context(self):
         return {'object': self.project,
                 'relationship': self.relationship,
-                'location': self.relationship.spatial_unit,
-                'geojson': '{"type": "FeatureCollection", "features": []}'}
+                'location': self.relationship.spatial_unit}
 
     def setup_url_kwargs(self):
         return {
@@ -1134,8 +1131,7 @@ class PartyRelationshipResourceAddTest(ViewTestCase, UserTestCase, TestCase):
         return {'object': self.project,
                 'relationship': self.relationship,
                 'location': self.relationship.spatial_unit,
-                'form': form,
-                'geojson': '{"type": "FeatureCollection", "features": []}'}
+                'form': form}
 
     def setup_url_kwargs(self):
         return {
@@ -1268,8 +1264,7 @@ class PartyRelationshipResourceNewTest(ViewTestCase, UserTestCase, TestCase):
         return {'object': self.project,
                 'location': self.relationship.spatial_unit,
                 'relationship': self.relationship,
-                'form': form,
-                'geojson': '{"type": "FeatureCollection", "features": []}'}
+                'form': form}
 
     def setup_post_data(self):
         path = os.path.dirname(settings.BASE_DIR)
@@ -15,4 +15,8 @@ urlpatterns = [
         r'^(?P<party>[-\w]+)/relationships/$',
         api.RelationshipList.as_view(),
         name='rel_list'),
+    url(
+        r'^(?P<party>[-\w]+)/relationships/graph/$',
+        api.RelationshipGraph.as_view(),
+        name='rel_graph'),
 ]
@@ -8,6 +8,14 @@ urlpatterns = [
         r'^spatial/$',
         spatial_api.SpatialRelationshipCreate.as_view(),
         name='spatial_rel_create'),
+    url(
+        r'^spatial/containment/$',
+        spatial_api.SpatialContainmentCompute.as_view(),
+        name='spatial_rel_containment'),
+    url(
+        r'^spatial/containment/(?P<job>[-\w]+)/$',
+        spatial_api.SpatialContainmentJobDetail.as_view(),
+        name='spatial_rel_containment_detail'),
     url(
         r'^spatial/(?P<spatial_rel_id>[-\w]+)/$',
         spatial_api.SpatialRelationshipDetail.as_view(),
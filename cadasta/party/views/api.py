@@ -3,15 +3,19 @@
 from django.db.models import Q
 from django.utils.translation import gettext as _
 from rest_framework import generics, filters, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from tutelary.mixins import APIPermissionRequiredMixin
+from core.filters import AttributeFilter, filter_attributes, parse_params
 from core.mixins import update_permissions
+from core.models import known_project
 
 from party.models import (PartyRelationship,
                           TenureRelationship)
 from spatial.models import SpatialRelationship
 from party import serializers
+from party.graph import relationship_neighbourhood
 from spatial.serializers import SpatialRelationshipReadSerializer
 from . import mixins
 from organization.views.mixins import ProjectMixin
@@ -23,7 +27,8 @@ class PartyList(APIPermissionRequiredMixin,
 
     serializer_class = serializers.PartySerializer
     filter_backends = (filters.DjangoFilterBackend,
-                       filters.SearchFilter, filters.OrderingFilter,)
+                       filters.SearchFilter, filters.OrderingFilter,
+                       AttributeFilter,)
     filter_fields = ('name', 'type')
     search_fields = ('name',)
     ordering_fields = ('name',)
@@ -59,6 +64,49 @@ class RelationshipList(APIPermissionRequiredMixin,
     permission_required = (
         'spatial_rel.list', 'party_rel.list', 'tenure_rel.list')
 
+    def get_spatial_relationships(self, *args, **kwargs):
+        return SpatialRelationship.objects.filter(
+            *args, project=self.get_project(), **kwargs
+        ).select_related('project__organization',
+                         'su1__project__organization',
+                         'su2__project__organization')
+
+    def get_party_relationships(self, *args, **kwargs):
+        return PartyRelationship.objects.filter(
+            *args, project=self.get_project(), **kwargs
+        ).select_related('project__organization',
+                         'party1__project__organization',
+                         'party2__project__organization')
+
+    def get_tenure_relationships(self, *args, **kwargs):
+        return TenureRelationship.objects.filter(
+            *args, project=self.get_project(), **kwargs
+        ).select_related('project__organization',
+                         'party__project__organization',
+                         'spatial_unit__project__organization')
+
+    def serialize(self, spatial_rels, party_rels, tenure_rels):
+        # The relationships and their parties and locations are loaded
+        # while serializing; all of them belong to the project, which
+        # their attribute schemas are then looked up with.
+        with known_project(self.get_project()):
+            return (
+                SpatialRelationshipReadSerializer(
+                    spatial_rels, many=True).data +
+                serializers.PartyRelationshipReadSerializer(
+                    party_rels, many=True).data +
+                serializers.TenureRelationshipReadSerializer(
+                    tenure_rels, many=True).data
+            )
+
+    def get_node(self):
+        """Returns the kind and ID of the party or location whose
+        relationships are requested."""
+        if 'spatial_id' in self.kwargs:
+            return 'spatial', self.kwargs['spatial_id']
+        # The party URLs name the party ``party``
+        return 'party', self.kwargs.get('party_id', self.kwargs.get('party'))
+
     def get(self, request, *args, **kwargs):
 
         acceptable_classes = ('spatial', 'party', 'tenure')
@@ -66,61 +114,87 @@ class RelationshipList(APIPermissionRequiredMixin,
         if rel_class is not None and rel_class not in acceptable_classes:
             content = {'detail': _("Relationship class is unknown")}
             return Response(content, status=status.HTTP_400_BAD_REQUEST)
+        # Each class of relationships has its own attributes
+        attribute_filters = parse_params(self.request.query_params)
+        if rel_class is None and attribute_filters:
+            content = {'detail': _(
+                "Attribute filters need a relationship class")}
+            return Response(content, status=status.HTTP_400_BAD_REQUEST)
 
+        kind, node = self.get_node()
         spatial_rels = []
-        if (
-            'spatial_id' in kwargs and
-            (rel_class is None or rel_class == 'spatial')
-        ):
-            manager = SpatialRelationship.objects
-            spatial_rels = (
-                manager.filter(
-                    Q(su1=kwargs['spatial_id']) |
-                    Q(su2=kwargs['spatial_id'])
-                )
-            )
-        serialized_spatial_rels = SpatialRelationshipReadSerializer(
-            spatial_rels, many=True).data
-
         party_rels = []
-        if (
-            'party_id' in kwargs and
-            (rel_class is None or rel_class == 'party')
-        ):
-            manager = PartyRelationship.objects
-            party_rels = (
-                manager.filter(
-                    Q(party1=kwargs['party_id']) |
-                    Q(party2=kwargs['party_id'])
-                )
-            )
-        serialized_party_rels = serializers.PartyRelationshipReadSerializer(
-            party_rels, many=True).data
-
         tenure_rels = []
-        if rel_class is None or rel_class == 'tenure':
-            manager = TenureRelationship.objects
-            if 'spatial_id' in kwargs:
-                tenure_rels = (
-                    manager.filter(spatial_unit=kwargs['spatial_id'])
-                )
-            elif 'party_id' in kwargs:
-                tenure_rels = (
-                    manager.filter(party=kwargs['party_id'])
-                )
-        serialized_tenure_rels = serializers.TenureRelationshipReadSerializer(
-            tenure_rels, many=True).data
+        if kind == 'spatial':
+            if rel_class is None or rel_class == 'spatial':
+                spatial_rels = self.get_spatial_relationships(
+                    Q(su1=node) | Q(su2=node))
+            if rel_class is None or rel_class == 'tenure':
+                tenure_rels = self.get_tenure_relationships(
+                    spatial_unit=node)
+        else:
+            if rel_class is None or rel_class == 'party':
+                party_rels = self.get_party_relationships(
+                    Q(party1=node) | Q(party2=node))
+            if rel_class is None or rel_class == 'tenure':
+                tenure_rels = self.get_tenure_relationships(party=node)
+
+        if attribute_filters:
+            project = self.get_project()
+            spatial_rels, party_rels, tenure_rels = [
+                rels if isinstance(rels, list) else
+                filter_attributes(rels, project, self.request.query_params)
+                for rels in (spatial_rels, party_rels, tenure_rels)]
 
         return Response(
-            serialized_spatial_rels +
-            serialized_party_rels +
-            serialized_tenure_rels
-        )
+            self.serialize(spatial_rels, party_rels, tenure_rels))
 
     def get_perms_objects(self):
         return [self.get_project()]
 
 
+class RelationshipGraph(RelationshipList):
+    """Relationships within ``depth`` relationships of a party or a
+    location, each with the ``depth`` at which it was reached."""
+
+    default_depth = 2
+    max_depth = 5
+
+    def get_depth(self):
+        depth = self.request.query_params.get('depth', self.default_depth)
+        try:
+            depth = int(depth)
+        except ValueError:
+            depth = None
+        if depth is None or not 1 <= depth <= self.max_depth:
+            raise ValidationError({'depth': _(
+                "Expected a number from 1 to {}.").format(self.max_depth)})
+        return depth
+
+    def get(self, request, *args, **kwargs):
+        kind, node = self.get_node()
+        depths = relationship_neighbourhood(
+            self.get_project(), kind, node, self.get_depth())
+
+        ids = {'spatial': [], 'party': [], 'tenure': []}
+        for rel_class, rel_id in depths:
+            ids[rel_class].append(rel_id)
+        spatial_rels, party_rels, tenure_rels = [], [], []
+        if ids['spatial']:
+            spatial_rels = self.get_spatial_relationships(
+                id__in=ids['spatial'])
+        if ids['party']:
+            party_rels = self.get_party_relationships(id__in=ids['party'])
+        if ids['tenure']:
+            tenure_rels = self.get_tenure_relationships(id__in=ids['tenure'])
+
+        data = self.serialize(spatial_rels, party_rels, tenure_rels)
+        for rel in data:
+            rel['depth'] = depths[(rel['rel_class'], rel['id'])]
+        data.sort(key=lambda rel: rel['depth'])
+        return Response(data)
+
+
 class PartyRelationshipCreate(APIPermissionRequiredMixin,
                               mixins.PartyRelationshipQuerySetMixin,
                               generics.CreateAPIView):
@@ -1,10 +1,8 @@
-import json
 from django.http import Http404
 from django.core.urlresolvers import reverse
 from organization.views.mixins import ProjectMixin
 from resources.views.mixins import ResourceViewMixin
 
-from spatial.serializers import SpatialUnitGeoJsonSerializer
 from ..models import Party, TenureRelationship
 
 
@@ -92,14 +90,6 @@ class PartyRelationshipObjectMixin(ProjectMixin):
         context['object'] = self.get_project()
         context['relationship'] = self.get_object()
         context['location'] = self.get_object().spatial_unit
-
-        locations = context['object'].spatial_units.exclude(
-            id=context['location'].id)
-
-        context['geojson'] = json.dumps(
-            SpatialUnitGeoJsonSerializer(locations, many=True).data
-        )
-
         return context
 
     def get_object(self):
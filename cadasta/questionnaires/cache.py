@@ -0,0 +1,170 @@
+"""In-process cache of the compiled attribute schemas of questionnaires.
+
+Processing a submission or importing a CSV file needs to know, for every
+answered attribute, whether it exists and how its value is stored (a
+``select_multiple`` answer is a space-separated list). Looking this up
+in the database for every field makes processing a submission cost a
+few queries per answer. Instead, the attribute schemas of all attribute
+groups of a questionnaire are compiled into plain tuples once, with a
+single query, and kept in memory.
+
+The attributes of a questionnaire are written when the questionnaire is
+uploaded and never change afterwards; uploading a new version of a form
+creates a new questionnaire with a new ID. Compiled schemas are keyed by
+the questionnaire ID, so an entry never goes stale in any process, and
+only the most recently used entries are kept. Entries are evicted in the
+current process when a questionnaire or an attribute schema is saved,
+which keeps the cache correct for schemas created in tests or in the
+admin. Schemas of projects without a questionnaire can be changed at any
+time and are compiled without being cached.
+
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+from jsonattrs.models import Attribute
+
+ATTRIBUTE_GROUPS = settings.ATTRIBUTE_GROUPS
+
+# Number of questionnaires whose compiled schemas are kept in memory
+MAX_ENTRIES = 256
+
+CompiledAttribute = namedtuple(
+    'CompiledAttribute',
+    ('name', 'long_name', 'type', 'choices', 'required', 'default'))
+
+_schemas = OrderedDict()
+_lock = threading.Lock()
+
+
+def content_type_key(group):
+    """Returns the ``app_label.model`` key of an attribute group."""
+    return '{app_label}.{model}'.format(**ATTRIBUTE_GROUPS[group])
+
+
+class CompiledSchema:
+    """The attributes of all attribute groups of a questionnaire.
+
+    ``attributes`` maps ``app_label.model`` keys to ordered dictionaries
+    of the composed, non-omitted attributes of that content type.
+    ``conditional`` maps ``(app_label.model, selector)`` pairs to the
+    attributes of objects selected by one more selector, such as the type
+    of a party, composed with those of the content type.
+    """
+
+    def __init__(self, attributes, conditional=None):
+        self.attributes = attributes
+        self.conditional = conditional or {}
+        # Attributes of any selector, for looking up attributes by name
+        # when the selector of an object is not known
+        self._all = {key: OrderedDict(attrs)
+                     for key, attrs in attributes.items()}
+        for (key, selector), attrs in sorted(self.conditional.items()):
+            for name, attr in attrs.items():
+                self._all[key].setdefault(name, attr)
+
+    def get(self, content_type_key, selector=None):
+        """Returns the attributes of objects of ``content_type_key``
+        selected by ``selector``. Without a selector, the attributes of
+        all selectors are returned."""
+        if selector is None:
+            return self._all.get(content_type_key, OrderedDict())
+        key = (content_type_key, str(selector))
+        if key in self.conditional:
+            return self.conditional[key]
+        return self.attributes.get(content_type_key, OrderedDict())
+
+    def coerce(self, content_type_key, name, value):
+        """Returns an answer in the form in which it is stored in the
+        ``attributes`` field of an object."""
+        attr = self.get(content_type_key).get(name)
+        if (attr is not None and attr.type == 'select_multiple' and
+                isinstance(value, str)):
+            return value.split(' ')
+        return value
+
+
+def _compile_attribute(attr):
+    return CompiledAttribute(
+        name=attr.name,
+        long_name=attr.long_name,
+        type=attr.attr_type.name,
+        choices=tuple(attr.choices) if attr.choices else (),
+        required=attr.required,
+        default=attr.default)
+
+
+def compile_schema(project, questionnaire_id):
+    """Compiles the attribute schemas of all attribute groups of
+    ``questionnaire_id`` in ``project`` with a single query."""
+    # Selectors are stored as strings, as jsonattrs builds them from an
+    # object; the attribute groups of a questionnaire may be conditional
+    # on one more selector, such as the type of a party.
+    selectors = [str(s) for s in (project.organization_id, project.id,
+                                  questionnaire_id)]
+    schemas = Q(schema__selectors__len=len(selectors) + 1,
+                schema__selectors__0_3=selectors)
+    for i in range(len(selectors) + 1):
+        schemas |= Q(schema__selectors=selectors[:i])
+
+    content_types = {}
+    for group in ATTRIBUTE_GROUPS:
+        content_type = ContentType.objects.get_by_natural_key(
+            **ATTRIBUTE_GROUPS[group])
+        content_types[content_type.id] = content_type_key(group)
+    attrs = Attribute.objects.filter(
+        schemas, schema__content_type__in=content_types
+    ).select_related('attr_type', 'schema')
+
+    # Composes the schemas as jsonattrs does: more specific schemas
+    # override or omit the attributes of less specific ones. Conditional
+    # schemas are composed separately for each of their selectors.
+    attributes = {key: OrderedDict() for key in content_types.values()}
+    conditional = {}
+    for attr in sorted(attrs, key=lambda a: (len(a.schema.selectors),
+                                             a.schema_id, a.index)):
+        key = content_types[attr.schema.content_type_id]
+        if len(attr.schema.selectors) > len(selectors):
+            selector = attr.schema.selectors[len(selectors)]
+            if (key, selector) not in conditional:
+                conditional[key, selector] = OrderedDict(attributes[key])
+            compiled = conditional[key, selector]
+        else:
+            compiled = attributes[key]
+        if attr.omit:
+            compiled.pop(attr.name, None)
+        else:
+            compiled[attr.name] = _compile_attribute(attr)
+    return CompiledSchema(attributes, conditional)
+
+
+def get_schema(project, questionnaire_id=None):
+    """Returns the compiled schema of ``questionnaire_id``, which defaults
+    to the current questionnaire of ``project``."""
+    if questionnaire_id is None:
+        questionnaire_id = project.current_questionnaire
+    if not questionnaire_id:
+        return compile_schema(project, questionnaire_id)
+
+    with _lock:
+        schema = _schemas.get(questionnaire_id)
+        if schema is not None:
+            _schemas.move_to_end(questionnaire_id)
+            return schema
+
+    schema = compile_schema(project, questionnaire_id)
+    with _lock:
+        _schemas[questionnaire_id] = schema
+        while len(_schemas) > MAX_ENTRIES:
+            _schemas.popitem(last=False)
+    return schema
+
+
+def invalidate_schemas():
+    """Removes all compiled schemas from the cache of this process."""
+    with _lock:
+        _schemas.clear()
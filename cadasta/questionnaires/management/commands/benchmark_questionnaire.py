@@ -0,0 +1,145 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from pyxform.xls2json import parse_file_to_json
+
+from organization.models import Organization, Project
+from ...managers import QuestionnaireObjects
+from ...models import Questionnaire
+
+QUESTION_TYPES = ('text', 'integer', 'select one', 'select all that apply',
+                  'date', 'geopoint')
+
+
+def make_choices(name, count):
+    return [{'name': '{}_{}'.format(name, i), 'label': 'Choice {}'.format(i)}
+            for i in range(count)]
+
+
+def make_form(questions, choices):
+    """Returns the children of a form in pyxform's JSON format with
+    ``questions`` questions in groups of 20, and an attribute group of 20
+    questions for each model listed in ``ATTRIBUTE_GROUPS``. Select
+    questions have ``choices`` options each."""
+    def question(name, type):
+        q = {'name': name, 'label': name.replace('_', ' '), 'type': type}
+        if type in ('select one', 'select all that apply'):
+            q['choices'] = make_choices(name, choices)
+        return q
+
+    children = []
+    for g in range(0, questions, 20):
+        children.append({
+            'name': 'group_{}'.format(g // 20),
+            'label': 'Group {}'.format(g // 20),
+            'type': 'group',
+            'children': [
+                question('question_{}'.format(i),
+                         QUESTION_TYPES[i % len(QUESTION_TYPES)])
+                for i in range(g, min(g + 20, questions))
+            ]
+        })
+    for attr_group in settings.ATTRIBUTE_GROUPS:
+        children.append({
+            'name': attr_group,
+            'label': attr_group,
+            'type': 'group',
+            'children': [
+                question('{}_{}'.format(attr_group, i),
+                         QUESTION_TYPES[i % 4])
+                for i in range(20)
+            ]
+        })
+    return children
+
+
+def save_one_by_one(objs):
+    """Writes the collected objects with one ``save`` per object, the way
+    forms were ingested before they were written in bulk."""
+    for schema, attributes in objs.schemas:
+        schema.save()
+        for attr in attributes:
+            attr.schema = schema
+            attr.save()
+    for obj in objs.groups + objs.questions + objs.options:
+        obj.save(force_insert=True)
+
+
+class Command(BaseCommand):
+    help = """Measures how long it takes to write the question groups,
+    questions, options and attributes of a large form. Nothing is kept
+    in the database."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--form',
+            dest='form',
+            help='XLSForm to ingest instead of a generated form'
+        )
+        parser.add_argument(
+            '--questions',
+            type=int,
+            dest='questions',
+            default=600,
+            help='Number of questions of the generated form'
+        )
+        parser.add_argument(
+            '--choices',
+            type=int,
+            dest='choices',
+            default=100,
+            help='Number of options of each select question of the '
+                 'generated form'
+        )
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            dest='compare',
+            default=False,
+            help='Also write the form saving one object at a time'
+        )
+
+    def ingest(self, label, children, save):
+        with transaction.atomic():
+            org = Organization.objects.create(name='Benchmark')
+            project = Project.objects.create(name='Benchmark',
+                                             organization=org)
+            questionnaire = Questionnaire.objects.create(
+                project=project, filename='benchmark',
+                id_string='benchmark', xls_form='benchmark.xlsx')
+            project.current_questionnaire = questionnaire.id
+            project.save()
+
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                objs = QuestionnaireObjects(project=project)
+                objs.add_children(children, questionnaire=questionnaire)
+                save(objs)
+                elapsed = time.perf_counter() - start
+
+            self.stdout.write('{:<14} {:8.3f}s {:8d} queries'.format(
+                label, elapsed, len(queries)))
+            transaction.set_rollback(True)
+        return objs, elapsed
+
+    def handle(self, *args, **options):
+        if options['form']:
+            children = parse_file_to_json(options['form']).get('children')
+        else:
+            children = make_form(options['questions'], options['choices'])
+
+        objs, bulk_time = self.ingest(
+            'bulk', children, QuestionnaireObjects.save)
+        self.stdout.write(
+            '{} groups, {} questions, {} options, {} attributes'.format(
+                len(objs.groups), len(objs.questions), len(objs.options),
+                sum(len(attrs) for _, attrs in objs.schemas)))
+
+        if options['compare']:
+            _, single_time = self.ingest('one by one', children,
+                                         save_one_by_one)
+            self.stdout.write(
+                'Speed-up: {:.1f}x'.format(single_time / bulk_time))
@@ -11,6 +11,8 @@ from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db import models, transaction
 from django.utils.translation import ugettext as _
+from core.history import bulk_create_history
+from core.util import random_id
 from jsonattrs.models import Attribute, AttributeType, Schema
 from pyxform.builder import create_survey_element_from_dict
 from pyxform.errors import PyXFormError
@@ -20,103 +22,193 @@ from questionnaires.exceptions import InvalidXLSForm
 ATTRIBUTE_GROUPS = settings.ATTRIBUTE_GROUPS
 
 
-def create_children(children, errors=[], project=None, kwargs={}):
-    if children:
+class QuestionnaireObjects:
+    """Collects the question groups, questions, options and attributes
+    of a form in memory and writes each kind of object with a single
+    bulk insert once the whole form has been read.
+
+    ``bulk_create`` neither calls ``save`` nor sends model signals, so
+    IDs are assigned here and the historical records are created in
+    bulk. Attribute schemas are saved one by one: there is at most one
+    per attribute group, and ``bulk_create`` does not return the IDs of
+    the new rows that the attributes need to point to.
+    """
+
+    def __init__(self, project=None, errors=[]):
+        self.project = project
+        self.errors = errors
+        self.groups = []
+        self.questions = []
+        self.options = []
+        self.schemas = []
+        self._attr_types = None
+
+        Question = apps.get_model('questionnaires', 'Question')
+        self.question_types = {name: code
+                               for code, name in Question.TYPE_CHOICES}
+
+    @property
+    def attr_types(self):
+        if self._attr_types is None:
+            self._attr_types = {t.name: t for t in AttributeType.objects.all()}
+        return self._attr_types
+
+    def add_children(self, children, questionnaire=None, question_group=None):
+        if not children:
+            return
+
         for c in children:
             if c.get('type') == 'repeat':
-                create_children(c['children'], errors, project, kwargs)
+                self.add_children(c['children'], questionnaire, question_group)
             elif c.get('type') == 'group':
-                model_name = 'QuestionGroup'
-
                 # parse attribute group
                 attribute_group = c.get('name')
                 for attr_group in ATTRIBUTE_GROUPS.keys():
                     if attribute_group.startswith(attr_group):
                         app_label = ATTRIBUTE_GROUPS[attr_group]['app_label']
                         model = ATTRIBUTE_GROUPS[attr_group]['model']
-                        content_type = ContentType.objects.get(
-                            app_label=app_label, model=model)
-                        create_attrs_schema(
-                            project=project, dict=c,
-                            content_type=content_type, errors=errors
-                        )
+                        content_type = ContentType.objects.get_by_natural_key(
+                            app_label, model)
+                        self.add_attrs_schema(c, content_type)
+
+                self.add_group(c, questionnaire)
+            else:
+                self.add_question(c, questionnaire, question_group)
+
+    def add_group(self, dict, questionnaire):
+        QuestionGroup = apps.get_model('questionnaires', 'QuestionGroup')
+        group = QuestionGroup(id=random_id(),
+                              questionnaire=questionnaire,
+                              name=dict.get('name'),
+                              label=dict.get('label'))
+        self.groups.append(group)
+
+        if self.project is None:
+            self.project = questionnaire.project
+        self.add_children(dict.get('children'), questionnaire, group)
+        return group
+
+    def add_question(self, dict, questionnaire, question_group=None):
+        Question = apps.get_model('questionnaires', 'Question')
+        question = Question(id=random_id(),
+                            questionnaire=questionnaire,
+                            question_group=question_group,
+                            type=self.question_types[dict.get('type')],
+                            name=dict.get('name'),
+                            label=dict.get('label'),
+                            required=dict.get('required', False),
+                            constraint=dict.get('constraint'))
+        self.questions.append(question)
+
+        if question.has_options:
+            self.add_options(dict.get('choices'), question)
+        return question
+
+    def add_options(self, options, question):
+        QuestionOption = apps.get_model('questionnaires', 'QuestionOption')
+
+        if options:
+            for o, idx in zip(options, itertools.count()):
+                self.options.append(QuestionOption(
+                    id=random_id(), question=question, index=idx+1, **o))
+        else:
+            self.errors.append(
+                _("Please provide at least one option for field"
+                  " '{field_name}'".format(field_name=question.name)))
+
+    def add_attrs_schema(self, dict, content_type):
+        project = self.project
+        selectors = (project.organization.pk, project.pk,
+                     project.current_questionnaire)
+        # check if the attribute group has a relevant bind statement,
+        # eg ${party_type}='IN'
+        # this enables conditional attribute schema creation
+        bind = dict.get('bind', None)
+        if bind:
+            relevant = bind.get('relevant', None)
+            if relevant:
+                clauses = relevant.split('=')
+                selector = re.sub("'", '', clauses[1])
+                selectors += (selector,)
+
+        schema = Schema(content_type=content_type, selectors=selectors)
+        attributes = []
+
+        for c, index in zip(dict.get('children'), itertools.count(1)):
+            # HACK: pyxform renames select_multiple to select all that apply
+            if c.get('type') == 'select all that apply':
+                attr_type = 'select_multiple'
             else:
-                model_name = 'Question'
+                # HACK: pyxform strips underscores from xform field names
+                attr_type = c.get('type').replace(' ', '_')
+            try:
+                attr_type = self.attr_types[attr_type]
+            except KeyError:
+                raise AttributeType.DoesNotExist(
+                    "AttributeType '{}' does not exist.".format(attr_type))
+
+            required = False
+            bind = c.get('bind')
+            if bind:
+                required = bind.get('required', 'no') == 'yes'
+
+            choices = []
+            choice_labels = None
+            if c.get('choices'):
+                choices = [choice.get('name') for choice in c.get('choices')]
+                choice_labels = [choice.get('label')
+                                 for choice in c.get('choices')]
+                # bulk_create skips the checks of AttributeManager.create
+                if not all([isinstance(label, str)
+                            for label in choice_labels]):
+                    raise ValueError("non-string choice label in Attribute")
+
+            attributes.append(Attribute(
+                name=c.get('name'),
+                long_name=c.get('label') or c.get('name'),
+                attr_type=attr_type, index=index,
+                choices=choices, choice_labels=choice_labels,
+                default=c.get('default') or '',
+                required=required,
+                omit=c.get('omit', '') == 'yes'
+            ))
+
+        self.schemas.append((schema, attributes))
+        return schema
+
+    def save(self):
+        batch_size = settings.IMPORT_BATCH_SIZE
+
+        attributes = []
+        for schema, schema_attrs in self.schemas:
+            schema.save()
+            for attr in schema_attrs:
+                attr.schema = schema
+            attributes.extend(schema_attrs)
+        Attribute.objects.bulk_create(attributes, batch_size=batch_size)
+
+        for objs in (self.groups, self.questions, self.options):
+            if objs:
+                type(objs[0]).objects.bulk_create(objs, batch_size=batch_size)
+                bulk_create_history(objs, batch_size=batch_size)
 
-            if c.get('type') != 'repeat':
-                model = apps.get_model('questionnaires', model_name)
-                model.objects.create_from_dict(dict=c, errors=errors, **kwargs)
 
+def create_children(children, errors=[], project=None, kwargs={}):
+    objs = QuestionnaireObjects(project=project, errors=errors)
+    objs.add_children(children, **kwargs)
+    objs.save()
 
-def create_options(options, question, errors=[]):
-    if options:
-        for o, idx in zip(options, itertools.count()):
-            QuestionOption = apps.get_model('questionnaires', 'QuestionOption')
 
-            QuestionOption.objects.create(question=question, index=idx+1, **o)
-    else:
-        errors.append(_("Please provide at least one option for field"
-                        " '{field_name}'".format(field_name=question.name)))
+def create_options(options, question, errors=[]):
+    objs = QuestionnaireObjects(errors=errors)
+    objs.add_options(options, question)
+    objs.save()
 
 
 def create_attrs_schema(project=None, dict=None, content_type=None, errors=[]):
-    fields = []
-    selectors = (project.organization.pk, project.pk,
-                 project.current_questionnaire)
-    # check if the attribute group has a relevant bind statement,
-    # eg ${party_type}='IN'
-    # this enables conditional attribute schema creation
-    bind = dict.get('bind', None)
-    if bind:
-        relevant = bind.get('relevant', None)
-        if relevant:
-            clauses = relevant.split('=')
-            selector = re.sub("'", '', clauses[1])
-            selectors += (selector,)
-
-    schema_obj = Schema.objects.create(content_type=content_type,
-                                       selectors=selectors)
-
-    for c in dict.get('children'):
-        field = {}
-        field['name'] = c.get('name')
-        field['long_name'] = c.get('label')
-        # HACK: pyxform renames select_multiple to select all that apply
-        if c.get('type') == 'select all that apply':
-            field['attr_type'] = 'select_multiple'
-        else:
-            # HACK: pyxform strips underscores from xform field names
-            field['attr_type'] = c.get('type').replace(' ', '_')
-        if c.get('default'):
-            field['default'] = c.get('default', '')
-        if c.get('omit'):
-            field['omit'] = c.get('omit')
-        bind = c.get('bind')
-        if bind:
-            field['required'] = True if bind.get(
-                'required', 'no') == 'yes' else False
-        if c.get('choices'):
-            field['choices'] = [choice.get('name')
-                                for choice in c.get('choices')]
-            field['choice_labels'] = [choice.get('label')
-                                      for choice in c.get('choices')]
-        fields.append(field)
-
-    for field, index in zip(fields, itertools.count(1)):
-        long_name = field.get('long_name', field['name'])
-        attr_type = AttributeType.objects.get(name=field['attr_type'])
-        choices = field.get('choices', [])
-        choice_labels = field.get('choice_labels', None)
-        default = field.get('default', '')
-        required = field.get('required', False)
-        omit = True if field.get('omit', '') == 'yes' else False
-        Attribute.objects.create(
-            schema=schema_obj,
-            name=field['name'], long_name=long_name,
-            attr_type=attr_type, index=index,
-            choices=choices, choice_labels=choice_labels,
-            default=default, required=required, omit=omit
-        )
+    objs = QuestionnaireObjects(project=project, errors=errors)
+    objs.add_attrs_schema(dict, content_type)
+    objs.save()
 
 
 class QuestionnaireManager(models.Manager):
@@ -197,22 +289,10 @@ class QuestionnaireManager(models.Manager):
 class QuestionGroupManager(models.Manager):
 
     def create_from_dict(self, dict=None, questionnaire=None, errors=[]):
-        instance = self.model(questionnaire=questionnaire)
-
-        instance.name = dict.get('name')
-        instance.label = dict.get('label')
-        instance.save()
-
-        create_children(
-            children=dict.get('children'),
-            errors=errors,
-            project=questionnaire.project,
-            kwargs={
-                'questionnaire': questionnaire,
-                'question_group': instance
-            }
-        )
-
+        objs = QuestionnaireObjects(project=questionnaire.project,
+                                    errors=errors)
+        instance = objs.add_group(dict, questionnaire)
+        objs.save()
         return instance
 
 
@@ -220,25 +300,7 @@ class QuestionManager(models.Manager):
 
     def create_from_dict(self, errors=[], **kwargs):
         dict = kwargs.pop('dict')
-        instance = self.model(**kwargs)
-        type_dict = {name: code for code, name in instance.TYPE_CHOICES}
-
-        instance.type = type_dict[dict.get('type')]
-
-        # try:
-        #     instance.type = type_dict[dict.get('type')]
-        # except KeyError as e:
-        #     errors.append(
-        #         _('{type} is not an accepted question type').format(type=e)
-        #     )
-
-        instance.name = dict.get('name')
-        instance.label = dict.get('label')
-        instance.required = dict.get('required', False)
-        instance.constraint = dict.get('constraint')
-        instance.save()
-
-        if instance.has_options:
-            create_options(dict.get('choices'), instance, errors=errors)
-
+        objs = QuestionnaireObjects(errors=errors)
+        instance = objs.add_question(dict, **kwargs)
+        objs.save()
         return instance
@@ -1,11 +1,14 @@
 from buckets.fields import S3FileField
 from core.models import RandomIDModel
 from django.db import models
+from django.dispatch import receiver
 from django.utils.translation import ugettext as _
-from simple_history.models import HistoricalRecords
+from jsonattrs.models import Attribute, Schema
+from core.history import HistoricalRecords
 from tutelary.decorators import permissioned_model
 
 from . import managers, messages
+from .cache import invalidate_schemas
 
 
 @permissioned_model
@@ -115,3 +118,11 @@ class QuestionOption(RandomIDModel):
     question = models.ForeignKey(Question, related_name='options')
 
     history = HistoricalRecords()
+
+
+@receiver(models.signals.post_save, sender=Questionnaire)
+@receiver(models.signals.post_save, sender=Schema)
+@receiver(models.signals.post_save, sender=Attribute)
+@receiver(models.signals.post_delete, sender=Attribute)
+def invalidate_schema_cache(sender, instance, **kwargs):
+    invalidate_schemas()
@@ -0,0 +1,119 @@
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from jsonattrs.models import Attribute, AttributeType, Schema
+from jsonattrs.management.commands import loadattrtypes
+
+from organization.tests.factories import ProjectFactory
+from .factories import QuestionnaireFactory
+from .. import cache
+
+
+class SchemaCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        loadattrtypes.Command().handle(force=True)
+        self.project = ProjectFactory.create()
+        self.questionnaire = QuestionnaireFactory.create(project=self.project)
+        self.project.current_questionnaire = self.questionnaire.id
+        self.project.save()
+
+        content_type = ContentType.objects.get(
+            app_label='party', model='party')
+        org_schema = Schema.objects.create(
+            content_type=content_type,
+            selectors=(self.project.organization.id,))
+        schema = Schema.objects.create(
+            content_type=content_type,
+            selectors=(self.project.organization.id, self.project.id,
+                       self.questionnaire.id))
+        Attribute.objects.create(
+            schema=org_schema, name='omitted', long_name='Omitted',
+            attr_type=AttributeType.objects.get(name='text'), index=0)
+        Attribute.objects.create(
+            schema=schema, name='omitted', long_name='Omitted',
+            attr_type=AttributeType.objects.get(name='text'), index=0,
+            omit=True)
+        Attribute.objects.create(
+            schema=schema, name='choices', long_name='Choices',
+            attr_type=AttributeType.objects.get(name='select_multiple'),
+            index=1, choices=['a', 'b'], required=True)
+
+    def test_compile_schema(self):
+        schema = cache.compile_schema(self.project, self.questionnaire.id)
+        assert list(schema.get('spatial.spatialunit')) == []
+        attrs = schema.get('party.party')
+        assert list(attrs) == ['choices']
+        assert attrs['choices'] == cache.CompiledAttribute(
+            name='choices', long_name='Choices', type='select_multiple',
+            choices=('a', 'b'), required=True, default='')
+
+    def test_compile_conditional_schema(self):
+        schema = Schema.objects.create(
+            content_type=ContentType.objects.get(
+                app_label='party', model='party'),
+            selectors=(self.project.organization.id, self.project.id,
+                       self.questionnaire.id, 'IN'))
+        Attribute.objects.create(
+            schema=schema, name='individual', long_name='Individual',
+            attr_type=AttributeType.objects.get(name='select_multiple'),
+            index=0, choices=['a', 'b'])
+
+        # Content types are cached after the first compilation
+        cache.compile_schema(self.project, self.questionnaire.id)
+        with self.assertNumQueries(1):
+            schema = cache.compile_schema(
+                self.project, self.questionnaire.id)
+        assert list(schema.get('party.party')) == ['choices', 'individual']
+        assert schema.get('party.party')['individual'].type == (
+            'select_multiple')
+        assert list(schema.get('party.party', 'IN')) == [
+            'choices', 'individual']
+        assert list(schema.get('party.party', 'GR')) == ['choices']
+
+    def test_compile_conditional_schemas_separately(self):
+        content_type = ContentType.objects.get(
+            app_label='party', model='party')
+        selectors = (self.project.organization.id, self.project.id,
+                     self.questionnaire.id)
+        Attribute.objects.create(
+            schema=Schema.objects.create(content_type=content_type,
+                                         selectors=selectors + ('GR',)),
+            name='members', long_name='Members',
+            attr_type=AttributeType.objects.get(name='integer'),
+            index=0, required=True)
+        Attribute.objects.create(
+            schema=Schema.objects.create(content_type=content_type,
+                                         selectors=selectors + ('IN',)),
+            name='choices', long_name='Choices',
+            attr_type=AttributeType.objects.get(name='text'),
+            index=0, omit=True)
+
+        schema = cache.compile_schema(self.project, self.questionnaire.id)
+        assert list(schema.get('party.party', 'IN')) == []
+        assert list(schema.get('party.party', 'GR')) == ['choices', 'members']
+        assert list(schema.get('party.party', 'CO')) == ['choices']
+        assert list(schema.get('party.party')) == ['choices', 'members']
+
+    def test_coerce(self):
+        schema = cache.compile_schema(self.project, self.questionnaire.id)
+        assert schema.coerce('party.party', 'choices', 'a b') == ['a', 'b']
+        assert schema.coerce('party.party', 'choices', ['a']) == ['a']
+        assert schema.coerce('party.party', 'other', 'a b') == 'a b'
+        assert schema.coerce('spatial.spatialunit', 'choices', 'a') == 'a'
+
+    def test_get_schema(self):
+        schema = cache.get_schema(self.project)
+        with self.assertNumQueries(0):
+            assert cache.get_schema(self.project) is schema
+
+        Attribute.objects.create(
+            schema=Schema.objects.get(selectors__len=3),
+            name='new', long_name='New',
+            attr_type=AttributeType.objects.get(name='text'), index=2)
+        new_schema = cache.get_schema(self.project)
+        assert new_schema is not schema
+        assert list(new_schema.get('party.party')) == ['choices', 'new']
+
+    def test_get_schema_without_questionnaire(self):
+        project = ProjectFactory.create(current_questionnaire='')
+        assert cache.get_schema(project) is not cache.get_schema(project)
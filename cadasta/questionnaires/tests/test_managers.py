@@ -103,6 +103,40 @@ class CreateChildrenTest(TestCase):
             questionnaire=questionnaire,
             question_group__isnull=False).count() == 1
 
+    def test_create_children_in_bulk(self):
+        questionnaire = factories.QuestionnaireFactory.create()
+        children = [{
+            'label': 'Group {}'.format(g),
+            'name': 'group_{}'.format(g),
+            'type': 'group',
+            'children': [{
+                'label': 'Question {}'.format(q),
+                'name': 'question_{}_{}'.format(g, q),
+                'type': 'select one',
+                'choices': [{'label': 'Option {}'.format(o),
+                             'name': str(o)} for o in range(10)]
+            } for q in range(10)]
+        } for g in range(3)]
+
+        # one insert and one history insert for each of groups, questions
+        # and options, regardless of the size of the form
+        with self.assertNumQueries(6):
+            create_children(children, kwargs={'questionnaire': questionnaire})
+
+        assert models.QuestionGroup.objects.filter(
+            questionnaire=questionnaire).count() == 3
+        assert models.Question.objects.filter(
+            questionnaire=questionnaire,
+            question_group__name='group_1').count() == 10
+        assert models.QuestionOption.objects.filter(
+            question__questionnaire=questionnaire).count() == 300
+        question = models.Question.objects.get(name='question_2_4')
+        assert question.type == 'S1'
+        assert list(question.options.values_list('index', 'name')) == [
+            (i + 1, str(i)) for i in range(10)]
+        assert models.Question.history.filter(
+            questionnaire=questionnaire).count() == 30
+
 
 class CreateOptionsTest(TestCase):
 
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.util import random_id
+from ...models import Resource, ThumbnailJob
+from ...utils import thumbnail
+
+
+class Command(BaseCommand):
+    help = """Queues thumbnail jobs for the image resources that are
+    missing any of the thumbnail sizes. The jobs are processed by
+    runworker."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='all',
+            default=False,
+            help='Remake the thumbnails of all image resources'
+        )
+
+    def handle(self, *args, **options):
+        sizes = [thumbnail.size_name(size)
+                 for size in settings.THUMBNAIL_SIZES]
+        pending = set(ThumbnailJob.objects.filter(
+            status__in=(ThumbnailJob.QUEUED, ThumbnailJob.RUNNING)
+        ).values_list('resource_id', 'file'))
+
+        images = Resource.objects.filter(
+            mime_type__contains='image'
+        ).exclude(
+            mime_type__contains='tif'
+        ).values_list('id', 'file', 'derivatives')
+
+        jobs = []
+        for resource_id, file, derivatives in images.iterator():
+            if (resource_id, file) in pending:
+                continue
+            if not options['all'] and all(
+                    size in (derivatives or {}) for size in sizes):
+                continue
+            jobs.append(ThumbnailJob(id=random_id(), resource_id=resource_id,
+                                     file=file))
+        ThumbnailJob.objects.bulk_create(
+            jobs, batch_size=settings.IMPORT_BATCH_SIZE)
+
+        self.stdout.write('Queued {} thumbnail job(s).'.format(len(jobs)))
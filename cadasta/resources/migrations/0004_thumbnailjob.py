@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.6 on 2016-10-18 16:21
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def add_existing_thumbnails(apps, schema_editor):
+    # Thumbnails used to be made when image resources were saved, in the
+    # 128x128 size only. The other sizes are made by makethumbnails.
+    Resource = apps.get_model('resources', 'Resource')
+    images = Resource.objects.filter(
+        mime_type__contains='image').exclude(mime_type__contains='tif')
+    for resource_id, url in images.values_list('id', 'file'):
+        base_url = url[:url.rfind('.')]
+        ext = url.split('.')[-1]
+        Resource.objects.filter(id=resource_id).update(
+            derivatives={'128x128': base_url + '-128x128.' + ext})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0003_spatialresource'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicalresource',
+            name='derivatives',
+            field=django.contrib.postgres.fields.jsonb.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='derivatives',
+            field=django.contrib.postgres.fields.jsonb.JSONField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ThumbnailJob',
+            fields=[
+                ('id', models.CharField(max_length=24, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('Q', 'Queued'), ('R', 'Running'), ('D', 'Done'), ('F', 'Failed')], db_index=True, default='Q', max_length=1)),
+                ('progress', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('started_date', models.DateTimeField(blank=True, null=True)),
+                ('finished_date', models.DateTimeField(blank=True, null=True)),
+                ('file', models.CharField(max_length=200)),
+                ('resource', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='thumbnail_jobs', to='resources.Resource')),
+            ],
+            options={
+                'ordering': ('created_date',),
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(add_existing_thumbnails,
+                             migrations.RunPython.noop),
+    ]
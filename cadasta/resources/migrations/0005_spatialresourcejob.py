@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.6 on 2016-10-19 09:12
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0004_thumbnailjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpatialResourceJob',
+            fields=[
+                ('id', models.CharField(max_length=24, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('Q', 'Queued'), ('R', 'Running'), ('D', 'Done'), ('F', 'Failed')], db_index=True, default='Q', max_length=1)),
+                ('progress', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('started_date', models.DateTimeField(blank=True, null=True)),
+                ('finished_date', models.DateTimeField(blank=True, null=True)),
+                ('file', models.CharField(max_length=200)),
+                ('resource', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='spatial_jobs', to='resources.Resource')),
+            ],
+            options={
+                'ordering': ('created_date',),
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.6 on 2016-10-26 09:21
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0005_spatialresourcejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='spatialresourcejob',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='spatialresourcejob',
+            name='heartbeat_date',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='thumbnailjob',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='thumbnailjob',
+            name='heartbeat_date',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        # Running jobs have not reported a heartbeat yet
+        migrations.RunSQL(
+            "UPDATE resources_spatialresourcejob "
+            "SET heartbeat_date = started_date WHERE status = 'R'",
+            migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            "UPDATE resources_thumbnailjob SET heartbeat_date = started_date "
+            "WHERE status = 'R'",
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -3,24 +3,25 @@ from datetime import datetime
 
 import magic
 from buckets.fields import S3FileField
-from core.models import ID_FIELD_LENGTH, RandomIDModel
+from core.models import ID_FIELD_LENGTH, BackgroundJob, RandomIDModel
+from django.apps import apps
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.gis.db.models import GeometryCollectionField
 from django.contrib.gis.gdal.error import GDALException
 from django.contrib.postgres.fields import JSONField
-from django.db import models
+from django.db import models, transaction
 from django.dispatch import receiver
 from django.utils.translation import ugettext as _
 from jsonattrs.fields import JSONAttributeField
-from simple_history.models import HistoricalRecords
+from core.history import HistoricalRecords
 from tutelary.decorators import permissioned_model
 
 from . import messages
 from .exceptions import InvalidGPXFile
 from .managers import ResourceManager
-from .processors.gpx import GPXProcessor
+from .processors.gpx import KEEP_LAYERS, GPXProcessor
 from .utils import io, thumbnail
 from .validators import ACCEPTED_TYPES, validate_file_type
 
@@ -28,6 +29,9 @@ content_types = models.Q(app_label='organization', model='project')
 
 GPX_MIME_TYPES = ('application/xml', 'text/xml', 'application/gpx+xml')
 
+# Number of bytes at the start of a file used to detect its mime type
+MAGIC_BYTES = 8192
+
 
 @permissioned_model
 class Resource(RandomIDModel):
@@ -36,6 +40,8 @@ class Resource(RandomIDModel):
     file = S3FileField(upload_to='resources', accepted_types=ACCEPTED_TYPES)
     original_file = models.CharField(max_length=200)
     file_versions = JSONField(null=True, blank=True)
+    # Thumbnails of the current file, mapping sizes like "128x128" to URLs
+    derivatives = JSONField(null=True, blank=True)
     mime_type = models.CharField(max_length=100,
                                  validators=[validate_file_type])
     archived = models.BooleanField(default=False)
@@ -76,6 +82,7 @@ class Resource(RandomIDModel):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._original_url = self.file.url
+        self._original_archived = self.archived
 
     @property
     def file_name(self):
@@ -88,28 +95,49 @@ class Resource(RandomIDModel):
     def file_type(self):
         return self.file_name.split('.')[-1]
 
+    @property
+    def supports_thumbnails(self):
+        return 'image' in self.mime_type and 'tif' not in self.mime_type
+
     @property
     def thumbnail(self):
         if not hasattr(self, '_thumbnail'):
             icon = settings.MIME_LOOKUPS.get(self.mime_type, None)
-            if 'image' in self.mime_type and 'tif' not in self.mime_type:
-                ext = self.file_name.split('.')[-1]
-                base_url = self.file.url[:self.file.url.rfind('.')]
-                self._thumbnail = base_url + '-128x128.' + ext
+            derivatives = self.derivatives or {}
+            size = thumbnail.size_name(settings.THUMBNAIL_SIZES[0])
+            if size in derivatives:
+                self._thumbnail = derivatives[size]
             elif icon:
+                # Also shown while the thumbnails are being made
                 self._thumbnail = settings.ICON_URL.format(icon)
             else:
                 self._thumbnail = ''
 
         return self._thumbnail
 
+    @property
+    def spatial_job(self):
+        """The latest job extracting the geometries of the current file,
+        or ``None`` if the file has no geometries."""
+        if not hasattr(self, '_spatial_job'):
+            self._spatial_job = self.spatial_jobs.filter(
+                file=self.file.url).order_by('-created_date').first()
+        return self._spatial_job
+
     @property
     def num_entities(self):
         return ContentObject.objects.filter(resource=self).count()
 
     def save(self, *args, **kwargs):
-        create_thumbnails(self, (not self.id))
+        file_changed = not self.id or self._original_url != self.file.url
+        if file_changed:
+            self.derivatives = None
+        # Read by create_spatial_resource, as _original_url has been reset
+        # by the time it runs
+        self._file_changed = file_changed
         super().save(*args, **kwargs)
+        if file_changed and self.supports_thumbnails:
+            ThumbnailJob.objects.enqueue(self)
 
 
 @receiver(models.signals.pre_save, sender=Resource)
@@ -126,63 +154,139 @@ def archive_file(sender, instance, **kwargs):
         ContentObject.objects.filter(resource=instance).delete()
 
 
-def create_thumbnails(instance, created):
-    if created or instance._original_url != instance.file.url:
-        if 'image' in instance.mime_type:
-            io.ensure_dirs()
-            file_name = instance.file.url.split('/')[-1]
-            name = file_name[:file_name.rfind('.')]
-            ext = file_name.split('.')[-1]
-            write_path = os.path.join(settings.MEDIA_ROOT,
-                                      'temp',
-                                      name + '-128x128.' + ext)
-
-            size = 128, 128
-
-            file = instance.file.open()
-            thumb = thumbnail.make(file, size)
-            thumb.save(write_path)
-            if instance.file.field.upload_to:
-                name = instance.file.field.upload_to + '/' + name
-            instance.file.storage.save(name + '-128x128.' + ext,
-                                       open(write_path, 'rb').read())
+@receiver(models.signals.post_save, sender=Resource)
+def count_archived_resource(sender, instance, created, **kwargs):
+    # Creating and deleting resources is counted by the organization app;
+    # archived resources are not counted.
+    if not created and instance.archived != instance._original_archived:
+        ProjectStatistics = apps.get_model('organization', 'ProjectStatistics')
+        ProjectStatistics.objects.add(
+            instance.project_id,
+            num_resources=-1 if instance.archived else 1)
+    instance._original_archived = instance.archived
 
 
 @receiver(models.signals.post_save, sender=Resource)
 def create_spatial_resource(sender, instance, created, **kwargs):
-    if created or instance._original_url != instance.file.url:
+    if created or instance._file_changed:
         if instance.mime_type in GPX_MIME_TYPES:
-            io.ensure_dirs()
-            file_name = instance.file.url.split('/')[-1]
-            write_path = os.path.join(settings.MEDIA_ROOT,
-                                      'temp', file_name)
-            file = instance.file.open().read()
-            with open(write_path, 'wb') as f:
-                f.write(file)
             # need to double check the mime-type here as browser detection
-            # of gpx mime type is not reliable
+            # of gpx mime type is not reliable. The start of the file is
+            # enough to tell.
+            head = next(io.iter_file(instance.file, MAGIC_BYTES), b'')
             mime = magic.Magic(mime=True)
-            mime_type = str(mime.from_file(write_path), 'utf-8')
+            mime_type = str(mime.from_buffer(head), 'utf-8')
             if mime_type in GPX_MIME_TYPES:
-                try:
-                    processor = GPXProcessor(write_path)
-                    layers = processor.get_layers()
-                except GDALException:
-                    raise InvalidGPXFile(
-                        _('Invalid GPX file')
-                    )
-                for layer in layers.keys():
-                    if len(layers[layer]) > 0:
-                        SpatialResource.objects.create(
-                            resource=instance, name=layer, geom=layers[layer])
+                SpatialResourceJob.objects.enqueue(instance)
             else:
-                os.remove(write_path)
                 raise InvalidGPXFile(
                     _('Invalid GPX mime type: {error}'.format(
                         error=mime_type))
                 )
 
 
+class ResourceJobManager(models.Manager):
+
+    def enqueue(self, resource):
+        """Queues a job processing the resource's current file, unless
+        one is already queued or running."""
+        job = self.filter(
+            resource=resource, file=resource.file.url,
+            status__in=(self.model.QUEUED, self.model.RUNNING)
+        ).first()
+        return job or self.create(resource=resource, file=resource.file.url)
+
+
+class ThumbnailJob(BackgroundJob):
+    """Makes the thumbnails listed in ``settings.THUMBNAIL_SIZES`` of an
+    image resource. Running a job again overwrites the thumbnails saved
+    before, and a job whose file has been replaced in the meantime does
+    nothing, as another job was queued for the new file."""
+    resource = models.ForeignKey(Resource, related_name='thumbnail_jobs')
+    file = models.CharField(max_length=200)
+
+    objects = ResourceJobManager()
+
+    def __str__(self):
+        return "<ThumbnailJob: {}>".format(self.file)
+
+    def __repr__(self):
+        return str(self)
+
+    def run(self):
+        resource = self.resource
+        if resource.file.url != self.file:
+            return
+
+        file_name = self.file.split('/')[-1]
+        name, ext = file_name[:file_name.rfind('.')], file_name.split('.')[-1]
+        if resource.file.field.upload_to:
+            name = resource.file.field.upload_to + '/' + name
+
+        with resource.file.open() as file:
+            thumbs, image_format = thumbnail.make_all(
+                file, settings.THUMBNAIL_SIZES)
+        derivatives = {}
+        for size, thumb in thumbs.items():
+            derivatives[size] = io.save_file(
+                resource.file.storage, '{}-{}.{}'.format(name, size, ext),
+                thumbnail.encode(thumb, image_format), overwrite=True)
+
+        # Neither history nor the signal handlers are concerned with this
+        Resource.objects.filter(
+            id=resource.id, file=self.file).update(derivatives=derivatives)
+
+
+class SpatialResourceJob(BackgroundJob):
+    """Extracts the tracks, routes and waypoints of a GPX resource into
+    spatial resources, replacing those of the previous file. All layers
+    are read before the previous spatial resources are replaced in one
+    transaction, so an invalid file leaves them as they were. Layers with
+    more than ``settings.GPX_SIMPLIFY_POINTS`` points are simplified."""
+    resource = models.ForeignKey(Resource, related_name='spatial_jobs')
+    file = models.CharField(max_length=200)
+
+    objects = ResourceJobManager()
+
+    def __str__(self):
+        return "<SpatialResourceJob: {}>".format(self.file)
+
+    def __repr__(self):
+        return str(self)
+
+    def run(self):
+        resource = self.resource
+        if resource.file.url != self.file:
+            return
+
+        io.ensure_dirs()
+        write_path = os.path.join(settings.MEDIA_ROOT, 'temp',
+                                  '{}.gpx'.format(self.id))
+        with open(write_path, 'wb') as f:
+            for chunk in io.iter_file(resource.file):
+                f.write(chunk)
+
+        layers = []
+        try:
+            processor = GPXProcessor(write_path)
+            for i, (name, geom) in enumerate(processor.iter_layers(
+                    simplify_above=settings.GPX_SIMPLIFY_POINTS,
+                    tolerance=settings.GPX_SIMPLIFY_TOLERANCE), 1):
+                if len(geom) > 0:
+                    layers.append((name, geom))
+                self.set_progress(100 * i // len(KEEP_LAYERS))
+        except GDALException:
+            raise InvalidGPXFile(_('Invalid GPX file'))
+        finally:
+            os.remove(write_path)
+
+        with transaction.atomic():
+            SpatialResource.objects.filter(resource=resource).delete()
+            for name, geom in layers:
+                SpatialResource.objects.create(
+                    resource=resource, name=name, geom=geom)
+
+
 class ContentObject(RandomIDModel):
     resource = models.ForeignKey(Resource, related_name='content_objects')
 
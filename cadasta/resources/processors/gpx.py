@@ -10,10 +10,20 @@ class GPXProcessor:
         self.ds = DataSource(gpx_file)
 
     def get_layers(self):
-        layers = {}
+        return dict(self.iter_layers())
+
+    def iter_layers(self, simplify_above=None, tolerance=None):
+        """Yields the name and geometries of each layer in turn, so that
+        only one layer is held in memory at a time. Layers with more than
+        ``simplify_above`` points are simplified with ``tolerance``
+        (in degrees), keeping their topology."""
         for layer in self.ds:
             name = layer.name
             if name in KEEP_LAYERS:
-                # geom = self._get_features(layer)
-                layers[name] = GeometryCollection(layer.get_geoms(geos=True))
-        return layers
+                geom = GeometryCollection(layer.get_geoms(geos=True))
+                if (simplify_above is not None and
+                        geom.num_coords > simplify_above):
+                    geom = geom.simplify(tolerance, preserve_topology=True)
+                    if not isinstance(geom, GeometryCollection):
+                        geom = GeometryCollection(geom)
+                yield name, geom
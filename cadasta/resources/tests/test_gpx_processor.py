@@ -43,3 +43,14 @@ class GPXProcessorTest(TestCase):
         routes = layers['routes']
         assert type(routes) is GeometryCollection
         assert len(routes) == 1
+
+    def test_simplify_layers(self):
+        file_path = path + '/resources/tests/files/tracks.gpx'
+        g = GPXProcessor(file_path)
+        tracks = dict(g.iter_layers())['tracks']
+
+        g = GPXProcessor(file_path)
+        layers = dict(g.iter_layers(simplify_above=10, tolerance=0.01))
+        simplified = layers['tracks']
+        assert type(simplified) is GeometryCollection
+        assert simplified.num_coords < tracks.num_coords
@@ -0,0 +1,41 @@
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from .factories import ResourceFactory
+from ..models import Resource, ThumbnailJob
+
+
+class MakeThumbnailsTest(TestCase):
+    def setUp(self):
+        self.image = ResourceFactory.create(mime_type='image/jpeg')
+        self.done = ResourceFactory.create(mime_type='image/png')
+        self.tiff = ResourceFactory.create(mime_type='image/tiff')
+        self.pdf = ResourceFactory.create(mime_type='application/pdf')
+        Resource.objects.filter(id=self.done.id).update(derivatives={
+            '128x128': 'https://example.com/thumb-128x128.png',
+            '512x512': 'https://example.com/thumb-512x512.png',
+        })
+        ThumbnailJob.objects.all().delete()
+
+    def call(self, *args):
+        out = StringIO()
+        call_command('makethumbnails', *args, stdout=out)
+        return out.getvalue()
+
+    def test_queue_missing_thumbnails(self):
+        out = self.call()
+        assert 'Queued 1 thumbnail job(s).' in out
+        job = ThumbnailJob.objects.get()
+        assert job.resource_id == self.image.id
+        assert job.file == self.image.file.url
+
+        # Resources that are already queued are skipped
+        out = self.call()
+        assert 'Queued 0 thumbnail job(s).' in out
+
+    def test_queue_all_thumbnails(self):
+        out = self.call('--all')
+        assert 'Queued 2 thumbnail job(s).' in out
+        assert set(ThumbnailJob.objects.values_list(
+            'resource_id', flat=True)) == {self.image.id, self.done.id}
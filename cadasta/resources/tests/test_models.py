@@ -6,12 +6,13 @@ from buckets.test.storage import FakeS3Storage
 from core.tests.utils.cases import UserTestCase
 from core.tests.utils.files import make_dirs  # noqa
 from django.conf import settings
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils.translation import gettext as _
 
 from accounts.tests.factories import UserFactory
 from ..exceptions import InvalidGPXFile
-from ..models import ContentObject, Resource, create_spatial_resource
+from ..models import (ContentObject, Resource, SpatialResourceJob,
+                      ThumbnailJob, create_spatial_resource)
 from .factories import ResourceFactory, SpatialResourceFactory
 from .utils import clear_temp  # noqa
 
@@ -33,11 +34,34 @@ class ResourceTest(UserTestCase, TestCase):
     def test_thumbnail_img(self):
         resource = ResourceFactory.build(
             file='http://example.com/dir/filename.jpg',
-            mime_type='image/jpg'
+            mime_type='image/jpeg',
+            derivatives={
+                '128x128': 'http://example.com/dir/filename-128x128.jpg'}
         )
         assert (resource.thumbnail ==
                 'http://example.com/dir/filename-128x128.jpg')
 
+    @override_settings(THUMBNAIL_SIZES=((64, 64), (128, 128)))
+    def test_thumbnail_img_uses_first_size(self):
+        resource = ResourceFactory.build(
+            file='http://example.com/dir/filename.jpg',
+            mime_type='image/jpeg',
+            derivatives={
+                '64x64': 'http://example.com/dir/filename-64x64.jpg',
+                '128x128': 'http://example.com/dir/filename-128x128.jpg'}
+        )
+        assert (resource.thumbnail ==
+                'http://example.com/dir/filename-64x64.jpg')
+
+    def test_thumbnail_img_without_derivatives(self):
+        resource = ResourceFactory.build(
+            file='http://example.com/dir/filename.jpg',
+            mime_type='image/jpeg'
+        )
+        assert (resource.thumbnail ==
+                'https://s3-us-west-2.amazonaws.com/cadasta-platformprod-'
+                'bucket/icons/jpg.png')
+
     def test_thumbnail_pdf(self):
         resource = ResourceFactory.build(
             file='http://example.com/dir/filename.pdf',
@@ -179,20 +203,66 @@ class ResourceTest(UserTestCase, TestCase):
                                          mime_type='image/jpeg',
                                          contributor=contributor)
         resource.save()
-        assert os.path.isfile(os.path.join(
+        assert resource.derivatives is None
+        assert not os.path.isfile(os.path.join(
             settings.MEDIA_ROOT, 's3/uploads/resources/thumb_test-128x128.jpg')
         )
 
+        job = ThumbnailJob.objects.get(resource=resource)
+        assert job.file == file_name
+        assert ThumbnailJob.objects.enqueue(resource) == job
+
+        job.execute()
+        assert job.status == ThumbnailJob.DONE
+        for size in ('128x128', '512x512'):
+            assert os.path.isfile(os.path.join(
+                settings.MEDIA_ROOT,
+                's3/uploads/resources/thumb_test-{}.jpg'.format(size))
+            )
+        resource.refresh_from_db()
+        assert resource.derivatives['128x128'] == (
+            file_name[:-4] + '-128x128.jpg')
+        assert resource.thumbnail == resource.derivatives['128x128']
+
+    def test_replaced_file_resets_thumbnails(self):
+        storage = FakeS3Storage()
+        file = open(path + '/resources/tests/files/image.jpg', 'rb').read()
+        first = storage.save('resources/thumb_first.jpg', file)
+        second = storage.save('resources/thumb_second.jpg', file)
+        resource = ResourceFactory.create(file=first, mime_type='image/jpeg')
+        job = ThumbnailJob.objects.get(resource=resource)
+
+        resource.file = second
+        resource.save()
+        assert ThumbnailJob.objects.filter(resource=resource).count() == 2
+
+        # The job of the replaced file does not make any thumbnails
+        job.execute()
+        resource.refresh_from_db()
+        assert resource.derivatives is None
+        assert not os.path.isfile(os.path.join(
+            settings.MEDIA_ROOT,
+            's3/uploads/resources/thumb_first-128x128.jpg')
+        )
+
     def test_create_spatial_resource(self):
         storage = FakeS3Storage()
         file = open(path + '/resources/tests/files/deramola.xml', 'rb').read()
         file_name = storage.save('resources/deramola.xml', file)
-        resource = ResourceFactory.build(
+        resource = ResourceFactory.create(
             file=file_name, mime_type='text/xml')
         assert os.path.isfile(os.path.join(
             settings.MEDIA_ROOT, 's3/uploads/resources/deramola.xml')
         )
-        create_spatial_resource(Resource, resource, True)
+        # The geometries are extracted by a background job
+        assert resource.spatial_resources.count() == 0
+        job = resource.spatial_job
+        assert job.status == SpatialResourceJob.QUEUED
+        assert SpatialResourceJob.objects.enqueue(resource) == job
+
+        job.execute()
+        assert job.status == SpatialResourceJob.DONE
+        assert job.progress == 100
         spatial_resources = resource.spatial_resources.all()
         assert spatial_resources.count() == 1
         geom = spatial_resources[0].geom
@@ -200,6 +270,50 @@ class ResourceTest(UserTestCase, TestCase):
         assert spatial_resources[0].name == 'waypoints'
         assert spatial_resources[0].attributes == {}
 
+        # Running the job again replaces the geometries
+        job.execute()
+        assert resource.spatial_resources.count() == 1
+
+    def test_replaced_file_replaces_spatial_resources(self):
+        storage = FakeS3Storage()
+        tracks = open(path + '/resources/tests/files/tracks.gpx', 'rb').read()
+        first = storage.save('resources/tracks_first.gpx', tracks)
+        waypoints = open(
+            path + '/resources/tests/files/waypoints.gpx', 'rb').read()
+        second = storage.save('resources/waypoints_second.gpx', waypoints)
+        resource = ResourceFactory.create(file=first, mime_type='text/xml')
+        resource.spatial_job.execute()
+        assert resource.spatial_resources.count() == 1
+        job = resource.spatial_job
+
+        resource.file = second
+        resource.save()
+        del resource._spatial_job
+        assert resource.spatial_job != job
+
+        # The job of the replaced file does nothing
+        job.execute()
+        assert resource.spatial_resources.get().name == 'tracks'
+
+        resource.spatial_job.execute()
+        assert resource.spatial_resources.get().name == 'waypoints'
+
+    def test_simplify_dense_tracks(self):
+        storage = FakeS3Storage()
+        file = open(path + '/resources/tests/files/tracks.gpx', 'rb').read()
+        file_name = storage.save('resources/tracks_dense.gpx', file)
+        resource = ResourceFactory.create(
+            file=file_name, mime_type='text/xml')
+        resource.spatial_job.execute()
+        num_coords = resource.spatial_resources.get().geom.num_coords
+
+        with self.settings(GPX_SIMPLIFY_POINTS=10,
+                           GPX_SIMPLIFY_TOLERANCE=0.01):
+            resource.spatial_job.execute()
+        simplified = resource.spatial_resources.get().geom
+        assert simplified.num_coords < num_coords
+        assert simplified.geom_type == 'GeometryCollection'
+
     def test_invalid_gpx_mime_type(self):
         storage = FakeS3Storage()
         file = open(path + '/resources/tests/files/mp3.xml', 'rb').read()
@@ -213,21 +327,43 @@ class ResourceTest(UserTestCase, TestCase):
             create_spatial_resource(Resource, resource, True)
 
         assert str(e.value) == _('Invalid GPX mime type: audio/mpeg')
+        assert SpatialResourceJob.objects.count() == 0
 
     def test_invalid_gpx_file(self):
         storage = FakeS3Storage()
         file = open(path +
                     '/resources/tests/files/invalidgpx.xml', 'rb').read()
         file_name = storage.save('resources/invalidgpx.xml', file)
-        resource = ResourceFactory.build(
+        resource = ResourceFactory.create(
             file=file_name, mime_type='application/xml')
         assert os.path.isfile(os.path.join(
             settings.MEDIA_ROOT, 's3/uploads/resources/invalidgpx.xml')
         )
-        with pytest.raises(InvalidGPXFile)as e:
-            create_spatial_resource(Resource, resource, True)
-        assert str(e.value) == _('Invalid GPX file')
-        assert Resource.objects.all().count() == 0
+        job = resource.spatial_job
+        job.execute()
+        assert job.status == SpatialResourceJob.FAILED
+        assert job.error == _('Invalid GPX file')
+        assert resource.spatial_resources.count() == 0
+
+    def test_invalid_gpx_file_keeps_spatial_resources(self):
+        storage = FakeS3Storage()
+        file = open(path + '/resources/tests/files/tracks.gpx', 'rb').read()
+        file_name = storage.save('resources/tracks_replaced.gpx', file)
+        resource = ResourceFactory.create(
+            file=file_name, mime_type='text/xml')
+        job = resource.spatial_job
+        job.execute()
+        assert resource.spatial_resources.count() == 1
+
+        invalid = open(
+            path + '/resources/tests/files/invalidgpx.xml', 'rb').read()
+        with open(os.path.join(
+                settings.MEDIA_ROOT,
+                's3/uploads/resources/tracks_replaced.gpx'), 'wb') as f:
+            f.write(invalid)
+        job.execute()
+        assert job.status == SpatialResourceJob.FAILED
+        assert resource.spatial_resources.count() == 1
 
 
 class SpatialResourceTest(UserTestCase, TestCase):
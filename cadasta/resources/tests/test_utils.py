@@ -1,8 +1,12 @@
 import os
+import tempfile
 from PIL import Image
+from buckets.test.storage import FakeS3Storage
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
 from django.conf import settings
-from ..utils import thumbnail
+from ..utils import io, thumbnail
 
 path = os.path.dirname(settings.BASE_DIR)
 
@@ -29,3 +33,55 @@ class ThumbnailTest(TestCase):
         thumb = thumbnail.make(image, (100, 100))
         assert thumb.size[0] == 100
         assert thumb.size[1] == 100
+
+    def test_orient(self):
+        image = Image.new('RGB', (200, 100))
+        image._getexif = lambda: {thumbnail.EXIF_ORIENTATION: 6}
+        assert thumbnail.orient(image).size == (100, 200)
+
+        image = Image.new('RGB', (200, 100))
+        image._getexif = lambda: {thumbnail.EXIF_ORIENTATION: 1}
+        assert thumbnail.orient(image).size == (200, 100)
+
+    def test_make_all(self):
+        image = path + '/resources/tests/files/image.jpg'
+        thumbs, image_format = thumbnail.make_all(
+            image, [(100, 100), (50, 50)])
+        assert image_format == 'JPEG'
+        assert thumbs['100x100'].size == (100, 100)
+        assert thumbs['50x50'].size == (50, 50)
+
+        encoded = Image.open(thumbnail.encode(thumbs['50x50'], 'JPEG'))
+        assert encoded.format == 'JPEG'
+        assert encoded.info.get('progressive') == 1
+
+
+class SaveFileTest(TestCase):
+    def setUp(self):
+        self.file = SimpleUploadedFile('image.jpg', b'image data')
+        self.file.read()
+
+    def test_save_to_django_storage(self):
+        with tempfile.TemporaryDirectory() as dir:
+            storage = FileSystemStorage(location=dir)
+            name = io.save_file(storage, 'resources/image.jpg', self.file)
+            assert name == 'resources/image.jpg'
+            assert storage.open(name).read() == b'image data'
+
+    def test_overwrite_in_django_storage(self):
+        with tempfile.TemporaryDirectory() as dir:
+            storage = FileSystemStorage(location=dir)
+            io.save_file(storage, 'resources/image.jpg',
+                         SimpleUploadedFile('image.jpg', b'old data'))
+            name = io.save_file(storage, 'resources/image.jpg', self.file,
+                                overwrite=True)
+            assert name == 'resources/image.jpg'
+            assert storage.open(name).read() == b'image data'
+
+    def test_save_to_fake_storage(self):
+        storage = FakeS3Storage()
+        url = io.save_file(storage, 'resources/image.jpg', self.file)
+        assert url == '/media/s3/uploads/resources/image.jpg'
+        with open(os.path.join(storage.dir, 'uploads/resources/image.jpg'),
+                  'rb') as f:
+            assert f.read() == b'image data'
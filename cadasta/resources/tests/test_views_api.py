@@ -15,6 +15,7 @@ from core.tests.utils.files import make_dirs  # noqa
 from organization.tests.factories import ProjectFactory
 from accounts.tests.factories import UserFactory
 from .factories import ResourceFactory
+from ..models import SpatialResourceJob
 from ..views import api
 
 path = os.path.dirname(settings.BASE_DIR)
@@ -94,9 +95,9 @@ class ProjectResourcesTest(APITestCase, UserTestCase, TestCase):
     def test_list_resources(self):
         response = self.request(user=self.user)
         assert response.status_code == 200
-        assert len(response.content) == 2
+        assert len(response.content['results']) == 2
 
-        returned_ids = [r['id'] for r in response.content]
+        returned_ids = [r['id'] for r in response.content['results']]
         assert all(res.id in returned_ids for res in self.resources)
 
     def test_get_full_list_organization_does_not_exist(self):
@@ -113,7 +114,7 @@ class ProjectResourcesTest(APITestCase, UserTestCase, TestCase):
     def test_get_full_list_with_unauthorized_user(self):
         response = self.request(user=UserFactory.create())
         assert response.status_code == 200
-        assert len(response.content) == 0
+        assert len(response.content['results']) == 0
 
     def test_add_resource(self):
         response = self.request(method='POST', user=self.user)
@@ -174,7 +175,7 @@ class ProjectResourcesTest(APITestCase, UserTestCase, TestCase):
                         'project': prj.slug},
             get_data={'search': 'image'})
         assert response.status_code == 200
-        assert len(response.content) == 2
+        assert len(response.content['results']) == 2
 
     def test_filter_unarchived(self):
         prj = ProjectFactory.create()
@@ -189,7 +190,7 @@ class ProjectResourcesTest(APITestCase, UserTestCase, TestCase):
                         'project': prj.slug},
             get_data={'archived': False})
         assert response.status_code == 200
-        assert len(response.content) == 1
+        assert len(response.content['results']) == 1
 
     def test_filter_archived_with_nonunarchiver(self):
         prj = ProjectFactory.create()
@@ -205,7 +206,7 @@ class ProjectResourcesTest(APITestCase, UserTestCase, TestCase):
                         'project': prj.slug},
             get_data={'archived': True})
         assert response.status_code == 200
-        assert len(response.content) == 0
+        assert len(response.content['results']) == 0
 
     def test_filter_archived_with_unarchiver(self):
         prj = ProjectFactory.create()
@@ -226,7 +227,7 @@ class ProjectResourcesTest(APITestCase, UserTestCase, TestCase):
                         'project': prj.slug},
             get_data={'archived': True})
         assert response.status_code == 200
-        assert len(response.content) == 2
+        assert len(response.content['results']) == 2
 
     def test_ordering(self):
         prj = ProjectFactory.create()
@@ -242,8 +243,8 @@ class ProjectResourcesTest(APITestCase, UserTestCase, TestCase):
                         'project': prj.slug},
             get_data={'ordering': 'name'})
         assert response.status_code == 200
-        assert len(response.content) == 3
-        names = [resource['name'] for resource in response.content]
+        assert len(response.content['results']) == 3
+        names = [resource['name'] for resource in response.content['results']]
         assert(names == sorted(names))
 
     def test_reverse_ordering(self):
@@ -259,8 +260,8 @@ class ProjectResourcesTest(APITestCase, UserTestCase, TestCase):
                         'project': prj.slug},
             get_data={'ordering': '-name'})
         assert response.status_code == 200
-        assert len(response.content) == 3
-        names = [resource['name'] for resource in response.content]
+        assert len(response.content['results']) == 3
+        names = [resource['name'] for resource in response.content['results']]
         assert(names == sorted(names, reverse=True))
 
 
@@ -438,6 +439,8 @@ class ProjectSpatialResourcesTest(APITestCase, UserTestCase, TestCase):
             project=self.project, file=self.waypoints_file,
             original_file='waypoints.gpx', mime_type='text/xml'
         )
+        for job in SpatialResourceJob.objects.all():
+            job.execute()
 
         self.user = UserFactory.create()
         additional_clauses = [
@@ -458,17 +461,18 @@ class ProjectSpatialResourcesTest(APITestCase, UserTestCase, TestCase):
     def test_list_spatial_resources(self):
         response = self.request(user=self.user)
         assert response.status_code == 200
-        assert len(response.content) == 1
-        assert response.content[0]['id'] == self.resource.id
-        assert response.content[0]['spatial_resources'] is not None
-        assert response.content[0]['spatial_resources'][0]['name'] == 'tracks'
-        assert response.content[0]['spatial_resources'][0][
+        assert len(response.content['results']) == 1
+        assert response.content['results'][0]['id'] == self.resource.id
+        assert response.content['results'][0]['spatial_resources'] is not None
+        assert response.content['results'][0]['spatial_resources'][0][
+            'name'] == 'tracks'
+        assert response.content['results'][0]['spatial_resources'][0][
             'geom']['type'] == 'GeometryCollection'
-        assert response.content[0]['spatial_resources'][0]['geom'][
+        assert response.content['results'][0]['spatial_resources'][0]['geom'][
             'geometries'][0]['type'] == 'MultiLineString'
 
     def test_list_spatial_resources_with_unauthorized_user(self):
         response = self.request(user=UserFactory.create())
         assert response.status_code == 200
-        assert len(response.content) == 0
-        assert response.content == []
+        assert len(response.content['results']) == 0
+        assert response.content['results'] == []
@@ -26,6 +26,7 @@ class ResourceWidgetTest(TestCase):
             file='https://example.com/file.txt',
             original_file='original_file.jpg',
             mime_type='image/png',
+            derivatives={'128x128': 'https://example.com/file-128x128.txt'},
             contributor=self.user,
             last_updated=self.last_updated,
         )
@@ -1,8 +1,55 @@
 import os
 from django.conf import settings
+from django.core.files.storage import Storage
+
+from buckets.storage import S3Storage
+
+CHUNK_SIZE = 64 * 1024
 
 
 def ensure_dirs():
     path = os.path.join(settings.MEDIA_ROOT, 'temp')
     if not os.path.exists(path):
         os.makedirs(path)
+
+
+def save_file(storage, name, file, overwrite=False):
+    """Saves an uploaded file to ``storage`` and returns its URL.
+
+    Django storages such as ``S3Storage`` accept the file object and
+    read it in chunks, so the file is never held in memory as a whole.
+    The fake S3 storage used in development and tests only accepts
+    bytes.
+
+    Django storages save a file under a new name if ``name`` is taken.
+    With ``overwrite``, the file saved under ``name`` is deleted first."""
+    file.seek(0)
+    if not isinstance(storage, Storage):
+        return storage.save(name, file.read())
+    if overwrite and storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, file)
+
+
+def iter_file(file, chunk_size=CHUNK_SIZE):
+    """Yields the content of an ``S3File`` in chunks.
+
+    ``S3File.open()`` downloads the whole file to the local disk before
+    it can be read. Files in S3 are read from the response body as it
+    arrives instead. Files in the fake S3 storage are local already."""
+    storage = file.storage
+    if isinstance(storage, S3Storage):
+        name = file.url.split('/')[-1]
+        if file.field.upload_to:
+            name = file.field.upload_to + '/' + name
+        s3 = storage.get_boto_ressource()
+        body = s3.Object(storage.bucket_name, name).get()['Body']
+    else:
+        body = file.open()
+        body.seek(0)
+
+    while True:
+        chunk = body.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
@@ -1,5 +1,21 @@
+from io import BytesIO
+
 from PIL import Image
 
+EXIF_ORIENTATION = 0x0112
+
+# Transpositions that turn an image stored with the given EXIF orientation
+# upright
+ORIENTATIONS = {
+    2: (Image.FLIP_LEFT_RIGHT,),
+    3: (Image.ROTATE_180,),
+    4: (Image.FLIP_TOP_BOTTOM,),
+    5: (Image.ROTATE_90, Image.FLIP_TOP_BOTTOM),
+    6: (Image.ROTATE_270,),
+    7: (Image.ROTATE_270, Image.FLIP_TOP_BOTTOM),
+    8: (Image.ROTATE_90,),
+}
+
 
 def is_landscape(width, height):
     if width >= height:
@@ -29,9 +45,61 @@ def crop(img):
     return region
 
 
+def orient(img):
+    """Returns the image turned the way the camera's EXIF orientation tag
+    says it is meant to be shown."""
+    try:
+        exif = img._getexif() or {}
+    except (AttributeError, IndexError, KeyError, SyntaxError):
+        exif = {}
+    for method in ORIENTATIONS.get(exif.get(EXIF_ORIENTATION), ()):
+        img = img.transpose(method)
+    return img
+
+
 def make(img, size):
     im = Image.open(img)
-    copy = im.copy()
+    copy = orient(im).copy()
     cropped_img = crop(copy)
     cropped_img.thumbnail(size, Image.ANTIALIAS)
     return cropped_img
+
+
+def size_name(size):
+    """Returns the name of a thumbnail size, like "128x128", used as its
+    key in ``Resource.derivatives`` and in the thumbnail's file name."""
+    return '{}x{}'.format(*size)
+
+
+def make_all(img, sizes):
+    """Returns a dict that maps the name of each of ``sizes`` to a square
+    thumbnail of the image, and the image's format. The image is decoded
+    once, at the lowest resolution the JPEG decoder can provide for the
+    largest size, and each thumbnail is scaled down from the next larger
+    one."""
+    im = Image.open(img)
+    largest = max(sizes)
+    im.draft(im.mode, largest)
+    image_format = im.format
+    thumb = crop(orient(im))
+
+    thumbs = {}
+    for size in sorted(sizes, reverse=True):
+        thumb = thumb.copy()
+        thumb.thumbnail(size, Image.ANTIALIAS)
+        thumbs[size_name(size)] = thumb
+    return thumbs, image_format
+
+
+def encode(img, image_format):
+    """Writes the image to a file object. JPEGs are written as progressive
+    JPEGs, so that browsers can show them before they have loaded."""
+    out = BytesIO()
+    if image_format == 'JPEG':
+        if img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+        img.save(out, 'JPEG', quality=85, optimize=True, progressive=True)
+    else:
+        img.save(out, image_format, optimize=True)
+    out.seek(0)
+    return out
@@ -1,6 +1,7 @@
 from django.core.urlresolvers import reverse
 from django.contrib.contenttypes.models import ContentType
 from django.http import Http404
+from organization.models import ProjectStatistics
 from organization.views.mixins import ProjectMixin
 
 from ..forms import ResourceForm
@@ -131,8 +132,8 @@ class HasUnattachedResourcesMixin(ProjectMixin):
             # This is for views that list entity resources
             object = self.object
 
-        project_resource_set_count = self.get_project().resource_set.filter(
-            archived=False).count()
+        project_resource_set_count = ProjectStatistics.objects.get_for_project(
+            self.get_project()).num_resources
         if (
             project_resource_set_count > 0 and
             project_resource_set_count != object.resources.count()
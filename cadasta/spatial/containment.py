@@ -0,0 +1,77 @@
+"""Computation of the containment relationships of a project.
+
+Creating a containment relationship through the API checks one pair of
+locations at a time. ``add_containment_relationships`` finds every
+location of a project that lies within a polygon of the same project
+with a single spatial join and writes the missing relationships in
+bulk. As for relationships created one by one, ``su1`` is the polygon
+and ``su2`` the location within it.
+
+"""
+
+from django.conf import settings
+from django.db import connection, models, router, transaction
+
+from core.history import bulk_create_history
+from core.util import random_ids
+from .models import SpatialRelationship, SpatialUnit
+
+# Uses the partial GiST index on polygon geometries added in migration
+# 0004_spatialunit_polygon_index, which has the same condition.
+CONTAINMENT_SQL = """
+SELECT parent.id, child.id
+  FROM {units} parent
+  JOIN {units} child
+    ON child.project_id = parent.project_id
+   AND child.id <> parent.id
+   AND ST_Contains(parent.geometry, child.geometry)
+ WHERE parent.project_id = %(project)s
+   AND GeometryType(parent.geometry) IN ('POLYGON', 'MULTIPOLYGON')
+   AND NOT ST_Equals(parent.geometry, child.geometry)
+   AND NOT EXISTS (
+       SELECT 1 FROM {relationships} rel
+        WHERE rel.su1_id = parent.id AND rel.su2_id = child.id
+          AND rel.type = 'C')
+"""
+
+
+def find_containment(project):
+    """Returns the ``(container, contained)`` ID pairs of all locations of
+    ``project`` that lie within one of its polygons and are not related
+    as such yet. Polygons with equal geometries do not contain each
+    other."""
+    sql = CONTAINMENT_SQL.format(
+        units=SpatialUnit._meta.db_table,
+        relationships=SpatialRelationship._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {'project': project.id})
+        return cursor.fetchall()
+
+
+def add_containment_relationships(project, pairs=None, batch_size=None):
+    """Creates the missing containment relationships of ``project`` and
+    returns them. ``pairs`` are the ID pairs from ``find_containment``,
+    which is called if they are not given."""
+    if pairs is None:
+        pairs = find_containment(project)
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    using = router.db_for_write(SpatialRelationship)
+
+    created = []
+    with transaction.atomic():
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            objs = [SpatialRelationship(id=id, project=project,
+                                        su1_id=su1, su2_id=su2, type='C',
+                                        attributes={})
+                    for id, (su1, su2) in zip(random_ids(len(batch)), batch)]
+            # bulk_create sends no signals; the attribute schema checks
+            # are dispatched here, as for imported data.
+            for obj in objs:
+                models.signals.pre_save.send(
+                    sender=SpatialRelationship, instance=obj, raw=False,
+                    using=using, update_fields=None)
+            SpatialRelationship.objects.bulk_create(objs)
+            bulk_create_history(objs)
+            created.extend(objs)
+    return created
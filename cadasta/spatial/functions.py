@@ -0,0 +1,18 @@
+from django.contrib.gis.db.models.functions import GeoFunc
+from django.db.models import Value
+
+
+class SimplifyPreserveTopology(GeoFunc):
+    """Simplifies a geometry to the given tolerance (in the units of the
+    geometry's SRID) without producing invalid geometries."""
+    function = 'ST_SimplifyPreserveTopology'
+
+    def __init__(self, expression, tolerance, **extra):
+        super().__init__(expression, Value(tolerance), **extra)
+
+
+def zoom_tolerance(zoom, tile_size=256):
+    """Returns the size of one pixel in degrees at the given web map zoom
+    level, which is the most a geometry can be simplified by without the
+    change being visible on the map."""
+    return 360.0 / (tile_size * 2 ** zoom)
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from organization.models import Project
+from ...containment import add_containment_relationships, find_containment
+
+
+class Command(BaseCommand):
+    help = """Adds an is-contained-in relationship for every location of a
+    project that lies within one of its polygons and is not related to
+    the polygon yet."""
+
+    def add_arguments(self, parser):
+        parser.add_argument('organization', help='Organization slug')
+        parser.add_argument('project', help='Project slug')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            dest='dry_run',
+            default=False,
+            help='Only count the missing relationships'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            project = Project.objects.get(
+                organization__slug=options['organization'],
+                slug=options['project'])
+        except Project.DoesNotExist:
+            raise CommandError('Project not found.')
+
+        start = time.perf_counter()
+        pairs = find_containment(project)
+        found = time.perf_counter()
+        self.stdout.write(
+            'Found {} missing relationship(s) in {:.2f}s.'.format(
+                len(pairs), found - start))
+        if options['dry_run']:
+            return
+
+        created = add_containment_relationships(project, pairs)
+        self.stdout.write('Created {} relationship(s) in {:.2f}s.'.format(
+            len(created), time.perf_counter() - found))
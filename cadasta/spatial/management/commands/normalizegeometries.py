@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core.geometry import normalize_longitudes, normalize_longitudes_sql
+from core.history import bulk_create_history
+from organization.models import Project
+from ...models import SpatialUnit
+
+
+def normalize_spatial_units(project):
+    """Moves all location geometries of the project that lie entirely
+    outside of the -180..180 longitude range back into it with a single
+    UPDATE and returns the IDs of the changed locations."""
+    expression, condition = normalize_longitudes_sql('geometry')
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'UPDATE {table} SET geometry = {expression} '
+            'WHERE project_id = %s AND {condition} '
+            'RETURNING id'.format(table=SpatialUnit._meta.db_table,
+                                  expression=expression,
+                                  condition=condition),
+            [project.id])
+        return [row[0] for row in cursor.fetchall()]
+
+
+class Command(BaseCommand):
+    help = """Moves the location geometries and the extent of a project
+    that lie beyond the antimeridian back into the -180..180 longitude
+    range."""
+
+    def add_arguments(self, parser):
+        parser.add_argument('organization', help='Organization slug')
+        parser.add_argument('project', help='Project slug')
+
+    def handle(self, *args, **options):
+        try:
+            project = Project.objects.get(
+                organization__slug=options['organization'],
+                slug=options['project'])
+        except Project.DoesNotExist:
+            raise CommandError('Project not found.')
+
+        with transaction.atomic():
+            ids = normalize_spatial_units(project)
+            if ids:
+                bulk_create_history(
+                    list(SpatialUnit.objects.filter(id__in=ids)),
+                    history_type='~')
+
+            extent = normalize_longitudes(project.extent)
+            extent_changed = extent is not project.extent
+            if extent_changed:
+                project.extent = extent
+                project.save()
+
+        self.stdout.write('Normalised {} location(s){}.'.format(
+            len(ids), ' and the project extent' if extent_changed else ''))
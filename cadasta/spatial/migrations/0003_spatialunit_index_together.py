@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.6 on 2016-10-18 15:02
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spatial', '0002_auto_20160712_1513'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='spatialunit',
+            index_together=set([('project', 'type', 'id')]),
+        ),
+    ]
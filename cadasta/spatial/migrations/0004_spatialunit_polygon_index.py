@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.6 on 2016-10-19 11:40
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spatial', '0003_spatialunit_index_together'),
+    ]
+
+    # The GiST index of all geometries is created with the table. This one
+    # only holds the polygons that can contain other locations, and is
+    # used by spatial.containment.
+    operations = [
+        migrations.RunSQL(
+            "CREATE INDEX spatial_spatialunit_polygon_geometry_gist "
+            "ON spatial_spatialunit USING GIST (geometry) "
+            "WHERE GeometryType(geometry) IN ('POLYGON', 'MULTIPOLYGON')",
+            "DROP INDEX spatial_spatialunit_polygon_geometry_gist",
+        ),
+    ]
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.6 on 2016-10-26 09:22
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spatial', '0006_containmentjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='containmentjob',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='containmentjob',
+            name='heartbeat_date',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        # Running jobs have not reported a heartbeat yet
+        migrations.RunSQL(
+            "UPDATE spatial_containmentjob SET heartbeat_date = started_date "
+            "WHERE status = 'R'",
+            migrations.RunSQL.noop,
+        ),
+    ]
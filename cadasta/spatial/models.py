@@ -1,4 +1,6 @@
-from core.models import RandomIDModel
+from core.geometry import normalize_longitudes
+from core.models import (BackgroundJob, ProjectObjectModel,
+                         RandomIDModel)
 from django.core.urlresolvers import reverse
 from django.contrib.gis.db.models import GeometryField
 from django.db import models
@@ -7,9 +9,7 @@ from django.dispatch import receiver
 from organization.models import Project
 from party import managers
 from tutelary.decorators import permissioned_model
-from simple_history.models import HistoricalRecords
-from shapely.geometry import Point, Polygon, LineString
-from shapely.wkt import dumps
+from core.history import HistoricalRecords
 
 from . import messages
 from .choices import TYPE_CHOICES
@@ -21,7 +21,7 @@ from jsonattrs.decorators import fix_model_for_attributes
 
 @fix_model_for_attributes
 @permissioned_model
-class SpatialUnit(ResourceModelMixin, RandomIDModel):
+class SpatialUnit(ProjectObjectModel, ResourceModelMixin, RandomIDModel):
     """A single spatial unit: has a type, an optional geometry, a
     type-dependent set of attributes, and a set of relationships to
     other spatial units.
@@ -57,6 +57,8 @@ class SpatialUnit(ResourceModelMixin, RandomIDModel):
 
     class Meta:
         ordering = ('type',)
+        # Serves the keyset-paginated location lists of a project
+        index_together = (('project', 'type', 'id'),)
 
     class TutelaryMeta:
         perm_type = 'spatial'
@@ -110,40 +112,10 @@ class SpatialUnit(ResourceModelMixin, RandomIDModel):
         )
 
 
-def reassign_spatial_geometry(instance):
-    coords = list(instance.geometry.coords)
-    if type(coords[0]) == float:
-        coords = [coords]
-    else:
-        while (type(coords[0][0]) != float):
-            coords = coords[0]
-        coords = [list(x) for x in coords]
-    for point in coords:
-        if point[0] >= -180 and point[0] <= 180:
-            return
-    while coords[0][0] < -180:
-        for point in coords:
-            point[0] += 360
-    while coords[0][0] > 180:
-        for point in coords:
-            point[0] -= 360
-    geometry = []
-    for point in coords:
-        latlng = [point[0], point[1]]
-        geometry.append(tuple(latlng))
-    if len(geometry) > 1:
-        if geometry[0] == geometry[-1]:
-            instance.geometry = dumps(Polygon(geometry))
-        else:
-            instance.geometry = dumps(LineString(geometry))
-    else:
-        instance.geometry = dumps(Point(geometry))
-
-
 @receiver(models.signals.pre_save, sender=SpatialUnit)
 def check_extent(sender, instance, **kwargs):
     if instance.geometry:
-        reassign_spatial_geometry(instance)
+        instance.geometry = normalize_longitudes(instance.geometry)
 
 models.signals.pre_delete.connect(detach_object_resources, sender=SpatialUnit)
 
@@ -184,7 +156,7 @@ class SpatialRelationshipManager(managers.BaseRelationshipManager):
 
 @fix_model_for_attributes
 @permissioned_model
-class SpatialRelationship(RandomIDModel):
+class SpatialRelationship(ProjectObjectModel, RandomIDModel):
     """A relationship between spatial units: encodes simple logical terms
     like ``su1 is-contained-in su2`` or ``su1 is-split-of su2``.  May
     have additional requirements.
@@ -249,3 +221,36 @@ class SpatialRelationship(RandomIDModel):
 
     def __repr__(self):
         return str(self)
+
+
+class ContainmentJobManager(models.Manager):
+
+    def enqueue(self, project, user):
+        """Queues a job computing the containment relationships of the
+        project, unless one is queued already. Running jobs are not
+        reused, as they may miss locations added after they started."""
+        job = self.filter(project=project, status=self.model.QUEUED).first()
+        return job or self.create(project=project, user=user)
+
+
+class ContainmentJob(BackgroundJob):
+    """Adds the missing containment relationships of a project, which can
+    take longer than a request may. ``num_created`` is the number of
+    relationships added."""
+    project = models.ForeignKey(Project, related_name='containment_jobs')
+    user = models.ForeignKey('accounts.User',
+                             related_name='containment_jobs')
+    num_created = models.PositiveIntegerField(default=0)
+
+    objects = ContainmentJobManager()
+
+    def __str__(self):
+        return "<ContainmentJob: {}>".format(self.project.name)
+
+    def __repr__(self):
+        return str(self)
+
+    def run(self):
+        from .containment import add_containment_relationships
+
+        self.num_created = len(add_containment_relationships(self.project))
@@ -1,9 +1,10 @@
+import json
 from django.utils.translation import ugettext as _
 from django.core.urlresolvers import reverse
 from rest_framework import serializers
 from rest_framework_gis import serializers as geo_serializers
 
-from .models import SpatialUnit, SpatialRelationship
+from .models import ContainmentJob, SpatialUnit, SpatialRelationship
 from core.serializers import DetailSerializer, FieldSelectorSerializer
 from organization.serializers import NestedProjectSerializer
 
@@ -28,6 +29,7 @@ class SpatialUnitSerializer(DetailSerializer, FieldSelectorSerializer,
 
 
 class SpatialUnitGeoJsonSerializer(geo_serializers.GeoFeatureModelSerializer):
+    geometry = serializers.SerializerMethodField()
     url = serializers.SerializerMethodField()
     type = serializers.SerializerMethodField()
 
@@ -36,8 +38,19 @@ class SpatialUnitGeoJsonSerializer(geo_serializers.GeoFeatureModelSerializer):
         geo_field = 'geometry'
         fields = ('id', 'type', 'url')
 
+    def get_geometry(self, location):
+        # Map views annotate the queryset with a geometry simplified for
+        # the requested zoom level.
+        if hasattr(location, 'simplified_geometry'):
+            geometry = location.simplified_geometry
+        else:
+            geometry = location.geometry
+        if geometry is None:
+            return None
+        return json.loads(geometry.geojson)
+
     def get_url(self, location):
-        project = location.project
+        project = self.context.get('project') or location.project
         return reverse(
             'locations:detail',
             kwargs={'organization': project.organization.slug,
@@ -80,7 +93,7 @@ class SpatialRelationshipWriteSerializer(serializers.ModelSerializer):
         if su1.id == su2.id:
             raise serializers.ValidationError(
                 _("The spatial units must be different"))
-        elif su1.project.slug != su2.project.slug:
+        elif su1.project_id != su2.project_id:
             err_msg = _(
                 "'su1' project ({}) should be equal to 'su2' project ({})")
             raise serializers.ValidationError(
@@ -91,3 +104,22 @@ class SpatialRelationshipWriteSerializer(serializers.ModelSerializer):
         project = self.context['project']
         return SpatialRelationship.objects.create(
             project=project, **validated_data)
+
+
+class ContainmentJobSerializer(serializers.ModelSerializer):
+    created = serializers.IntegerField(source='num_created', read_only=True)
+    url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ContainmentJob
+        fields = ('id', 'status', 'progress', 'error', 'created_date',
+                  'finished_date', 'created', 'url')
+        read_only_fields = ('id', 'status', 'progress', 'error',
+                            'created_date', 'finished_date')
+
+    def get_url(self, job):
+        return reverse(
+            'api:v1:relationship:spatial_rel_containment_detail',
+            kwargs={'organization': job.project.organization.slug,
+                    'project': job.project.slug,
+                    'job': job.id})
@@ -0,0 +1,112 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from organization.models import Project
+from organization.tests.factories import ProjectFactory
+from .factories import SpatialUnitFactory
+from ..models import SpatialRelationship, SpatialUnit
+
+
+class NormalizeGeometriesTest(TestCase):
+    def setUp(self):
+        self.project = ProjectFactory.create()
+        self.units = SpatialUnitFactory.create_batch(3, project=self.project)
+        self.other = SpatialUnitFactory.create()
+        # Queryset updates skip the pre_save normalisation
+        SpatialUnit.objects.filter(id=self.units[0].id).update(
+            geometry='SRID=4326;POINT(200 10)')
+        SpatialUnit.objects.filter(id=self.units[1].id).update(
+            geometry='SRID=4326;MULTIPOINT(-200 10, -210 20)')
+        SpatialUnit.objects.filter(id=self.units[2].id).update(
+            geometry='SRID=4326;POINT(20 10)')
+        SpatialUnit.objects.filter(id=self.other.id).update(
+            geometry='SRID=4326;POINT(200 10)')
+        Project.objects.filter(id=self.project.id).update(
+            extent='SRID=4326;POLYGON((200 0, 210 0, 210 10, 200 0))')
+
+    def call(self, *args):
+        out = StringIO()
+        call_command('normalizegeometries', *args, stdout=out)
+        return out.getvalue()
+
+    def test_normalize_project(self):
+        out = self.call(self.project.organization.slug, self.project.slug)
+        assert 'Normalised 2 location(s) and the project extent.' in out
+
+        geometries = dict(
+            SpatialUnit.objects.values_list('id', 'geometry'))
+        assert geometries[self.units[0].id].coords == (-160, 10)
+        assert geometries[self.units[1].id].coords == ((160, 10),
+                                                       (150, 20))
+        assert geometries[self.units[2].id].coords == (20, 10)
+        assert geometries[self.other.id].coords == (200, 10)
+
+        self.project.refresh_from_db()
+        assert self.project.extent.coords == (
+            ((-160, 0), (-150, 0), (-150, 10), (-160, 0)),)
+
+        assert SpatialUnit.history.filter(history_type='~').count() == 2
+        record = SpatialUnit.history.get(id=self.units[0].id,
+                                         history_type='~')
+        assert record.geometry.coords == (-160, 10)
+
+    def test_normalize_normalized_project(self):
+        self.call(self.project.organization.slug, self.project.slug)
+        out = self.call(self.project.organization.slug, self.project.slug)
+        assert 'Normalised 0 location(s).' in out
+
+    def test_project_not_found(self):
+        with pytest.raises(CommandError):
+            self.call(self.project.organization.slug, 'unknown')
+
+
+class ComputeContainmentTest(TestCase):
+    def setUp(self):
+        self.project = ProjectFactory.create()
+        self.village = SpatialUnitFactory.create(
+            project=self.project,
+            geometry='SRID=4326;POLYGON((0 0, 10 0, 10 10, 0 10, 0 0))')
+        self.parcel = SpatialUnitFactory.create(
+            project=self.project,
+            geometry='SRID=4326;POLYGON((1 1, 2 1, 2 2, 1 2, 1 1))')
+        self.building = SpatialUnitFactory.create(
+            project=self.project, geometry='SRID=4326;POINT(1.5 1.5)')
+        self.outside = SpatialUnitFactory.create(
+            project=self.project, geometry='SRID=4326;POINT(20 20)')
+        self.other = SpatialUnitFactory.create(
+            geometry='SRID=4326;POINT(5 5)')
+
+    def call(self, *args):
+        out = StringIO()
+        call_command('computecontainment', *args, stdout=out)
+        return out.getvalue()
+
+    def test_compute_containment(self):
+        out = self.call(self.project.organization.slug, self.project.slug)
+        assert 'Found 3 missing relationship(s)' in out
+        assert 'Created 3 relationship(s)' in out
+
+        pairs = set(SpatialRelationship.objects.filter(
+            project=self.project, type='C').values_list('su1_id', 'su2_id'))
+        assert pairs == {(self.village.id, self.parcel.id),
+                         (self.village.id, self.building.id),
+                         (self.parcel.id, self.building.id)}
+        assert SpatialRelationship.history.count() == 3
+
+        # Existing relationships are not created again
+        out = self.call(self.project.organization.slug, self.project.slug)
+        assert 'Found 0 missing relationship(s)' in out
+
+    def test_dry_run(self):
+        out = self.call(self.project.organization.slug, self.project.slug,
+                        '--dry-run')
+        assert 'Found 3 missing relationship(s)' in out
+        assert 'Created' not in out
+        assert SpatialRelationship.objects.count() == 0
+
+    def test_project_not_found(self):
+        with pytest.raises(CommandError):
+            self.call(self.project.organization.slug, 'unknown')
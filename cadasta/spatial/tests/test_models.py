@@ -50,6 +50,17 @@ class SpatialUnitTest(UserTestCase, TestCase):
             (-148.63333, 47.25), (-148.58333, 47.25), (-148.58333, 47.28333),
             (-148.63333, 47.28333), (-148.63333, 47.25))
 
+    def test_reassign_multi_part_geometry(self):
+        spatial_unit = SpatialUnitFactory.create(
+            geometry='SRID=4326;MULTIPOLYGON(('
+            '(211 47, 212 47, 212 48, 211 47)), '
+            '((213 47, 214 47, 214 48, 213 47)))'
+        )
+        assert spatial_unit.geometry.geom_type == 'MultiPolygon'
+        assert spatial_unit.geometry.coords == (
+            (((-149, 47), (-148, 47), (-148, 48), (-149, 47)),),
+            (((-147, 47), (-146, 47), (-146, 48), (-147, 47)),))
+
     def test_defaults_no_geometry(self):
         spatial_unit = SpatialUnitFactory.create()
         assert spatial_unit.geometry is None
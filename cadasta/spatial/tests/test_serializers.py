@@ -1,4 +1,5 @@
 import pytest
+from django.contrib.gis.geos import GEOSGeometry
 from django.test import TestCase
 from rest_framework.serializers import ValidationError
 
@@ -126,6 +127,35 @@ class SpatialUnitGeoJsonSerializerTest(TestCase):
 
         assert serializer.get_url(location) == expected_url
 
+    def test_get_url_from_context_project(self):
+        project = ProjectFactory.build()
+        location = SpatialUnitFactory.build(id='abc123')
+        serializer = serializers.SpatialUnitGeoJsonSerializer(
+            location, context={'project': project})
+
+        expected_url = ('/organizations/{o}/projects/{p}/records/'
+                        'locations/{l}/'.format(
+                            o=project.organization.slug,
+                            p=project.slug,
+                            l=location.id
+                        ))
+
+        assert serializer.get_url(location) == expected_url
+
+    def test_get_geometry(self):
+        location = SpatialUnitFactory.build(
+            geometry=GEOSGeometry('SRID=4326;POINT(11 2)'))
+        serializer = serializers.SpatialUnitGeoJsonSerializer(location)
+        assert serializer.get_geometry(location) == {
+            'type': 'Point', 'coordinates': [11.0, 2.0]}
+
+        location.simplified_geometry = GEOSGeometry('SRID=4326;POINT(10 1)')
+        assert serializer.get_geometry(location) == {
+            'type': 'Point', 'coordinates': [10.0, 1.0]}
+
+        location.simplified_geometry = None
+        assert serializer.get_geometry(location) is None
+
     def test_get_type(self):
         location = SpatialUnitFactory.build(type='CB')
         serializer = serializers.SpatialUnitGeoJsonSerializer(location)
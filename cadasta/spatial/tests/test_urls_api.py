@@ -3,7 +3,7 @@ from django.core.urlresolvers import reverse, resolve
 from core.tests.utils.urls import version_ns, version_url
 
 from ..views import api
-from party.views.api import RelationshipList
+from party.views.api import RelationshipGraph, RelationshipList
 
 
 class SpatialUrlTest(TestCase):
@@ -26,6 +26,24 @@ class SpatialUrlTest(TestCase):
         assert resolved.kwargs['organization'] == 'habitat'
         assert resolved.kwargs['project'] == '123abc'
 
+    def test_project_spatial_unit_geojson(self):
+        actual = reverse(
+            version_ns('spatial:geojson'),
+            kwargs={
+                'organization': 'habitat',
+                'project': '123abc',
+            }
+        )
+        expected = version_url(
+            '/organizations/habitat/projects/123abc/spatial/geojson/')
+        assert actual == expected
+
+        resolved = resolve(version_url(
+            '/organizations/habitat/projects/123abc/spatial/geojson/'))
+        assert resolved.func.__name__ == api.SpatialUnitGeoJsonList.__name__
+        assert resolved.kwargs['organization'] == 'habitat'
+        assert resolved.kwargs['project'] == '123abc'
+
     def test_project_spatial_unit_detail(self):
         actual = reverse(
             version_ns('spatial:detail'),
@@ -69,3 +87,21 @@ class SpatialUrlTest(TestCase):
         assert resolved.kwargs['organization'] == 'habitat'
         assert resolved.kwargs['project'] == '123abc'
         assert resolved.kwargs['spatial_id'] == '123456123456123456123456'
+
+    def test_project_spatial_unit_relationship_graph(self):
+        actual = reverse(
+            version_ns('spatial:rel_graph'),
+            kwargs={
+                'organization': 'habitat',
+                'project': '123abc',
+                'spatial_id': '123456123456123456123456',
+            }
+        )
+        expected = version_url(
+            '/organizations/habitat/projects/123abc/'
+            'spatial/123456123456123456123456/relationships/graph/')
+        assert actual == expected
+
+        resolved = resolve(expected)
+        assert resolved.func.__name__ == RelationshipGraph.__name__
+        assert resolved.kwargs['spatial_id'] == '123456123456123456123456'
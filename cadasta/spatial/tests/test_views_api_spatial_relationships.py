@@ -9,7 +9,7 @@ from organization.tests.factories import ProjectFactory, clause
 from organization.models import OrganizationRole
 from core.tests.utils.cases import UserTestCase
 from .factories import SpatialUnitFactory, SpatialRelationshipFactory
-from ..models import SpatialRelationship
+from ..models import ContainmentJob, SpatialRelationship
 from ..views import api
 
 
@@ -181,6 +181,104 @@ class SpatialRelationshipCreateAPITest(APITestCase, UserTestCase, TestCase):
         assert response.content['detail'] == PermissionDenied.default_detail
 
 
+class SpatialContainmentComputeAPITest(APITestCase, UserTestCase, TestCase):
+    view_class = api.SpatialContainmentCompute
+
+    def setup_models(self):
+        self.user = UserFactory.create()
+        assign_policies(self.user)
+
+        self.prj = ProjectFactory.create(slug='test-project', access='public')
+        self.parcel = SpatialUnitFactory.create(
+            project=self.prj, type='PA',
+            geometry='SRID=4326;POLYGON((0 0, 1 0, 1 1, 0 1, 0 0))')
+        self.building = SpatialUnitFactory.create(
+            project=self.prj, type='BU', geometry='SRID=4326;POINT(0.5 0.5)')
+
+    def setup_url_kwargs(self):
+        return {
+            'organization': self.prj.organization.slug,
+            'project': self.prj.slug
+        }
+
+    def test_compute_containment(self):
+        response = self.request(user=self.user, method='POST')
+        assert response.status_code == 202
+        job = ContainmentJob.objects.get()
+        assert response.content['id'] == job.id
+        assert response.content['status'] == ContainmentJob.QUEUED
+        assert response.content['url'] == (
+            '/api/v1/organizations/{}/projects/test-project/relationships/'
+            'spatial/containment/{}/'.format(
+                self.prj.organization.slug, job.id))
+        assert SpatialRelationship.objects.count() == 0
+
+        # A queued job is reused
+        response = self.request(user=self.user, method='POST')
+        assert response.content['id'] == job.id
+
+        job.execute()
+        assert job.num_created == 1
+        rel = SpatialRelationship.objects.get()
+        assert rel.su1 == self.parcel
+        assert rel.su2 == self.building
+        assert rel.type == 'C'
+
+        response = self.request(user=self.user, method='POST')
+        new_job = ContainmentJob.objects.get(id=response.content['id'])
+        assert new_job != job
+        new_job.execute()
+        assert new_job.num_created == 0
+        assert SpatialRelationship.objects.count() == 1
+
+    def test_compute_containment_with_unauthorized_user(self):
+        response = self.request(method='POST')
+        assert response.status_code == 403
+        assert ContainmentJob.objects.count() == 0
+
+    def test_compute_containment_in_archived_project(self):
+        self.prj.archived = True
+        self.prj.save()
+        response = self.request(user=self.user, method='POST')
+        assert response.status_code == 403
+        assert ContainmentJob.objects.count() == 0
+
+
+class SpatialContainmentJobDetailAPITest(APITestCase, UserTestCase,
+                                         TestCase):
+    view_class = api.SpatialContainmentJobDetail
+
+    def setup_models(self):
+        self.user = UserFactory.create()
+        assign_policies(self.user)
+        self.prj = ProjectFactory.create(slug='test-project', access='public')
+        self.job = ContainmentJob.objects.create(
+            project=self.prj, user=self.user, status=ContainmentJob.DONE,
+            progress=100, num_created=3)
+
+    def setup_url_kwargs(self):
+        return {
+            'organization': self.prj.organization.slug,
+            'project': self.prj.slug,
+            'job': self.job.id
+        }
+
+    def test_get_job(self):
+        response = self.request(user=self.user)
+        assert response.status_code == 200
+        assert response.content['id'] == self.job.id
+        assert response.content['status'] == ContainmentJob.DONE
+        assert response.content['created'] == 3
+
+    def test_get_job_that_does_not_exist(self):
+        response = self.request(user=self.user, url_kwargs={'job': 'abc'})
+        assert response.status_code == 404
+
+    def test_get_job_with_unauthorized_user(self):
+        response = self.request()
+        assert response.status_code == 403
+
+
 class SpatialRelationshipDetailAPITest(APITestCase, UserTestCase, TestCase):
     view_class = api.SpatialRelationshipDetail
 
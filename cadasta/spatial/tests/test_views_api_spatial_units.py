@@ -1,5 +1,7 @@
 import json
+from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
+from jsonattrs.models import Attribute, AttributeType, Schema
 from rest_framework.exceptions import PermissionDenied
 from tutelary.models import Policy, assign_user_policies
 from skivvy import APITestCase
@@ -60,7 +62,7 @@ class SpatialUnitListAPITest(APITestCase, UserTestCase, TestCase):
         extra_record = SpatialUnitFactory.create()
         response = self.request(user=self.user)
         assert response.status_code == 200
-        assert len(response.content) == 2
+        assert len(response.content['features']) == 2
         assert extra_record.id not in (
             [u['properties']['id'] for u in response.content['features']])
 
@@ -70,7 +72,7 @@ class SpatialUnitListAPITest(APITestCase, UserTestCase, TestCase):
 
         response = self.request()
         assert response.status_code == 200
-        assert len(response.content) == 2
+        assert len(response.content['features']) == 2
         assert extra_record.id not in (
             [u['properties']['id'] for u in response.content['features']])
 
@@ -106,6 +108,31 @@ class SpatialUnitListAPITest(APITestCase, UserTestCase, TestCase):
         assert response.status_code == 200
         assert len(response.content['features']) == 1
 
+    def test_attribute_filter(self):
+        schema = Schema.objects.create(
+            content_type=ContentType.objects.get_for_model(SpatialUnit),
+            selectors=(self.prj.organization.id, self.prj.id))
+        Attribute.objects.create(
+            schema=schema, name='area', long_name='Area',
+            attr_type=AttributeType.objects.get(name='integer'), index=0)
+        large = SpatialUnitFactory.create(
+            project=self.prj, type='PA', attributes={'area': '500'})
+        SpatialUnitFactory.create(
+            project=self.prj, type='PA', attributes={'area': '50'})
+        SpatialUnitFactory.create(
+            project=self.prj, type='BU', attributes={'area': '800'})
+
+        response = self.request(user=self.user, get_data={
+            'type': 'PA', 'attributes.area__gt': '100'})
+        assert response.status_code == 200
+        assert [f['properties']['id']
+                for f in response.content['features']] == [large.id]
+
+        response = self.request(user=self.user, get_data={
+            'attributes.area__gt': 'large'})
+        assert response.status_code == 400
+        assert 'attributes.area__gt' in response.content
+
     def test_get_full_list_organization_does_not_exist(self):
         response = self.request(user=self.user,
                                 url_kwargs={'organization': 'some-org'})
@@ -126,7 +153,7 @@ class SpatialUnitListAPITest(APITestCase, UserTestCase, TestCase):
         extra_record = SpatialUnitFactory.create()
         response = self.request(user=self.user)
         assert response.status_code == 200
-        assert len(response.content) == 2
+        assert len(response.content['features']) == 2
         assert extra_record.id not in (
             [u['properties']['id'] for u in response.content['features']])
 
@@ -198,6 +225,93 @@ class SpatialUnitListAPITest(APITestCase, UserTestCase, TestCase):
         assert response.status_code == 200
 
 
+class SpatialUnitGeoJsonListAPITest(APITestCase, UserTestCase, TestCase):
+    view_class = api.SpatialUnitGeoJsonList
+
+    def setup_models(self):
+        self.user = UserFactory.create()
+        assign_policies(self.user)
+        self.prj = ProjectFactory.create(slug='test-project', access='public')
+
+    def setup_url_kwargs(self):
+        return {
+            'organization': self.prj.organization.slug,
+            'project': self.prj.slug
+        }
+
+    def test_full_list(self):
+        units = SpatialUnitFactory.create_batch(2, project=self.prj)
+        SpatialUnitFactory.create()
+        response = self.request(user=self.user)
+        assert response.status_code == 200
+        assert response.content['type'] == 'FeatureCollection'
+        assert (sorted(f['id'] for f in response.content['features']) ==
+                sorted(u.id for u in units))
+        feature = response.content['features'][0]
+        assert feature['properties']['url'].startswith(
+            '/organizations/{}/projects/{}/records/locations/'.format(
+                self.prj.organization.slug, self.prj.slug))
+
+    def test_full_list_with_anonymous_user(self):
+        unit = SpatialUnitFactory.create(project=self.prj)
+        response = self.request()
+        assert response.status_code == 200
+        assert [f['id'] for f in response.content['features']] == [unit.id]
+
+    def test_bbox_filter(self):
+        inside = SpatialUnitFactory.create(
+            project=self.prj, geometry='SRID=4326;POINT(11 2)')
+        SpatialUnitFactory.create(
+            project=self.prj, geometry='SRID=4326;POINT(50 50)')
+        SpatialUnitFactory.create(project=self.prj)
+        response = self.request(user=self.user,
+                                get_data={'bbox': '10,0,12,4'})
+        assert response.status_code == 200
+        assert [f['id'] for f in response.content['features']] == [inside.id]
+
+    def test_invalid_bbox(self):
+        response = self.request(user=self.user, get_data={'bbox': '10,0,12'})
+        assert response.status_code == 400
+        assert 'bbox' in response.content
+
+        response = self.request(user=self.user, get_data={'bbox': 'a,b,c,d'})
+        assert response.status_code == 400
+        assert 'bbox' in response.content
+
+    def test_zoom_simplifies_geometry(self):
+        SpatialUnitFactory.create(
+            project=self.prj,
+            geometry='SRID=4326;POLYGON((10 0, 10.5 0.0001, 11 0, 11 1, '
+                     '10 1, 10 0))')
+        response = self.request(user=self.user)
+        coords = response.content['features'][0]['geometry']['coordinates']
+        assert len(coords[0]) == 6
+
+        response = self.request(user=self.user, get_data={'zoom': '2'})
+        assert response.status_code == 200
+        coords = response.content['features'][0]['geometry']['coordinates']
+        assert len(coords[0]) < 6
+
+    def test_zoom_without_geometry(self):
+        SpatialUnitFactory.create(project=self.prj)
+        response = self.request(user=self.user, get_data={'zoom': '10'})
+        assert response.status_code == 200
+        assert response.content['features'][0]['geometry'] is None
+
+    def test_invalid_zoom(self):
+        response = self.request(user=self.user, get_data={'zoom': 'far'})
+        assert response.status_code == 400
+        assert 'zoom' in response.content
+
+    def test_list_private_record_with_unauthorized_user(self):
+        self.prj.access = 'private'
+        self.prj.save()
+
+        response = self.request()
+        assert response.status_code == 403
+        assert response.content['detail'] == PermissionDenied.default_detail
+
+
 class SpatialUnitCreateAPITest(APITestCase, UserTestCase, TestCase):
     view_class = api.SpatialUnitList
 
@@ -25,7 +25,6 @@ from .factories import SpatialUnitFactory
 from ..views import default
 from .. import forms
 from ..models import SpatialUnit
-from ..serializers import SpatialUnitGeoJsonSerializer
 
 
 def assign_policies(user):
@@ -65,12 +64,10 @@ class LocationsListTest(ViewTestCase, UserTestCase, TestCase):
         SpatialUnitFactory.create()
 
     def setup_template_context(self):
-        geojson = json.dumps(
-            SpatialUnitGeoJsonSerializer(self.locations, many=True).data)
         return {
             'object': self.project,
             'object_list': self.locations,
-            'geojson': geojson,
+            'locations_extent': 'null',
             'is_allowed_add_location': True
         }
 
@@ -87,6 +84,21 @@ class LocationsListTest(ViewTestCase, UserTestCase, TestCase):
         assert response.status_code == 200
         assert response.content == self.expected_content
 
+    def test_get_with_locations_extent(self):
+        SpatialUnitFactory.create(
+            project=self.project,
+            geometry='SRID=4326;LINESTRING(10 -5, 12 -3)')
+        SpatialUnitFactory.create(
+            project=self.project,
+            geometry='SRID=4326;POINT(11 2)')
+        user = UserFactory.create()
+        assign_policies(user)
+        response = self.request(user=user)
+        assert response.status_code == 200
+        assert response.content == self.render_content(
+            object_list=self.project.spatial_units.all(),
+            locations_extent='[10.0, -5.0, 12.0, 2.0]')
+
     def test_get_from_non_existend_project(self):
         user = UserFactory.create()
         assign_policies(user)
@@ -151,7 +163,6 @@ class LocationAddTest(ViewTestCase, UserTestCase, TestCase):
                      'selector': self.project.current_questionnaire}
                 )
             ),
-            'geojson': '{"type": "FeatureCollection", "features": []}',
             'is_allowed_add_location': True
         }
 
@@ -288,7 +299,6 @@ class LocationDetailTest(ViewTestCase, UserTestCase, TestCase):
         return {
             'object': self.project,
             'location': self.location,
-            'geojson': '{"type": "FeatureCollection", "features": []}',
             'attributes': (('Test field', 'test', ),
                            ('Test field 2', 'Choice 2', ),
                            ('Test field 3', 'Choice 1, Choice 3', )),
@@ -369,7 +379,6 @@ class LocationEditTest(ViewTestCase, UserTestCase, TestCase):
         return {'object': self.project,
                 'location': self.location,
                 'form': forms.LocationForm(instance=self.location),
-                'geojson': '{"type": "FeatureCollection", "features": []}',
                 'is_allowed_add_location': True}
 
     def setup_url_kwargs(self):
@@ -474,7 +483,6 @@ class LocationDeleteTest(ViewTestCase, UserTestCase, TestCase):
     def setup_template_context(self):
         return {'object': self.project,
                 'location': self.location,
-                'geojson': '{"type": "FeatureCollection", "features": []}',
                 'is_allowed_add_location': True}
 
     def setup_url_kwargs(self):
@@ -589,7 +597,6 @@ class LocationResourceAddTest(ViewTestCase, UserTestCase, TestCase):
         return {'object': self.project,
                 'location': self.location,
                 'form': form,
-                'geojson': '{"type": "FeatureCollection", "features": []}',
                 'is_allowed_add_location': True}
 
     def setup_url_kwargs(self):
@@ -711,7 +718,6 @@ class LocationResourceNewTest(ViewTestCase, UserTestCase, TestCase):
         return {'object': self.project,
                 'location': self.location,
                 'form': form,
-                'geojson': '{"type": "FeatureCollection", "features": []}',
                 'is_allowed_add_location': True}
 
     def setup_post_data(self):
@@ -868,8 +874,6 @@ class TenureRelationshipAddTest(ViewTestCase, UserTestCase, TestCase):
                     'new_entity': not self.project.parties.exists(),
                 },
             ),
-            'geojson': json.dumps(SpatialUnitGeoJsonSerializer(
-                [self.spatial_unit], many=True).data),
             'is_allowed_add_location': True
         }
 
@@ -1,13 +1,17 @@
 from django.conf.urls import url
 
 from spatial.views import api
-from party.views.api import RelationshipList
+from party.views.api import RelationshipGraph, RelationshipList
 
 urlpatterns = [
     url(
         r'^$',
         api.SpatialUnitList.as_view(),
         name='list'),
+    url(
+        r'^geojson/$',
+        api.SpatialUnitGeoJsonList.as_view(),
+        name='geojson'),
     url(
         r'^(?P<spatial_id>[-\w]+)/$',
         api.SpatialUnitDetail.as_view(),
@@ -16,4 +20,8 @@ urlpatterns = [
         r'^(?P<spatial_id>[-\w]+)/relationships/$',
         RelationshipList.as_view(),
         name='rel_list'),
+    url(
+        r'^(?P<spatial_id>[-\w]+)/relationships/graph/$',
+        RelationshipGraph.as_view(),
+        name='rel_graph'),
 ]
@@ -1,9 +1,17 @@
+from django.contrib.gis.geos import Polygon
+from django.shortcuts import get_object_or_404
+from django.utils.translation import ugettext as _
 from rest_framework import generics, filters, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from tutelary.mixins import APIPermissionRequiredMixin
+from core.filters import AttributeFilter
 from core.mixins import update_permissions
+from core.pagination import GeoJsonKeysetPagination
 
 from spatial import serializers
+from spatial.functions import SimplifyPreserveTopology, zoom_tolerance
+from spatial.models import ContainmentJob
 from . import mixins
 
 
@@ -19,9 +27,11 @@ class SpatialUnitList(APIPermissionRequiredMixin,
             return ['project.view_private', 'spatial.list']
 
     serializer_class = serializers.SpatialUnitSerializer
+    pagination_class = GeoJsonKeysetPagination
     filter_backends = (filters.DjangoFilterBackend,
                        filters.SearchFilter,
-                       filters.OrderingFilter,)
+                       filters.OrderingFilter,
+                       AttributeFilter,)
     filter_fields = ('type',)
 
     permission_required = {
@@ -33,6 +43,66 @@ class SpatialUnitList(APIPermissionRequiredMixin,
         return [self.get_project()]
 
 
+class SpatialUnitGeoJsonList(APIPermissionRequiredMixin,
+                             mixins.SpatialQuerySetMixin,
+                             generics.ListAPIView):
+    """Lightweight GeoJSON features for the project maps. ``bbox``
+    (``west,south,east,north``) limits the features to the visible part of
+    the map and ``zoom`` simplifies their geometries to what can be seen
+    at that zoom level. The maps load all visible features at once, so the
+    list is not paginated."""
+    serializer_class = serializers.SpatialUnitGeoJsonSerializer
+    pagination_class = None
+    # The maps of public projects are shown to anonymous visitors too, so
+    # access is only decided by the project's policies.
+    permission_classes = ()
+    permission_required = {'GET': SpatialUnitList.get_actions}
+    max_zoom = 22
+
+    def get_perms_objects(self):
+        return [self.get_project()]
+
+    def get_bbox(self):
+        bbox = self.request.query_params.get('bbox')
+        if not bbox:
+            return None
+        try:
+            bbox = [float(c) for c in bbox.split(',')]
+        except ValueError:
+            bbox = None
+        if not bbox or len(bbox) != 4:
+            raise ValidationError(
+                {'bbox': _("Expected 'west,south,east,north'.")})
+        polygon = Polygon.from_bbox(bbox)
+        polygon.srid = 4326
+        return polygon
+
+    def get_zoom(self):
+        zoom = self.request.query_params.get('zoom')
+        if zoom is None:
+            return None
+        try:
+            zoom = int(zoom)
+        except ValueError:
+            raise ValidationError({'zoom': _("Expected an integer.")})
+        return min(max(zoom, 0), self.max_zoom)
+
+    def get_queryset(self):
+        # The attribute schema of every spatial unit is looked up from its
+        # project and organization when the unit is loaded.
+        queryset = super().get_queryset().select_related(
+            'project__organization')
+        bbox = self.get_bbox()
+        if bbox is not None:
+            queryset = queryset.filter(geometry__bboverlaps=bbox)
+        zoom = self.get_zoom()
+        if zoom is None:
+            return queryset
+        return queryset.defer('geometry').annotate(
+            simplified_geometry=SimplifyPreserveTopology(
+                'geometry', zoom_tolerance(zoom)))
+
+
 class SpatialUnitDetail(APIPermissionRequiredMixin,
                         mixins.SpatialQuerySetMixin,
                         generics.RetrieveUpdateDestroyAPIView):
@@ -62,6 +132,40 @@ class SpatialRelationshipCreate(APIPermissionRequiredMixin,
         return [self.get_project()]
 
 
+class SpatialContainmentCompute(APIPermissionRequiredMixin,
+                                mixins.SpatialRelationshipQuerySetMixin,
+                                generics.GenericAPIView):
+    """Queues a job that adds an is-contained-in relationship for every
+    location of the project that lies within one of its polygons. The
+    response describes the job; its ``url`` reports the job's status and
+    the number of relationships created once it is done."""
+
+    serializer_class = serializers.ContainmentJobSerializer
+    permission_required = update_permissions('spatial_rel.create')
+
+    def get_perms_objects(self):
+        return [self.get_project()]
+
+    def post(self, request, *args, **kwargs):
+        job = ContainmentJob.objects.enqueue(self.get_project(), request.user)
+        return Response(self.get_serializer(job).data,
+                        status=status.HTTP_202_ACCEPTED)
+
+
+class SpatialContainmentJobDetail(APIPermissionRequiredMixin,
+                                  mixins.SpatialRelationshipQuerySetMixin,
+                                  generics.RetrieveAPIView):
+    serializer_class = serializers.ContainmentJobSerializer
+    permission_required = 'spatial_rel.list'
+
+    def get_perms_objects(self):
+        return [self.get_project()]
+
+    def get_object(self):
+        return get_object_or_404(ContainmentJob, project=self.get_project(),
+                                 id=self.kwargs['job'])
+
+
 class SpatialRelationshipDetail(APIPermissionRequiredMixin,
                                 mixins.SpatialRelationshipQuerySetMixin,
                                 generics.RetrieveUpdateDestroyAPIView):
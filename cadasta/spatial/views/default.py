@@ -1,6 +1,7 @@
 import json
 from jsonattrs.mixins import JsonAttrsMixin
 import django.views.generic as base_generic
+from django.contrib.gis.db.models import Extent
 from core.views import generic
 from django.core.urlresolvers import reverse
 
@@ -12,7 +13,6 @@ from party.messages import TENURE_REL_CREATE
 from . import mixins
 from organization.views import mixins as organization_mixins
 from .. import forms
-from ..serializers import SpatialUnitGeoJsonSerializer
 from .. import messages as error_messages
 
 
@@ -24,6 +24,13 @@ class LocationsList(LoginPermissionRequiredMixin,
     permission_required = 'spatial.list'
     permission_denied_message = error_messages.SPATIAL_LIST
 
+    def get_context_data(self, *args, **kwargs):
+        context = super().get_context_data(*args, **kwargs)
+        extent = self.get_queryset().aggregate(
+            extent=Extent('geometry'))['extent']
+        context['locations_extent'] = json.dumps(extent)
+        return context
+
 
 class LocationsAdd(LoginPermissionRequiredMixin,
                    mixins.SpatialQuerySetMixin,
@@ -127,16 +134,6 @@ class LocationResourceNew(LoginPermissionRequiredMixin,
     permission_required = update_permissions('spatial.resources.add')
     permission_denied_message = error_messages.SPATIAL_ADD_RESOURCE
 
-    def get_context_data(self, *args, **kwargs):
-        context = super().get_context_data(*args, **kwargs)
-        project_locations = context['object'].spatial_units
-        context['geojson'] = json.dumps(
-            SpatialUnitGeoJsonSerializer(
-                project_locations.exclude(id=context['location'].id),
-                many=True).data
-        )
-        return context
-
 
 class TenureRelationshipAdd(LoginPermissionRequiredMixin,
                             mixins.SpatialUnitRelationshipMixin,
@@ -150,15 +147,6 @@ class TenureRelationshipAdd(LoginPermissionRequiredMixin,
     def get_perms_objects(self):
         return [self.get_project()]
 
-    def get_context_data(self, *args, **kwargs):
-        context = super().get_context_data(*args, **kwargs)
-
-        context['geojson'] = json.dumps(
-            SpatialUnitGeoJsonSerializer(self.get_queryset(), many=True).data
-        )
-
-        return context
-
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
 
@@ -1,10 +1,8 @@
-import json
 from django.http import Http404
 from django.core.urlresolvers import reverse
 from organization.views.mixins import ProjectMixin
 from resources.views.mixins import ResourceViewMixin
 
-from ..serializers import SpatialUnitGeoJsonSerializer
 from ..models import SpatialUnit
 
 
@@ -16,14 +14,6 @@ class SpatialQuerySetMixin(ProjectMixin):
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
         context['object'] = self.get_project()
-        locations = self.get_queryset()
-
-        if locations.model == SpatialUnit:
-            context['geojson'] = json.dumps(
-                SpatialUnitGeoJsonSerializer(
-                    self.get_queryset(), many=True).data
-            )
-
         return context
 
     def get_serializer_context(self, *args, **kwargs):
@@ -68,29 +58,10 @@ class SpatialUnitObjectMixin(SpatialQuerySetMixin):
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
         context['location'] = self.get_object()
-
-        locations = self.get_queryset()
-        if locations.model == SpatialUnit:
-            context['geojson'] = json.dumps(
-                SpatialUnitGeoJsonSerializer(
-                    locations.exclude(id=context['location'].id),
-                    many=True).data
-            )
         return context
 
 
 class SpatialUnitResourceMixin(ResourceViewMixin, SpatialUnitObjectMixin):
-    def get_context_data(self, *args, **kwargs):
-        context = super().get_context_data(*args, **kwargs)
-
-        locs = context['object'].spatial_units.exclude(
-            id=context['location'].id)
-        context['geojson'] = json.dumps(
-            SpatialUnitGeoJsonSerializer(locs, many=True).data
-        )
-
-        return context
-
     def get_content_object(self):
         return self.get_object()
 
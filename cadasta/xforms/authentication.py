@@ -0,0 +1,109 @@
+"""HTTP Basic authentication for the OpenRosa API.
+
+ODK Collect sends the user's credentials with every request: the HEAD
+request before each submission, the submission itself and every form
+list request. Checking a password means computing its PBKDF2 hash, which
+is slow on purpose, so uploading a batch of forms spends most of its
+time hashing the same password over and over.
+
+``OpenRosaBasicAuthentication`` remembers credentials that were verified
+for a few minutes. Entries are keyed by a keyed hash of the user name
+and the password, so the cache holds no passwords, and are kept in the
+memory of the process only. An entry holds the password hash of the
+user at the time the credentials were verified; it is only used while
+the user is active and still has that password hash, so changing the
+password or deactivating the user makes it unusable in every process.
+Saving a user also removes its entries from the cache of the current
+process.
+
+"""
+
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from rest_framework.authentication import BasicAuthentication
+
+# How long verified credentials are remembered, in seconds
+CACHE_TIMEOUT = 60 * 5
+# Number of credentials that are remembered
+MAX_ENTRIES = 1024
+
+_credentials = OrderedDict()
+_lock = threading.Lock()
+
+
+def _key(userid, password):
+    return hmac.new(settings.SECRET_KEY.encode('utf-8'),
+                    '{}\0{}'.format(userid, password).encode('utf-8'),
+                    hashlib.sha256).hexdigest()
+
+
+def _is_userid(user, userid):
+    # Users sign in with their user name or their email address
+    userid = userid.lower()
+    return userid in (user.get_username().lower(),
+                      (user.email or '').lower())
+
+
+def get_verified_user(userid, password):
+    """Returns the user whose credentials were verified recently, or
+    ``None``."""
+    key = _key(userid, password)
+    with _lock:
+        entry = _credentials.get(key)
+        if entry is None:
+            return None
+        user_pk, password_hash, expires = entry
+        if expires < time.monotonic():
+            del _credentials[key]
+            return None
+        _credentials.move_to_end(key)
+
+    user = get_user_model()._default_manager.filter(pk=user_pk).first()
+    if (user is None or not user.is_active or
+            user.password != password_hash or
+            not _is_userid(user, userid)):
+        with _lock:
+            _credentials.pop(key, None)
+        return None
+    return user
+
+
+def remember_user(userid, password, user):
+    key = _key(userid, password)
+    with _lock:
+        _credentials[key] = (user.pk, user.password,
+                             time.monotonic() + CACHE_TIMEOUT)
+        _credentials.move_to_end(key)
+        while len(_credentials) > MAX_ENTRIES:
+            _credentials.popitem(last=False)
+
+
+def invalidate_credentials(user_pk=None):
+    """Forgets the verified credentials of the user with ``user_pk``, or
+    of all users, in the current process."""
+    with _lock:
+        if user_pk is None:
+            _credentials.clear()
+            return
+        for key in [k for k, v in _credentials.items() if v[0] == user_pk]:
+            del _credentials[key]
+
+
+class OpenRosaBasicAuthentication(BasicAuthentication):
+    """HTTP Basic authentication that checks the password of a user once
+    every few minutes instead of on every request."""
+
+    def authenticate_credentials(self, userid, password):
+        user = get_verified_user(userid, password)
+        if user is not None:
+            return (user, None)
+
+        user, auth = super().authenticate_credentials(userid, password)
+        remember_user(userid, password, user)
+        return (user, auth)
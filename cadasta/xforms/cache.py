@@ -0,0 +1,75 @@
+"""Cache of the OpenRosa form lists.
+
+ODK Collect requests the form list every time a user fetches blank
+forms. A form list only depends on whether the user is a superuser and on
+the organizations the user is a member of, which are cached by
+``core.permissions``, so form lists are cached by those and shared by
+users with the same memberships. A change to a project, organization or
+questionnaire can affect any form list; it increments a version number
+that is part of every cache key instead of removing the entries one by
+one. The version number is kept in the cache shared by all processes,
+so an increment is seen by every process at once and none of them serves
+a form list, or an ETag, of outdated questionnaires.
+
+"""
+
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+
+# Entries are invalidated explicitly; the timeout only limits how long a
+# change made outside of the signal handlers can go unnoticed.
+CACHE_TIMEOUT = 60 * 15
+VERSION_KEY = 'xforms:formlist:version'
+CACHE_KEY = 'xforms:formlist:{version}:{digest}'
+
+
+def _new_version():
+    # Starts from the current time, so that entries of the versions used
+    # before the version number was evicted are not picked up again.
+    return int(time.time() * 1000)
+
+
+def _get_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, _new_version(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _cache_key(roles, base_url):
+    if roles['superuser']:
+        members = 'superuser'
+    else:
+        members = ','.join(sorted(roles['organizations']))
+    digest = hashlib.md5(
+        '{}|{}'.format(members, base_url).encode('utf-8')).hexdigest()
+    return CACHE_KEY.format(version=_get_version(), digest=digest)
+
+
+def get_form_list(roles, base_url, load):
+    """Returns the form list data and its ETag for a user with ``roles``
+    (as returned by ``core.permissions.get_user_roles``). ``load`` is
+    called to serialize the form list if it is not cached. ``base_url``
+    is the URL prepended to download URLs of local files, which differs
+    between hosts."""
+    key = _cache_key(roles, base_url)
+    cached = cache.get(key)
+    if cached is None:
+        data = load()
+        etag = '"{}"'.format(hashlib.md5(
+            json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest())
+        cached = (data, etag)
+        cache.set(key, cached, CACHE_TIMEOUT)
+    return cached
+
+
+def invalidate_form_lists():
+    """Makes all cached form lists stale."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, _new_version(), None)
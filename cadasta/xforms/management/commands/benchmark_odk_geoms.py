@@ -0,0 +1,79 @@
+import random
+import time
+
+from django.contrib.gis.geos import GEOSGeometry
+from django.core.management.base import BaseCommand
+
+from ...utils import odk_geom_to_wkt, odk_geoms_to_ewkb
+
+
+def make_geotraces(count, points):
+    """Returns ``count`` random geotraces in ODK format with ``points``
+    coordinates each."""
+    rnd = random.Random(0)
+    geoms = []
+    for i in range(count):
+        lat = rnd.uniform(-60, 60)
+        lng = rnd.uniform(-170, 170)
+        coords = []
+        for j in range(points):
+            coords.append('{} {} 0.0 0.0'.format(
+                lat + rnd.uniform(-0.01, 0.01),
+                lng + rnd.uniform(-0.01, 0.01)))
+        geoms.append(';'.join(coords) + ';')
+    return geoms
+
+
+class Command(BaseCommand):
+    help = """Compares the per-geometry ODK to WKT conversion with the
+    batch ODK to EWKB conversion on random geotraces."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            dest='count',
+            default=100000,
+            help='Number of geotraces to convert'
+        )
+        parser.add_argument(
+            '--points',
+            type=int,
+            dest='points',
+            default=10,
+            help='Number of coordinates in each geotrace'
+        )
+        parser.add_argument(
+            '--geos',
+            action='store_true',
+            dest='geos',
+            default=False,
+            help='Include building GEOS geometries from the results, as '
+                 'geometry fields do when the values are saved'
+        )
+
+    def timed(self, label, func):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        self.stdout.write('{:<24} {:8.3f}s'.format(label, elapsed))
+        return elapsed
+
+    def handle(self, *args, **options):
+        geoms = make_geotraces(options['count'], options['points'])
+        self.stdout.write('{} geotraces with {} points each'.format(
+            options['count'], options['points']))
+
+        def wkt():
+            result = [odk_geom_to_wkt(g) for g in geoms]
+            if options['geos']:
+                [GEOSGeometry(g) for g in result]
+
+        def ewkb():
+            result = odk_geoms_to_ewkb(geoms)
+            if options['geos']:
+                [GEOSGeometry(g) for g in result]
+
+        wkt_time = self.timed('odk_geom_to_wkt', wkt)
+        ewkb_time = self.timed('odk_geoms_to_ewkb', ewkb)
+        self.stdout.write('Speed-up: {:.1f}x'.format(wkt_time / ewkb_time))
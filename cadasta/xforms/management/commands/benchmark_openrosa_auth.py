@@ -0,0 +1,70 @@
+import base64
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.authentication import BasicAuthentication
+from rest_framework.test import APIRequestFactory
+
+from accounts.models import User
+from ...authentication import (OpenRosaBasicAuthentication,
+                               invalidate_credentials)
+from ...views.api import XFormListView, XFormSubmissionViewSet
+
+
+class Command(BaseCommand):
+    help = """Compares the number of OpenRosa requests per second that are
+    authenticated with DRF's BasicAuthentication, which checks the password
+    on every request, and with OpenRosaBasicAuthentication. The requests
+    are the HEAD requests that ODK Collect sends before each submission
+    and form list requests. Nothing is kept in the database."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            dest='requests',
+            default=300,
+            help='Number of requests of each kind'
+        )
+
+    def timed(self, view, method, count, credentials):
+        factory = APIRequestFactory()
+        start = time.perf_counter()
+        for _ in range(count):
+            request = getattr(factory, method)(
+                '/collect/', HTTP_AUTHORIZATION=credentials)
+            response = view(request)
+            assert response.status_code in (200, 204), response.status_code
+        return count / (time.perf_counter() - start)
+
+    def handle(self, *args, **options):
+        count = options['requests']
+
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username='benchmark-collector',
+                email='benchmark-collector@example.com',
+                password='benchmark-password')
+            credentials = 'Basic ' + base64.b64encode(
+                b'benchmark-collector:benchmark-password').decode('ascii')
+            invalidate_credentials()
+
+            self.stdout.write('{:<16} {:>16} {:>16}'.format(
+                '', 'BasicAuth', 'OpenRosa'))
+            for label, viewset, actions, method in (
+                    ('submission HEAD', XFormSubmissionViewSet,
+                     {'head': 'create'}, 'head'),
+                    ('form list', XFormListView, {'get': 'list'}, 'get')):
+                rates = []
+                for auth in (BasicAuthentication,
+                             OpenRosaBasicAuthentication):
+                    view = viewset.as_view(
+                        actions, authentication_classes=(auth,))
+                    rates.append(self.timed(view, method, count,
+                                            credentials))
+                self.stdout.write('{:<16} {:>12.1f}/s {:>12.1f}/s'.format(
+                    label, *rates))
+
+            invalidate_credentials(user.pk)
+            transaction.set_rollback(True)
@@ -1,16 +1,16 @@
 from django.core.exceptions import ValidationError
 from django.core.files.storage import get_storage_class
-from django.db import transaction
 from django.utils.translation import ugettext as _
-from jsonattrs.models import Attribute, AttributeType
+from core.history import buffered_history
 from party.models import Party, TenureRelationship, TenureRelationshipType
-from pyxform.xform2json import XFormToDict
+from questionnaires.cache import content_type_key, get_schema
 from questionnaires.models import Questionnaire
 from resources.models import Resource
+from resources.utils.io import save_file
 from spatial.models import SpatialUnit
 from xforms.exceptions import InvalidXMLSubmission
 from xforms.models import XFormSubmission
-from xforms.utils import odk_geom_to_wkt
+from xforms.utils import odk_geoms_to_ewkb, parse_submission
 
 
 class ModelHelper():
@@ -58,7 +58,7 @@ class ModelHelper():
                     project=project,
                     name=group['party_name'],
                     type=group['party_type'],
-                    attributes=self._get_attributes(group, 'party')
+                    attributes=self._get_attributes(group, 'party', project)
                 )
 
                 party_resources.append(
@@ -77,20 +77,23 @@ class ModelHelper():
         try:
             location_group = self._format_repeat(data, ['location'])
 
+            geometries = []
             for group in location_group:
                 if 'location_geotrace' in group.keys():
-                    location_geometry = group['location_geotrace']
+                    geometries.append(group['location_geotrace'])
                 elif 'location_geoshape' in group.keys():
-                    location_geometry = group['location_geoshape']
+                    geometries.append(group['location_geoshape'])
                 else:
-                    location_geometry = group['location_geometry']
+                    geometries.append(group['location_geometry'])
 
-                geom = odk_geom_to_wkt(location_geometry)
+            geometries = odk_geoms_to_ewkb(geometries)
+            for group, geom in zip(location_group, geometries):
                 location = SpatialUnit.objects.create(
                     project=project,
                     type=group['location_type'],
                     geometry=geom,
-                    attributes=self._get_attributes(group, 'location')
+                    attributes=self._get_attributes(
+                        group, 'location', project)
                 )
 
                 location_resources.append(
@@ -127,7 +130,8 @@ class ModelHelper():
                             id=tenure_group[t]['tenure_type']),
                         attributes=self._get_attributes(
                             tenure_group[t],
-                            'tenure_relationship')
+                            'tenure_relationship',
+                            project)
                     )
                     tenure_resources.append(
                         self._get_resource_names(
@@ -141,9 +145,10 @@ class ModelHelper():
 
     def create_resource(self, data, user, project, content_object=None):
         Storage = get_storage_class()
-        file = data.file.read()
         try:
-            if file == b'':
+            # Only check whether there is anything (left) to read, instead
+            # of reading the whole file into memory
+            if not data.read(1):
                 Resource.objects.get(
                     name=data.name,
                     contributor=user,
@@ -154,7 +159,7 @@ class ModelHelper():
                     content_object=content_object
                 )
             else:
-                url = Storage().save('resources/' + data.name, file)
+                url = save_file(Storage(), 'resources/' + data.name, data)
                 Resource.objects.create(
                     name=data.name,
                     file=url,
@@ -171,13 +176,12 @@ class ModelHelper():
         if 'xml_submission_file' not in request.data.keys():
             raise InvalidXMLSubmission(_('XML submission not found'))
 
-        xml_submission_file = request.data['xml_submission_file'].read()
-        full_submission = XFormToDict(
-            xml_submission_file.decode('utf-8')).get_dict()
+        full_submission = parse_submission(
+            request.data['xml_submission_file'])
 
         submission = full_submission[list(full_submission.keys())[0]]
 
-        with transaction.atomic():
+        with buffered_history():
             (questionnaire, party,
                 location, tenure) = self.create_models(submission)
 
@@ -299,19 +303,18 @@ class ModelHelper():
         except Questionnaire.DoesNotExist:
             raise ValidationError(_('Questionnaire not found.'))
 
-    def _get_attributes(self, data, model_type):
+    def _get_attributes(self, data, model_type, project):
+        # The compiled schema of the current questionnaire is cached, so
+        # that answers are coerced without querying the attributes
+        group = '{model}_attributes'.format(model=model_type)
+        key = content_type_key(group)
+        schema = get_schema(project)
         attributes = {}
         for attr_group in data:
-            if '{model}_attributes'.format(model=model_type) in attr_group:
+            if group in attr_group:
                 for item in data[attr_group]:
-                    if Attribute.objects.filter(
-                        name=item,
-                        attr_type=AttributeType.objects.get(
-                            name='select_multiple')).exists():
-                        answers = data[attr_group][item].split(' ')
-                        attributes[item] = answers
-                    else:
-                        attributes[item] = data[attr_group][item]
+                    attributes[item] = schema.coerce(
+                        key, item, data[attr_group][item])
         return attributes
 
     def _get_resource_files(self, data, model_type):
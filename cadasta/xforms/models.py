@@ -1,12 +1,33 @@
 from django.db import models
 from django.contrib.postgres.fields import JSONField
+from django.dispatch import receiver
 from core.models import RandomIDModel
+from organization.models import Organization, Project
 from questionnaires.models import Questionnaire
 from accounts.models import User
 
+from .authentication import invalidate_credentials
+from .cache import invalidate_form_lists
+
 
 class XFormSubmission(RandomIDModel):
     json_submission = JSONField(default={}, null=False)
     user = models.ForeignKey(User, related_name='submissions', null=False)
     questionnaire = models.ForeignKey(
         Questionnaire, null=False, related_name='submissions')
+
+
+@receiver(models.signals.post_save, sender=Organization)
+@receiver(models.signals.post_save, sender=Project)
+@receiver(models.signals.post_delete, sender=Project)
+@receiver(models.signals.post_save, sender=Questionnaire)
+def invalidate_form_list_cache(sender, instance, **kwargs):
+    # Changes to memberships are picked up through the roles cache, which
+    # is part of the form list cache key.
+    invalidate_form_lists()
+
+
+@receiver(models.signals.post_save, sender=User)
+@receiver(models.signals.post_delete, sender=User)
+def invalidate_credential_cache(sender, instance, **kwargs):
+    invalidate_credentials(instance.pk)
@@ -21,8 +21,9 @@ class XFormListRenderer(renderers.BaseRenderer):
         """
         Renders *obj* into serialized XML.
         """
-        # if data is None:
-        #     return ''
+        # Responses without a body, e.g. 304 Not Modified
+        if data is None:
+            return ''
         # elif isinstance(data, six.string_types):
         #     return data
 
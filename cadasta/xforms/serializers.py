@@ -18,16 +18,24 @@ class XFormListSerializer(FieldSelectorSerializer,
     downloadUrl = serializers.SerializerMethodField('get_xml_form')
 
     def get_xml_form(self, obj):
-        if obj.xml_form.url.startswith('/media/s3/uploads/'):
-            if self.context['request'].META['SERVER_PROTOCOL'] == 'HTTP/1.1':
-                url = 'http://'
+        url = obj.xml_form.url
+        if url.startswith('/media/s3/uploads/'):
+            return self.get_base_url() + url
+        return url
+
+    def get_base_url(self):
+        """Returns the URL of the server that files in the local storage
+        are served from. The URL is only built once for a whole list."""
+        base_url = self.context.get('base_url')
+        if base_url is None:
+            request = self.context['request']
+            if request.META.get('SERVER_PROTOCOL') == 'HTTP/1.1':
+                base_url = 'http://'
             else:
-                url = 'https://'
-            url += self.context['request'].META.get('HTTP_HOST',
-                                                    'localhost:8000')
-            return url + obj.xml_form.url
-
-        return obj.xml_form.url
+                base_url = 'https://'
+            base_url += request.META.get('HTTP_HOST', 'localhost:8000')
+            self.context['base_url'] = base_url
+        return base_url
 
 
 class XFormSubmissionSerializer(FieldSelectorSerializer,
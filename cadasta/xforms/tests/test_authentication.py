@@ -0,0 +1,109 @@
+import base64
+
+import pytest
+from django.test import TestCase
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+
+from accounts.models import User
+from accounts.tests.factories import UserFactory
+from .. import authentication
+from ..authentication import OpenRosaBasicAuthentication
+
+
+class OpenRosaBasicAuthenticationTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        authentication.invalidate_credentials()
+        self.user = UserFactory.create(username='collector',
+                                       email='collector@example.com',
+                                       password='secret123')
+        self.auth = OpenRosaBasicAuthentication()
+
+    def authenticate(self, username='collector', password='secret123'):
+        credentials = base64.b64encode(
+            '{}:{}'.format(username, password).encode('utf-8'))
+        request = APIRequestFactory().head(
+            '/', HTTP_AUTHORIZATION='Basic ' + credentials.decode('ascii'))
+        return self.auth.authenticate(request)
+
+    def test_verified_credentials_are_remembered(self):
+        user, _ = self.authenticate()
+        assert user == self.user
+        assert len(authentication._credentials) == 1
+        entry = list(authentication._credentials.values())[0]
+        assert entry[:2] == (self.user.pk, self.user.password)
+
+        # The user is loaded again, but the password is not checked
+        with self.assertNumQueries(1):
+            user, _ = self.authenticate()
+        assert user == self.user
+
+    def test_email_login_is_remembered(self):
+        user, _ = self.authenticate(username='collector@example.com')
+        assert user == self.user
+        with self.assertNumQueries(1):
+            user, _ = self.authenticate(username='collector@example.com')
+        assert user == self.user
+
+        User.objects.filter(pk=self.user.pk).update(
+            email='other@example.com')
+        with pytest.raises(AuthenticationFailed):
+            self.authenticate(username='collector@example.com')
+
+    def test_invalid_credentials_are_not_remembered(self):
+        with pytest.raises(AuthenticationFailed):
+            self.authenticate(password='wrong')
+        assert len(authentication._credentials) == 0
+
+        self.authenticate()
+        with pytest.raises(AuthenticationFailed):
+            self.authenticate(password='wrong')
+
+    def test_password_change(self):
+        self.authenticate()
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password('changed123')
+        # Not saved through the model, as by another process
+        User.objects.filter(pk=user.pk).update(password=user.password)
+
+        with pytest.raises(AuthenticationFailed):
+            self.authenticate()
+        assert len(authentication._credentials) == 0
+        user, _ = self.authenticate(password='changed123')
+        assert user == self.user
+
+    def test_deactivated_user(self):
+        self.authenticate()
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        with pytest.raises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_user_save_invalidates_credentials(self):
+        self.authenticate()
+        self.user.save()
+        assert len(authentication._credentials) == 0
+
+    def test_expired_credentials(self):
+        self.authenticate()
+        key = list(authentication._credentials)[0]
+        user_pk, password, expires = authentication._credentials[key]
+        authentication._credentials[key] = (user_pk, password, 0)
+        assert authentication.get_verified_user(
+            'collector', 'secret123') is None
+        assert len(authentication._credentials) == 0
+
+    def test_cache_is_bounded(self):
+        max_entries = authentication.MAX_ENTRIES
+        authentication.MAX_ENTRIES = 2
+        try:
+            for password in ('one', 'two', 'three'):
+                authentication.remember_user('collector', password,
+                                             self.user)
+            assert len(authentication._credentials) == 2
+            assert authentication.get_verified_user('collector',
+                                                    'one') is None
+            assert authentication.get_verified_user(
+                'collector', 'three') == self.user
+        finally:
+            authentication.MAX_ENTRIES = max_entries
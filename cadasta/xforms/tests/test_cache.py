@@ -0,0 +1,38 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from .. import cache as form_cache
+
+ROLES = {'superuser': False, 'organizations': {'org': False},
+         'projects': {}}
+
+
+class FormListCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.loads = []
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def load(self):
+        self.loads.append(1)
+        return [{'formID': 'form-{}'.format(len(self.loads))}]
+
+    def get_form_list(self):
+        return form_cache.get_form_list(ROLES, 'http://testserver',
+                                        self.load)
+
+    def test_form_list_is_cached(self):
+        data, etag = self.get_form_list()
+        assert self.get_form_list() == (data, etag)
+        assert len(self.loads) == 1
+
+    def test_invalidate_form_lists(self):
+        data, etag = self.get_form_list()
+        form_cache.invalidate_form_lists()
+        new_data, new_etag = self.get_form_list()
+        assert len(self.loads) == 2
+        assert new_etag != etag
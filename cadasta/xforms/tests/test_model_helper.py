@@ -689,7 +689,7 @@ class XFormModelHelperTest(TestCase):
             },
             'party_name': 'House Party'
         }
-        attributes = mh._get_attributes(self, data, 'party')
+        attributes = mh._get_attributes(self, data, 'party', self.project)
 
         assert attributes['name_indv'] == 'Party Indv Attrs'
         assert attributes['type_indv'] == 'Party for one'
@@ -698,6 +698,37 @@ class XFormModelHelperTest(TestCase):
         assert 'party_name' not in attributes
         assert 'party_type' not in attributes
 
+    def test_get_attributes_select_multiple(self):
+        schema = Schema.objects.get(
+            content_type__model='party',
+            selectors=(self.project.organization.id, self.project.id, 'a1'))
+        Attribute.objects.create(
+            schema=schema,
+            name='fmulti', long_name='Choices',
+            attr_type=AttributeType.objects.get(name='select_multiple'),
+            index=2, choices=['one', 'two', 'three'],
+            required=False, omit=False
+        )
+        data = {
+            'party_attributes_individual': {
+                'fmulti': 'one three',
+                'fname_two': 'one three',
+            },
+            'tenure_relationship_attributes': {
+                'fmulti': 'one three',
+            },
+        }
+        # The schemas of all attribute groups are compiled once
+        mh._get_attributes(self, data, 'location', self.project)
+        with self.assertNumQueries(0):
+            attributes = mh._get_attributes(self, data, 'party', self.project)
+        assert attributes == {'fmulti': ['one', 'three'],
+                              'fname_two': 'one three'}
+
+        attributes = mh._get_attributes(
+            self, data, 'tenure_relationship', self.project)
+        assert attributes == {'fmulti': 'one three'}
+
     def test_get_resource_files(self):
         data = {
             'ardvark': 'Ardvark!',
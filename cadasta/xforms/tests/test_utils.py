@@ -1,6 +1,13 @@
-from ..utils import odk_geom_to_wkt
+import io
 
+from ..utils import (odk_geom_to_wkt, odk_geom_to_ewkb, odk_geoms_to_ewkb,
+                     parse_submission)
+
+from django.contrib.gis.geos import GEOSGeometry
 from django.test import TestCase
+from pyxform.xform2json import XFormToDict
+
+from .files.test_resources import responses
 
 
 class TestODKGeomToWKT(TestCase):
@@ -72,3 +79,79 @@ class TestODKGeomToWKT(TestCase):
         )
         geom = odk_geom_to_wkt(self.geotrace_as_poly)
         assert geom == poly
+
+
+class TestODKGeomsToEWKB(TestCase):
+
+    setUp = TestODKGeomToWKT.setUp
+
+    def assert_same_geometry(self, ewkb, coords):
+        geom = GEOSGeometry(ewkb)
+        assert geom.srid == 4326
+        assert geom.equals_exact(GEOSGeometry(odk_geom_to_wkt(coords)))
+
+    def test_single_geometries(self):
+        for coords in (self.geoshape, self.line, self.simple_line,
+                       self.geotrace_as_poly, self.point):
+            self.assert_same_geometry(odk_geom_to_ewkb(coords), coords)
+
+    def test_geometry_types(self):
+        geoms = odk_geoms_to_ewkb([self.geoshape, self.line, self.point,
+                                   self.simple_line, self.geotrace_as_poly])
+        assert ([GEOSGeometry(g).geom_type for g in geoms] ==
+                ['Polygon', 'LineString', 'Point', 'LineString', 'Polygon'])
+
+    def test_batch(self):
+        batch = [self.geoshape, '', self.line, self.point,
+                 self.geotrace_as_poly]
+        geoms = odk_geoms_to_ewkb(batch)
+        assert len(geoms) == 5
+        assert geoms[1] is None
+        for ewkb, coords in zip(geoms, batch):
+            if coords:
+                self.assert_same_geometry(ewkb, coords)
+
+    def test_without_srid(self):
+        geom = GEOSGeometry(odk_geom_to_ewkb(self.line, srid=None))
+        assert geom.srid is None
+        assert geom.equals_exact(GEOSGeometry(odk_geom_to_wkt(self.line)))
+
+    def test_empty_batch(self):
+        assert odk_geoms_to_ewkb([]) == []
+
+    def test_invalid_coordinates(self):
+        with self.assertRaises(ValueError):
+            odk_geoms_to_ewkb([self.point, '45.5 abc 0.0 0.0;'])
+        with self.assertRaises(ValueError):
+            odk_geoms_to_ewkb(['45.5;'])
+
+
+class TestParseSubmission(TestCase):
+
+    def test_parse_submission(self):
+        xml = (b'<?xml version="1.0" ?>'
+               b'<t_questionnaire xmlns:jr="http://openrosa.org/javarosa" '
+               b'id="t_questionnaire" version="20160727122110">'
+               b'<!-- comment -->'
+               b'<party_name>Bilbo</party_name>'
+               b'<party_repeat><party_type>IN</party_type></party_repeat>'
+               b'<party_repeat><party_type>GR</party_type></party_repeat>'
+               b'<location_photo />'
+               b'<meta><instanceID jr:a="1">uuid:1</instanceID></meta>'
+               b'</t_questionnaire>')
+        assert parse_submission(io.BytesIO(xml)) == {
+            't_questionnaire': {
+                'id': 't_questionnaire',
+                'version': '20160727122110',
+                'party_name': 'Bilbo',
+                'party_repeat': [{'party_type': 'IN'},
+                                 {'party_type': 'GR'}],
+                'location_photo': '',
+                'meta': {'instanceID': {'a': '1', '_text': 'uuid:1'}},
+            }
+        }
+
+    def test_same_result_as_pyxform(self):
+        for response in responses.values():
+            assert parse_submission(io.BytesIO(response.encode())) == (
+                XFormToDict(response).get_dict())
@@ -9,9 +9,11 @@ from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import InMemoryUploadedFile
+from rest_framework.test import APIRequestFactory, force_authenticate
 from skivvy import APITestCase
 
 from accounts.tests.factories import UserFactory
+from core.permissions import get_user_roles
 from core.tests.utils.cases import UserTestCase
 from core.tests.utils.files import make_dirs  # noqa
 from organization.models import OrganizationRole
@@ -114,6 +116,68 @@ class XFormListTest(APITestCase, UserTestCase, TestCase):
         assert 'downloadUrl' not in response
         assert 'hash' not in response
 
+    def test_get_xforms_with_one_query(self):
+        OrganizationRole.objects.create(
+            organization=self.org, user=self.user, admin=True)
+        other_prj = ProjectFactory.create(organization=self.org)
+        self._get_questionnaire()
+        QuestionnaireFactory.create(project=other_prj,
+                                    xls_form=get_form('xls-form'))
+        get_user_roles(self.user)
+
+        # Only the questionnaires are queried, however many projects
+        with self.assertNumQueries(1):
+            response = self.request(user=self.user)
+        assert response.status_code == 200
+        xml = etree.fromstring(response.content.encode('utf-8'))
+        ns = {'xf': 'http://openrosa.org/xforms/xformsList'}
+        assert len(xml.xpath('.//xf:xform', namespaces=ns)) == 2
+
+        # The form list is cached until a project changes
+        with self.assertNumQueries(0):
+            self.request(user=self.user)
+        other_prj.archived = True
+        other_prj.save()
+        response = self.request(user=self.user)
+        xml = etree.fromstring(response.content.encode('utf-8'))
+        assert len(xml.xpath('.//xf:xform', namespaces=ns)) == 1
+
+    def test_get_xforms_after_joining_organization(self):
+        questionnaire = self._get_questionnaire()
+        response = self.request(user=self.user)
+        assert questionnaire.md5_hash not in response.content
+
+        OrganizationRole.objects.create(
+            organization=self.org, user=self.user, admin=False)
+        response = self.request(user=self.user)
+        assert questionnaire.md5_hash in response.content
+
+    def test_get_xforms_not_modified(self):
+        OrganizationRole.objects.create(
+            organization=self.org, user=self.user, admin=True)
+        self._get_questionnaire()
+        view = api.XFormListView.as_view({'get': 'list'})
+
+        request = APIRequestFactory().get('/collect/')
+        force_authenticate(request, user=self.user)
+        response = view(request)
+        assert response.status_code == 200
+        etag = response['ETag']
+
+        request = APIRequestFactory().get('/collect/',
+                                          HTTP_IF_NONE_MATCH=etag)
+        force_authenticate(request, user=self.user)
+        response = view(request)
+        assert response.status_code == 304
+        assert response.render().content == b''
+        assert response['ETag'] == etag
+
+        # A new questionnaire changes the ETag
+        self._get_questionnaire(id='form_2', version=2016072516330113)
+        response = view(request)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
 
 class XFormSubmissionTest(APITestCase, UserTestCase, TestCase):
     view_class = api.XFormSubmissionViewSet
@@ -1,37 +1,170 @@
+import binascii
+import struct
+import sys
+from array import array
+
+from lxml import etree
 from shapely.geometry import LineString, Point, Polygon
 from shapely.wkt import dumps
 
+# WKB geometry type codes
+WKB_POINT = 1
+WKB_LINESTRING = 2
+WKB_POLYGON = 3
+
+# Flags the presence of an SRID in the geometry type of EWKB
+EWKB_SRID_FLAG = 0x20000000
+
+# WKB byte order marker for the machine's native byte order, which is
+# the byte order array('d') writes coordinates in
+WKB_BYTE_ORDER = 1 if sys.byteorder == 'little' else 0
+
+_ewkb_header = struct.Struct('=BII')
+_wkb_header = struct.Struct('=BI')
+_uint32 = struct.Struct('=I')
+
+
+def _split_odk_geom(coords):
+    """Splits a geometry in ODK format into its coordinate strings and
+    returns them together with the WKB type of the geometry."""
+    coords = coords.replace('\n', '')
+    coords = [c.strip() for c in coords.split(';')]
+    if (coords[-1] == ''):
+        coords.pop()
+
+    if len(coords) == 1:
+        return WKB_POINT, coords
+
+    # check for a geoshape taking into account
+    # the bug in odk where the second coordinate in a geoshape
+    # is the same as the last (first and last should be equal)
+    if len(coords) > 3:
+        if coords[1] == coords[-1]:  # geom is closed
+            coords[-1] = coords[0]
+    if (coords[0] != coords[-1] or len(coords) == 2):
+        return WKB_LINESTRING, coords
+    return WKB_POLYGON, coords
+
 
 def odk_geom_to_wkt(coords):
     """Convert geometries in ODK format to WKT."""
     if coords == '':
         return ''
-    coords = coords.replace('\n', '')
-    coords = coords.split(';')
-    coords = [c.strip() for c in coords]
-    if (coords[-1] == ''):
-        coords.pop()
+    geom_type, coords = _split_odk_geom(coords)
+
+    points = []
+    for coord in coords:
+        coord = coord.split()
+        points.append((float(coord[1]), float(coord[0])))
+
+    if geom_type == WKB_POINT:
+        return dumps(Point(points[0]))
+    elif geom_type == WKB_LINESTRING:
+        return dumps(LineString(points))
+    else:
+        return dumps(Polygon(points))
 
-    if len(coords) > 1:
-        # check for a geoshape taking into account
-        # the bug in odk where the second coordinate in a geoshape
-        # is the same as the last (first and last should be equal)
-        if len(coords) > 3:
-            if coords[1] == coords[-1]:  # geom is closed
-                coords.pop()
-                coords.append(coords[0])
-        points = []
+
+def odk_geoms_to_ewkb(geoms, srid=4326):
+    """Convert a list of geometries in ODK format to hex-encoded EWKB,
+    which can be assigned to geometry fields as is. Empty geometries are
+    returned as ``None``. If ``srid`` is ``None``, plain WKB is returned.
+
+    All coordinates of the batch are converted to one array of doubles
+    in a single pass, and each geometry is written as its WKB header
+    followed by its slice of that array, so no geometry objects or WKT
+    strings are built on the way."""
+    parsed = []
+    values = []
+    for geom in geoms:
+        if not geom:
+            parsed.append(None)
+            continue
+        geom_type, coords = _split_odk_geom(geom)
         for coord in coords:
-            coord = coord.split(' ')
-            coord = [x for x in coord if x]
-            latlng = [float(coord[1]),
-                      float(coord[0])]
-            points.append(tuple(latlng))
-        if (coords[0] != coords[-1] or len(coords) == 2):
-            return dumps(LineString(points))
+            lat, lng = coord.split(None, 2)[:2]
+            values.append(lng)
+            values.append(lat)
+        parsed.append((geom_type, len(coords)))
+
+    doubles = array('d', map(float, values)).tobytes()
+    point_size = 2 * array('d').itemsize
+
+    result = []
+    offset = 0
+    for item in parsed:
+        if item is None:
+            result.append(None)
+            continue
+        geom_type, count = item
+        if srid is None:
+            wkb = _wkb_header.pack(WKB_BYTE_ORDER, geom_type)
+        else:
+            wkb = _ewkb_header.pack(
+                WKB_BYTE_ORDER, geom_type | EWKB_SRID_FLAG, srid)
+        if geom_type == WKB_POLYGON:
+            wkb += _uint32.pack(1)
+        if geom_type != WKB_POINT:
+            wkb += _uint32.pack(count)
+        end = offset + count * point_size
+        wkb += doubles[offset:end]
+        offset = end
+        result.append(binascii.hexlify(wkb).decode())
+    return result
+
+
+def odk_geom_to_ewkb(coords, srid=4326):
+    """Convert a single geometry in ODK format to hex-encoded EWKB."""
+    return odk_geoms_to_ewkb([coords], srid=srid)[0]
+
+
+def _add_child(nodedict, tag, item):
+    if tag in nodedict:
+        # found duplicate tag, force a list
+        if isinstance(nodedict[tag], list):
+            nodedict[tag].append(item)
         else:
-            return dumps(Polygon(points))
+            nodedict[tag] = [nodedict[tag], item]
     else:
-        latlng = coords[0].split(' ')
-        latlng = [x for x in latlng if x]
-        return dumps(Point(float(latlng[1]), float(latlng[0])))
+        nodedict[tag] = item
+
+
+def parse_submission(file):
+    """Parses an XML submission from a file object into the dict that
+    pyxform's ``XFormToDict(xml).get_dict()`` returns for it: elements
+    become dicts of their attributes and children, repeated children
+    become lists, elements without attributes and children become their
+    text and namespaces are removed from tags.
+
+    The file is read incrementally with ``iterparse`` and each element is
+    discarded as soon as it has been converted, so only the resulting
+    dict is kept in memory. Text between child elements (mixed content)
+    is not part of OpenRosa submissions and is ignored."""
+    stack = []
+    result = None
+    for event, elem in etree.iterparse(file, events=('start', 'end'),
+                                       remove_comments=True):
+        if event == 'start':
+            stack.append({etree.QName(k).localname: v
+                          for k, v in elem.items()})
+            continue
+
+        nodedict = stack.pop()
+        text = (elem.text or '').strip()
+        if nodedict:
+            if text:
+                nodedict['_text'] = text
+        else:
+            nodedict = text
+
+        tag = etree.QName(elem).localname
+        if stack:
+            _add_child(stack[-1], tag, nodedict)
+        else:
+            result = {tag: nodedict}
+
+        # free the converted element and its preceding siblings
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+    return result
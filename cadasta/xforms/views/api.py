@@ -1,20 +1,22 @@
 import logging
 
+from core.permissions import get_user_roles
+from django.db.models import F
 from django.utils.six import BytesIO
 from django.utils.translation import ugettext as _
 from questionnaires.models import Questionnaire
 from rest_framework import status, viewsets
-from rest_framework.authentication import BasicAuthentication
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-from tutelary.models import Role
 from xforms.mixins.model_helper import ModelHelper
 from xforms.mixins.openrosa_headers_mixin import OpenRosaHeadersMixin
 from xforms.renderers import XFormListRenderer
 from xforms.serializers import XFormListSerializer, XFormSubmissionSerializer
 
+from ..authentication import OpenRosaBasicAuthentication
+from ..cache import get_form_list
 from ..exceptions import InvalidXMLSubmission
 
 logger = logging.getLogger('xform.submissions')
@@ -36,7 +38,7 @@ class XFormSubmissionViewSet(OpenRosaHeadersMixin,
     Returns number of successful forms submitted
     """
 
-    authentication_classes = (BasicAuthentication,)
+    authentication_classes = (OpenRosaBasicAuthentication,)
     permission_classes = (IsAuthenticated,)
     parser_classes = (FormParser, MultiPartParser,)
     serializer_class = XFormSubmissionSerializer
@@ -86,34 +88,41 @@ class XFormListView(OpenRosaHeadersMixin,
     projects a user is a member of.
     """
 
-    authentication_classes = (BasicAuthentication,)
+    authentication_classes = (OpenRosaBasicAuthentication,)
     permission_classes = (IsAuthenticated,)
     renderer_classes = (XFormListRenderer,)
     serializer_class = XFormListSerializer
 
     def get_user_forms(self):
-        forms = []
-        policies = self.request.user.assigned_policies()
-        orgs = self.request.user.organizations.filter(archived=False)
-        if Role.objects.get(name='superuser') in policies:
-            return Questionnaire.objects.filter(project__archived=False)
-        for org in orgs:
-            projects = org.projects.filter(archived=False)
-            for project in projects:
-                try:
-                    questionnaire = Questionnaire.objects.get(
-                        id=project.current_questionnaire
-                    )
-                    forms.append(questionnaire)
-                except Questionnaire.DoesNotExist:
-                    pass
-        return forms
+        roles = get_user_roles(self.request.user)
+        forms = Questionnaire.objects.filter(project__archived=False)
+        if roles['superuser']:
+            return forms.order_by('id')
+        # The current questionnaires of the projects of the user's
+        # organizations, in a single query.
+        return forms.filter(
+            project__organization_id__in=list(roles['organizations']),
+            project__organization__archived=False,
+            id=F('project__current_questionnaire')
+        ).order_by('id')
 
     def get_queryset(self):
         return self.get_user_forms()
 
     def list(self, request, *args, **kwargs):
-        self.object_list = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(self.object_list, many=True)
-        return Response(
-            serializer.data, headers=self.get_openrosa_headers(request))
+        serializer = self.get_serializer(many=True)
+        base_url = serializer.child.get_base_url()
+
+        def load():
+            self.object_list = self.filter_queryset(self.get_queryset())
+            serializer.instance = self.object_list
+            return serializer.data
+
+        data, etag = get_form_list(
+            get_user_roles(request.user), base_url, load)
+        headers = self.get_openrosa_headers(request)
+        headers['ETag'] = etag
+        if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+            return Response(headers=headers,
+                            status=status.HTTP_304_NOT_MODIFIED)
+        return Response(data, headers=headers)